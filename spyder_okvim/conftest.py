@@ -1,6 +1,7 @@
 """Conftest."""
 
 # Standard Libraries
+import gc
 import os
 import os.path as osp
 from unittest.mock import Mock
@@ -121,7 +122,7 @@ def qtbot_module(qapp, request):
 
 
 @pytest.fixture(scope="session", autouse=True)
-def vim_bot(qtbot_module):
+def vim_bot(qtbot_module, tmp_path_factory):
     """Editorstack pytest fixture."""
     text = (
         "   123\n" "line 1\n" "line 2\n" "line 3\n" "line 4"
@@ -144,7 +145,11 @@ def vim_bot(qtbot_module):
     finfo3 = editor_stack.new(osp.join(LOCATION, "foo3.py"), "utf-8", text)
     main = MainMock(editor_stack, qtbot_module)
 
-    vim = VimTesting(main, None)
+    # Keep the marks and the session of the tests out of the user config.
+    config_dir = str(tmp_path_factory.mktemp("okvim"))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(CONF, "get_plugin_config_path", lambda *args: config_dir)
+        vim = VimTesting(main, None)
     vim.on_initialize()
 
     qtbot_module.addWidget(editor_stack)
@@ -180,3 +185,7 @@ def process_events_after_test():
     """Process pending Qt events after each test."""
     yield
     QCoreApplication.processEvents()
+    # Spyder's text decorations hold QObjects in reference cycles. Collect
+    # them between tests instead of whenever the garbage collector happens
+    # to run inside a Qt call.
+    gc.collect(1)
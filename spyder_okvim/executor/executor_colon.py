@@ -1,15 +1,128 @@
 # -*- coding: utf-8 -*-
 """Executor for ":" command-line input."""
 
+# Standard Libraries
+import os
+import re
+from functools import partial
+
 # Third Party Libraries
-from qtpy.QtWidgets import QDialog
+from qtpy.QtGui import QTextCursor
+from qtpy.QtWidgets import QDialog, QTextEdit
+from spyder.config.manager import CONF
 
 # Project Libraries
 from spyder_okvim.executor.executor_base import ExecutorSubBase
+from spyder_okvim.spyder.config import CONF_SECTION
+from spyder_okvim.utils.ex_range import ExRangeParser, search_lines
 from spyder_okvim.utils.jump_dialog import JumpListDialog
+from spyder_okvim.utils.line_ops import (
+    IN_PLACE,
+    TO_BOTTOM,
+    TO_TOP,
+    copy_lines,
+    global_lines,
+    move_lines,
+    shift_lines,
+    sort_lines,
+)
+from spyder_okvim.utils.macro_batch import (
+    MacroBatchDialog,
+    MacroBatchResult,
+    MacroBatchRun,
+    parse_macro_batch,
+)
 from spyder_okvim.utils.qtcompat import exec_dialog
 from spyder_okvim.utils.mark_dialog import MarkListDialog
-from spyder_okvim.vim import VimState
+from spyder_okvim.utils.project_substitute import (
+    ProjectSubstitute,
+    SubstitutePreviewDialog,
+    substitute_text,
+)
+from spyder_okvim.utils.quickfix import (
+    QuickfixDialog,
+    expand_files,
+    parse_vimgrep,
+    vimgrep,
+)
+from spyder_okvim.utils.substitute import (
+    RE_FLAGS,
+    compile_replacement,
+    expand,
+    parse_substitute,
+    split_delimited,
+    substitute_line,
+    substitute_spans,
+)
+from spyder_okvim.utils.text_edit import LineTracker, apply_line_change, apply_spans
+from spyder_okvim.utils.vim_regex import compile_pattern, has_uppercase
+from spyder_okvim.vim import Macro, VimState
+
+RE_COMMAND = re.compile(r"\s*([a-zA-Z]+|[<>])?(!?)\s*(.*)", re.S)
+RE_REGISTER_COUNT = re.compile(r"\s*([a-zA-Z\"])?\s*(\d*)")
+RE_GLOBAL_COUNT = re.compile(r"\s*\.?\s*,\s*\.?\s*\+(\d*)")
+
+# Ex commands taking a line range and the method running them.
+RANGE_COMMANDS = {
+    "d": "delete",
+    "de": "delete",
+    "del": "delete",
+    "delete": "delete",
+    "y": "yank",
+    "ya": "yank",
+    "yank": "yank",
+    "m": "move",
+    "mo": "move",
+    "move": "move",
+    "t": "copy",
+    "co": "copy",
+    "copy": "copy",
+    ">": "shift_right",
+    "<": "shift_left",
+    "sor": "sort",
+    "sort": "sort",
+    "s": "substitute",
+    "su": "substitute",
+    "substitute": "substitute",
+    "g": "global_",
+    "gl": "global_",
+    "global": "global_",
+    "v": "vglobal",
+    "vg": "vglobal",
+    "vglobal": "vglobal",
+    "norm": "normal",
+    "norma": "normal",
+    "normal": "normal",
+}
+# Range commands running on the whole file by default.
+WHOLE_FILE_COMMANDS = ("global_", "vglobal")
+
+
+def _plural(count, word):
+    suffix = "es" if word.endswith("h") else "s"
+    return f"{count} {word}" if count == 1 else f"{count} {word}{suffix}"
+
+
+def apply_substitutions(vim_status, pos_start, spans):
+    """Apply the replacements of ``:s`` as one undo step and report them."""
+    editor = vim_status.get_editor()
+    document = editor.document()
+    lines = {
+        document.findBlock(pos_start + start).blockNumber() for start, _, _ in spans
+    }
+    # The cursor goes to the last changed line, below the added lines.
+    last_line = max(lines) + sum(text.count("\n") for _, _, text in spans)
+
+    apply_spans(vim_status.get_cursor(), pos_start, spans)
+    editor.document_did_change()
+
+    block = document.findBlockByNumber(last_line)
+    text = block.text()
+    vim_status.cursor.set_cursor_pos(block.position() + len(text) - len(text.lstrip()))
+    if len(spans) > 2:
+        vim_status.set_message(
+            f"{_plural(len(spans), 'substitution')} on {_plural(len(lines), 'line')}"
+        )
 
 
 class ExecutorColon(ExecutorSubBase):
@@ -20,6 +133,7 @@ class ExecutorColon(ExecutorSubBase):
         self.allow_leaderkey = False
 
         self.editor_widget = vim_status.editor_widget
+        self.executor_confirm = ExecutorSubstituteConfirm(vim_status)
 
     def __call__(self, txt: str) -> bool:
         """Parse ``txt`` and execute the corresponding ex command.
@@ -34,13 +148,16 @@ class ExecutorColon(ExecutorSubBase):
         if txt[-1] == "\b":
             cmd_line = self.vim_status.cmd_line
             if len(txt) <= 2:
+                self.vim_status.substitute_preview.clear()
                 self.vim_status.sub_mode = None
                 return True
             else:
                 cmd_line.setText(txt[:-2])
         if txt[-1] != "\r":
+            self._update_preview(txt)
             return False
 
+        self.vim_status.substitute_preview.clear()
         if txt[0] != ":" or len(txt) <= 2:
             self.vim_status.sub_mode = None
             return True
@@ -50,13 +167,43 @@ class ExecutorColon(ExecutorSubBase):
         self.update_input_cmd_info(None, None, txt[1:])
 
         txt = txt[1:-1]  # remove :, \r
-        cmd = txt.split(None, 1)
-        args = cmd[1] if len(cmd) > 1 else ""
-        cmd = cmd[0]
+        vs = self.vim_status
+        vs.add_history("cmd", txt)
+        is_visual = vs.vim_state in (VimState.VISUAL, VimState.VLINE)
+        if is_visual:
+            vs.set_visual_marks()
+
+        parser = self._get_range_parser()
+        try:
+            line_range, txt = parser.parse(txt)
+        except ValueError as e:
+            vs.set_message(str(e))
+            vs.sub_mode = None
+            return True
 
-        if cmd.isdigit():
-            self.goto_line(int(cmd))
+        name, bang, args = RE_COMMAND.match(txt).groups()
+        if not name:
+            if line_range is not None:
+                self.goto_line(min(max(line_range[1], -1), parser.last) + 1)
+        elif name in RANGE_COMMANDS:
+            method_name = RANGE_COMMANDS[name]
+            if line_range is None:
+                if method_name in WHOLE_FILE_COMMANDS and not is_visual:
+                    line_range = (0, parser.last)
+                else:
+                    line_range = self._get_default_range(is_visual)
+            if is_visual:
+                vs.to_normal()
+            method = self.__getattribute__(method_name)
+            try:
+                parser.check(line_range)
+                method(bang + args, max(line_range[0], 0), line_range[1])
+            except ValueError as e:
+                vs.set_message(str(e))
+        elif line_range is not None:
+            vs.set_message("E481: No range allowed")
         else:
+            cmd = name + bang
             for symbol, text in self.SYMBOLS_REPLACEMENT.items():
                 cmd = cmd.replace(symbol, text)
 
@@ -67,10 +214,16 @@ class ExecutorColon(ExecutorSubBase):
             else:
                 method(args)
 
-        self.vim_status.sub_mode = None
+        # ``:s///c`` leaves the confirmation submode running.
+        if vs.sub_mode is self:
+            vs.sub_mode = None
 
         return True
 
+    def on_escape(self) -> None:
+        """Remove the preview of ``:s``."""
+        self.vim_status.substitute_preview.clear()
+
     def w(self, arg=""):
         """Save current file."""
         self.save_current_file()
@@ -127,6 +280,699 @@ class ExecutorColon(ExecutorSubBase):
 
         vs.set_focus_to_vim()
 
+    def vimgrep(self, arg=""):
+        """Fill the quickfix list, ``:vimgrep /{pattern}/[g][j] {file} ...``.
+
+        Open files are searched in their editor, so unsaved changes are
+        found; the other files are read from the disk.
+        """
+        vs = self.vim_status
+        try:
+            pattern, flags, names = parse_vimgrep(arg)
+            pattern = pattern or vs.search.txt_searched
+            if not pattern:
+                raise ValueError("E35: No previous regular expression")
+            regex = self._compile(pattern, "")
+        except ValueError as e:
+            vs.set_message(str(e))
+            return
+
+        stack = vs.get_editorstack()
+        files = expand_files(
+            names,
+            stack.get_current_filename(),
+            stack.get_filenames(),
+            vs.get_project_root() or os.getcwd(),
+        )
+        buffers = {}
+        for file_path in files:
+            document = vs.get_open_document(file_path)
+            if document is not None:
+                buffers[file_path] = document.toPlainText()
+        entries = vimgrep(files, buffers, regex, "g" in flags)
+        if not entries:
+            vs.set_message(f"E480: No match: {pattern}")
+            return
+
+        vs.set_quickfix(entries)
+        if "j" in flags:
+            vs.set_message(_plural(len(entries), "match"))
+        else:
+            vs.jump_to_quickfix(0)
+
+    vim = vimg = vimgrep
+
+    def copen(self, arg=""):
+        """Show the quickfix list and jump to the selected entry."""
+        vs = self.vim_status
+        vs.track_quickfix()
+
+        dlg = QuickfixDialog(vs, vs.main)
+        exec_dialog(dlg)
+        vs.set_focus_to_vim()
+        index = dlg.get_selected_index()
+        if index is not None:
+            vs.jump_to_quickfix(index)
+
+    cope = copen
+
+    def cdo(self, arg=""):
+        """Substitute on the lines of the quickfix list, ``:cdo s/{pattern}/...``."""
+        self._substitute_quickfix(arg, whole_files=False)
+
+    def cfdo(self, arg=""):
+        """Substitute in the files of the quickfix list, ``:cfdo %s/{pattern}/...``."""
+        self._substitute_quickfix(arg, whole_files=True)
+
+    def _substitute_quickfix(self, arg, whole_files):
+        """Scan every file, then change them all.
+
+        Open files are changed in their editor, one undo step each, and the
+        other files are rewritten on disk without being opened. With the
+        ``c`` flag the changed lines are previewed and applied on Enter.
+        """
+        vs = self.vim_status
+        try:
+            if not len(vs.quickfix):
+                raise ValueError("E42: No Errors")
+            name, _, args = RE_COMMAND.match(arg.strip().lstrip("%")).groups()
+            if RANGE_COMMANDS.get(name) != "substitute":
+                raise ValueError(f"E492: Not an editor command: {arg.strip()}")
+            pattern, replacement, flags, _ = self._get_substitute(args)
+            regex = self._compile(pattern, flags)
+        except ValueError as e:
+            vs.set_message(str(e))
+            return
+        previous = vs.last_substitute[1] if vs.last_substitute else ""
+        parts = compile_replacement(replacement, previous)
+        vs.last_substitute = (pattern, replacement, flags.lstrip("&"))
+        replace_all = "g" in flags
+
+        vs.track_quickfix()
+        targets = {}
+        for entry in vs.quickfix.entries:
+            if whole_files:
+                targets[entry.file] = None
+                continue
+            document = vs.get_open_document(entry.file)
+            if document is None:
+                line = entry.line
+            else:
+                line = document.findBlock(entry.pos).blockNumber()
+            targets.setdefault(entry.file, set()).add(line)
+
+        buffers = {}
+        hunks = []
+        on_disk = {}
+        for file_path, lines in targets.items():
+            editor = vs.get_open_editor(file_path)
+            if editor is None:
+                on_disk[file_path] = lines
+                continue
+            spans, file_hunks = substitute_text(
+                editor.toPlainText(), regex, parts, replace_all, lines
+            )
+            if spans:
+                buffers[file_path] = (editor, spans)
+                hunks.extend((file_path, *hunk) for hunk in file_hunks)
+        project = ProjectSubstitute(on_disk, regex, parts, replace_all)
+        hunks.extend(project.scan())
+        if not hunks:
+            if "e" not in flags:
+                vs.set_message(f"E486: Pattern not found: {pattern}")
+            return
+        order = {file_path: idx for idx, file_path in enumerate(targets)}
+        hunks.sort(key=lambda hunk: order[hunk[0]])
+
+        if "n" in flags:
+            count = project.count + sum(len(spans) for _, spans in buffers.values())
+            vs.set_message(
+                f"{_plural(count, 'match')} on {_plural(len(hunks), 'line')}"
+            )
+            return
+        if "c" in flags:
+            dlg = SubstitutePreviewDialog(hunks, vs.main)
+            exec_dialog(dlg)
+            vs.set_focus_to_vim()
+            if not dlg.confirmed:
+                return
+
+        count = 0
+        for editor, spans in buffers.values():
+            count += apply_spans(QTextCursor(editor.document()), 0, spans)
+            editor.document_did_change()
+        written, n_written, skipped = project.apply()
+        msg = (
+            f"{_plural(count + written, 'substitution')} in "
+            f"{_plural(len(buffers) + n_written, 'file')}"
+        )
+        if skipped:
+            msg += f", {_plural(skipped, 'file')} changed on disk skipped"
+        vs.set_message(msg)
+        vs.cursor.draw_vim_cursor()
+
+    def macrobatch(self, arg=""):
+        """Run a macro on many files, ``:macrobatch {reg} [workers] {file} ...``.
+
+        The macro starts at the first line of each file. Open files are
+        changed in their editor, one undo step each. The other files are
+        changed by headless editors in worker processes and written back
+        atomically. The result of each file is listed in a dialog as it
+        comes; closing the dialog cancels the files that did not start.
+        """
+        vs = self.vim_status
+        try:
+            register, workers, names = parse_macro_batch(arg)
+        except ValueError as e:
+            vs.set_message(str(e))
+            return
+        keys = vs.get_macro(register).notation
+        if not keys:
+            vs.set_message(f"E353: Nothing in register {register}")
+            return
+        stack = vs.get_editorstack()
+        current = stack.get_current_filename()
+        files = expand_files(
+            names,
+            current,
+            stack.get_filenames(),
+            vs.get_project_root() or os.getcwd(),
+        )
+        if not files:
+            vs.set_message(f"E480: No match: {' '.join(names)}")
+            return
+
+        results = {}
+        for file_path in files:
+            if vs.get_open_editor(file_path) is not None:
+                stack.set_current_filename(file_path)
+                results[file_path] = self._run_macro_in_editor(file_path, keys)
+        if results:
+            stack.set_current_filename(current)
+        # Every file starts with the registers of this session.
+        registers = {
+            name: (info.content, info.type) for name, info in vs.register_dict.items()
+        }
+        on_disk = [file_path for file_path in files if file_path not in results]
+        run = MacroBatchRun()
+        dlg = MacroBatchDialog(list(results.values()), len(files), run, vs.main)
+        run.start(on_disk, keys, registers, workers)
+        exec_dialog(dlg)
+        vs.set_focus_to_vim()
+        results = dlg.results
+        n_failed = sum(not result.ok for result in results)
+        msg = f"{_plural(sum(result.changed for result in results), 'file')} changed"
+        if n_failed:
+            msg += f", {n_failed} failed"
+        if len(results) < len(files):
+            msg += f", {len(files) - len(results)} not done"
+        vs.set_message(msg)
+
+    def _run_macro_in_editor(self, file_path, keys):
+        """Type ``keys`` in the current editor; an error undoes the changes."""
+        vs = self.vim_status
+        vs.set_focus_to_vim()
+        editor = vs.get_editor()
+        text = editor.toPlainText()
+        vs.error_message = ""
+        self._run_normal(keys, range(1))
+        changed = editor.toPlainText() != text
+        if vs.error_message:
+            if changed:
+                editor.undo()
+            return MacroBatchResult(file_path, False, message=vs.error_message)
+        return MacroBatchResult(file_path, True, changed)
+
+    def earlier(self, arg=""):
+        """Go to an older text state, ``arg`` changes or a time ago."""
+        self._travel_undo(arg, later=False)
+
+    def later(self, arg=""):
+        """Go to a newer text state, ``arg`` changes or a time later."""
+        self._travel_undo(arg, later=True)
+
+    def _travel_undo(self, arg, later):
+        vs = self.vim_status
+        if vs.travel_undo(arg, later):
+            vs.cursor.set_cursor_pos_without_end(vs.get_cursor().position())
+
+    def delete(self, arg, start, end):
+        """Delete the lines into a register, ``:[range]d [x] [count]``."""
+        start, end, register = self._apply_register_count(arg, start, end)
+        lines = self._get_lines()
+        text = "\n".join(lines[start : end + 1]) + "\n"
+        vs = self.vim_status
+        vs.set_register(register, text, VimState.VLINE)
+        if register == '"':
+            vs.set_deleted_register(text, VimState.VLINE, False)
+
+        new_lines = lines[:start] + lines[end + 1 :]
+        self._set_lines(lines, new_lines or [""])
+        self._goto_line_start(min(start, max(len(new_lines) - 1, 0)))
+        self._report(end - start + 1, "fewer lines")
+
+    def yank(self, arg, start, end):
+        """Yank the lines into a register, ``:[range]y [x] [count]``."""
+        start, end, register = self._apply_register_count(arg, start, end)
+        lines = self._get_lines()
+        text = "\n".join(lines[start : end + 1]) + "\n"
+        vs = self.vim_status
+        vs.set_register(register, text, VimState.VLINE)
+        if register == '"':
+            vs.set_register("0", text, VimState.VLINE)
+        self._report(end - start + 1, "lines yanked")
+
+    def move(self, arg, start, end):
+        """Move the lines below the address ``arg``, ``:[range]m {address}``."""
+        dest = self._get_range_parser().parse_address(arg)
+        lines = self._get_lines()
+        self._set_lines(lines, move_lines(lines, start, end, dest))
+        last = dest if dest >= end else dest + end - start + 1
+        self._goto_line_start(last)
+        self._report(end - start + 1, "lines moved")
+
+    def copy(self, arg, start, end):
+        """Copy the lines below the address ``arg``, ``:[range]t {address}``."""
+        dest = self._get_range_parser().parse_address(arg)
+        lines = self._get_lines()
+        self._set_lines(lines, copy_lines(lines, start, end, dest))
+        self._goto_line_start(dest + end - start + 1)
+        self._report(end - start + 1, "more lines")
+
+    def shift_right(self, arg, start, end):
+        """Indent the lines once per ``>``, ``:[range]>``."""
+        self._shift(start, end, 1 + arg.count(">"))
+
+    def shift_left(self, arg, start, end):
+        """Unindent the lines once per ``<``, ``:[range]<``."""
+        self._shift(start, end, -1 - arg.count("<"))
+
+    def sort(self, arg, start, end):
+        """Sort the lines, ``:[range]sort[!] [i] [n] [u]``."""
+        lines = self._get_lines()
+        if start == end:
+            return
+        new_lines = sort_lines(lines[start : end + 1], arg.replace(" ", ""))
+        self._set_lines(lines, lines[:start] + new_lines + lines[end + 1 :])
+        self._goto_line_start(start)
+
+    def substitute(self, arg, start, end):
+        """Replace a pattern, ``:[range]s/{pattern}/{string}/[flags] [count]``."""
+        vs = self.vim_status
+        pattern, replacement, flags, count = self._get_substitute(arg)
+        if count:
+            start = end
+            end = min(end + count - 1, vs.get_editor().blockCount() - 1)
+        regex = self._compile(pattern, flags)
+        previous = vs.last_substitute[1] if vs.last_substitute else ""
+        parts = compile_replacement(replacement, previous)
+        vs.last_substitute = (pattern, replacement, flags.lstrip("&"))
+
+        lines = self._get_lines()[start : end + 1]
+        spans, changed = substitute_spans(
+            lines, regex, partial(expand, parts), "g" in flags
+        )
+        if not spans:
+            if "e" not in flags:
+                vs.set_message(f"E486: Pattern not found: {pattern}")
+            return
+        if "n" in flags:
+            vs.set_message(
+                f"{_plural(len(spans), 'match')} on {_plural(len(changed), 'line')}"
+            )
+            return
+
+        pos_start = vs.get_editor().document().findBlockByNumber(start).position()
+        if "c" in flags:
+            self.executor_confirm.start(pos_start, spans)
+        else:
+            apply_substitutions(vs, pos_start, spans)
+
+    def global_(self, arg, start, end):
+        """Run a command on the matching lines, ``:[range]g[!]/{pattern}/{cmd}``."""
+        invert = arg.startswith("!")
+        self._global(arg[1:] if invert else arg, start, end, invert)
+
+    def vglobal(self, arg, start, end):
+        """Run a command on the other lines, ``:[range]v/{pattern}/{cmd}``."""
+        self._global(arg, start, end, True)
+
+    def _global(self, arg, start, end, invert):
+        """Mark the lines in one scan, then run the command once per mark.
+
+        All the commands edit the same list of lines, which is applied to
+        the document as one undo step.
+        """
+        vs = self.vim_status
+        if not arg:
+            raise ValueError("E476: Invalid command")
+        if arg[0].isalnum() or arg[0] in '\\"|':
+            raise ValueError("E146: Regular expressions can't be delimited by letters")
+        pattern, cmd = split_delimited(arg[1:], arg[0])
+        if not pattern:
+            pattern = vs.last_substitute[0] if vs.last_substitute else ""
+            pattern = pattern or vs.search.txt_searched
+            if not pattern:
+                raise ValueError("E35: No previous regular expression")
+        regex = self._compile(pattern, "")
+
+        lines = self._get_lines()
+        search = regex.search
+        marked = [
+            idx
+            for idx in range(start, end + 1)
+            if (search(lines[idx]) is None) == invert
+        ]
+        if not marked:
+            vs.set_message(f"E486: Pattern not found: {pattern}")
+            return
+
+        count = 1
+        cmd = cmd or ""
+        match = RE_GLOBAL_COUNT.match(cmd)
+        if match:
+            count = int(match[1] or 1) + 1
+            cmd = cmd[match.end() :]
+        name, bang, args = RE_COMMAND.match(cmd).groups()
+        if not name:
+            self._goto_line_start(marked[-1])
+            return
+        if RANGE_COMMANDS.get(name) == "normal":
+            self._run_normal(args, marked, follow=True)
+            return
+        action, report = self._get_global_action(
+            RANGE_COMMANDS.get(name), args, cmd, pattern
+        )
+
+        new_lines, last_line = global_lines(lines, marked, action, count)
+        self._set_lines(lines, new_lines)
+        self._goto_line_start(last_line)
+        report()
+
+    def _get_global_action(self, method_name, args, cmd, pattern):
+        """Return the action of :func:`global_lines` for ``cmd`` and its report.
+
+        ``pattern`` of ``:g`` is used by ``:s`` without a pattern.
+        """
+        vs = self.vim_status
+        args = args.strip()
+        n_lines = 0
+        if method_name == "delete":
+            register = RE_REGISTER_COUNT.match(args)[1] or '"'
+            deleted = []
+
+            def action(chunk):
+                nonlocal n_lines
+                n_lines += len(chunk)
+                deleted[:] = chunk
+                return [], IN_PLACE, []
+
+            def report():
+                # Like repeated ``:d``, the register keeps the last lines.
+                text = "\n".join(deleted) + "\n"
+                vs.set_register(register, text, VimState.VLINE)
+                if register == '"':
+                    vs.set_deleted_register(text, VimState.VLINE, False)
+                self._report(n_lines, "fewer lines")
+
+            return action, report
+
+        if method_name in ("move", "copy"):
+            where = {"0": TO_TOP, "$": TO_BOTTOM, ".": IN_PLACE}.get(args)
+            if where is None:
+                raise ValueError(f"E14: Invalid address: {args}")
+            is_copy = method_name == "copy"
+
+            def action(chunk):
+                nonlocal n_lines
+                n_lines += len(chunk)
+                if where == IN_PLACE:
+                    return chunk * 2 if is_copy else chunk, IN_PLACE, []
+                return chunk if is_copy else [], where, chunk
+
+            text = "more lines" if is_copy else "lines moved"
+            return action, lambda: self._report(n_lines, text)
+
+        if method_name in ("shift_right", "shift_left"):
+            level = (
+                1 + args.count(">")
+                if method_name == "shift_right"
+                else -1 - args.count("<")
+            )
+
+            def action(chunk):
+                return shift_lines(chunk, vs.indent, level), IN_PLACE, []
+
+            return action, lambda: None
+
+        if method_name == "substitute":
+            pattern, replacement, flags, _ = self._get_substitute(args, pattern)
+            regex = self._compile(pattern, flags)
+            previous = vs.last_substitute[1] if vs.last_substitute else ""
+            replace = partial(expand, compile_replacement(replacement, previous))
+            vs.last_substitute = (pattern, replacement, flags.lstrip("&"))
+            replace_all = "g" in flags
+            n_subs = 0
+
+            def action(chunk):
+                nonlocal n_subs, n_lines
+                new_chunk = []
+                for line in chunk:
+                    text, segments = substitute_line(line, regex, replace, replace_all)
+                    if segments:
+                        n_subs += len(segments)
+                        n_lines += 1
+                    new_chunk.append(text)
+                return "\n".join(new_chunk).split("\n"), IN_PLACE, []
+
+            def report():
+                if not n_subs:
+                    if "e" not in flags:
+                        vs.set_message(f"E486: Pattern not found: {pattern}")
+                elif n_subs > 2:
+                    vs.set_message(
+                        f"{_plural(n_subs, 'substitution')} on "
+                        f"{_plural(n_lines, 'line')}"
+                    )
+
+            return action, report
+
+        raise ValueError(f"E492: Not an editor command: {cmd.strip()}")
+
+    def normal(self, arg, start, end):
+        """Type normal mode keys on each line, ``:[range]norm[al][!] {keys}``."""
+        self._run_normal(arg[1:] if arg.startswith("!") else arg, range(start, end + 1))
+
+    def _run_normal(self, keys, lines, follow=False):
+        """Type ``keys`` at the start of each line of ``lines``.
+
+        The keys are parsed once. Like Vim, a range goes on with the next
+        line number whatever the keys changed, while the lines marked by
+        ``:g`` are followed through the edits and skipped once deleted
+        (``follow``). The insert mode does not move the focus, the editor
+        is not repainted until the end, and all the changes are one undo
+        step.
+        """
+        vs = self.vim_status
+        key_infos = list(Macro(keys).key_infos())
+        if not key_infos:
+            raise ValueError("E471: Argument required")
+        editor = vs.get_editor()
+        document = editor.document()
+        vim_widget = vs.cmd_line.vim_widget
+        # Let the keys reach the executors instead of this command.
+        vs.sub_mode = None
+        vs.cmd_line.clear()
+
+        n_blocks = document.blockCount()
+        n_steps = document.availableUndoSteps()
+        modified = document.isModified()
+        if follow:
+            lines = LineTracker(document, lines)
+        edit = QTextCursor(document)
+        # The panels, the decorations, the mode label and the language server
+        # are updated once at the end instead of after every key.
+        editor.setUpdatesEnabled(False)
+        editor.blockSignals(True)
+        vs.blockSignals(True)
+        editor.document_did_change = lambda: None
+        edit.beginEditBlock()
+        try:
+            for line in lines:
+                if line >= document.blockCount():
+                    break
+                vs.cursor.set_cursor_pos(document.findBlockByNumber(line).position())
+                vim_widget.feed_keys(key_infos)
+        finally:
+            edit.endEditBlock()
+            del editor.document_did_change
+            vs.blockSignals(False)
+            editor.blockSignals(False)
+            editor.setUpdatesEnabled(True)
+        if editor.hasFocus():
+            # Hiding the completion widget of the editor, like after typing
+            # a delimiter, gives it the focus.
+            vs.set_focus_to_vim()
+        vs.change_label.emit(vs.vim_state)
+        editor.cursorPositionChanged.emit()
+        if document.blockCount() != n_blocks:
+            # The line number margin and the bookmarks follow the line count.
+            editor.blockCountChanged.emit(document.blockCount())
+        if document.isModified() != modified:
+            # The tab title and the save actions follow the modified state.
+            editor.modificationChanged.emit(document.isModified())
+        if document.availableUndoSteps() != n_steps:
+            editor.document_did_change()
+        vs.cursor.draw_vim_cursor()
+
+    def _get_substitute(self, arg, default_pattern=""):
+        """Return the pattern, replacement, flags and count of ``:s``.
+
+        An empty pattern is ``default_pattern``, else the last one used.
+        """
+        vs = self.vim_status
+        last = vs.last_substitute
+        parsed = parse_substitute(arg)
+        if parsed is None:
+            # ``:s [flags] [count]`` repeats the last substitution.
+            match = RE_FLAGS.match(arg.strip())
+            if last is None or match is None:
+                raise ValueError("E35: No previous regular expression")
+            flags, count = match.groups()
+            return last[0], last[1], flags, int(count) if count else 0
+
+        pattern, replacement, flags, count = parsed
+        if flags.startswith("&"):
+            flags = (last[2] if last else "") + flags[1:]
+        if not pattern:
+            pattern = default_pattern or (last[0] if last else vs.search.txt_searched)
+            if not pattern:
+                raise ValueError("E35: No previous regular expression")
+        return pattern, replacement or "", flags, count
+
+    def _compile(self, pattern, flags):
+        if "i" in flags:
+            ignore_case = True
+        elif "I" in flags:
+            ignore_case = False
+        else:
+            ignore_case = CONF.get(CONF_SECTION, "ignorecase") and not (
+                CONF.get(CONF_SECTION, "smartcase") and has_uppercase(pattern)
+            )
+        try:
+            return compile_pattern(pattern, ignore_case)
+        except re.error:
+            raise ValueError(f"E383: Invalid search string: {pattern}")
+
+    def _update_preview(self, txt):
+        """Preview ``:s`` on the visible lines while it is typed."""
+        vs = self.vim_status
+        preview = vs.substitute_preview
+        name = parsed = None
+        try:
+            line_range, rest = self._get_range_parser().parse(txt[1:])
+            name, _, args = RE_COMMAND.match(rest).groups()
+            if RANGE_COMMANDS.get(name) == "substitute":
+                parsed = parse_substitute(args)
+        except ValueError:
+            name = None
+        if RANGE_COMMANDS.get(name) != "substitute" or not parsed or not parsed[0]:
+            preview.clear()
+            return
+
+        pattern, replacement, flags, _ = parsed
+        try:
+            regex = self._compile(pattern, flags)
+        except ValueError:
+            preview.clear()
+            return
+        if line_range is None:
+            is_visual = vs.vim_state in (VimState.VISUAL, VimState.VLINE)
+            if is_visual:
+                vs.set_visual_marks()
+            line_range = self._get_default_range(is_visual)
+
+        replace = None
+        if replacement is not None:
+            previous = vs.last_substitute[1] if vs.last_substitute else ""
+            replace = partial(expand, compile_replacement(replacement, previous))
+        preview.color_fg = vs.search.color_fg.color()
+        preview.color_bg = vs.search.color_bg.color()
+        preview.show(vs.get_editor(), line_range, regex, replace, "g" in flags)
+
+    def _shift(self, start, end, level):
+        lines = self._get_lines()
+        shifted = shift_lines(lines[start : end + 1], self.vim_status.indent, level)
+        self._set_lines(lines, lines[:start] + shifted + lines[end + 1 :])
+        self._goto_line_start(end)
+        direction = ">" if level > 0 else "<"
+        self._report(end - start + 1, f"lines {direction}ed {abs(level)} time")
+
+    def _get_range_parser(self):
+        vs = self.vim_status
+        editor = vs.get_editor()
+        lines = None
+
+        def get_mark(name):
+            info = vs.get_bookmark(name)
+            if info is None:
+                return None
+            if info.get("file") != vs.get_editorstack().get_current_filename():
+                return None
+            return info.get("line")
+
+        def search(pattern, line, backward):
+            nonlocal lines
+            if lines is None:
+                lines = self._get_lines()
+            return search_lines(lines, pattern, line, backward)
+
+        return ExRangeParser(
+            vs.get_cursor().blockNumber(), editor.blockCount() - 1, get_mark, search
+        )
+
+    def _get_default_range(self, is_visual):
+        if is_visual:
+            vs = self.vim_status
+            start = vs.get_bookmark("<")
+            end = vs.get_bookmark(">")
+            if start is not None and end is not None:
+                return start["line"], end["line"]
+        line = self.vim_status.get_cursor().blockNumber()
+        return line, line
+
+    def _apply_register_count(self, arg, start, end):
+        """Read ``[x] [count]`` and return the range and the register."""
+        match = RE_REGISTER_COUNT.match(arg)
+        register, count = match.groups()
+        if count:
+            start = end
+            end = min(
+                end + int(count) - 1, self.vim_status.get_editor().blockCount() - 1
+            )
+        return start, end, register or '"'
+
+    def _get_lines(self):
+        return self.vim_status.get_editor().toPlainText().split("\n")
+
+    def _set_lines(self, old_lines, new_lines):
+        """Apply the new lines as one edit and one undo step."""
+        vs = self.vim_status
+        if apply_line_change(vs.get_cursor(), 0, old_lines, new_lines):
+            vs.get_editor().document_did_change()
+
+    def _goto_line_start(self, line):
+        """Put the cursor on the first non-blank character of ``line``."""
+        block = self.vim_status.get_editor().document().findBlockByNumber(line)
+        text = block.text()
+        self.vim_status.cursor.set_cursor_pos(
+            block.position() + len(text) - len(text.lstrip())
+        )
+
+    def _report(self, count, text):
+        if count > 2:
+            self.vim_status.set_message(f"{count} {text}")
+
     def goto_line(self, num):
         """Move cursor according to :number command."""
         vs = self.vim_status
@@ -142,3 +988,72 @@ class ExecutorColon(ExecutorSubBase):
                 vs.cursor.apply_motion_info_in_vline(motion_info)
             vs.to_normal()
         vs.push_jump()
+
+
+class ExecutorSubstituteConfirm(ExecutorSubBase):
+    """Submode asking whether to replace each match of ``:s///c``.
+
+    ``y`` replaces the match, ``n`` skips it, ``a`` replaces all the
+    remaining matches, ``l`` replaces the match and stops and ``q`` or
+    ``Esc`` stop. The accepted replacements are applied as one undo step.
+    """
+
+    def __init__(self, vim_status):
+        super().__init__(vim_status)
+        self.allow_leaderkey = False
+        self.pos_start = 0
+        self.spans = []
+        self.accepted = []
+        self.idx = 0
+
+    def start(self, pos_start, spans):
+        """Ask about ``spans``, whose offsets are relative to ``pos_start``."""
+        self.pos_start = pos_start
+        self.spans = spans
+        self.accepted = []
+        self.idx = 0
+        self.vim_status.sub_mode = self
+        self._show_match()
+
+    def __call__(self, txt: str) -> bool:
+        ch = txt[-1]
+        if ch == "a":
+            self.accepted.extend(self.spans[self.idx :])
+            self.idx = len(self.spans)
+        elif ch in "ynlq":
+            if ch in "yl":
+                self.accepted.append(self.spans[self.idx])
+            self.idx += 1
+
+        if ch in "lq" or self.idx >= len(self.spans):
+            self.vim_status.sub_mode = None
+            self._finish()
+        else:
+            self._show_match()
+        return True
+
+    def on_escape(self) -> None:
+        """Apply the replacements accepted so far."""
+        self._finish()
+
+    def _show_match(self):
+        vs = self.vim_status
+        start, end, text = self.spans[self.idx]
+        sel = QTextEdit.ExtraSelection()
+        sel.format.setForeground(vs.search.color_fg)
+        sel.format.setBackground(vs.search.color_bg)
+        sel.cursor = vs.get_cursor()
+        sel.cursor.setPosition(self.pos_start + start)
+        sel.cursor.setPosition(self.pos_start + end, QTextCursor.KeepAnchor)
+        vs.cursor.set_extra_selections("vim_search", [sel])
+        vs.cursor.set_cursor_pos(self.pos_start + start)
+        vs.set_message(f"replace with {text} (y/n/a/q/l)")
+
+    def _finish(self):
+        vs = self.vim_status
+        vs.cursor.set_extra_selections("vim_search", [])
+        vs.set_message("")
+        if self.accepted:
+            apply_substitutions(vs, self.pos_start, self.accepted)
+        self.spans = []
+        self.accepted = []
@@ -7,6 +7,9 @@ from spyder.api.plugins import Plugins
 
 # Project Libraries
 from spyder_okvim.executor.executor_base import ExecutorBase
+from spyder_okvim.utils.live_grep import LiveGrepDialog
+from spyder_okvim.utils.qtcompat import exec_dialog
+from spyder_okvim.utils.symbol_search import SymbolSearchDialog
 
 
 class ExecutorLeaderKey(ExecutorBase):
@@ -23,6 +26,8 @@ class ExecutorLeaderKey(ExecutorBase):
             "f": self.formatting,
             "p": self.open_switcher,
             "s": self.open_symbol_swicher,
+            "g": self.live_grep,
+            "S": self.open_project_symbols,
         }
 
         self.set_selection_to_editor_using_vim_selection = (
@@ -106,6 +111,34 @@ class ExecutorLeaderKey(ExecutorBase):
         switcher = main.get_plugin(Plugins.Switcher)
         switcher.open_switcher(symbol=True)
 
+    def live_grep(self, num=1, num_str=""):
+        """Search the project files and jump to the selected line."""
+        vs = self.vim_status
+        root_folder = vs.get_project_root()
+        dlg = LiveGrepDialog(root_folder, vs.get_file_index(root_folder), vs.main)
+        exec_dialog(dlg)
+        self.jump_to_location(dlg.get_selected_hit())
+
+    def open_project_symbols(self, num=1, num_str=""):
+        """Search the symbols of the project and jump to the selected one."""
+        vs = self.vim_status
+        root_folder = vs.get_project_root()
+        dlg = SymbolSearchDialog(root_folder, vs.get_symbol_index(root_folder), vs.main)
+        exec_dialog(dlg)
+        dlg.release_symbol_index()
+        self.jump_to_location(dlg.get_selected_symbol())
+
+    def jump_to_location(self, location):
+        """Open ``(file, line, col)`` and record the jump."""
+        if location is None:
+            return
+        file_path, line, col = location
+        vs = self.vim_status
+        vs.push_jump()
+        vs.open_file_at(file_path, line, col)
+        vs.push_jump()
+        vs.set_focus_to_vim()
+
     def execute_easymotion(self, num=1, num_str=""):
         """Execute easymotion."""
         return self.prev_executor.run_easymotion()
@@ -46,6 +46,7 @@ from spyder_okvim.executor.executor_sub import (
 from spyder_okvim.executor.mixins import MovementMixin
 from spyder_okvim.spyder.config import CONF_SECTION
 from spyder_okvim.utils.motion import MotionInfo, MotionType
+from spyder_okvim.utils.undo_history import undo_steps
 
 
 class ExecutorNormalCmd(MovementMixin, ExecutorBase):
@@ -83,6 +84,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         self.executor_sub_register = ExecutorSubCmd_register(vim_status)
         self.executor_sub_search = ExecutorSearch(vim_status)
         self.executor_sub_alnum = ExecutorSubCmd_alnum(vim_status)
+        self.executor_sub_mark = ExecutorSubCmd_alnum(vim_status, extra_chars='"')
         self.executor_sub_easymotion = ExecutorEasymotion(vim_status)
         self.executor_sub_leap = ExecutorSubCmdLeap(vim_status)
         self.executor_sub_opensquarebracekt = ExecutorSubCmd_opensquarebracket(
@@ -102,7 +104,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         if not (cursor.atBlockEnd() and cursor.atBlockStart()):
             cursor.movePosition(QTextCursor.Right)
             self.set_cursor(cursor)
-        self.get_editor().setFocus()
+        self.vim_status.set_focus_to_editor()
 
     def A(self, num=1, num_str=""):
         """Append text at the end of the line."""
@@ -111,12 +113,12 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         cursor = self.get_cursor()
         cursor.movePosition(QTextCursor.EndOfLine)
         self.set_cursor(cursor)
-        self.get_editor().setFocus()
+        self.vim_status.set_focus_to_editor()
 
     def i(self, num=1, num_str=""):
         """Insert text before the cursor."""
         self.vim_status.update_dot_cmd(connect_editor=True)
-        self.get_editor().setFocus()
+        self.vim_status.set_focus_to_editor()
 
     def I(self, num=1, num_str=""):
         """Insert text before the first non-blank in the line."""
@@ -128,7 +130,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         cursor.setPosition(motion_info.cursor_pos)
         self.set_cursor(cursor)
 
-        self.get_editor().setFocus()
+        self.vim_status.set_focus_to_editor()
 
     def v(self, num=1, num_str=""):
         """Start visual mode per character."""
@@ -157,7 +159,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         cursor = editor.textCursor()
         cursor.movePosition(QTextCursor.EndOfLine)
         editor.setTextCursor(cursor)
-        editor.setFocus()
+        self.vim_status.set_focus_to_editor()
 
         # Send the keyevent to editor for using autoindent of editor.
         new_event = QKeyEvent(QEvent.KeyPress, Qt.Key_Return, Qt.NoModifier)
@@ -173,7 +175,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         cursor.insertText("\n")
         cursor.movePosition(QTextCursor.Up)
         editor.setTextCursor(cursor)
-        editor.setFocus()
+        self.vim_status.set_focus_to_editor()
 
         self.vim_status.update_dot_cmd(connect_editor=True)
 
@@ -187,8 +189,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         editor = self.get_editor()
         n_block_old = editor.blockCount()
 
-        for _ in range(num):
-            editor.undo()
+        undo_steps(editor, num)
         cursor = editor.textCursor()
         pos = cursor.position()
         if cursor.atBlockEnd() and not cursor.atBlockStart():
@@ -274,8 +275,6 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
 
     def dot(self, num=1, num_str=""):
         """Run previous change."""
-        # avoid to execute . command twice.
-        self.vim_status.manager_macro.remove_last_key(".")
         cmd_str = self.vim_status.dot_cmd.to_cmd_string(num, num_str)
 
         if not cmd_str:
@@ -291,10 +290,9 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
             event = key_info.to_event()
             cmd_line.keyPressEvent(event)
 
-        editor = self.get_editor()
-        for key_info in self.vim_status.dot_cmd.key_list_from_editor:
-            event = key_info.to_event()
-            editor.keyPressEvent(event)
+        insert_change = self.vim_status.dot_cmd.insert_change
+        if insert_change:
+            insert_change.apply(self.get_editor())
 
         self.vim_status.running_dot_cmd = False
 
@@ -396,7 +394,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
             motion_info = self.helper_motion.l(num, num_str)
             self.helper_action.yank(motion_info)
             self.helper_action.delete(motion_info, is_insert=True)
-            self.get_editor().setFocus()
+            self.vim_status.set_focus_to_editor()
 
     def S(self, num=1, num_str=""):
         """Delete characters and start insert."""
@@ -421,7 +419,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
             self.helper_action.delete(
                 motion_info, is_insert=True, replace_txt=" " * n_space
             )
-            self.get_editor().setFocus()
+            self.vim_status.set_focus_to_editor()
 
     def x(self, num=1, num_str=""):
         """Delete characters and start insert."""
@@ -468,7 +466,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
         self.helper_action.delete(motion_info, is_insert=True)
 
         self.vim_status.cursor.set_cursor_pos(sel_start)
-        self.get_editor().setFocus()
+        self.vim_status.set_focus_to_editor()
 
     def d(self, num=1, num_str=""):
         """Delete text."""
@@ -497,7 +495,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
             [
                 FUNC_INFO(self.helper_action.yank, True),
                 FUNC_INFO(lambda x: self.helper_action.delete(x, is_insert=True), True),
-                FUNC_INFO(self.get_editor().setFocus, False),
+                FUNC_INFO(self.vim_status.set_focus_to_editor, False),
             ]
         )
 
@@ -543,7 +541,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
 
     def apostrophe(self, num=1, num_str=""):
         """Jump to bookmark linewise."""
-        executor_sub = self.executor_sub_alnum
+        executor_sub = self.executor_sub_mark
         self.set_parent_info_to_submode(executor_sub, num, num_str)
 
         def run(ch):
@@ -563,7 +561,7 @@ class ExecutorNormalCmd(MovementMixin, ExecutorBase):
 
     def backtick(self, num=1, num_str=""):
         """Jump to bookmark charwise."""
-        executor_sub = self.executor_sub_alnum
+        executor_sub = self.executor_sub_mark
         self.set_parent_info_to_submode(executor_sub, num, num_str)
 
         def run(ch):
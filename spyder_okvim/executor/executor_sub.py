@@ -107,6 +107,7 @@ class ExecutorSubMotion(ExecutorSubBase):
         self.executor_sub_motion_i = ExecutorSubMotion_i(vim_status)
         self.executor_sub_motion_a = ExecutorSubMotion_a(vim_status)
         self.executor_sub_alnum = ExecutorSubCmd_alnum(vim_status)
+        self.executor_sub_mark = ExecutorSubCmd_alnum(vim_status, extra_chars='"')
         self.executor_sub_search = ExecutorSearch(vim_status)
         self.executor_sub_easymotion = ExecutorEasymotion(vim_status)
         self.executor_sub_leap = ExecutorSubCmdLeap(vim_status)
@@ -326,7 +327,7 @@ class ExecutorSubMotion(ExecutorSubBase):
 
     def apostrophe(self, num=1, num_str=""):
         """Motion to line of mark."""
-        executor_sub = self.executor_sub_alnum
+        executor_sub = self.executor_sub_mark
         self.set_parent_info_to_submode(executor_sub, num, num_str)
 
         def run(ch):
@@ -338,7 +339,7 @@ class ExecutorSubMotion(ExecutorSubBase):
 
     def backtick(self, num=1, num_str=""):
         """Motion to position of mark."""
-        executor_sub = self.executor_sub_alnum
+        executor_sub = self.executor_sub_mark
         self.set_parent_info_to_submode(executor_sub, num, num_str)
 
         def run(ch):
@@ -563,7 +564,7 @@ class ExecutorSubCmd_g(ExecutorSubBase):
         super().__init__(vim_status)
         self.allow_leaderkey = False
 
-        cmds = "gdtTuUc~"
+        cmds = "gdtTuUc~;,"
         self.pattern_cmd = re.compile(r"(\d*)([{}])".format(cmds))
         self.executor_sub_motion = ExecutorSubMotion(vim_status)
 
@@ -577,14 +578,21 @@ class ExecutorSubCmd_g(ExecutorSubBase):
 
     def d(self, num=1, num_str=""):
         """Go to definition and update the jumplist."""
-        vs = self.vim_status
-        previous = vs.get_current_location()
-        vs.push_jump()
+        self.vim_status.go_to_definition()
 
-        editor = self.get_editor()
-        if editor:
-            vs.start_definition_tracking(previous)
-            editor.go_to_definition_from_cursor()
+    def semicolon(self, num=1, num_str=""):
+        """Go to an older position in the change list."""
+        pos = self.vim_status.get_change_position(self.parent_num[-1], older=True)
+        if pos is not None:
+            motion_info = MotionInfo(cursor_pos=pos, motion_type=MotionType.CharWise)
+            return self.execute_func_deferred(motion_info)
+
+    def comma(self, num=1, num_str=""):
+        """Go to a newer position in the change list."""
+        pos = self.vim_status.get_change_position(self.parent_num[-1], older=False)
+        if pos is not None:
+            motion_info = MotionInfo(cursor_pos=pos, motion_type=MotionType.CharWise)
+            return self.execute_func_deferred(motion_info)
 
     def t(self, num=1, num_str=""):
         """Cycle to next file."""
@@ -967,6 +975,7 @@ class ExecutorSearch(ExecutorSubBase):
         self.update_input_cmd_info(None, None, txt[1:])
 
         txt = txt[1:-1]  # remove /, \r
+        self.vim_status.add_history("search", txt)
 
         self.helper_motion.search(txt)
         motion_info = self.helper_motion.n(1, "")
@@ -981,9 +990,10 @@ class ExecutorSearch(ExecutorSubBase):
 class ExecutorSubCmd_alnum(ExecutorSubBase):
     """Allow the alphabetics and numbers as input."""
 
-    def __init__(self, vim_status):
+    def __init__(self, vim_status, extra_chars: str = ""):
         super().__init__(vim_status)
         self.allow_leaderkey = False
+        self.extra_chars = extra_chars
 
     def __call__(self, ch: str):
         """Return deferred result when ``ch`` is alphanumeric."""
@@ -991,7 +1001,7 @@ class ExecutorSubCmd_alnum(ExecutorSubBase):
 
         self.vim_status.sub_mode = None
 
-        if ch.isalnum():
+        if ch.isalnum() or (ch and ch in self.extra_chars):
             return self.process_return(self.execute_func_deferred(ch))
 
         return True
@@ -1007,7 +1017,7 @@ class ExecutorSubCmd_opensquarebracket(ExecutorSubBase):
 
         self.has_zero_cmd = False
 
-        cmds = "".join(re.escape(c) for c in "dc[")
+        cmds = "".join(re.escape(c) for c in "dcq[")
         self.pattern_cmd = re.compile(r"(\d*)([{}])".format(cmds))
 
     def d(self, num=1, num_str=""):
@@ -1018,6 +1028,11 @@ class ExecutorSubCmd_opensquarebracket(ExecutorSubBase):
             editor.go_to_previous_warning()
         self.vim_status.cursor.draw_vim_cursor()
 
+    def q(self, num=1, num_str=""):
+        """Go to the previous entry of the quickfix list."""
+        num = num * self.parent_num[0]
+        self.vim_status.move_in_quickfix(-num)
+
     def opensquarebracket(self, num=1, num_str=""):
         """Jump to previous Python definition."""
         num = num * self.parent_num[0]
@@ -1041,7 +1056,7 @@ class ExecutorSubCmd_closesquarebracket(ExecutorSubBase):
 
         self.has_zero_cmd = False
 
-        cmds = "".join(re.escape(c) for c in "dc]")
+        cmds = "".join(re.escape(c) for c in "dcq]")
         self.pattern_cmd = re.compile(r"(\d*)([{}])".format(cmds))
 
     def d(self, num=1, num_str=""):
@@ -1052,6 +1067,11 @@ class ExecutorSubCmd_closesquarebracket(ExecutorSubBase):
             editor.go_to_next_warning()
         self.vim_status.cursor.draw_vim_cursor()
 
+    def q(self, num=1, num_str=""):
+        """Go to the next entry of the quickfix list."""
+        num = num * self.parent_num[0]
+        self.vim_status.move_in_quickfix(num)
+
     def closesquarebracket(self, num=1, num_str=""):
         """Jump to next Python definition."""
         num = num * self.parent_num[0]
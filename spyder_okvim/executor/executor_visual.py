@@ -71,6 +71,7 @@ class ExecutorVisualCmd(SelectionMixin, MovementMixin, ExecutorBase):
         self.executor_sub_motion_a = ExecutorSubMotion_a(vim_status)
         self.executor_sub_register = ExecutorSubCmd_register(vim_status)
         self.executor_sub_alnum = ExecutorSubCmd_alnum(vim_status)
+        self.executor_sub_mark = ExecutorSubCmd_alnum(vim_status, extra_chars='"')
         self.executor_sub_search = ExecutorSearch(vim_status)
         self.executor_sub_easymotion = ExecutorEasymotion(vim_status)
         self.executor_sub_leap = ExecutorSubCmdLeap(vim_status)
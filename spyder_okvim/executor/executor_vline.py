@@ -56,6 +56,7 @@ class ExecutorVlineCmd(SelectionMixin, MovementMixin, ExecutorBase):
         self.executor_sub_r = ExecutorSubCmd_r(vim_status)
         self.executor_sub_register = ExecutorSubCmd_register(vim_status)
         self.executor_sub_alnum = ExecutorSubCmd_alnum(vim_status)
+        self.executor_sub_mark = ExecutorSubCmd_alnum(vim_status, extra_chars='"')
         self.executor_sub_search = ExecutorSearch(vim_status)
         self.executor_sub_easymotion = ExecutorEasymotion(vim_status)
         self.executor_sub_leap = ExecutorSubCmdLeap(vim_status)
@@ -201,7 +201,7 @@ class SelectionMixin:
         self.helper_action.delete(None, is_insert=True)
         self.vim_status.to_normal()
         self.set_cursor_pos(sel_start)
-        self.get_editor().setFocus()
+        self.vim_status.set_focus_to_editor()
 
     def s(self, num: int = 1, num_str: str = ""):
         """Replace selection using leap if enabled."""
@@ -281,7 +281,7 @@ class SelectionMixin:
 
     def apostrophe(self, num: int = 1, num_str: str = ""):
         """Jump to a bookmark linewise and keep selection."""
-        executor_sub = self.executor_sub_alnum
+        executor_sub = self.executor_sub_mark
         self.set_parent_info_to_submode(executor_sub, num, num_str)
 
         def run(ch: str):
@@ -306,7 +306,7 @@ class SelectionMixin:
 
     def backtick(self, num: int = 1, num_str: str = ""):
         """Jump to a bookmark charwise and keep selection."""
-        executor_sub = self.executor_sub_alnum
+        executor_sub = self.executor_sub_mark
         self.set_parent_info_to_submode(executor_sub, num, num_str)
 
         def run(ch: str):
@@ -4,7 +4,10 @@
 # Third Party Libraries
 import pytest
 from qtpy.QtCore import QEvent, Qt
-from qtpy.QtGui import QKeyEvent
+from qtpy.QtGui import QKeyEvent, QTextCursor
+
+# Project Libraries
+from spyder_okvim.vim import VimState
 
 
 @pytest.mark.parametrize(
@@ -247,3 +250,656 @@ def test_colon_jumps_dialog_navigation(vim_bot, monkeypatch):
 
     # Restore state for other tests
     stack.set_current_filename(orig_file)
+
+
+def test_colon_vimgrep_quickfix(vim_bot, monkeypatch):
+    """:vimgrep fills the quickfix list from the open files; ]q, [q follow it."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    files = stack.get_filenames()
+    texts = [finfo.editor.toPlainText() for finfo in stack.data]
+    for idx, finfo in enumerate(stack.data):
+        finfo.editor.set_text(f"a\nfoo {idx}\nb foo")
+    stack.set_current_filename(files[0])
+    vs.cursor.set_cursor_pos(0)
+    vs.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, ":vimgrep /fo\\+/ ##")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert len(vs.quickfix) == 8
+    assert vs.get_cursor().position() == 2
+    assert vs.msg_label.text() == "(1 of 8): foo 0"
+
+    qtbot.keyClicks(cmd_line, "3]q")
+    assert stack.get_current_filename() == files[1]
+    assert vs.get_cursor().position() == 10
+
+    # The entries follow the edits of their file.
+    cursor = stack.data[2].editor.textCursor()
+    cursor.insertText("xyz\n")
+    qtbot.keyClicks(cmd_line, "2]q")
+    assert stack.get_current_filename() == files[2]
+    assert vs.get_cursor().position() == 14
+    qtbot.keyClicks(cmd_line, "[q")
+    assert vs.get_cursor().position() == 6
+    assert vs.msg_label.text() == "(5 of 8): foo 2"
+
+    qtbot.keyClicks(cmd_line, "9[q")
+    assert stack.get_current_filename() == files[0]
+    qtbot.keyClicks(cmd_line, "[q")
+    assert vs.msg_label.text() == "E553: No more items"
+
+    # Project Libraries
+    from spyder_okvim.utils import quickfix
+
+    captured = {}
+
+    def fake_exec(self):
+        captured["rows"] = [
+            [self.list_model.text(row, col) for col in range(4)] for row in (0, 5)
+        ]
+        self.next_row(5)
+        self.accept()
+
+    monkeypatch.setattr(quickfix.QuickfixDialog, "exec_", fake_exec)
+    qtbot.keyClicks(cmd_line, ":copen")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert captured["rows"] == [
+        ["foo.py", "2", "1", "foo 0"],
+        ["foo2.py", "4", "3", "b foo"],
+    ]
+    assert stack.get_current_filename() == files[2]
+    assert vs.get_cursor().position() == 14
+    assert cmd_line.hasFocus()
+
+    qtbot.keyClicks(cmd_line, ":vimgrep /nothing/ %")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "E480: No match: nothing"
+    assert len(vs.quickfix) == 8
+
+    qtbot.keyClicks(cmd_line, ":vim /b/j %")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "1 match"
+    assert vs.get_cursor().position() == 14
+
+    # Restore state for other tests
+    for finfo, text in zip(stack.data, texts):
+        finfo.editor.set_text(text)
+    stack.set_current_filename(files[0])
+
+
+def test_colon_cdo_cfdo_substitute(vim_bot, monkeypatch, tmpdir):
+    """:cdo and :cfdo change the open files in one step and the disk files."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    files = stack.get_filenames()
+    texts = [finfo.editor.toPlainText() for finfo in stack.data]
+    for idx, finfo in enumerate(stack.data):
+        finfo.editor.set_text(f"foo {idx}\nbar foo foo")
+    stack.set_current_filename(files[0])
+    vs.cursor.set_cursor_pos(0)
+    vs.reset_for_test()
+    on_disk = tmpdir.join("disk.py")
+    on_disk.write("foo = 1\nfoo = foo\n")
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, f":vimgrep /foo/ % {files[1]} {on_disk}")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert len(vs.quickfix) == 6
+
+    qtbot.keyClicks(cmd_line, ":cdo s/foo/x/n")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "6 matches on 6 lines"
+
+    # Project Libraries
+    from spyder_okvim.utils import project_substitute
+
+    captured = {}
+
+    def fake_exec(self):
+        captured["rows"] = self.list_model.rowCount()
+        self.reject()
+
+    monkeypatch.setattr(project_substitute.SubstitutePreviewDialog, "exec_", fake_exec)
+    qtbot.keyClicks(cmd_line, ":cdo s/foo/x/c")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert captured["rows"] == 6
+    assert on_disk.read() == "foo = 1\nfoo = foo\n"
+    assert editor.toPlainText() == "foo 0\nbar foo foo"
+
+    qtbot.keyClicks(cmd_line, ":cdo s/foo/x/")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "6 substitutions in 3 files"
+    assert editor.toPlainText() == "x 0\nbar x foo"
+    assert stack.data[1].editor.toPlainText() == "x 1\nbar x foo"
+    assert stack.data[2].editor.toPlainText() == "foo 2\nbar foo foo"
+    assert on_disk.read() == "x = 1\nx = foo\n"
+    # Each open file is changed in one undo step.
+    for idx in (0, 1):
+        stack.data[idx].editor.undo()
+        assert stack.data[idx].editor.toPlainText() == f"foo {idx}\nbar foo foo"
+        stack.data[idx].editor.redo()
+
+    qtbot.keyClicks(cmd_line, ":cfdo %s/foo/y/g")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "3 substitutions in 3 files"
+    assert editor.toPlainText() == "x 0\nbar x y"
+    assert on_disk.read() == "x = 1\nx = y\n"
+
+    qtbot.keyClicks(cmd_line, ":cfdo s/foo/y/")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "E486: Pattern not found: foo"
+    qtbot.keyClicks(cmd_line, ":cfdo d")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "E492: Not an editor command: d"
+
+    # Restore state for other tests
+    for finfo, text in zip(stack.data, texts):
+        finfo.editor.set_text(text)
+    stack.set_current_filename(files[0])
+
+
+def test_colon_macrobatch(vim_bot, monkeypatch, tmpdir):
+    """:macrobatch runs a register in the open files and sends the others."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    files = stack.get_filenames()
+    texts = [finfo.editor.toPlainText() for finfo in stack.data]
+    for idx, finfo in enumerate(stack.data):
+        finfo.editor.set_text(f"foo {idx}\nbar" if idx else "bar")
+    stack.set_current_filename(files[0])
+    vs.cursor.set_cursor_pos(0)
+    vs.reset_for_test()
+    on_disk = str(tmpdir.join("disk.py"))
+    tmpdir.join("disk.py").write("foo\n")
+
+    # Project Libraries
+    from spyder_okvim.utils import macro_batch
+
+    sent = {}
+
+    def fake_start(self, paths, keys, registers, workers=None):
+        sent.update(paths=paths, keys=keys, registers=registers, workers=workers)
+        self.sig_results.emit(
+            [macro_batch.MacroBatchResult(path, True, True) for path in paths]
+        )
+        self.sig_finished.emit()
+
+    captured = {}
+
+    def fake_exec(self):
+        captured["rows"] = [
+            [self.list_model.text(row, col) for col in range(3)]
+            for row in range(self.list_model.rowCount())
+        ]
+        captured["progress"] = self.label_progress.text()
+        self.reject()
+
+    monkeypatch.setattr(macro_batch.MacroBatchRun, "start", fake_start)
+    monkeypatch.setattr(macro_batch.MacroBatchDialog, "exec_", fake_exec)
+    vs.set_register("q", ":s/foo/X/<CR>Ax<Esc>", VimState.NORMAL)
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, f":macrobatch q 3 {files[0]} {files[1]} {on_disk}")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert sent["paths"] == [on_disk]
+    assert sent["keys"] == ":s/foo/X/<CR>Ax<Esc>"
+    assert sent["registers"]["q"] == (":s/foo/X/<CR>Ax<Esc>", VimState.NORMAL)
+    assert sent["workers"] == 3
+    # A failed command undoes the changes of the open file.
+    assert editor.toPlainText() == "bar"
+    assert stack.data[1].editor.toPlainText() == "X 1x\nbar"
+    assert captured["rows"] == [
+        ["foo.py", "failed", "E486: Pattern not found: foo"],
+        ["foo1.py", "changed", ""],
+        ["disk.py", "changed", ""],
+    ]
+    assert captured["progress"] == "3 files done"
+    assert stack.get_current_filename() == files[0]
+    assert vs.msg_label.text() == "2 files changed, 1 failed"
+    # The open file is changed in one undo step.
+    stack.data[1].editor.undo()
+    assert stack.data[1].editor.toPlainText() == "foo 1\nbar"
+
+    qtbot.keyClicks(cmd_line, ":macrobatch w %")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "E353: Nothing in register w"
+    qtbot.keyClicks(cmd_line, ":macrobatch q nothing*.py")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.msg_label.text() == "E480: No match: nothing*.py"
+
+    # Restore state for other tests
+    for finfo, text in zip(stack.data, texts):
+        finfo.editor.set_text(text)
+    stack.set_current_filename(files[0])
+
+
+def test_colon_earlier_later_command(vim_bot, monkeypatch):
+    """Test :earlier and :later."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.reset_for_test()
+    vim_status.track_changes()
+
+    now = [1000.0]
+    monkeypatch.setattr("spyder_okvim.vim.status.time.monotonic", lambda: now[0])
+    for text, delay in (("a", 0), ("b", 10), ("c", 300), ("d", 20)):
+        now[0] += delay
+        # Inserting at the start keeps Qt from merging the undo steps.
+        cursor = editor.textCursor()
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText(text)
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, ":earlier 1m\r")
+    assert editor.toPlainText() == "ba"
+    assert vim.vim_cmd.msg_label.text() == "2 changes"
+
+    qtbot.keyClicks(cmd_line, ":earlier\r")
+    assert editor.toPlainText() == "a"
+
+    qtbot.keyClicks(cmd_line, ":later 10m\r")
+    assert editor.toPlainText() == "dcba"
+
+    qtbot.keyClicks(cmd_line, ":earlier 5x\r")
+    assert editor.toPlainText() == "dcba"
+    assert vim.vim_cmd.msg_label.text() == "E475: Invalid argument"
+
+
+@pytest.mark.parametrize(
+    "text, cmd_list, text_expected, cursor_pos",
+    [
+        ("a\nb\nc\nd", [":2,3d\r"], "a\nd", 2),
+        ("a\nb\nc\nd", ["j", ":.,+1d\r"], "a\nd", 2),
+        ("a\nb\nc\nd", [":$d\r"], "a\nb\nc", 4),
+        ("a\nb\nc\nd", [":%d\r"], "", 0),
+        ("a\nb\nc\nd", [":d 2\r"], "c\nd", 0),
+        ("a\nb\nc\nd", [":/c/d\r"], "a\nb\nd", 4),
+        ("a\nb\nc\nd", ["jVj", ":m 0\r"], "b\nc\na\nd", 2),
+        ("a\nb\nc\nd", [":1,2m$\r"], "c\nd\na\nb", 6),
+        ("a\nb\nc\nd", [":1t.\r"], "a\na\nb\nc\nd", 2),
+        ("a\nb\nc\nd", [":2;+1t0\r"], "b\nc\na\nb\nc\nd", 2),
+        ("a\n\nb", [":%>\r"], "    a\n\n    b", 11),
+        ("        a\nb", [":1<\r"], "    a\nb", 4),
+        ("a\nb", [":%>>\r"], "        a\n        b", 18),
+        ("c\nb\na\nb", [":%sort u\r"], "a\nb\nc", 0),
+        ("a10\na9\nx\n", [":1,3sort n\r"], "x\na9\na10\n", 0),
+        ("a\nB\nc", [":sort! i\r"], "a\nB\nc", 0),
+        ("a\nB\nc", [":%sort! i\r"], "c\nB\na", 0),
+    ],
+)
+def test_colon_range_command(vim_bot, text, cmd_list, text_expected, cursor_pos):
+    """Test the line range commands."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text(text)
+    vim.vim_cmd.vim_status.cursor.set_cursor_pos(0)
+    vim.vim_cmd.vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    for cmd in cmd_list:
+        qtbot.keyClicks(cmd_line, cmd)
+
+    assert cmd_line.text() == ""
+    assert editor.toPlainText() == text_expected
+    assert editor.textCursor().position() == cursor_pos
+
+    editor.undo()
+    assert editor.toPlainText() == text
+
+
+def test_colon_range_register_and_errors(vim_bot):
+    """Test the registers of :d and :y and the range errors."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("a\nb\nc")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, ":2,3y a\r")
+    assert vim_status.register_dict["a"].content == "b\nc\n"
+    qtbot.keyClicks(cmd_line, ":1d\r")
+    assert vim_status.register_dict['"'].content == "a\n"
+    assert vim_status.register_dict["1"].content == "a\n"
+
+    qtbot.keyClicks(cmd_line, ":1,9d\r")
+    assert vim.vim_cmd.msg_label.text() == "E16: Invalid range"
+    qtbot.keyClicks(cmd_line, ":'zd\r")
+    assert vim.vim_cmd.msg_label.text() == "E20: Mark not set"
+    qtbot.keyClicks(cmd_line, ":1,2m1\r")
+    assert vim.vim_cmd.msg_label.text() == (
+        "E134: Cannot move a range of lines into itself"
+    )
+    qtbot.keyClicks(cmd_line, ":1w\r")
+    assert vim.vim_cmd.msg_label.text() == "E481: No range allowed"
+    assert editor.toPlainText() == "b\nc"
+
+    qtbot.keyClicks(cmd_line, ":9\r")
+    assert editor.textCursor().blockNumber() == 1
+
+
+def test_colon_visual_marks(vim_bot):
+    """Test the '< and '> marks set by the visual selection."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("a\nb\nc\nd")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, "jvj")
+    qtbot.keyPress(cmd_line, Qt.Key_Escape)
+    qtbot.keyClicks(cmd_line, "gg:'<,'>d\r")
+    assert editor.toPlainText() == "a\nd"
+
+
+@pytest.mark.parametrize(
+    "text, cmd_list, text_expected, cursor_pos",
+    [
+        ("a a\na a", [":s/a/b/\r"], "b a\na a", 0),
+        ("a a\na a", [":%s/a/b/g\r"], "b b\nb b", 4),
+        ("a-b\nc", [":s#-#/#\r"], "a/b\nc", 0),
+        ("foo bar", [":s/\\(\\w\\+\\) \\(\\w\\+\\)/\\2 \\1/\r"], "bar foo", 0),
+        ("foo bar", [r":s/\v(\w+) (\w+)/\2 \1/" + "\r"], "bar foo", 0),
+        ("f(o)o", [r":s/(o)/0/" + "\r"], "f0o", 0),
+        ("foo bar", [r":s/\<bar\>/x/" + "\r"], "foo x", 0),
+        ("foo bar", [r":s/foo \zsbar/x/" + "\r"], "foo x", 0),
+        ("  foo\nfoo", [r":%s/^\s*\zsfoo/bar/" + "\r"], "  bar\nbar", 6),
+        ("foo  bar", [r":s/\(foo\) *\zs\(bar\)/\2\1/" + "\r"], "foo  barfoo", 0),
+        ("foo bar", [":s/o/[&]/g\r"], "f[o][o] bar", 0),
+        ("foo bar", [r":s/\w\+/\u&/g" + "\r"], "Foo Bar", 0),
+        ("foo bar", [r":s/foo/\U&\E-x/" + "\r"], "FOO-x bar", 0),
+        ("a,b", [r":s/,/\r/" + "\r"], "a\nb", 2),
+        ("Ab ab", [":s/ab/x/gI\r"], "Ab x", 0),
+        ("Ab ab", [":s/ab/x/g\r"], "x x", 0),
+        ("a\na\na\na", [":2s/a/b/ 2\r"], "a\nb\nb\na", 4),
+        ("a\na", ["Vj", ":s/a/b/\r"], "b\nb", 2),
+        ("a a\na a", [":s/a/b/\r", "j", ":s\r"], "b a\nb a", 4),
+        ("a a\na a", [":s/a/b/\r", "j", ":s//c/&g\r"], "b a\nc c", 4),
+    ],
+)
+def test_colon_substitute_command(vim_bot, text, cmd_list, text_expected, cursor_pos):
+    """Test :s."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text(text)
+    vim.vim_cmd.vim_status.cursor.set_cursor_pos(0)
+    vim.vim_cmd.vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    for cmd in cmd_list:
+        qtbot.keyClicks(cmd_line, cmd)
+
+    assert cmd_line.text() == ""
+    assert editor.toPlainText() == text_expected
+    assert editor.textCursor().position() == cursor_pos
+
+
+def test_colon_substitute_one_undo_step(vim_bot):
+    """Test that :s is undone at once and reports the substitutions."""
+    _, _, editor, vim, qtbot = vim_bot
+    text = "\n".join(f"x{idx} y x" for idx in range(1000))
+    editor.set_text(text)
+    vim.vim_cmd.vim_status.cursor.set_cursor_pos(0)
+    vim.vim_cmd.vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, ":%s/x/z/g\r")
+    assert editor.toPlainText() == text.replace("x", "z")
+    assert vim.vim_cmd.msg_label.text() == "2000 substitutions on 1000 lines"
+    assert editor.textCursor().blockNumber() == 999
+
+    editor.undo()
+    assert editor.toPlainText() == text
+
+    qtbot.keyClicks(cmd_line, ":%s/q/z/g\r")
+    assert vim.vim_cmd.msg_label.text() == "E486: Pattern not found: q"
+    qtbot.keyClicks(cmd_line, ":%s/x/z/gn\r")
+    assert vim.vim_cmd.msg_label.text() == "2000 matches on 1000 lines"
+    assert editor.toPlainText() == text
+
+
+def test_colon_substitute_confirm(vim_bot):
+    """Test the c flag of :s."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("a a a\na a")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, ":%s/a/b/gc\r")
+    assert vim.vim_cmd.msg_label.text() == "replace with b (y/n/a/q/l)"
+    qtbot.keyClicks(cmd_line, "y")
+    assert editor.textCursor().position() == 2
+    qtbot.keyClicks(cmd_line, "n")
+    qtbot.keyClicks(cmd_line, "y")
+    assert editor.toPlainText() == "a a a\na a"
+    qtbot.keyClicks(cmd_line, "q")
+    assert editor.toPlainText() == "b a b\na a"
+    assert vim_status.sub_mode is None
+
+    editor.undo()
+    assert editor.toPlainText() == "a a a\na a"
+
+    qtbot.keyClicks(cmd_line, ":%s/a/b/gc\r")
+    qtbot.keyClicks(cmd_line, "n")
+    qtbot.keyClicks(cmd_line, "a")
+    assert editor.toPlainText() == "a b b\nb b"
+    assert vim_status.sub_mode is None
+
+
+def test_colon_substitute_preview(vim_bot):
+    """Test the preview of :s on the visible lines."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("\n".join(["foo foo"] * 5000))
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+    preview = vim_status.substitute_preview
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, ":%s/foo")
+    assert preview.lines[0] == (0, "foo foo", [(0, 3)])
+    qtbot.keyClicks(cmd_line, "/ba/g")
+    assert preview.lines[0] == (0, "ba ba", [(0, 2), (3, 5)])
+    assert len(preview.lines) < 5000
+    assert editor.toPlainText().startswith("foo foo")
+
+    qtbot.keyPress(cmd_line, Qt.Key_Escape)
+    assert preview.lines == []
+    assert preview.editor is None
+
+    qtbot.keyClicks(cmd_line, ":s/foo/x")
+    assert not editor.viewport().grab().isNull()
+    cmd_line.esc_pressed()
+    assert preview.editor is None
+
+
+@pytest.mark.parametrize(
+    "text, cmd_list, text_expected, cursor_pos",
+    [
+        ("a\n\n  \nb\n", [":g/^\\s*$/d\r"], "a\nb", 2),
+        ("ax\nb\ncx", [":v/x/d\r"], "ax\ncx", 3),
+        ("ax\nb\ncx", [":g!/x/d\r"], "ax\ncx", 3),
+        ("a\nb\nc", [":g/^/m0\r"], "c\nb\na", 0),
+        ("a\nb\na", [":g/a/t$\r"], "a\nb\na\na\na", 8),
+        ("a\nb\na", [":g/a/m$\r"], "b\na\na", 4),
+        ("a\nb\na", [":g/a/t.\r"], "a\na\nb\na\na", 8),
+        ("a1\nb\na2", [":g/a/s/\\d/x/\r"], "ax\nb\nax", 5),
+        ("a1\nb\na2", [":g/a/s//x/\r"], "x1\nb\nx2", 5),
+        ("a\nb\nc\na\nd", [":g/a/.,+1d\r"], "c", 0),
+        ("a\nb\na", [":g/a/>\r"], "    a\nb\n    a", 12),
+        ("a\nb\na\nb", [":2,$g/a/d\r"], "a\nb\nb", 4),
+        ("a\nb\nc", ["Vj", ":g/b/d\r"], "a\nc", 2),
+    ],
+)
+def test_colon_global_command(vim_bot, text, cmd_list, text_expected, cursor_pos):
+    """Test :g and :v."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text(text)
+    vim.vim_cmd.vim_status.cursor.set_cursor_pos(0)
+    vim.vim_cmd.vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    for cmd in cmd_list:
+        qtbot.keyClicks(cmd_line, cmd)
+
+    assert cmd_line.text() == ""
+    assert editor.toPlainText() == text_expected
+    assert editor.textCursor().position() == cursor_pos
+
+
+def test_colon_global_one_undo_step(vim_bot):
+    """Test that :g is undone at once, with its errors."""
+    _, _, editor, vim, qtbot = vim_bot
+    text = "\n".join("" if idx % 2 else f"x{idx}" for idx in range(20000))
+    editor.set_text(text)
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, ":g/^\\s*$/d\r")
+    assert editor.blockCount() == 10000
+    assert vim.vim_cmd.msg_label.text() == "10000 fewer lines"
+    assert vim_status.register_dict['"'].content == "\n"
+
+    editor.undo()
+    assert editor.toPlainText() == text
+
+    qtbot.keyClicks(cmd_line, ":g/q/d\r")
+    assert vim.vim_cmd.msg_label.text() == "E486: Pattern not found: q"
+    qtbot.keyClicks(cmd_line, ":g/x/j\r")
+    assert vim.vim_cmd.msg_label.text() == "E492: Not an editor command: j"
+    qtbot.keyClicks(cmd_line, ":g axa\r")
+    assert vim.vim_cmd.msg_label.text() == (
+        "E146: Regular expressions can't be delimited by letters"
+    )
+    assert editor.toPlainText() == text
+
+
+@pytest.mark.parametrize(
+    "text, cmd_list, text_expected, cursor_pos",
+    [
+        ("a\nb\nc", [":%norm A;\r"], "a;\nb;\nc;", 7),
+        ("a\nb\nc", [":2,3norm I# \r"], "a\n# b\n# c", 8),
+        ("a\nb\nc", [":%norm dd\r"], "b", 0),
+        ("a\nb", [":%norm yyp\r"], "a\na\na\nb", 4),
+        ("x1\nx2", [":%norm! x\r"], "1\n2", 2),
+        ("abc\nabc", [":%normal 2x\r"], "c\nc", 2),
+        ("a b\nc d", [":%norm wD\r"], "a \nc ", 4),
+        ("a\nb", [":%norm ix<Esc>Ay\r"], "xay\nxby", 6),
+        ("a\nb\nc", ["Vj", ":norm A;\r"], "a;\nb;\nc", 4),
+        ("ax\nb\ncx", [":g/x/norm Ay\r"], "axy\nb\ncxy", 8),
+        ("ax\nb\ncx", [":v/x/norm dd\r"], "ax\ncx", 3),
+        ("1\n2\n3\n4\n5\n6", [":%norm jdd\r"], "1\n3\n5", 4),
+        ("1\n2\n3\n4\n5\n6", [":%norm jJ\r"], "1\n2 3\n4 5\n6", 10),
+        ("a\nb\nc", [":2,3norm kdd\r"], "b\nc", 0),
+        ("a\nb", [":%norm Ox<Esc>\r"], "x\nx\na\nb", 2),
+        ("a\nb\nc", [":%norm ccx\r"], "x\nx\nx", 4),
+        ("ax\nb\ncx\nd", [":g/x/norm jdd\r"], "ax\ncx", 3),
+        ("a\nb", [":g/^/norm yyp\r"], "a\na\nb\nb", 6),
+        ("a\nb\nc", [":g/^/norm dd\r"], "", 0),
+        ("1\n2\n3\n4\n5\n6", [":g/^/norm jJ\r"], "1\n2 3\n4 5\n6", 10),
+        ("a\nb\nc", [":g/^/norm Ox<Esc>\r"], "x\na\nx\nb\nx\nc", 8),
+    ],
+)
+def test_colon_normal_command(vim_bot, text, cmd_list, text_expected, cursor_pos):
+    """Test :normal."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text(text)
+    vim.vim_cmd.vim_status.cursor.set_cursor_pos(0)
+    vim.vim_cmd.vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    for cmd in cmd_list:
+        qtbot.keyClicks(cmd_line, cmd)
+
+    assert cmd_line.text() == ""
+    assert vim.vim_cmd.vim_status.vim_state == VimState.NORMAL
+    assert editor.toPlainText() == text_expected
+    assert editor.textCursor().position() == cursor_pos
+
+
+def test_colon_normal_one_undo_step(vim_bot):
+    """Test that :normal is undone at once and is not recorded in a macro."""
+    _, _, editor, vim, qtbot = vim_bot
+    text = "\n".join(f"x{idx}" for idx in range(1000))
+    editor.set_text(text)
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, "qa")
+    qtbot.keyClicks(cmd_line, ":%norm A;\r")
+    qtbot.keyClicks(cmd_line, "q")
+    assert editor.toPlainText() == text.replace("\n", ";\n") + ";"
+    assert vim_status.get_macro("a").notation == ":%norm A;<CR>"
+
+    editor.undo()
+    assert editor.toPlainText() == text
+
+    qtbot.keyClicks(cmd_line, ":norm\r")
+    assert vim.vim_cmd.msg_label.text() == "E471: Argument required"
+
+
+def test_colon_normal_keeps_focus(vim_bot, monkeypatch):
+    """Test that :normal types in insert mode without moving the focus."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("a\nb\nc")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+    cmd_line = vim.vim_cmd.commandline
+    focused = []
+    monkeypatch.setattr(editor, "setFocus", lambda: focused.append(editor))
+    monkeypatch.setattr(cmd_line, "setFocus", lambda: focused.append(cmd_line))
+
+    qtbot.keyClicks(cmd_line, ":%norm Ix<Esc>Ay\r")
+    assert editor.toPlainText() == "xay\nxby\nxcy"
+    assert focused == []
+    assert vim_status.feeding_insert is None
+    assert vim_status.vim_state == VimState.NORMAL
+
+
+def test_colon_normal_modified_tab(vim_bot):
+    """Test that the tab of the file is marked as modified by :normal."""
+    _, editor_stack, editor, vim, qtbot = vim_bot
+    editor.set_text("a\nb")
+    editor.document().setModified(False)
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+    index = editor_stack.get_stack_index()
+    finfo = editor_stack.data[index]
+    newly_created = finfo.newly_created
+    finfo.newly_created = False
+    editor_stack.modification_changed(False, index)
+    try:
+        assert not editor_stack.tabs.tabText(index).endswith("*")
+
+        with qtbot.waitSignal(editor.modificationChanged) as blocker:
+            qtbot.keyClicks(vim.vim_cmd.commandline, ":%norm A;\r")
+        assert blocker.args == [True]
+        assert editor_stack.tabs.tabText(index).endswith("*")
+    finally:
+        # A modified file would ask to be saved when it is closed.
+        finfo.newly_created = newly_created
+        editor.document().setModified(False)
+
+
+def test_colon_normal_line_number_margin(vim_bot):
+    """Test that the margins follow the lines added by :normal."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("\n".join(f"x{idx}" for idx in range(99)))
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+    margin = editor.viewportMargins().left()
+
+    qtbot.keyClicks(vim.vim_cmd.commandline, ":%norm yyp\r")
+    assert editor.blockCount() == 198
+    assert editor.viewportMargins().left() > margin
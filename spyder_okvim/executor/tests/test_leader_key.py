@@ -9,6 +9,10 @@ import pytest
 from qtpy.QtCore import Qt
 from spyder.api.plugins import Plugins
 
+# Project Libraries
+from spyder_okvim.utils.live_grep import LiveGrepDialog
+from spyder_okvim.utils.symbol_search import SymbolSearchDialog
+
 
 def test_auto_import(vim_bot):
     """Test auto_import."""
@@ -148,3 +152,52 @@ def test_open_symbol_swithcer_plugin(vim_bot):
 
     assert cmd_line.text() == ""
     assert plugin.open_switcher.called
+
+
+def test_live_grep(vim_bot, monkeypatch):
+    """Test that the live grep jumps to the selected hit."""
+    main, editor_stack, editor, vim, qtbot = vim_bot
+    vim_status = vim.vim_cmd.vim_status
+    editor.set_text("a\nb\nc\n")
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.to_normal()
+    file_path = editor_stack.data[1].filename
+
+    def fake_exec(self):
+        self.hit_selected = (file_path, 1, 1)
+
+    monkeypatch.setattr(LiveGrepDialog, "exec_", fake_exec)
+    monkeypatch.setattr(vim_status, "get_file_index", lambda root: None)
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyPress(cmd_line, Qt.Key_Space)
+    qtbot.keyClicks(cmd_line, "g")
+
+    assert cmd_line.text() == ""
+    assert editor_stack.get_current_filename() == file_path
+    cursor = vim_status.get_cursor()
+    assert (cursor.blockNumber(), cursor.positionInBlock()) == (1, 1)
+    assert vim_status.jump_list.jumps[-1].file == file_path
+    editor_stack.set_stack_index(0)
+
+
+def test_open_project_symbols(vim_bot, monkeypatch):
+    """Test that the symbol finder jumps to the selected symbol."""
+    main, editor_stack, editor, vim, qtbot = vim_bot
+    vim_status = vim.vim_cmd.vim_status
+    file_path = editor_stack.data[2].filename
+
+    def fake_exec(self):
+        self.symbol_selected = (file_path, 2, 0)
+
+    monkeypatch.setattr(SymbolSearchDialog, "exec_", fake_exec)
+    monkeypatch.setattr(vim_status, "get_symbol_index", lambda root: None)
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyPress(cmd_line, Qt.Key_Space)
+    qtbot.keyClicks(cmd_line, "S")
+
+    assert cmd_line.text() == ""
+    assert editor_stack.get_current_filename() == file_path
+    assert vim_status.get_cursor().blockNumber() == 2
+    editor_stack.set_stack_index(0)
@@ -1,6 +1,7 @@
 """Tests for the executor_normal."""
 
 # Standard Libraries
+import os
 from unittest.mock import Mock
 
 # Third Party Libraries
@@ -14,6 +15,7 @@ from spyder.config.manager import CONF
 from spyder_okvim.spyder.config import CONF_SECTION
 from spyder_okvim.spyder.vim_widgets import enable_coverage_tracing
 from spyder_okvim.utils.motion import MotionInfo
+from spyder_okvim.vim import register
 from spyder_okvim.vim.state import VimState
 
 
@@ -768,6 +770,7 @@ def test_tilde_cmd(vim_bot, text, cmd_list, text_expected, cursor_pos):
         (" -2a", ["l", "15", "^A", "2."], " 15a", 2),
         (" -2a", ["l", "c", "^A"], " -2a", 1),
         (" -2a", ["l", "/", "^A"], " -2a", 1),
+        ("x = -0x10", ["^A"], "x = -0x11", 8),
     ],
 )
 def test_add_num_cmd(vim_bot, text, cmd_list, text_expected, cursor_pos):
@@ -1560,6 +1563,52 @@ def test_clipboard(vim_bot):
     assert clipboard.text() == "1dhrwodn\n"
 
 
+def test_delete_ring_registers(vim_bot):
+    """Deletes fill the numbered ring and small deletes go to "-."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("a1\na2\na3\n")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, "dd")
+    qtbot.keyClicks(cmd_line, "dd")
+    qtbot.keyClicks(cmd_line, "x")
+    qtbot.keyClicks(cmd_line, "yy")
+
+    registers = vim_status.register_dict
+    assert registers["1"].content == "a2\n"
+    assert registers["2"].content == "a1\n"
+    assert registers["-"].content == "a"
+    assert registers["0"].content == "3\n"
+
+    qtbot.keyClicks(cmd_line, '"2p')
+    assert editor.toPlainText() == "3\na1\n"
+
+
+def test_register_spill_to_disk(vim_bot, monkeypatch):
+    """Large registers are kept in temporary files."""
+    monkeypatch.setattr(register, "MAX_REGISTER_MEMORY", 8)
+    monkeypatch.setattr(register, "MAX_TOTAL_MEMORY", 12)
+    store = register.RegisterStore()
+    big = store.set("a", "0123456789", VimState.NORMAL)
+    assert big.path is not None
+    assert big.content == "0123456789"
+    assert store.memory == 0
+
+    store.set("b", "abcdefg", VimState.NORMAL)
+    store.set("c", "hijklmn", VimState.NORMAL)
+    assert store["b"].path is not None
+    assert store["c"].path is None
+    assert store.memory == 7
+    assert store["b"].content == "abcdefg"
+
+    path = store["b"].path
+    store.close()
+    assert not os.path.exists(path)
+
+
 @pytest.mark.parametrize(
     "text, cmd_list, cursor_pos, register_name, text_yanked",
     [
@@ -2039,6 +2088,32 @@ def test_dot_cmd_with_insert(
     assert editor.toPlainText() == text_expected
 
 
+def test_dot_cmd_replays_text_change(vim_bot):
+    """Test that . replays the net text change of the insert."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("abc\nabc\n")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(2)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    cmd_line.setFocus()
+    qtbot.keyClicks(cmd_line, "i")
+    qtbot.keyClick(editor, Qt.Key_Backspace)
+    qtbot.keyClicks(editor, "XY")
+    cmd_line.setFocus()
+    vim_status.disconnect_from_editor()
+
+    change = vim_status.dot_cmd.insert_change
+    assert (change.n_before, change.text, change.n_after) == (1, "XY", 0)
+
+    qtbot.keyClicks(cmd_line, "j.")
+    assert editor.toPlainText() == "aXYc\naXYc\n"
+
+    editor.undo()
+    assert editor.toPlainText() == "aXYc\nabc\n"
+
+
 @pytest.mark.parametrize(
     "text, cmd_list, cursor_pos",
     [
@@ -2242,6 +2317,22 @@ def test_search_backspace_command(vim_bot):
     assert vim.vim_cmd.vim_status.sub_mode is None
 
 
+def test_search_cmd_after_zs(vim_bot):
+    """Test / command with a part of any width before \\zs."""
+    _, _, editor, vim, qtbot = vim_bot
+    cmd_line = vim.vim_cmd.commandline
+
+    editor.set_text("foo\n   foo foo\n")
+    vim.vim_cmd.vim_status.cursor.set_cursor_pos(0)
+    vim.vim_cmd.vim_status.reset_for_test()
+    get_start_list = vim.vim_cmd.vim_status.search.get_sel_start_list
+
+    qtbot.keyClicks(cmd_line, r"/^\s*\zsfoo")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert get_start_list() == [0, 7]
+    assert editor.textCursor().position() == 7
+
+
 def test_search_cmd_with_option(vim_bot):
     """Test / command with option."""
     _, _, editor, vim, qtbot = vim_bot
@@ -2283,6 +2374,15 @@ def test_search_cmd_with_option(vim_bot):
     qtbot.keyPress(cmd_line, Qt.Key_Return)
     assert get_start_list() == [4, 12]
 
+    # \c and \C override the options.
+    qtbot.keyClicks(cmd_line, "/Foo\\c")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert get_start_list() == [0, 4, 8, 12]
+
+    qtbot.keyClicks(cmd_line, "/foo\\C")
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert get_start_list() == [0, 8]
+
 
 @pytest.mark.parametrize(
     "text, cmd_list, cursor_pos, text_expected, reg_name, text_yanked",
@@ -2618,6 +2718,62 @@ def test_q_cmd(vim_bot):
     foo()
 
 
+def test_macro_register_text(vim_bot):
+    """Test that macros round-trip through the registers as text."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("iZ<Esc>\nabc\nabc\n")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, "qwjq")
+    assert vim_status.register_dict["w"].content == "j"
+
+    macro = vim_status.get_macro("w")
+    assert macro.notation == "j"
+    assert macro.codes.itemsize == 8
+    assert vim_status.get_macro("w") is macro
+
+    qtbot.keyClicks(cmd_line, "gg")
+    qtbot.keyClicks(cmd_line, '"qy$')
+    qtbot.keyClicks(cmd_line, "j0@q")
+    qtbot.wait(500)
+    assert editor.toPlainText() == "iZ<Esc>\nZabc\nabc\n"
+    assert cmd_line.hasFocus()
+
+    qtbot.keyClicks(cmd_line, "j0")
+    qtbot.keyClicks(cmd_line, '"wP')
+    assert editor.toPlainText() == "iZ<Esc>\nZabc\njabc\n"
+
+
+def test_macro_records_inserted_text(vim_bot):
+    """Test that a macro keeps the inserted text instead of the keys."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("a\nb\nc\n")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.cursor.set_cursor_pos(0)
+    vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    cmd_line.setFocus()
+    qtbot.keyClicks(cmd_line, "qeA")
+    qtbot.keyClicks(editor, "xy")
+    qtbot.keyClick(editor, Qt.Key_Backspace)
+    qtbot.keyClicks(editor, "z")
+    cmd_line.setFocus()
+    qtbot.wait(100)
+    qtbot.keyClicks(cmd_line, "jq")
+
+    assert vim_status.register_dict["e"].content == "Axz<Esc>j"
+    sources = [code >> 32 for code in vim_status.get_macro("e").codes]
+    assert sources == [0, 3, 3, 3, 0]
+
+    qtbot.keyClicks(cmd_line, "@e")
+    qtbot.wait(500)
+    assert editor.toPlainText() == "axz\nbxz\nc\n"
+
+
 def test_squarebracket_d_cmd(vim_bot):
     """Test goto warning."""
     _, _, editor, vim, qtbot = vim_bot
@@ -2,7 +2,8 @@
 
 # Third Party Libraries
 import pytest
-from qtpy.QtCore import Qt
+from qtpy.QtCore import QEvent, Qt
+from qtpy.QtGui import QKeyEvent
 from spyder.config.manager import CONF
 
 # Project Libraries
@@ -1767,3 +1768,38 @@ def test_prev_python_block_in_visual(vim_bot, start_line, cmd_list, expected):
 
     assert cmd_line.text() == ""
     assert editor.textCursor().blockNumber() == expected
+
+
+@pytest.mark.parametrize(
+    "text, cmd_list, text_expected, cursor_pos",
+    [
+        ("a 1\nb 0x0f\nc\nd -2\n", ["V", "3j", "^A"], "a 2\nb 0x10\nc\nd -1\n", 0),
+        ("a 1\nb 2\n", ["V", "j", "3", "^X"], "a -2\nb -1\n", 0),
+        ("1 1\n1 1\n", ["2l", "v", "j", "^A"], "1 2\n2 1\n", 2),
+        ("0\n0\nx\n0\n", ["V", "3j", "g", "^A"], "1\n2\nx\n3\n", 0),
+        ("0\n0\n", ["V", "j", "2g", "^A"], "2\n4\n", 0),
+    ],
+)
+def test_change_numbers_in_selection(vim_bot, text, cmd_list, text_expected, cursor_pos):
+    """Test Ctrl-A, Ctrl-X and g Ctrl-A on the selected lines."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text(text)
+    vim.vim_cmd.vim_status.cursor.set_cursor_pos(0)
+    vim.vim_cmd.vim_status.reset_for_test()
+
+    cmd_line = vim.vim_cmd.commandline
+    keys = {"^A": Qt.Key_A, "^X": Qt.Key_X}
+    for cmd in cmd_list:
+        if cmd in keys:
+            event = QKeyEvent(QEvent.KeyPress, keys[cmd], Qt.ControlModifier)
+            cmd_line.keyPressEvent(event)
+        else:
+            qtbot.keyClicks(cmd_line, cmd)
+
+    assert cmd_line.text() == ""
+    assert editor.toPlainText() == text_expected
+    assert editor.textCursor().position() == cursor_pos
+    assert vim.vim_cmd.vim_status.vim_state == VimState.NORMAL
+
+    editor.undo()
+    assert editor.toPlainText() == text
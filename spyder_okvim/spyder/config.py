@@ -35,8 +35,12 @@ CONF_DEFAULTS = [
             "yank_fg_color": "#17172d",
             "yank_bg_color": "#5cacee",
             "leader_key": "Space",
+            "file_search_include": "*.py, *.txt, *.md",
+            "file_search_exclude": (
+                ".git, .hg, .svn, __pycache__, .ipynb_checkpoints, node_modules"
+            ),
         },
     )
 ]
 
-CONF_VERSION = "0.9"
+CONF_VERSION = "0.10"
@@ -82,10 +82,31 @@ class OkvimConfigPage(PluginConfigPage):
         leaderkey_layout.addWidget(self.leaderkey_edit)
         leaderkey_group.setLayout(leaderkey_layout)
 
+        file_search_group = QGroupBox("Path Finder")
+        file_search_layout = QVBoxLayout()
+        file_search_layout.addWidget(
+            newle(
+                "Include",
+                "file_search_include",
+                tip="Comma separated glob patterns of indexed files",
+                alignment=Qt.Horizontal,
+            )
+        )
+        file_search_layout.addWidget(
+            newle(
+                "Exclude",
+                "file_search_exclude",
+                tip="Comma separated glob patterns of skipped files or folders",
+                alignment=Qt.Horizontal,
+            )
+        )
+        file_search_group.setLayout(file_search_layout)
+
         layout = QVBoxLayout()
         layout.addWidget(color_group)
         layout.addWidget(options_group)
         layout.addWidget(leaderkey_group)
+        layout.addWidget(file_search_group)
 
         self.setLayout(layout)
 
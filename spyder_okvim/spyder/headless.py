@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Vim commands on editors which are never shown, for batch jobs."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import sys
+import tempfile
+
+# Third Party Libraries
+from qtpy.QtWidgets import QApplication, QVBoxLayout, QWidget
+from spyder.plugins.editor.widgets.editorstack import EditorStack
+from spyder.widgets.findreplace import FindReplace
+
+# Project Libraries
+from spyder_okvim.spyder.vim_widgets import VimWidget
+from spyder_okvim.vim import FindInfo, Macro, SearchInfo
+from spyder_okvim.vim.insert_change import InsertChange
+
+_headless_vim: HeadlessVim | None = None
+
+
+class HeadlessEditorPlugin(QWidget):
+    """Stand-in for the editor plugin holding a single editor stack."""
+
+    def __init__(self, editor_stack: EditorStack) -> None:
+        super().__init__(None)
+        self.editor_stack = editor_stack
+        self.editorsplitter = editor_stack
+        # The stack asks its parent for the main widget when closing files.
+        self.main_widget = self
+        layout = QVBoxLayout(self)
+        layout.addWidget(editor_stack)
+
+    def get_widget(self):
+        """Return self, like the editor plugin."""
+        return self
+
+    def get_current_editorstack(self) -> EditorStack:
+        """Return the editor stack."""
+        return self.editor_stack
+
+    def can_close_file(self, filename=None) -> bool:
+        """Allow closing every file."""
+        return True
+
+    def save(self) -> None:
+        """Do nothing for ``:w``; the changed files are written by the batch."""
+
+
+class HeadlessMain(QWidget):
+    """Stand-in for the main window, without any plugin."""
+
+    def get_plugin(self, plugin, error=True):
+        """Return ``None``; no plugin is available."""
+        return None
+
+
+class MacroPlayback:
+    """Play ``@x`` at once instead of from a thread.
+
+    There is no event loop delivering the keys sent by
+    :class:`MacroPlaybackWorker`, so the nested macros are typed directly.
+    """
+
+    def __init__(self, vim_widget: VimWidget) -> None:
+        self.vim_widget = vim_widget
+        self.macro = Macro()
+        self.num_iteration = 0
+
+    def set_macro(self, macro: Macro, num: int) -> None:
+        """Set the macro to play ``num`` times."""
+        self.macro = macro.copy()
+        self.num_iteration = num
+
+    def start(self) -> None:
+        """Type the keys of the macro."""
+        # The keys are typed before the ``@x`` returns; it must not run again.
+        self.vim_widget.vim_status.manager_macro.set_info_for_execute("", 0)
+        for _ in range(self.num_iteration):
+            for key_info in self.macro.key_infos():
+                if isinstance(key_info, InsertChange):
+                    self.vim_widget.apply_insert_change(key_info)
+                else:
+                    self.vim_widget.send_key_event(key_info)
+
+    def isRunning(self) -> bool:
+        """Return ``False``; the keys are typed by :meth:`start`."""
+        return False
+
+
+class HeadlessVim:
+    """Editor stack and Vim widget living in a window never shown on screen.
+
+    The window needs an offscreen Qt platform. Each file is opened in its own
+    editor, so the marks and the change list of a file do not leak into the
+    next one. The marks and the session are kept in a temporary folder.
+    """
+
+    def __init__(self) -> None:
+        self._config_dir = tempfile.TemporaryDirectory(prefix="okvim-")
+        self.main = HeadlessMain()
+        self.editor_stack = EditorStack(None, [])
+        find_widget = FindReplace(self.editor_stack, enable_replace=True)
+        find_widget.hide()
+        self.editor_stack.set_find_widget(find_widget)
+        # Vim always needs a current editor, even between two files.
+        self.editor_stack.new("untitled.py", "utf-8", "", empty=True)
+        editor_plugin = HeadlessEditorPlugin(self.editor_stack)
+
+        self.vim_widget = VimWidget(editor_plugin, self.main, self._config_dir.name)
+        self.vim_widget.worker_macro = MacroPlayback(self.vim_widget)
+        self.vim_status = self.vim_widget.vim_status
+
+        layout = QVBoxLayout(self.main)
+        layout.addWidget(editor_plugin)
+        layout.addWidget(self.vim_widget.commandline)
+        # The keys are sent to the editor or the command line by their focus.
+        self.main.show()
+        self.main.activateWindow()
+        QApplication.processEvents()
+
+    def run(
+        self, path: str, text: str, keys: str, registers: dict[str, tuple[str, int]]
+    ) -> tuple[str, str]:
+        """Type ``keys`` in normal mode from the start of ``text``.
+
+        Every file starts with the same ``registers`` and without a previous
+        search, so the result does not depend on the files run before.
+
+        Args:
+            path: File name of the editor.
+            text: Text of the editor.
+            keys: Keys in Vim key notation.
+            registers: Content and type of each register.
+
+        Returns:
+            The text after the keys and the last error message, empty if
+            there was no error.
+
+        Raises:
+            Exception: The first error raised by a command. The commands run
+                in Qt slots, which would only print it.
+        """
+        vs = self.vim_status
+        finfo = self.editor_stack.new(path, "utf-8", text, empty=True)
+        self.editor_stack.set_current_filename(path)
+        try:
+            vs.register_dict.clear()
+            for name, (content, register_type) in registers.items():
+                vs.register_dict.set(name, content, register_type)
+            vs.search = SearchInfo(vs.cursor)
+            vs.find_info = FindInfo()
+            vs.last_substitute = None
+            vs.dot_cmd.clear_key_list()
+            vs.cursor.set_cursor_pos(0)
+            vs.to_normal()
+            vs.set_focus_to_vim()
+            vs.set_message("")
+            vs.error_message = ""
+
+            errors = []
+            excepthook = sys.excepthook
+            sys.excepthook = lambda _, error, __: errors.append(error)
+            try:
+                self.vim_widget.feed_keys(list(Macro(keys).key_infos()))
+            finally:
+                sys.excepthook = excepthook
+            if errors:
+                raise errors[0]
+            return finfo.editor.toPlainText(), vs.error_message
+        finally:
+            index = self.editor_stack.data.index(finfo)
+            self.editor_stack.close_file(index, force=True)
+            # The closed editor may be collected before the pending update
+            # of its decorations, which then reads a deleted document.
+            finfo.editor.decorations.update_timer.stop()
+
+
+def get_headless_vim() -> HeadlessVim:
+    """Return the headless editor of this process."""
+    global _headless_vim
+    if _headless_vim is None:
+        _headless_vim = HeadlessVim()
+    return _headless_vim
@@ -115,7 +115,7 @@ class OkVim(SpyderDockablePlugin):  # pylint: disable=R0904
         Plugins.Application,
         Plugins.Editor,
     ]
-    OPTIONAL = []
+    OPTIONAL = [Plugins.Projects]
     WIDGET_CLASS = VimPane
     CONF_SECTION = CONF_SECTION
     CONF_WIDGET_CLASS = OkvimConfigPage
@@ -176,6 +176,23 @@ class OkVim(SpyderDockablePlugin):  # pylint: disable=R0904
         preferences = self.get_plugin(Plugins.Preferences)
         preferences.register_plugin_preferences(self)
 
+    @on_plugin_available(plugin=Plugins.Editor)
+    def on_editor_available(self) -> None:
+        """Index the symbols of a file again when it is saved."""
+        editor = self.get_plugin(Plugins.Editor)
+        vim_status = self.get_widget().vim_cmd.vim_status
+        editor.sig_file_opened_closed_or_updated.connect(
+            vim_status.update_symbols_of_file
+        )
+
+    @on_plugin_available(plugin=Plugins.Projects)
+    def on_projects_available(self) -> None:
+        """Index the files of a project as soon as it is opened."""
+        projects = self.get_plugin(Plugins.Projects)
+        vim_status = self.get_widget().vim_cmd.vim_status
+        projects.sig_project_loaded.connect(vim_status.get_symbol_index)
+        projects.sig_project_closed.connect(vim_status.release_file_index)
+
     @staticmethod
     def check_compatibility():
         """Check plugin compatibility."""
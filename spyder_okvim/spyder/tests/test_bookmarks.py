@@ -1,10 +1,14 @@
 """Tests for the Marks."""
 
+# Standard Libraries
+import json
+
 # Third Party Libraries
 import pytest
 from qtpy.QtCore import Qt
 
 # Project Libraries
+from spyder_okvim.utils.bookmark_manager import BookmarkManager
 from spyder_okvim.vim import VimState
 
 
@@ -485,3 +489,61 @@ def test_jump_global_mark_visual_removed(vim_bot, cmd):
     qtbot.keyClicks(cmd_line, "v")
     qtbot.keyClicks(cmd_line, cmd)
     assert editor.textCursor().position() == 0
+
+
+def test_bookmark_follows_edits(vim_bot):
+    """Marks move with the lines inserted or removed above them."""
+    _, _, editor, vim, qtbot = vim_bot
+    editor.set_text("a\nb\nc\n")
+    vim_status = vim.vim_cmd.vim_status
+    vim_status.reset_for_test()
+    vim_status.cursor.set_cursor_pos(4)
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, "ma")
+    qtbot.keyClicks(cmd_line, "mB")
+
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText("x\ny\n")
+    assert vim_status.get_bookmark("a")["line"] == 4
+    assert vim_status.get_bookmark("B")["line"] == 4
+
+    vim_status.cursor.set_cursor_pos(0)
+    qtbot.keyClicks(cmd_line, "'a")
+    assert editor.textCursor().position() == 8
+
+    cursor.setPosition(0)
+    cursor.setPosition(2, cursor.KeepAnchor)
+    cursor.removeSelectedText()
+    vim_status.cursor.set_cursor_pos(0)
+    qtbot.keyClicks(cmd_line, "`B")
+    assert editor.textCursor().position() == 6
+
+
+def test_global_bookmark_persistence(vim_bot, tmp_path):
+    """Global marks are loaded lazily and written after a delay."""
+    _, stack, editor, _, _ = vim_bot
+    bookmarks_file = tmp_path / "bookmarks.json"
+    bookmarks_file.write_text('{"Z": {"file": "f.py", "line": 3, "col": 1}}')
+
+    manager = BookmarkManager(
+        str(bookmarks_file),
+        lambda path: None,
+        lambda: stack,
+        lambda: editor,
+        lambda pos: None,
+    )
+    assert manager.bookmarks_global == {}
+    assert manager.list_bookmarks()[-1][0] == "Z"
+
+    editor.set_text("a\nb\n")
+    manager.set_bookmark("Y")
+    assert manager.timer_flush.isActive()
+    manager.flush()
+    assert not manager.timer_flush.isActive()
+
+    data = json.loads(bookmarks_file.read_text())
+    assert set(data) == {"Y", "Z"}
+    assert "pos" not in data["Y"]
+    assert [p.name for p in tmp_path.iterdir()] == ["bookmarks.json"]
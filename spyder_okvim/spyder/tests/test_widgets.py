@@ -8,10 +8,13 @@
 # Third Party Libraries
 import pytest
 from qtpy.QtCore import QCoreApplication, QEvent, Qt
-from qtpy.QtGui import QFocusEvent, QKeyEvent
+from qtpy.QtGui import QFocusEvent, QKeyEvent, QTextCursor
 
 # Project Libraries
 from spyder_okvim.spyder.confpage import OkvimConfigPage
+from spyder_okvim.utils.quickfix import QuickfixEntry
+from spyder_okvim.utils.session_store import SessionStore
+from spyder_okvim.vim import VimState
 
 
 def test_conf_page(vim_bot):
@@ -273,6 +276,50 @@ def test_jumplist_n_command(vim_bot):
     assert editor.textCursor().position() == second
 
 
+def test_forget_closed_editor(vim_bot):
+    """Closing an editor disconnects the jump, quickfix and change lists."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    editor.set_text("alpha\nbravo\n")
+    vs.reset_for_test()
+    vs.watch_editorstack()
+    vs.cursor.set_cursor_pos(6)
+    vs.push_jump()
+    file_path = editor.filename
+    assert file_path in vs._jump_documents
+
+    vs.track_changes()
+    assert file_path in vs._change_documents
+    vs.set_quickfix([QuickfixEntry(file_path, 6, 1, 0, "bravo")])
+    assert file_path in vs._quickfix_documents
+
+    stack.sig_codeeditor_deleted.emit(editor)
+    assert file_path not in vs._jump_documents
+    assert file_path not in vs._change_documents
+    assert file_path not in vs._quickfix_documents
+    QTextCursor(editor.document()).insertText("x")
+    assert vs.jump_list[-1].pos == 6
+    assert vs.quickfix.entries[0].pos == 6
+    assert file_path not in vs.change_lists
+
+
+def test_forget_closed_editor_keeps_quickfix_lines(vim_bot):
+    """The quickfix entries of a closed editor keep their moved lines."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    editor.set_text("alpha\nbravo\n")
+    vs.reset_for_test()
+    vs.watch_editorstack()
+    file_path = editor.filename
+    vs.set_quickfix([QuickfixEntry(file_path, 8, 1, 2, "bravo")])
+
+    QTextCursor(editor.document()).insertText("zero\none\n")
+    assert vs.quickfix.entries[0].pos == 17
+    stack.sig_codeeditor_deleted.emit(editor)
+    entry = vs.quickfix.entries[0]
+    assert (entry.line, entry.col) == (3, 2)
+
+
 def test_jumplist_mark_jump(vim_bot):
     """Jump list records mark jumps."""
     _, _, editor, vim, qtbot = vim_bot
@@ -388,3 +435,179 @@ def test_gd_no_change_pop(vim_bot, monkeypatch):
     qtbot.wait(2500)
 
     assert vs.jump_list.jumps == []
+
+
+def test_gd_unique_tag(vim_bot, monkeypatch):
+    """A unique definition is asked to the language server first."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    stack.set_current_filename(stack.get_filenames()[0])
+    editor.set_text("def foo():\n    pass\n\nfoo()\n")
+    vs.reset_for_test()
+    vs.cursor.set_cursor_pos(22)
+
+    # Third Party Libraries
+    from spyder.plugins.editor.widgets.codeeditor import CodeEditor
+
+    requests = []
+    monkeypatch.setattr(
+        CodeEditor, "go_to_definition_from_cursor", lambda self: requests.append(1)
+    )
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, "gd")
+    assert requests == [1]
+    assert editor.textCursor().position() == 22
+    # The tag is used when the language server does not answer in time.
+    qtbot.waitUntil(lambda: editor.textCursor().position() == 4, timeout=2000)
+    assert [jump.pos for jump in vs.jump_list.jumps] == [22, 4]
+
+    vs.cursor.set_cursor_pos(22)
+    event = QKeyEvent(QEvent.KeyPress, Qt.Key_BracketRight, Qt.ControlModifier)
+    cmd_line.keyPressEvent(event)
+    assert requests == [1, 1]
+    qtbot.waitUntil(lambda: editor.textCursor().position() == 4, timeout=2000)
+
+
+def test_gd_ambiguous_tag(vim_bot, monkeypatch):
+    """The first definition is used when the language server is silent."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    stack.set_current_filename(stack.get_filenames()[0])
+    editor.set_text(
+        "class A:\n    def run(self):\n        pass\n\n"
+        "class B:\n    def run(self):\n        pass\n\nB().run()\n"
+    )
+    vs.reset_for_test()
+    pos_run = editor.toPlainText().rindex("run")
+    vs.cursor.set_cursor_pos(pos_run)
+
+    # Third Party Libraries
+    from spyder.plugins.editor.widgets.codeeditor import CodeEditor
+
+    requests = []
+    monkeypatch.setattr(
+        CodeEditor, "go_to_definition_from_cursor", lambda self: requests.append(1)
+    )
+
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, "gd")
+    assert requests == [1]
+    qtbot.waitUntil(lambda: len(vs.jump_list.jumps) == 2, timeout=2000)
+    assert editor.textCursor().blockNumber() == 1
+    assert vs.timer_go_to_definition is None
+
+
+def test_jumplist_follows_edits(vim_bot):
+    """Jumps of an open file move with the inserted and removed text."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    stack.set_current_filename(stack.get_filenames()[0])
+    editor.set_text("a\nb\nc\nd\n")
+    vs.reset_for_test()
+
+    vs.cursor.set_cursor_pos(4)
+    vs.push_jump()
+    vs.cursor.set_cursor_pos(6)
+    vs.push_jump()
+
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText("new\n")
+    assert [jump.pos for jump in vs.jump_list.jumps] == [8, 10]
+
+    cursor.setPosition(4)
+    cursor.setPosition(10, cursor.KeepAnchor)
+    cursor.removeSelectedText()
+    assert [jump.pos for jump in vs.jump_list.jumps] == [4, 4]
+
+
+def test_change_list(vim_bot):
+    """g; and g, walk through the positions of the last edits."""
+    _, _, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    editor.set_text("aaa\nbbb\nccc\nddd\n")
+    vs.reset_for_test()
+    vs.track_changes()
+    cmd_line = vim.vim_cmd.commandline
+
+    vs.cursor.set_cursor_pos(8)
+    qtbot.keyClicks(cmd_line, "x")
+    qtbot.keyClicks(cmd_line, "x")
+    vs.cursor.set_cursor_pos(1)
+    qtbot.keyClicks(cmd_line, "x")
+    assert editor.toPlainText() == "aa\nbbb\nc\nddd\n"
+
+    vs.cursor.set_cursor_pos(12)
+    qtbot.keyClicks(cmd_line, "g;")
+    assert editor.textCursor().position() == 1
+    qtbot.keyClicks(cmd_line, "g;")
+    assert editor.textCursor().position() == 7
+    qtbot.keyClicks(cmd_line, "g;")
+    assert vs.msg_label.text() == "E662: At start of changelist"
+    qtbot.keyClicks(cmd_line, "g,")
+    assert editor.textCursor().position() == 1
+
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText("\n")
+    qtbot.keyClicks(cmd_line, "2g;")
+    assert editor.textCursor().position() == 2
+    qtbot.keyClicks(cmd_line, "g;")
+    assert editor.textCursor().position() == 8
+
+
+def test_session_history(vim_bot):
+    """Up and Down browse the ex-command history matching the text."""
+    _, _, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    editor.set_text("a\nb\nc\n")
+    vs.reset_for_test()
+    cmd_line = vim.vim_cmd.commandline
+
+    for cmd in (":2", ":3", ":12"):
+        qtbot.keyClicks(cmd_line, cmd)
+        qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert vs.get_history("cmd") == ["2", "3", "12"]
+
+    qtbot.keyClicks(cmd_line, ":")
+    qtbot.keyPress(cmd_line, Qt.Key_Up)
+    assert cmd_line.text() == ":12"
+    qtbot.keyPress(cmd_line, Qt.Key_Up)
+    assert cmd_line.text() == ":3"
+    qtbot.keyPress(cmd_line, Qt.Key_Up)
+    assert cmd_line.text() == ":2"
+    qtbot.keyPress(cmd_line, Qt.Key_Down)
+    qtbot.keyPress(cmd_line, Qt.Key_Down)
+    qtbot.keyPress(cmd_line, Qt.Key_Down)
+    assert cmd_line.text() == ":"
+    qtbot.keyClicks(cmd_line, "1")
+    qtbot.keyPress(cmd_line, Qt.Key_Up)
+    assert cmd_line.text() == ":12"
+    qtbot.keyPress(cmd_line, Qt.Key_Return)
+    assert cmd_line.text() == ""
+    assert vs.get_history("cmd") == ["2", "3", "12"]
+
+
+def test_session_registers_and_last_position(vim_bot):
+    """Registers and the '" mark come back from the session store."""
+    _, stack, editor, vim, qtbot = vim_bot
+    vs = vim.vim_cmd.vim_status
+    editor.set_text("abc\ndef\n")
+    vs.reset_for_test()
+    vs.cursor.set_cursor_pos(5)
+    vs.remember_position(editor)
+    vs.cursor.set_cursor_pos(0)
+    cmd_line = vim.vim_cmd.commandline
+    qtbot.keyClicks(cmd_line, '`"')
+    assert editor.textCursor().position() == 5
+
+    vs.set_register("a", "saved", VimState.NORMAL)
+    assert vs.session.timer_append.isActive()
+    vs.save_session()
+    saved = SessionStore(vs.session.log_file)
+    assert saved.get("register", "a") == ["saved", VimState.NORMAL]
+    vs.register_dict.clear()
+    vs._registers_restored = False
+    qtbot.keyClicks(cmd_line, '"ap')
+    assert editor.toPlainText() == "abc\ndesavedf\n"
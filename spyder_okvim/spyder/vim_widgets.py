@@ -30,11 +30,21 @@ from spyder_okvim.executor import (
     ExecutorVisualCmd,
     ExecutorVlineCmd,
 )
+from spyder_okvim.executor.executor_sub import ExecutorSubCmd_g
 from spyder_okvim.spyder.config import CONF_SECTION, KEYCODE2STR
 from spyder_okvim.utils.file_search import FileSearchDialog
+from spyder_okvim.utils.number_helpers import (
+    change_number,
+    find_number,
+    increment_lines,
+)
 from spyder_okvim.utils.qtcompat import exec_dialog, text_width
 from spyder_okvim.utils.testing_env import running_in_pytest
-from spyder_okvim.vim import InputCmdInfo, KeyInfo, VimState, VimStatus
+from spyder_okvim.utils.text_edit import apply_text_change
+from spyder_okvim.utils.undo_history import undo_steps
+from spyder_okvim.vim import InputCmdInfo, KeyInfo, Macro, VimState, VimStatus
+from spyder_okvim.vim.insert_change import InsertChange
+from spyder_okvim.vim.macro import FROM_EDITOR, FROM_FOCUS, FROM_VIM
 
 running_coverage = "coverage" in sys.modules
 
@@ -165,80 +175,75 @@ class VimShortcut(QObject):
         """Scroll one page down."""
         self._scroll(False, False)
 
-    def _extract_number(self) -> tuple[int | None, int, int]:
-        """Return the number under the cursor.
-
-        Returns:
-            tuple[int | None, int, int]: Extracted number and its start and end
-            positions.
-        """
-        cursor = self.get_editor().textCursor()
-
-        val = None
-        block_start = cursor.block().position()
-        block_end = block_start + cursor.block().length()
-        pos_start = cursor.position()
-        pos_end = pos_start
-
-        for index_end in range(pos_start + 1, block_end):
-            cursor.setPosition(pos_start)
-            cursor.setPosition(index_end, QTextCursor.KeepAnchor)
-            try:
-                text_selected = cursor.selectedText()
-                if text_selected == "-":
-                    continue
-                val_ = int(text_selected)
-                if text_selected.isdigit() or text_selected[0] == "-":
-                    val = val_
-                    pos_end = index_end
-                else:
-                    break
-            except ValueError:
-                break
-
-        for index_start in range(pos_start, block_start - 1, -1):
-            cursor.setPosition(index_start)
-            cursor.setPosition(pos_end, QTextCursor.KeepAnchor)
-            try:
-                val_ = int(cursor.selectedText())
-                text_selected = cursor.selectedText()
-                if text_selected.isdigit() or text_selected[0] == "-":
-                    val = val_
-                    pos_start = index_start
-                else:
-                    break
-            except ValueError:
-                break
-
-        return val, pos_start, pos_end
-
     def _change_number(self, delta: int, key: int) -> None:
-        """Change the number at the cursor.
+        """Change the number at the cursor or in the visual selection.
 
         Args:
             delta: Increment or decrement value.
             key: Qt key code used for dot command updates.
         """
-        val, start, end = self._extract_number()
-        if val is None:
-            return
-        if self.vim_status.sub_mode:
+        vs = self.vim_status
+        sub_mode = vs.sub_mode
+        progressive = vs.is_visual_mode and isinstance(sub_mode, ExecutorSubCmd_g)
+        if sub_mode:
             self.cmd_line.esc_pressed()
-            return
+            if not progressive:
+                return
+            count = sub_mode.parent_num[-1] if sub_mode.parent_num_str[-1] else 1
+        else:
+            count_text = self.cmd_line.text()
+            count = 1 if not count_text else int(count_text)
+            self.cmd_line.clear()
 
-        count_text = self.cmd_line.text()
-        count = 1 if not count_text else int(count_text)
+        if vs.is_visual_mode:
+            self._change_numbers_in_selection(delta * count, progressive)
+            return
 
         cursor = self.get_editor().textCursor()
-        cursor.setPosition(start)
-        cursor.setPosition(end, QTextCursor.KeepAnchor)
-        cursor.insertText(str(val + delta * count))
-        self.signal_cmd.emit("h")
+        block = cursor.block()
+        match = find_number(block.text(), cursor.positionInBlock())
+        if match is None:
+            return
+        number = change_number(match, delta * count)
+        cursor.setPosition(block.position() + match.start())
+        cursor.setPosition(block.position() + match.end(), QTextCursor.KeepAnchor)
+        cursor.insertText(number)
+        vs.cursor.set_cursor_pos(block.position() + match.start() + len(number) - 1)
 
         cmd_info = InputCmdInfo(str(count), "")
-        self.vim_status.input_cmd.set(cmd_info)
+        vs.input_cmd.set(cmd_info)
         key_info = KeyInfo(key, "", Qt.ControlModifier, 0)
-        self.vim_status.update_dot_cmd(False, key_list_to_cmd_line=[key_info])
+        vs.update_dot_cmd(False, key_list_to_cmd_line=[key_info])
+
+    def _change_numbers_in_selection(self, delta: int, progressive: bool) -> None:
+        """Change the first number of each selected line in one edit block."""
+        vs = self.vim_status
+        sel_start = vs.cursor.get_pos_start_in_selection()
+        sel_end = vs.cursor.get_pos_end_in_selection()
+        document = self.get_editor().document()
+        block_first = document.findBlock(sel_start)
+        block_last = document.findBlock(sel_end)
+        pos_first = block_first.position()
+
+        lines = []
+        block = block_first
+        while block.isValid():
+            lines.append(block.text())
+            if block == block_last:
+                break
+            block = block.next()
+
+        col_start, col_end = 0, None
+        if vs.vim_state == VimState.VISUAL:
+            col_start = sel_start - pos_first
+            col_end = sel_end - block_last.position()
+        new_lines, _ = increment_lines(lines, delta, progressive, col_start, col_end)
+        apply_text_change(
+            vs.get_cursor(), pos_first, "\n".join(lines), "\n".join(new_lines)
+        )
+
+        vs.to_normal()
+        vs.cursor.set_cursor_pos(sel_start)
 
     def add_num(self) -> None:
         """Add to the number at the cursor."""
@@ -264,8 +269,7 @@ class VimShortcut(QObject):
         num = 1 if not txt else int(txt)
 
         editor = self.get_editor()
-        for _ in range(num):
-            editor.redo()
+        undo_steps(editor, num, redo=True)
 
         n_block_new = editor.blockCount()
         if n_block_new != n_block_old:
@@ -281,16 +285,19 @@ class VimShortcut(QObject):
     def open_file_search(self) -> None:
         """Open the file search dialog."""
         root_folder = self.main.projects.get_active_project_path()
+        file_index = self.vim_status.get_file_index(root_folder)
+        boosts = self.vim_status.frecency.boosts(root_folder)
 
-        dlg = FileSearchDialog(root_folder, self.main)
+        dlg = FileSearchDialog(root_folder, self.main, file_index, boosts)
         exec_dialog(dlg)
+        dlg.release_file_index()
         path = dlg.get_selected_path()
 
         if osp.isfile(path):
             self.vim_status.push_jump()
             application = self.main.get_plugin(Plugins.Application)
             application.open_file_in_plugin(path)
-            self.vim_status.jump_list.push(path, 0)
+            self.vim_status.add_jump(path, 0)
             self.vim_status.set_focus_to_vim()
 
     def clear_tip_search(self) -> None:
@@ -298,6 +305,14 @@ class VimShortcut(QObject):
         self.get_editor().hide_tooltip()
         self.vim_status.cursor.set_extra_selections("vim_search", [])
 
+    def go_to_definition(self) -> None:
+        """Jump to the definition of the word under the cursor."""
+        if self.vim_status.sub_mode:
+            self.cmd_line.esc_pressed()
+            return
+        self.vim_status.go_to_definition()
+        self.vim_status.set_focus_to_vim()
+
     def jump_backward(self) -> None:
         """Jump to previous location in the jumplist."""
         if self.vim_status.sub_mode:
@@ -379,8 +394,11 @@ class VimLineEdit(QLineEdit):
             Qt.Key_C: vim_shortcut.clear_tip_search,
             Qt.Key_O: vim_shortcut.jump_backward,
             Qt.Key_I: vim_shortcut.jump_forward,
+            Qt.Key_BracketRight: vim_shortcut.go_to_definition,
         }
         self.setAttribute(Qt.WA_InputMethodEnabled, False)
+        self._history: list[str] | None = None
+        self._history_index = 0
 
     def to_normal(self) -> None:
         """Convert the state of vim to normal mode."""
@@ -394,6 +412,10 @@ class VimLineEdit(QLineEdit):
 
         key = e.key()
         pressed_ctrl = e.modifiers() == Qt.ControlModifier
+        if key in (Qt.Key_Up, Qt.Key_Down) and self._can_browse_history():
+            self.browse_history(key == Qt.Key_Up)
+            return
+        self._history = None
         if key == Qt.Key_Escape:
             self.esc_pressed()
         elif KEYCODE2STR.get(key, None):
@@ -403,6 +425,28 @@ class VimLineEdit(QLineEdit):
         else:
             super().keyPressEvent(e)
 
+    def _can_browse_history(self) -> bool:
+        return bool(self.vim_status.sub_mode) and self.text()[:1] in (":", "/")
+
+    def browse_history(self, older: bool) -> None:
+        """Show an older or newer ``:`` or ``/`` entry starting with the text."""
+        txt = self.text()
+        if self._history is None:
+            kind = "cmd" if txt[0] == ":" else "search"
+            prefix = txt[1:]
+            self._history = [
+                entry
+                for entry in self.vim_status.get_history(kind)
+                if entry.startswith(prefix)
+            ]
+            self._history.append(prefix)
+            self._history_index = len(self._history) - 1
+        if older:
+            self._history_index = max(self._history_index - 1, 0)
+        else:
+            self._history_index = min(self._history_index + 1, len(self._history) - 1)
+        self.setText(txt[0] + self._history[self._history_index])
+
     def esc_pressed(self) -> None:
         """Clear state."""
         self.vim_status.input_cmd.clear()
@@ -420,6 +464,8 @@ class VimLineEdit(QLineEdit):
     def focusInEvent(self, event: QFocusEvent) -> None:
         """Override Qt method."""
         self.vim_status.disconnect_from_editor()
+        self.vim_status.track_changes()
+        self.vim_status.watch_editorstack()
         super().focusInEvent(event)
         if self.vim_status.cursor.get_editor():
             self.to_normal()
@@ -452,15 +498,16 @@ class MacroPlaybackWorker(QThread):
 
     sig_focus_vim = Signal()
     sig_send_key_info = Signal(object)
+    sig_insert_change = Signal(object)
 
     def __init__(self, parent: QObject | None) -> None:
         super().__init__(parent)
-        self.key_info_list = []
+        self.macro = Macro()
         self.num_iteration = 0
 
-    def set_key_infos(self, key_infos: list[KeyInfo], num: int) -> None:
-        """Set key infos of registers."""
-        self.key_info_list = key_infos.copy()
+    def set_macro(self, macro: Macro, num: int) -> None:
+        """Set the macro to play ``num`` times."""
+        self.macro = macro.copy()
         self.num_iteration = num
 
     @enable_coverage_tracing
@@ -468,10 +515,14 @@ class MacroPlaybackWorker(QThread):
         """Send key info to main thread."""
         is_focus_vim = True
         for _ in range(self.num_iteration):
-            for key_info in self.key_info_list:
-                if key_info.identifier == 1:
+            for key_info in self.macro.key_infos():
+                if isinstance(key_info, InsertChange):
                     is_focus_vim = False
-                elif key_info.identifier == 0 and is_focus_vim is False:
+                    self.sig_insert_change.emit(key_info)
+                    continue
+                if key_info.identifier == FROM_EDITOR:
+                    is_focus_vim = False
+                elif key_info.identifier == FROM_VIM and is_focus_vim is False:
                     is_focus_vim = True
                     self.sig_focus_vim.emit()
                 self.sig_send_key_info.emit(key_info)
@@ -483,14 +534,14 @@ class MacroPlaybackWorker(QThread):
 class VimWidget(QWidget):
     """Vim widget."""
 
-    def __init__(self, editor_widget, main):
+    def __init__(self, editor_widget, main, config_dir=None):
         super().__init__(main)
         self.editor_widget = editor_widget
         self.main = main
         self.status_label = VimStateLabel(main)
         self.msg_label = VimMessageLabel("", main)
 
-        self.vim_status = VimStatus(editor_widget, main, self.msg_label)
+        self.vim_status = VimStatus(editor_widget, main, self.msg_label, config_dir)
         # # Avoid Qt crashes if the label is deleted by ignoring the signal
         # self.vim_status.change_label.connect(lambda state: None)
         self.vim_status.change_label.connect(self.status_label.change_state)
@@ -520,17 +571,61 @@ class VimWidget(QWidget):
         # macro
         self.worker_macro = MacroPlaybackWorker(main)
         self.worker_macro.sig_send_key_info.connect(self.send_key_event)
+        self.worker_macro.sig_insert_change.connect(self.apply_insert_change)
         self.worker_macro.sig_focus_vim.connect(self.commandline.setFocus)
 
     @Slot(object)
     def send_key_event(self, key_info: KeyInfo) -> None:
         event = key_info.to_event()
-        if key_info.identifier == 0:
+        editor = self.vim_status.get_editor()
+        identifier = key_info.identifier
+        if identifier == FROM_FOCUS:
+            # Keys parsed from a register go where they would be typed.
+            in_editor = self.vim_status.feeding_insert
+            if in_editor is None:
+                in_editor = editor.hasFocus()
+            identifier = FROM_EDITOR if in_editor else FROM_VIM
+            if identifier == FROM_EDITOR and key_info.key_code == Qt.Key_Escape:
+                self.vim_status.set_focus_to_vim()
+                return
+        if identifier == FROM_VIM:
             self.commandline.keyPressEvent(event)
         else:
-            editor = self.vim_status.get_editor()
             editor.keyPressEvent(event)
 
+    def feed_keys(self, key_infos: list[KeyInfo]) -> None:
+        """Type ``key_infos`` like ``:normal`` and end what they left pending.
+
+        An unfinished command, the visual mode or the insert mode is ended
+        like with ``Esc``. The keys are not added to the macro being
+        recorded. The focus stays on the command line; the keys typed in
+        insert mode are sent to the editor.
+        """
+        vs = self.vim_status
+        mm = vs.manager_macro
+        recording, is_recording = mm.recording, mm.is_recording
+        mm.recording, mm.is_recording = None, False
+        vs.feeding_insert = False
+        try:
+            for key_info in key_infos:
+                self.send_key_event(key_info)
+            if vs.feeding_insert:
+                vs.set_focus_to_vim()
+            elif (
+                vs.sub_mode
+                or vs.vim_state != VimState.NORMAL
+                or self.commandline.text()
+            ):
+                self.commandline.esc_pressed()
+        finally:
+            vs.feeding_insert = None
+            mm.recording, mm.is_recording = recording, is_recording
+
+    def apply_insert_change(self, change: InsertChange) -> None:
+        """Insert the text of a macro like it was typed."""
+        self.vim_status.capture_insert()
+        change.apply(self.vim_status.get_editor())
+
     def set_leader_key(self) -> None:
         """Set leader key from CONF."""
         leader_key = CONF.get(CONF_SECTION, "leader_key")
@@ -574,7 +669,9 @@ class VimWidget(QWidget):
         if self.vim_status.manager_macro.reg_name_for_execute:
             mm = self.vim_status.manager_macro
             ch = mm.reg_name_for_execute
-            self.worker_macro.set_key_infos(mm.registers[ch], mm.num_execute)
+            self.worker_macro.set_macro(
+                self.vim_status.get_macro(ch), mm.num_execute
+            )
             self.worker_macro.start()
             mm.set_info_for_execute("", 0)
 
@@ -587,6 +684,11 @@ class VimWidget(QWidget):
         if self.worker_macro.isRunning():
             self.worker_macro.quit()
             self.worker_macro.wait()
+        self.vim_status.release_file_index()
+        self.vim_status.bookmark_manager.flush()
+        self.vim_status.frecency.flush()
+        self.vim_status.save_session()
+        self.vim_status.register_dict.close()
         if running_in_pytest():
             self.worker_macro.deleteLater()
             self.commandline.deleteLater()
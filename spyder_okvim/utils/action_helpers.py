@@ -10,6 +10,7 @@ from qtpy.QtGui import QTextCursor
 # Project Libraries
 from spyder_okvim.utils.motion import MotionInfo, MotionType
 from spyder_okvim.utils.motion_helpers import MotionHelper
+from spyder_okvim.utils.text_edit import apply_text_change
 from spyder_okvim.vim import VimState
 
 
@@ -217,7 +218,7 @@ class ActionHelper:
         cursor.setPosition(pos_end, QTextCursor.KeepAnchor)
         text = cursor.selectedText().replace("\u2029", "\n")
         text_sub = self._add_surrounding(ch, text)
-        cursor.insertText(text_sub)
+        apply_text_change(cursor, pos_start, text, text_sub)
 
         editor = self.get_editor()
         editor.document_did_change()
@@ -257,7 +258,7 @@ class ActionHelper:
         cursor.setPosition(motion_info.sel_end, QTextCursor.KeepAnchor)
         text = cursor.selectedText().replace("\u2029", "\n")
         text_sub = self._delete_surrounding(ch, text)
-        cursor.insertText(text_sub)
+        apply_text_change(cursor, motion_info.sel_start, text, text_sub)
 
         editor = self.get_editor()
         editor.document_did_change()
@@ -293,7 +294,7 @@ class ActionHelper:
         text = cursor.selectedText().replace("\u2029", "\n")
         text_sub = self._delete_surrounding(ch_delete, text)
         text_sub = self._add_surrounding(ch_insert, text_sub)
-        cursor.insertText(text_sub)
+        apply_text_change(cursor, motion_info.sel_start, text, text_sub)
 
         editor = self.get_editor()
         editor.document_did_change()
@@ -350,13 +351,14 @@ class ActionHelper:
 
         cursor.setPosition(pos_start)
         cursor.setPosition(pos_end, QTextCursor.KeepAnchor)
-        text = cursor.selectedText()
+        text = cursor.selectedText().replace("\u2029", "\n")
         if method == "swap":
-            cursor.insertText(text.swapcase())
+            text_sub = text.swapcase()
         elif method == "lower":
-            cursor.insertText(text.lower())
+            text_sub = text.lower()
         else:
-            cursor.insertText(text.upper())
+            text_sub = text.upper()
+        apply_text_change(cursor, pos_start, text, text_sub)
 
         editor = self.get_editor()
         editor.document_did_change()
@@ -390,9 +392,7 @@ class ActionHelper:
                 text_list_indent.append("")
         texts_indent = "\n".join(text_list_indent)
 
-        cursor.setPosition(pos_start)
-        cursor.setPosition(pos_end, QTextCursor.KeepAnchor)
-        cursor.insertText(texts_indent)
+        apply_text_change(cursor, pos_start, "\n".join(text_list), texts_indent)
 
         block_start, _ = self.vim_status.cursor.get_block(pos_start)
         len_blank = len(block_start.text()) - len(block_start.text().lstrip())
@@ -429,9 +429,7 @@ class ActionHelper:
             text_list_unindent.append(text[idx_discard:])
         texts_unindent = "\n".join(text_list_unindent)
 
-        cursor.setPosition(pos_start)
-        cursor.setPosition(pos_end, QTextCursor.KeepAnchor)
-        cursor.insertText(texts_unindent)
+        apply_text_change(cursor, pos_start, "\n".join(text_list), texts_unindent)
 
         block_start, _ = self.vim_status.cursor.get_block(pos_start)
         len_blank = len(block_start.text()) - len(block_start.text().lstrip())
@@ -468,14 +466,20 @@ class ActionHelper:
         if register_type == VimState.VLINE:
             txt += "\n"
 
-        self.vim_status.set_register(register_name, txt, register_type)
-        if is_explicit is True and register_name == '"':
-            self.vim_status.set_register("0", txt, register_type)
-
-        # Set message
         doc = cursor.document()
         nb_start = doc.findBlock(sel_start).blockNumber()
         nb_end = doc.findBlock(sel_end).blockNumber()
+
+        self.vim_status.set_register(register_name, txt, register_type)
+        if register_name == '"':
+            if is_explicit is True:
+                self.vim_status.set_register("0", txt, register_type)
+            else:
+                # The text is about to be deleted or changed.
+                is_small = register_type == VimState.NORMAL and nb_start == nb_end
+                self.vim_status.set_deleted_register(txt, register_type, is_small)
+
+        # Set message
         if nb_start != nb_end:
             self.vim_status.set_message(f"{nb_end - nb_start + 1} lines yanked")
 
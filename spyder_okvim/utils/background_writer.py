@@ -0,0 +1,104 @@
+"""Write files on a background thread, away from the GUI thread."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import os
+import os.path as osp
+import stat
+import tempfile
+import threading
+from collections.abc import Callable
+from functools import partial
+
+
+def write_atomic(
+    file_path: str, data: str, encoding: str = "utf-8", keep_mode: bool = False
+) -> None:
+    """Write ``data`` to ``file_path`` through a renamed temporary file.
+
+    A failed write removes the temporary file and leaves ``file_path``
+    untouched.
+
+    Args:
+        file_path: File to write.
+        data: Text of the file; line breaks are written unchanged.
+        encoding: Encoding of the text.
+        keep_mode: Keep the permissions of the existing ``file_path``.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    folder = osp.dirname(file_path)
+    mode = stat.S_IMODE(os.stat(file_path).st_mode) if keep_mode else None
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline="") as fh:
+            fh.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class BackgroundWriter:
+    """Run file writes in order on one daemon thread.
+
+    A write submitted with a ``key`` replaces the pending write of the same
+    key, so the thread only writes the latest snapshot of a file and the
+    caller never waits for a running write.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: dict[object, Callable[[], None]] = {}
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, func: Callable, *args, key: object = None) -> None:
+        """Call ``func(*args)`` on the writer thread.
+
+        Args:
+            func: Function writing the data; its errors are ignored.
+            args: Arguments of ``func``, a snapshot taken by the caller.
+            key: Writes of the same key are coalesced; ``None`` never is.
+        """
+        with self._cond:
+            if key is None:
+                key = object()
+            else:
+                # Keep the order of the writes: the latest one goes last.
+                self._jobs.pop(key, None)
+            self._jobs[key] = partial(func, *args)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def join(self) -> None:
+        """Wait until the submitted writes are done."""
+        with self._cond:
+            while self._jobs or self._busy:
+                self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._jobs:
+                    self._cond.wait()
+                job = self._jobs.pop(next(iter(self._jobs)))
+                self._busy = True
+            try:
+                job()
+            except Exception:
+                pass
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
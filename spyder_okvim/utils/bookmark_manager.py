@@ -4,14 +4,32 @@ from __future__ import annotations
 
 # Standard Libraries
 import json
-import os
 import os.path as osp
 from collections import defaultdict
 from collections.abc import Callable
+from functools import partial
+
+# Third Party Libraries
+from qtpy.QtCore import QTimer
+
+# Project Libraries
+from spyder_okvim.utils.background_writer import BackgroundWriter, write_atomic
+
+# Delay used to coalesce the writes of global marks.
+FLUSH_DELAY_MS = 1000
 
 
 class BookmarkManager:
-    """Handle loading, saving and retrieving bookmarks."""
+    """Handle loading, saving and retrieving bookmarks.
+
+    Marks keep the ``file``, ``line`` and ``col`` keys. While the document
+    of a mark is open the mark also stores its character offset in ``pos``,
+    which follows the edits of the document. A mark whose text is removed
+    falls back to its last line and column.
+
+    Global marks are read on the first mark command and written on a
+    background thread after a short delay.
+    """
 
     def __init__(
         self,
@@ -29,42 +47,138 @@ class BookmarkManager:
 
         self.bookmarks: dict[str, dict[str, dict[str, int]]] = defaultdict(dict)
         self.bookmarks_global: dict[str, dict[str, int]] = {}
-        self._load_persistent_bookmarks()
+        self._loaded = False
+        self._documents: dict[str, object] = {}
+        self._writer = BackgroundWriter()
+
+        self.timer_flush = QTimer()
+        self.timer_flush.setSingleShot(True)
+        self.timer_flush.setInterval(FLUSH_DELAY_MS)
+        self.timer_flush.timeout.connect(self._write_in_background)
 
     # ------------------------------------------------------------------
     # Persistence helpers
     # ------------------------------------------------------------------
     def _load_persistent_bookmarks(self) -> None:
         """Load persistent bookmarks from disk if present."""
+        self._loaded = True
+        data = {}
         if osp.isfile(self.bookmarks_file):
             try:
                 with open(self.bookmarks_file, "r", encoding="utf-8") as fh:
-                    self.bookmarks_global = json.load(fh)
+                    data = json.load(fh)
             except Exception:
-                self.bookmarks_global = {}
-        else:
-            self.bookmarks_global = {}
+                data = {}
+        # Update in place so aliases of the dictionary stay valid.
+        self.bookmarks_global.clear()
+        if isinstance(data, dict):
+            self.bookmarks_global.update(data)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._load_persistent_bookmarks()
 
     def _save_persistent_bookmarks(self) -> None:
-        """Save persistent bookmarks to disk."""
-        folder = osp.dirname(self.bookmarks_file)
-        os.makedirs(folder, exist_ok=True)
-        with open(self.bookmarks_file, "w", encoding="utf-8") as fh:
-            json.dump(self.bookmarks_global, fh)
+        """Schedule a write of the persistent bookmarks."""
+        self.timer_flush.start()
+
+    def _serialize(self) -> str:
+        marks = {
+            name: {key: info[key] for key in ("file", "line", "col")}
+            for name, info in self.bookmarks_global.items()
+        }
+        return json.dumps(marks)
+
+    def _write_in_background(self) -> None:
+        # A write still running is followed by this snapshot only.
+        self._writer.submit(
+            write_atomic,
+            self.bookmarks_file,
+            self._serialize(),
+            key=self.bookmarks_file,
+        )
+
+    def flush(self) -> None:
+        """Write pending changes of the persistent bookmarks now."""
+        if self.timer_flush.isActive():
+            self.timer_flush.stop()
+            self._write_in_background()
+        self._writer.join()
+
+    # ------------------------------------------------------------------
+    # Edit tracking
+    # ------------------------------------------------------------------
+    def _marks_of_file(self, path: str) -> list[dict]:
+        marks = list(self.bookmarks.get(path, {}).values())
+        marks.extend(
+            info for info in self.bookmarks_global.values() if info.get("file") == path
+        )
+        return marks
+
+    def _track(self, path: str, editor) -> None:
+        """Anchor the marks of ``path`` to the document of ``editor``."""
+        document = editor.document()
+        if self._documents.get(path) is not document:
+            self._documents[path] = document
+            document.contentsChange.connect(partial(self._on_contents_change, path))
+            for info in self._marks_of_file(path):
+                info.pop("pos", None)
+        for info in self._marks_of_file(path):
+            if "pos" not in info:
+                block = document.findBlockByNumber(info.get("line", 0))
+                if block.isValid():
+                    col = min(info.get("col", 0), block.length() - 1)
+                    info["pos"] = block.position() + col
+
+    def _on_contents_change(
+        self, path: str, position: int, removed: int, added: int
+    ) -> None:
+        document = self._documents.get(path)
+        if document is None:
+            return
+        end = position + removed
+        delta = added - removed
+        global_ids = {id(info) for info in self.bookmarks_global.values()}
+        moved_global = False
+        for info in self._marks_of_file(path):
+            pos = info.get("pos")
+            if pos is None or pos < position:
+                continue
+            if pos >= end:
+                pos += delta
+                block = document.findBlock(pos)
+                info["pos"] = pos
+                info["line"] = block.blockNumber()
+                info["col"] = pos - block.position()
+                moved_global = moved_global or id(info) in global_ids
+            else:
+                # The marked text was removed; keep the last line and column.
+                del info["pos"]
+        if moved_global:
+            self._save_persistent_bookmarks()
+
+    def _track_current(self) -> None:
+        editor = self.get_editor()
+        if editor is not None:
+            self._track(self.get_editorstack().get_current_filename(), editor)
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def clear(self) -> None:
         """Remove all bookmarks from memory and disk."""
+        self._loaded = True
         self.bookmarks = defaultdict(dict)
         self.bookmarks_global = {}
         self._save_persistent_bookmarks()
 
-    def set_bookmark(self, name: str) -> None:
-        """Set bookmark at the current cursor position."""
+    def set_bookmark(self, name: str, position: int | None = None) -> None:
+        """Set bookmark at ``position``, the cursor position by default."""
+        self._ensure_loaded()
         editor = self.get_editor()
         cursor = editor.textCursor()
+        if position is not None:
+            cursor.setPosition(position)
         line = cursor.blockNumber()
         col = cursor.position() - cursor.block().position()
         path = self.get_editorstack().get_current_filename()
@@ -74,9 +188,12 @@ class BookmarkManager:
             self._save_persistent_bookmarks()
         else:
             self.bookmarks[path][name] = info
+        self._track(path, editor)
 
     def get_bookmark(self, name: str):
         """Return bookmark information for *name* or None."""
+        self._ensure_loaded()
+        self._track_current()
         if name.isupper():
             return self.bookmarks_global.get(name)
         current = self.get_editorstack().get_current_filename()
@@ -84,42 +201,42 @@ class BookmarkManager:
 
     def jump_to_bookmark(self, name: str) -> None:
         """Move cursor to bookmark *name* if it exists."""
+        self._ensure_loaded()
         if name.isupper():
             info = self.bookmarks_global.get(name)
             if not info:
                 return
             file_path = info.get("file")
-            line = info.get("line")
-            col = info.get("col")
             editor_stack = self.get_editorstack()
             if editor_stack.is_file_opened(file_path) is None:
                 self.open_file(file_path)
             editor_stack.set_current_filename(file_path)
+            self._track_current()
             editor = self.get_editor()
-            block = editor.document().findBlockByNumber(line)
+            block = editor.document().findBlockByNumber(info.get("line"))
             if not block.isValid():
                 self.bookmarks_global.pop(name, None)
                 self._save_persistent_bookmarks()
                 return
-            pos = block.position() + min(col, block.length() - 1)
+            pos = block.position() + min(info.get("col"), block.length() - 1)
             self.set_cursor_pos(pos)
         else:
+            self._track_current()
             current = self.get_editorstack().get_current_filename()
             info = self.bookmarks.get(current, {}).get(name)
             if not info:
                 return
-            line = info.get("line")
-            col = info.get("col")
             editor = self.get_editor()
-            block = editor.document().findBlockByNumber(line)
+            block = editor.document().findBlockByNumber(info.get("line"))
             if not block.isValid():
                 self.bookmarks[current].pop(name, None)
                 return
-            pos = block.position() + min(col, block.length() - 1)
+            pos = block.position() + min(info.get("col"), block.length() - 1)
             self.set_cursor_pos(pos)
 
     def list_bookmarks(self) -> list[tuple[str, dict]]:
         """Return a combined list of local and global bookmarks."""
+        self._ensure_loaded()
         current = self.get_editorstack().get_current_filename()
         marks = []
         for name, info in sorted(self.bookmarks.get(current, {}).items()):
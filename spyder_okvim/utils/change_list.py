@@ -0,0 +1,72 @@
+"""Manage the change list of a buffer."""
+
+from __future__ import annotations
+
+# Standard Libraries
+from array import array
+
+
+class ChangeList:
+    """Positions of the last edits of a buffer, oldest first.
+
+    The positions are stored in a compact ``array`` and shifted by later
+    edits, like the marks of the buffer.
+    """
+
+    def __init__(self, max_items: int = 100) -> None:
+        self.max_items = max_items
+        self.positions = array("q")
+        self.index: int = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def record(self, position: int, merge: bool = False) -> None:
+        """Add the position of a new edit.
+
+        Args:
+            position: Offset of the edit.
+            merge: Replace the newest entry instead of appending, used for
+                consecutive edits on the same line.
+        """
+        if merge and self.positions:
+            self.positions[-1] = position
+        else:
+            if len(self.positions) >= self.max_items:
+                del self.positions[0]
+            self.positions.append(position)
+        self.index = len(self.positions)
+
+    def shift(self, position: int, removed: int, added: int) -> None:
+        """Move the positions after an edit.
+
+        Args:
+            position: Offset where the edit starts.
+            removed: Number of characters removed.
+            added: Number of characters inserted.
+        """
+        if added == removed:
+            return
+        end = position + removed
+        delta = added - removed
+        positions = self.positions
+        for i, pos in enumerate(positions):
+            if pos >= end:
+                positions[i] = pos + delta
+            elif pos > position:
+                positions[i] = position
+
+    def older(self, count: int = 1) -> int | None:
+        """Move ``count`` entries back and return the position."""
+        if self.index <= 0 or not self.positions:
+            return None
+        self.index = max(self.index - count, 0)
+        return self.positions[self.index]
+
+    def newer(self, count: int = 1) -> int | None:
+        """Move ``count`` entries forward and return the position."""
+        last = len(self.positions) - 1
+        if self.index >= last:
+            return None
+        self.index = min(self.index + count, last)
+        return self.positions[self.index]
@@ -0,0 +1,146 @@
+"""Parse the line ranges of ex commands such as ``:'<,'>d``."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import re
+from typing import Callable
+
+# Project Libraries
+from spyder_okvim.utils.vim_regex import compile_pattern
+
+RE_ADDRESS = re.compile(
+    r"\s*(?:(?P<num>\d+)|(?P<dot>\.)|(?P<last>\$)|'(?P<mark>.)"
+    r"|/(?P<fwd>(?:\\.|[^/\\])*)/?|\?(?P<bwd>(?:\\.|[^?\\])*)\??)"
+)
+RE_OFFSET = re.compile(r"\s*([+-])(\d*)")
+
+
+def search_lines(
+    lines: list[str], pattern: str, line: int, backward: bool = False
+) -> int | None:
+    """Return the next line matching ``pattern`` after ``line``.
+
+    The search wraps around the end of the text like Vim does.
+    """
+    try:
+        regex = compile_pattern(pattern)
+    except re.error:
+        return None
+    size = len(lines)
+    step = -1 if backward else 1
+    for idx in range(1, size + 1):
+        line_no = (line + step * idx) % size
+        if regex.search(lines[line_no]):
+            return line_no
+    return None
+
+
+class ExRangeParser:
+    """Parser of the range prefix of ex commands.
+
+    Line numbers are 0-based, so the address ``0`` gives ``-1``.
+
+    Args:
+        current: Line of the cursor.
+        last: Last line of the document.
+        get_mark: Return the line of a mark or ``None``.
+        search: Return the line matching a pattern after or before a line.
+    """
+
+    def __init__(
+        self,
+        current: int,
+        last: int,
+        get_mark: Callable[[str], int | None],
+        search: Callable[[str, int, bool], int | None],
+    ) -> None:
+        self.current = current
+        self.last = last
+        self.get_mark = get_mark
+        self.search = search
+
+    def parse(self, text: str) -> tuple[tuple[int, int] | None, str]:
+        """Split ``text`` into its line range and the command after it.
+
+        The lines of the range are in order but may be out of the document;
+        see :meth:`check`.
+
+        Raises:
+            ValueError: With the Vim error message when a mark or a pattern
+                is not found.
+        """
+        stripped = text.lstrip()
+        if stripped.startswith("%"):
+            return (0, self.last), stripped[1:]
+
+        current = self.current
+        start, text = self._parse_address(text, current)
+        if not text.startswith((",", ";")):
+            if start is None:
+                return None, text
+            return (start, start), text
+
+        if start is None:
+            start = current
+        if text[0] == ";":
+            current = start
+        end, text = self._parse_address(text[1:], current)
+        if end is None:
+            end = current
+        return (min(start, end), max(start, end)), text
+
+    def parse_address(self, text: str) -> int:
+        """Return the line of the address ``text``, ``-1`` for ``0``.
+
+        Raises:
+            ValueError: If ``text`` is not a valid address.
+        """
+        line, rest = self._parse_address(text, self.current)
+        if line is None or rest or not -1 <= line <= self.last:
+            raise ValueError("E14: Invalid address")
+        return line
+
+    def check(self, line_range: tuple[int, int]) -> None:
+        """Raise ``ValueError`` if ``line_range`` is out of the document."""
+        if line_range[0] < -1 or line_range[1] > self.last:
+            raise ValueError("E16: Invalid range")
+
+    def _parse_address(self, text: str, current: int) -> tuple[int | None, str]:
+        line = None
+        match = RE_ADDRESS.match(text)
+        if match:
+            text = text[match.end() :]
+            line = self._resolve(match, current)
+
+        while True:
+            match = RE_OFFSET.match(text)
+            if match is None:
+                break
+            text = text[match.end() :]
+            sign, num = match.groups()
+            offset = int(num) if num else 1
+            line = (current if line is None else line) + (
+                offset if sign == "+" else -offset
+            )
+        return line, text.lstrip()
+
+    def _resolve(self, match: re.Match, current: int) -> int:
+        if match["num"] is not None:
+            return int(match["num"]) - 1
+        if match["dot"] is not None:
+            return current
+        if match["last"] is not None:
+            return self.last
+        if match["mark"] is not None:
+            line = self.get_mark(match["mark"])
+            if line is None:
+                raise ValueError("E20: Mark not set")
+            return line
+
+        backward = match["fwd"] is None
+        pattern = match["bwd"] if backward else match["fwd"]
+        line = self.search(pattern, current, backward)
+        if line is None:
+            raise ValueError(f"E486: Pattern not found: {pattern}")
+        return line
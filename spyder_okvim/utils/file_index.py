@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""Background index of project files used by the path finder."""
+from __future__ import annotations
+
+# Standard Libraries
+import fnmatch
+import hashlib
+import json
+import os
+import os.path as osp
+import re
+
+# Third Party Libraries
+from qtpy.QtCore import QFileSystemWatcher, QObject, QThread, QTimer, Signal
+
+# Project Libraries
+from spyder_okvim.utils.background_writer import BackgroundWriter, write_atomic
+
+DEFAULT_INCLUDE = "*.py, *.txt, *.md"
+DEFAULT_EXCLUDE = ".git, .hg, .svn, __pycache__, .ipynb_checkpoints, node_modules"
+
+# inotify and kqueue both limit the number of watched directories.
+MAX_WATCHED_DIRS = 4096
+# Delay used to coalesce bursts of file system events.
+RESCAN_DELAY_MS = 200
+
+
+def parse_globs(text: str) -> list[str]:
+    """Split a comma or whitespace separated list of glob patterns."""
+    return [pat for pat in re.split(r"[,\s]+", text or "") if pat]
+
+
+class GitIgnore:
+    """Match paths against the rules of a ``.gitignore`` file.
+
+    Only the commonly used subset is supported: comments, negation with
+    ``!``, directory-only rules ending with ``/`` and rules anchored to the
+    project root when they contain a ``/``.
+    """
+
+    def __init__(self, lines: list[str] | None = None) -> None:
+        self.rules: list[tuple[str, bool, bool, bool]] = []
+        for line in lines or []:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if dir_only else line
+            anchored = "/" in line
+            self.rules.append((line.lstrip("/"), negate, dir_only, anchored))
+
+    @classmethod
+    def from_folder(cls, folder: str) -> "GitIgnore":
+        """Return the rules defined in ``folder/.gitignore``."""
+        try:
+            with open(
+                osp.join(folder, ".gitignore"), "r", encoding="utf-8"
+            ) as fh:
+                return cls(fh.readlines())
+        except (OSError, UnicodeDecodeError):
+            return cls()
+
+    def match(self, rel_path: str, is_dir: bool) -> bool:
+        """Return ``True`` if ``rel_path`` is ignored."""
+        ignored = False
+        basename = rel_path.rsplit("/", 1)[-1]
+        for pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            target = rel_path if anchored else basename
+            if fnmatch.fnmatchcase(target, pattern):
+                ignored = not negate
+        return ignored
+
+
+def scan_folder(
+    root: str,
+    include: list[str],
+    exclude: list[str],
+    ignore: GitIgnore | None = None,
+    start: str = "",
+    recursive: bool = True,
+) -> tuple[list[str], list[str]]:
+    """Collect files below ``root`` that match the include patterns.
+
+    Args:
+        root: Project root folder.
+        include: Glob patterns a file name has to match.
+        exclude: Glob patterns removing files or whole folders.
+        ignore: Optional ``.gitignore`` rules.
+        start: Relative folder to start from.
+        recursive: Descend into sub folders when ``True``.
+
+    Returns:
+        Relative file paths using ``/`` separators and the relative folders
+        that were visited.
+    """
+    paths: list[str] = []
+    folders: list[str] = []
+    stack = [start]
+    while stack:
+        rel_dir = stack.pop()
+        folders.append(rel_dir)
+        try:
+            entries = list(os.scandir(osp.join(root, rel_dir)))
+        except OSError:
+            continue
+        for entry in entries:
+            name = entry.name
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if any(fnmatch.fnmatch(name, pat) for pat in exclude):
+                continue
+            try:
+                if entry.is_symlink():
+                    continue
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if ignore is not None and ignore.match(rel_path, is_dir):
+                continue
+            if is_dir:
+                if recursive:
+                    stack.append(rel_path)
+            elif any(fnmatch.fnmatch(name, pat) for pat in include):
+                paths.append(rel_path)
+    return paths, folders
+
+
+class FileIndexWorker(QThread):
+    """Walk the project tree outside of the GUI thread."""
+
+    sig_scanned = Signal(list, list)
+
+    def __init__(self, index: "ProjectFileIndex") -> None:
+        super().__init__(index)
+        self.root = index.root
+        self.include = list(index.include)
+        self.exclude = list(index.exclude)
+
+    def run(self) -> None:
+        """Scan the project and report the result."""
+        ignore = GitIgnore.from_folder(self.root)
+        paths, folders = scan_folder(self.root, self.include, self.exclude, ignore)
+        self.sig_scanned.emit(paths, folders)
+
+
+class ProjectFileIndex(QObject):
+    """Persistent list of the files in a project.
+
+    The index is filled from an on-disk cache first, refreshed by a
+    background walk and kept up to date by a file system watcher, so the
+    path finder never has to walk the project itself.
+    """
+
+    sig_paths_updated = Signal()
+
+    def __init__(
+        self,
+        root: str,
+        cache_dir: str | None = None,
+        include: str = DEFAULT_INCLUDE,
+        exclude: str = DEFAULT_EXCLUDE,
+        parent: QObject | None = None,
+    ) -> None:
+        """Create the index.
+
+        Args:
+            root: Project root folder.
+            cache_dir: Folder storing the cache between sessions.
+            include: Glob patterns of the files to index.
+            exclude: Glob patterns of files or folders to skip.
+            parent: Parent object.
+        """
+        super().__init__(parent)
+        self.root = root
+        self.cache_dir = cache_dir
+        self.include = parse_globs(include)
+        self.exclude = parse_globs(exclude)
+        self.is_ready = False
+
+        self._paths: set[str] = set()
+        self._sorted: list[str] | None = []
+        self._worker: FileIndexWorker | None = None
+        self._ignore = GitIgnore()
+        self._pending_dirs: set[str] = set()
+        self._writer = BackgroundWriter()
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        self.timer_rescan = QTimer(self)
+        self.timer_rescan.setSingleShot(True)
+        self.timer_rescan.setInterval(RESCAN_DELAY_MS)
+        self.timer_rescan.timeout.connect(self._rescan_pending)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @property
+    def paths(self) -> list[str]:
+        """Return the indexed relative paths in sorted order."""
+        if self._sorted is None:
+            self._sorted = sorted(self._paths)
+        return self._sorted
+
+    @property
+    def cache_file(self) -> str | None:
+        """Return the cache file used for this project."""
+        if not self.cache_dir:
+            return None
+        key = "\n".join([self.root, *self.include, "|", *self.exclude])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return osp.join(self.cache_dir, f"files_{digest}.json")
+
+    def start(self) -> None:
+        """Load the cached list and start a background refresh."""
+        self._load_cache()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Walk the project again on a background thread."""
+        if not osp.isdir(self.root):
+            return
+        if self._worker is not None and self._worker.isRunning():
+            return
+        self._ignore = GitIgnore.from_folder(self.root)
+        self._worker = FileIndexWorker(self)
+        self._worker.sig_scanned.connect(self._on_scanned)
+        self._worker.start()
+
+    def wait(self, msecs: int = 5000) -> bool:
+        """Block until the running scan finishes."""
+        if self._worker is None:
+            return True
+        return self._worker.wait(msecs)
+
+    def stop(self) -> None:
+        """Stop watching the project and wait for the worker and the cache."""
+        self.timer_rescan.stop()
+        if self._worker is not None:
+            self._worker.wait()
+        self._writer.join()
+        watched = self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+    def _set_paths(self, paths) -> None:
+        self._paths = set(paths)
+        self._sorted = None
+
+    def _on_scanned(self, paths: list[str], folders: list[str]) -> None:
+        """Replace the index with the result of a full scan."""
+        self._set_paths(paths)
+        self.is_ready = True
+        self._watch(folders)
+        self._save_cache()
+        self.sig_paths_updated.emit()
+
+    def _watch(self, folders: list[str]) -> None:
+        """Watch ``folders`` for added or removed files."""
+        watched = set(self.watcher.directories())
+        n_free = MAX_WATCHED_DIRS - len(watched)
+        new = []
+        for rel_dir in folders:
+            if len(new) >= n_free:
+                break
+            path = osp.join(self.root, rel_dir) if rel_dir else self.root
+            if path not in watched:
+                new.append(path)
+        if new:
+            self.watcher.addPaths(new)
+
+    def _on_directory_changed(self, path: str) -> None:
+        rel_dir = osp.relpath(path, self.root).replace(os.sep, "/")
+        self._pending_dirs.add("" if rel_dir == "." else rel_dir)
+        self.timer_rescan.start()
+
+    def _rescan_pending(self) -> None:
+        """Update the entries of the folders reported by the watcher."""
+        pending, self._pending_dirs = self._pending_dirs, set()
+        for rel_dir in pending:
+            self._rescan_folder(rel_dir)
+        self._save_cache()
+        self.sig_paths_updated.emit()
+
+    def _rescan_folder(self, rel_dir: str) -> None:
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        stale = {
+            path
+            for path in self._paths
+            if path.startswith(prefix) and "/" not in path[len(prefix) :]
+        }
+        self._paths -= stale
+
+        if osp.isdir(osp.join(self.root, rel_dir)):
+            paths, _ = scan_folder(
+                self.root,
+                self.include,
+                self.exclude,
+                self._ignore,
+                start=rel_dir,
+                recursive=False,
+            )
+            self._paths.update(paths)
+
+            # Folders created since the last scan are indexed recursively.
+            watched = set(self.watcher.directories())
+            try:
+                entries = list(os.scandir(osp.join(self.root, rel_dir)))
+            except OSError:
+                entries = []
+            for entry in entries:
+                if entry.is_symlink() or not entry.is_dir() or entry.path in watched:
+                    continue
+                rel_sub = f"{prefix}{entry.name}"
+                if any(fnmatch.fnmatch(entry.name, p) for p in self.exclude):
+                    continue
+                if self._ignore.match(rel_sub, True):
+                    continue
+                paths, folders = scan_folder(
+                    self.root, self.include, self.exclude, self._ignore, rel_sub
+                )
+                self._paths.update(paths)
+                self._watch(folders)
+        self._sorted = None
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def _load_cache(self) -> None:
+        cache_file = self.cache_file
+        if not cache_file or not osp.isfile(cache_file):
+            return
+        try:
+            with open(cache_file, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if data.get("root") == self.root:
+            self._set_paths(data.get("paths", []))
+
+    def _save_cache(self) -> None:
+        cache_file = self.cache_file
+        if not cache_file:
+            return
+        # The sorted list is replaced, never changed, so the writer thread
+        # can dump it while the index goes on.
+        self._writer.submit(
+            self._write_cache, cache_file, self.root, self.paths, key=cache_file
+        )
+
+    @staticmethod
+    def _write_cache(cache_file: str, root: str, paths: list[str]) -> None:
+        write_atomic(cache_file, json.dumps({"root": root, "paths": paths}))
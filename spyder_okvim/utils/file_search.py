@@ -4,23 +4,22 @@ from __future__ import annotations
 
 # Standard Libraries
 import os.path as osp
-import re
 import sys
 
 # Third Party Libraries
 from qtpy.QtCore import QDir, QDirIterator, Qt, Signal
-from qtpy.QtGui import QKeyEvent, QStandardItem
+from qtpy.QtGui import QKeyEvent
 from qtpy.QtWidgets import QApplication, QDialog, QLineEdit, QWidget
 from spyder.config.gui import get_font
 
+from .file_index import ProjectFileIndex
+from .fuzzy_matcher import FuzzyMatcher
 from .list_dialog import PopupTableDialog
 
 
 def fuzzyfinder(query: str, collection: list[str]) -> list[str]:
     """Fuzzy search.
 
-    Ref: https://github.com/amjith/fuzzyfinder
-
     Args:
         query: A partial string typically entered by a user.
         collection: Collection of strings filtered by ``query``.
@@ -29,19 +28,8 @@ def fuzzyfinder(query: str, collection: list[str]) -> list[str]:
         list: Suggestions narrowed down from ``collection`` using ``query``.
 
     """
-    suggestions = []
-    pat = ".*?".join(map(re.escape, query))
-    # lookahead regex to manage overlapping matches
-    pat = "(?=({0}))".format(pat)
-    regex = re.compile(pat, re.IGNORECASE)
-
-    for txt in collection:
-        r = list(regex.finditer(txt))
-        if r:
-            best = min(r, key=lambda x: len(x.group(1)))  # find shortest match
-            suggestions.append((len(best.group(1)), txt))
-
-    return [z[-1] for z in sorted(suggestions)]
+    matcher = FuzzyMatcher(collection, limit=len(collection))
+    return matcher.match(query)
 
 
 class FileSearchLineEdit(QLineEdit):
@@ -107,12 +95,21 @@ class FileSearchDialog(PopupTableDialog):
     _MIN_WIDTH = 800
     _MAX_HEIGHT = 600
 
-    def __init__(self, folder: str | None, parent: QWidget | None = None) -> None:
+    def __init__(
+        self,
+        folder: str | None,
+        parent: QWidget | None = None,
+        file_index: ProjectFileIndex | None = None,
+        boosts: dict[str, int] | None = None,
+    ) -> None:
         """Create the dialog and populate file information.
 
         Args:
             folder: Root directory to search.
             parent: Parent widget for the dialog.
+            file_index: Background index of ``folder``. When omitted the
+                folder is walked synchronously.
+            boosts: Ranking bonus of frequently opened relative paths.
         """
         super().__init__(
             "Path Finder",
@@ -124,9 +121,15 @@ class FileSearchDialog(PopupTableDialog):
         font = get_font(font_size_delta=2)
 
         self.folder = folder
+        self.file_index = file_index
         self.path_selected = ""
         self.path_list = []
-        self.results_old = {}
+        self.matcher = FuzzyMatcher()
+        self.matcher.set_boosts(boosts or {})
+        self.list_model.formatter = lambda path: (
+            osp.basename(path),
+            osp.dirname(path),
+        )
         self.list_viewer.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.list_viewer.setFocusPolicy(Qt.NoFocus)
 
@@ -159,6 +162,11 @@ class FileSearchDialog(PopupTableDialog):
         """Populate the list of discoverable file paths."""
         if self.folder is None or not osp.isdir(self.folder):
             self.edit.setPlaceholderText("The project is not valid.")
+        elif self.file_index is not None:
+            self.path_list = self.file_index.paths
+            if not self.file_index.is_ready:
+                self.edit.setPlaceholderText("Indexing the project...")
+            self.file_index.sig_paths_updated.connect(self.on_paths_updated)
         else:
             dir_ = QDir(self.folder)
             it = QDirIterator(
@@ -170,37 +178,37 @@ class FileSearchDialog(PopupTableDialog):
             while it.hasNext():
                 self.path_list.append(dir_.relativeFilePath(it.next()))
 
-        self.results_old[""] = self.path_list
+        self.matcher.set_paths(self.path_list)
+
+    def on_paths_updated(self) -> None:
+        """Merge the latest paths of the file index into the list."""
+        self.path_list = self.file_index.paths
+        self.matcher.set_paths(self.path_list)
+        self.edit.setPlaceholderText("")
+        self.update_list()
+
+    def release_file_index(self) -> None:
+        """Stop listening to the file index."""
+        if self.file_index is None:
+            return
+        try:
+            self.file_index.sig_paths_updated.disconnect(self.on_paths_updated)
+        except (TypeError, RuntimeError):
+            pass
 
     def update_list(self) -> None:
         """Update listview."""
-        query = self.edit.text()
-        query = query.replace(" ", "")
-        paths = self.results_old.get(query, None)
-
-        if paths is None:
-            collections = self.results_old.get(query[:-1], self.path_list)
-            paths = fuzzyfinder(query, collections)
+        paths = self.matcher.match(self.edit.text())
 
         if paths:
-            self.list_model.setRowCount(0)
-            for path in paths:
-                basename = osp.basename(path)
-                dirname = osp.dirname(path)
-                item = QStandardItem(basename)
-                item.setData(path, Qt.UserRole)
-                row = [item, QStandardItem(dirname)]
-                for it in row:
-                    it.setEditable(False)
-                self.list_model.appendRow(row)
+            self.list_model.set_rows(paths)
             self.list_viewer.setCurrentIndex(self.list_model.index(0, 0))
             self.list_viewer.selectRow(0)
 
     def enter(self) -> None:
         """Select next row in list viewer."""
         idx = self.list_viewer.currentIndex()
-        item = self.list_model.item(idx.row(), 0)
-        rel_path = item.data(Qt.UserRole) if item else None
+        rel_path = self.list_model.row_object(idx.row())
         if rel_path and isinstance(self.folder, str):
             path = osp.join(self.folder, rel_path)
             self.path_selected = path
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Persistent frecency scores of the files opened in each project."""
+from __future__ import annotations
+
+# Standard Libraries
+import json
+import math
+import os
+import os.path as osp
+import time
+
+# Third Party Libraries
+from qtpy.QtCore import QTimer
+
+# Project Libraries
+from spyder_okvim.utils.background_writer import BackgroundWriter, write_atomic
+
+# Scores lose half of their weight after a week without visits.
+HALF_LIFE = 7 * 24 * 3600
+# Scores below this value are dropped when the store is saved.
+MIN_SCORE = 0.05
+# Maximum number of files remembered per project.
+MAX_ENTRIES = 500
+# Weight of a frecency point compared to the fuzzy score.
+BOOST_SCALE = 8
+MAX_BOOST = 48
+# Delay used to coalesce the writes of successive visits.
+SAVE_DELAY_MS = 1000
+
+
+class FrecencyStore:
+    """Frequency and recency of file visits, kept per project root.
+
+    Each entry stores the score at the time of the last visit. The decayed
+    score is computed when it is read, so visits never rewrite other
+    entries. The store is written on a background thread after a short
+    delay.
+    """
+
+    def __init__(
+        self, store_file: str | None, half_life: float = HALF_LIFE
+    ) -> None:
+        """Create the store.
+
+        Args:
+            store_file: JSON file used for persistence. ``None`` keeps the
+                store in memory.
+            half_life: Seconds after which a score is halved.
+        """
+        self.store_file = store_file
+        self.half_life = half_life
+        self.entries: dict[str, dict[str, list[float]]] = {}
+        self._boosts: dict[str, dict[str, int]] = {}
+        self._writer = BackgroundWriter()
+        self._load()
+
+        self.timer_save = QTimer()
+        self.timer_save.setSingleShot(True)
+        self.timer_save.setInterval(SAVE_DELAY_MS)
+        self.timer_save.timeout.connect(self.save)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def score(self, root: str, rel_path: str, now: float | None = None) -> float:
+        """Return the decayed score of ``rel_path`` in ``root``."""
+        entry = self.entries.get(root, {}).get(rel_path)
+        if entry is None:
+            return 0.0
+        return self._decay(entry, time.time() if now is None else now)
+
+    def visit(self, root: str | None, path: str, now: float | None = None) -> None:
+        """Record that ``path`` was opened while ``root`` was active.
+
+        Files outside of ``root`` are ignored.
+        """
+        if not root or not path:
+            return
+        rel_path = osp.relpath(path, root) if osp.isabs(path) else path
+        if rel_path.startswith(".."):
+            return
+        rel_path = rel_path.replace(os.sep, "/")
+
+        now = time.time() if now is None else now
+        project = self.entries.setdefault(root, {})
+        entry = project.get(rel_path)
+        score = self._decay(entry, now) if entry else 0.0
+        project[rel_path] = [score + 1.0, now]
+        self._prune(project, now)
+        self._boosts.pop(root, None)
+        if self.store_file:
+            self.timer_save.start()
+
+    def boosts(self, root: str | None) -> dict[str, int]:
+        """Return the ranking bonus of the files of ``root``.
+
+        The table is computed once and reused until the next visit.
+        """
+        if not root:
+            return {}
+        boosts = self._boosts.get(root)
+        if boosts is None:
+            now = time.time()
+            boosts = {}
+            for rel_path, entry in self.entries.get(root, {}).items():
+                bonus = round(BOOST_SCALE * math.log2(1 + self._decay(entry, now)))
+                if bonus > 0:
+                    boosts[rel_path] = min(bonus, MAX_BOOST)
+            self._boosts[root] = boosts
+        return boosts
+
+    def save(self) -> None:
+        """Write the store to disk atomically on the writer thread."""
+        if not self.store_file:
+            return
+        data = json.dumps(self.entries, separators=(",", ":"))
+        self._writer.submit(write_atomic, self.store_file, data, key=self.store_file)
+
+    def flush(self) -> None:
+        """Write the pending visits now and wait for the writes."""
+        if self.timer_save.isActive():
+            self.timer_save.stop()
+            self.save()
+        self._writer.join()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _decay(self, entry: list[float], now: float) -> float:
+        score, last = entry
+        return score * 0.5 ** (max(now - last, 0.0) / self.half_life)
+
+    def _prune(self, project: dict[str, list[float]], now: float) -> None:
+        for rel_path in [
+            key for key, entry in project.items() if self._decay(entry, now) < MIN_SCORE
+        ]:
+            del project[rel_path]
+        if len(project) > MAX_ENTRIES:
+            ranked = sorted(project, key=lambda key: self._decay(project[key], now))
+            for rel_path in ranked[: len(project) - MAX_ENTRIES]:
+                del project[rel_path]
+
+    def _load(self) -> None:
+        if not self.store_file or not osp.isfile(self.store_file):
+            return
+        try:
+            with open(self.store_file, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.entries = data
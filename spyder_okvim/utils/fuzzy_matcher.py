@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""Fuzzy matching engine used by the path finder."""
+from __future__ import annotations
+
+# Standard Libraries
+import atexit
+import heapq
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 8
+BONUS_SEPARATOR = 9
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = 4
+BONUS_BASENAME = 2
+BONUS_FIRST_CHAR = 2
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+
+SEPARATORS = "/\\"
+DELIMITERS = "_-. "
+
+# Number of candidates above which scoring is split across processes.
+POOL_THRESHOLD = 50000
+# Number of previous queries whose candidate sets are kept.
+CACHE_SIZE = 32
+# Paths added or removed since the pool was started that are handled with
+# each query; more changes start the workers again with the new paths.
+MAX_POOL_CHANGES = 1000
+
+N_WORKERS = os.cpu_count() or 1
+_executor: ProcessPoolExecutor | None = None
+# Pool whose workers hold the paths of the last large matcher: these paths
+# and the future of the pool, set once its workers are started.
+_path_pool: tuple[list[str], Future] | None = None
+# Paths of a worker of the path pool.
+_worker_paths: list[str] = []
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the process pool shared by every matcher."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(N_WORKERS, mp_context=get_context("spawn"))
+        atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+    return _executor
+
+
+def _init_worker(paths: list[str]) -> None:
+    global _worker_paths
+    _worker_paths = paths
+
+
+def _start_path_pool(paths: list[str]) -> Executor:
+    """Return a new process pool whose workers hold ``paths``."""
+    return ProcessPoolExecutor(
+        N_WORKERS,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(paths,),
+    )
+
+
+def _shutdown_path_pool() -> None:
+    global _path_pool
+    if _path_pool is not None:
+        _path_pool[1].add_done_callback(_shutdown_started_pool)
+        _path_pool = None
+
+
+atexit.register(_shutdown_path_pool)
+
+
+def _shutdown_started_pool(ready: Future) -> None:
+    if ready.exception() is None:
+        ready.result().shutdown(wait=False, cancel_futures=True)
+
+
+def _start_workers(paths: list[str], ready: Future) -> None:
+    try:
+        executor = _start_path_pool(paths)
+        for future in [executor.submit(len, "") for _ in range(N_WORKERS)]:
+            future.result()
+    except Exception as e:
+        ready.set_exception(e)
+    else:
+        ready.set_result(executor)
+
+
+def get_path_pool(paths: list[str]) -> Future:
+    """Return the future of the pool whose workers hold ``paths``.
+
+    The pool is started in a thread and the paths are sent once to each
+    worker, so the queries only send the query. Only the pool of the last
+    list of paths is kept.
+    """
+    global _path_pool
+    if _path_pool is None or _path_pool[0] is not paths:
+        _shutdown_path_pool()
+        ready = Future()
+        threading.Thread(
+            target=_start_workers, args=(paths, ready), daemon=True
+        ).start()
+        _path_pool = (paths, ready)
+    return _path_pool[1]
+
+
+def _top_matches_shard(
+    query: str, shard: int, n_shards: int, limit: int, boosts: dict[str, int]
+) -> list[tuple[int, str]]:
+    """Return the best matches of ``query`` in a shard of the worker paths."""
+    size = -(-len(_worker_paths) // n_shards)
+    paths = _worker_paths[shard * size : (shard + 1) * size]
+    return top_matches(
+        query, list(filter(_compile_filter(query).match, paths)), limit, boosts
+    )
+
+
+def fuzzy_score(query: str, path: str) -> int | None:
+    """Return the fzf-like score of ``path`` for ``query``.
+
+    The characters of ``query`` have to appear in order in ``path``. The
+    shortest window ending at the first complete match is scored. Matches in
+    the basename, after a separator or delimiter and at camelCase humps get
+    a bonus, consecutive matches are preferred and gaps are penalized.
+
+    Args:
+        query: Lower case query without spaces.
+        path: Candidate path.
+
+    Returns:
+        The score, or ``None`` if ``path`` does not match.
+    """
+    if not query:
+        return 0
+    lower = path.lower()
+
+    idx = -1
+    for ch in query:
+        idx = lower.find(ch, idx + 1)
+        if idx < 0:
+            return None
+
+    positions = [0] * len(query)
+    idx += 1
+    for qi in range(len(query) - 1, -1, -1):
+        idx = lower.rfind(query[qi], 0, idx)
+        positions[qi] = idx
+
+    basename_start = max(path.rfind("/"), path.rfind("\\")) + 1
+    score = 0
+    prev = -2
+    chunk_bonus = 0
+    for qi, pos in enumerate(positions):
+        score += SCORE_MATCH
+        if pos == 0:
+            bonus = BONUS_BOUNDARY
+        else:
+            ch_prev = path[pos - 1]
+            if ch_prev in SEPARATORS:
+                bonus = BONUS_SEPARATOR
+            elif ch_prev in DELIMITERS:
+                bonus = BONUS_BOUNDARY
+            elif ch_prev.islower() and path[pos].isupper():
+                bonus = BONUS_CAMEL
+            else:
+                bonus = 0
+        if qi == 0 and bonus:
+            bonus += BONUS_FIRST_CHAR
+        if pos == prev + 1:
+            # A consecutive chunk keeps the bonus of its first character.
+            bonus = max(bonus, chunk_bonus, BONUS_CONSECUTIVE)
+        else:
+            chunk_bonus = bonus
+            if qi > 0:
+                score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (pos - prev - 2)
+        if pos >= basename_start:
+            bonus += BONUS_BASENAME
+        score += bonus
+        prev = pos
+    return score
+
+
+def _rank_key(item: tuple[int, str]) -> tuple[int, int]:
+    score, path = item
+    return score, -len(path)
+
+
+def top_matches(
+    query: str,
+    paths: list[str],
+    limit: int,
+    boosts: dict[str, int] | None = None,
+) -> list[tuple[int, str]]:
+    """Return the ``limit`` best ``(score, path)`` pairs for ``query``.
+
+    ``boosts`` maps paths to a bonus added to their fuzzy score.
+    """
+    scored = []
+    get_boost = boosts.get if boosts else None
+    for path in paths:
+        score = fuzzy_score(query, path)
+        if score is not None:
+            if get_boost is not None:
+                score += get_boost(path, 0)
+            scored.append((score, path))
+    return heapq.nlargest(limit, scored, key=_rank_key)
+
+
+def _compile_filter(query: str) -> re.Pattern:
+    """Return a regex matching the paths that contain ``query`` in order.
+
+    Each gap excludes the next query character so the regex never
+    backtracks.
+    """
+    body = "".join(f"[^{re.escape(ch)}]*{re.escape(ch)}" for ch in query)
+    return re.compile(body, re.IGNORECASE)
+
+
+class FuzzyMatcher:
+    """Rank a list of paths against successive queries.
+
+    Candidates are filtered with a compiled regex, so the per-path work in
+    Python is only spent on paths that match. When the
+    query is refined, the candidates of the previous query are reused.
+    Large candidate sets are scored in a process pool whose workers got the
+    paths once. When the paths change a little, the changes are handled
+    with each query instead of starting the workers again.
+    """
+
+    def __init__(
+        self,
+        paths: list[str] | None = None,
+        limit: int = 1000,
+        pool_threshold: int = POOL_THRESHOLD,
+    ) -> None:
+        """Create the matcher.
+
+        Args:
+            paths: Paths to search.
+            limit: Maximum number of results returned by :meth:`match`.
+            pool_threshold: Number of candidates above which scoring uses a
+                process pool.
+        """
+        self.limit = limit
+        self.pool_threshold = pool_threshold
+        self.paths: list[str] = []
+        self.boosts: dict[str, int] = {}
+        self._path_set: set[str] | None = None
+        self._pool_changes: tuple[list[str], list[str], set[str]] | None = None
+        self._candidates: OrderedDict[str, list[str]] = OrderedDict()
+        self.set_paths(paths or [])
+
+    def set_paths(self, paths: list[str]) -> None:
+        """Replace the searched paths and drop cached candidates.
+
+        With many paths, the workers of the pool are started in the
+        background; the queries are scored here until they are ready. A
+        running pool is kept for the next query, which handles the changed
+        paths or starts the workers again.
+        """
+        self.paths = paths
+        self._path_set = None
+        self._pool_changes = None
+        self._candidates.clear()
+        if self._use_pool(paths) and _path_pool is None:
+            get_path_pool(paths)
+
+    def _use_pool(self, candidates: list[str]) -> bool:
+        return len(candidates) >= self.pool_threshold and N_WORKERS > 1
+
+    def set_boosts(self, boosts: dict[str, int]) -> None:
+        """Set the ranking bonus of frequently opened paths."""
+        self.boosts = boosts
+
+    def candidates(self, query: str) -> list[str]:
+        """Return every path matching ``query`` in the original order."""
+        if not query:
+            return self.paths
+        cached = self._candidates.get(query)
+        if cached is not None:
+            self._candidates.move_to_end(query)
+            return cached
+
+        result = list(filter(_compile_filter(query).match, self._base(query)))
+
+        self._candidates[query] = result
+        if len(self._candidates) > CACHE_SIZE:
+            self._candidates.popitem(last=False)
+        return result
+
+    def _base(self, query: str) -> list[str]:
+        """Return the cached candidates of the longest prefix of ``query``."""
+        for n in range(len(query) - 1, 0, -1):
+            prev = self._candidates.get(query[:n])
+            if prev is not None:
+                return prev
+        return self.paths
+
+    def match(self, query: str) -> list[str]:
+        """Return the best paths for ``query`` in ranked order."""
+        query = query.replace(" ", "").lower()
+        if not query:
+            return self._best_without_query()
+
+        ranked = None
+        cached = self._candidates.get(query)
+        if self._use_pool(self._base(query) if cached is None else cached):
+            ranked = self._top_matches_parallel(query)
+        if ranked is None:
+            paths = self.candidates(query)
+            ranked = top_matches(query, paths, self.limit, self.boosts)
+        return [path for _, path in ranked]
+
+    def _best_without_query(self) -> list[str]:
+        """Return the boosted paths first, then the others in index order."""
+        if not self.boosts:
+            return self.paths[: self.limit]
+        if self._path_set is None:
+            self._path_set = set(self.paths)
+        boosted = [
+            path
+            for path in sorted(self.boosts, key=self.boosts.get, reverse=True)
+            if path in self._path_set
+        ][: self.limit]
+        seen = set(boosted)
+        rest = (path for path in self.paths if path not in seen)
+        return boosted + list(islice(rest, self.limit - len(boosted)))
+
+    def _top_matches_parallel(self, query: str) -> list[tuple[int, str]] | None:
+        """Score all the paths in the pool, or ``None`` if it is not ready."""
+        changes = None if _path_pool is None else self._get_pool_changes()
+        if changes is None:
+            get_path_pool(self.paths)
+            return None
+        ready = _path_pool[1]
+        if not ready.done() or ready.exception() is not None:
+            return None
+        added, removed = changes
+        executor = ready.result()
+        futures = [
+            executor.submit(
+                _top_matches_shard,
+                query,
+                shard,
+                N_WORKERS,
+                self.limit + len(removed),
+                self.boosts,
+            )
+            for shard in range(N_WORKERS)
+        ]
+        merged = [
+            item
+            for future in futures
+            for item in future.result()
+            if item[1] not in removed
+        ]
+        if added:
+            paths = list(filter(_compile_filter(query).match, added))
+            merged.extend(top_matches(query, paths, self.limit, self.boosts))
+        return heapq.nlargest(self.limit, merged, key=_rank_key)
+
+    def _get_pool_changes(self) -> tuple[list[str], set[str]] | None:
+        """Return the paths added and removed since the pool was started.
+
+        Returns ``None`` when there are too many changes.
+        """
+        pool_paths = _path_pool[0]
+        if pool_paths is self.paths:
+            return [], set()
+        if self._pool_changes is None or self._pool_changes[0] is not pool_paths:
+            old = set(pool_paths)
+            added = [path for path in self.paths if path not in old]
+            removed = old.difference(self.paths)
+            self._pool_changes = (pool_paths, added, removed)
+        _, added, removed = self._pool_changes
+        if len(added) + len(removed) > MAX_POOL_CHANGES:
+            return None
+        return added, removed
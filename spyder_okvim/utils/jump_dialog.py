@@ -1,15 +1,68 @@
 from __future__ import annotations
 
 # Standard Libraries
+import os
 import os.path as osp
+from bisect import bisect_right
+from collections import OrderedDict
 
 # Third Party Libraries
 from qtpy.QtCore import QEvent, Qt
-from qtpy.QtGui import QStandardItem
 
 from .list_dialog import PopupTableDialog
 
 
+class LineOffsetCache:
+    """Text and line start offsets of files on disk.
+
+    Entries are reused while the size and mtime of the file are unchanged,
+    so a file is read once for all the jumps pointing into it.
+    """
+
+    def __init__(self, max_files: int = 32) -> None:
+        self.max_files = max_files
+        self._files: OrderedDict[str, tuple] = OrderedDict()
+
+    def line_info(self, file_path: str, pos: int) -> tuple[int, int, str]:
+        """Return zero based line, column and text of ``pos``."""
+        entry = self._load(file_path)
+        if entry is None:
+            return 0, 0, ""
+        text, starts = entry
+        line = bisect_right(starts, pos) - 1
+        line_end = starts[line + 1] - 1 if line + 1 < len(starts) else len(text)
+        return line, pos - starts[line], text[starts[line] : line_end]
+
+    def _load(self, file_path: str) -> tuple[str, list[int]] | None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(file_path)
+        if cached is not None and cached[0] == key:
+            self._files.move_to_end(file_path)
+            return cached[1]
+        try:
+            with open(file_path, "r", encoding="utf-8") as fh:
+                text = fh.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        starts = [0]
+        find = text.find
+        idx = find("\n")
+        while idx >= 0:
+            starts.append(idx + 1)
+            idx = find("\n", idx + 1)
+        self._files[file_path] = (key, (text, starts))
+        if len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        return text, starts
+
+
+LINE_CACHE = LineOffsetCache()
+
+
 class JumpListDialog(PopupTableDialog):
     """Dialog to display the jump list."""
 
@@ -27,6 +80,11 @@ class JumpListDialog(PopupTableDialog):
 
         self.vim_status = vim_status
         self.jump_list = vim_status.jump_list
+        self.list_model.formatter = self._format_row
+        self.list_model.alignments = {
+            1: Qt.AlignRight | Qt.AlignVCenter,
+            2: Qt.AlignRight | Qt.AlignVCenter,
+        }
 
         self._populate()
         self.update_current_row()
@@ -41,41 +99,27 @@ class JumpListDialog(PopupTableDialog):
     # Helpers
     # ------------------------------------------------------------------
     def _get_line_info(self, file_path: str, pos: int) -> tuple[int, int, str]:
-        """Return line, column and text for *pos* in *file_path*."""
-        line = col = 0
-        text = ""
-        try:
-            with open(file_path, "r", encoding="utf-8") as fh:
-                data = fh.read()
-            line = data.count("\n", 0, pos)
-            line_start = data.rfind("\n", 0, pos) + 1
-            line_end = data.find("\n", pos)
-            if line_end == -1:
-                line_end = len(data)
-            col = pos - line_start
-            text = data[line_start:line_end].strip()
-        except Exception:
-            pass
-        return line + 1, col + 1, text
+        """Return line, column and text for *pos* in *file_path*.
+
+        Open files are read from the live buffer, other files from the line
+        offset cache.
+        """
+        document = self.vim_status.get_open_document(file_path)
+        block = document.findBlock(pos) if document is not None else None
+        if block is not None and block.isValid():
+            line, col, text = block.blockNumber(), pos - block.position(), block.text()
+        else:
+            line, col, text = LINE_CACHE.line_info(file_path, pos)
+        return line + 1, col + 1, text.strip()
+
+    def _format_row(self, row: tuple[int, object]) -> tuple[str, ...]:
+        i, jump = row
+        line, col, text = self._get_line_info(jump.file, jump.pos)
+        mark = ">" if i == self.jump_list.index else ""
+        return f"{mark}{i}", str(line), str(col), osp.basename(jump.file), text
 
     def _populate(self) -> None:
-        self.list_model.setRowCount(0)
-        for i, jump in enumerate(self.jump_list.jumps, start=1):
-            line, col, text = self._get_line_info(jump.file, jump.pos)
-            basename = osp.basename(jump.file)
-            mark = ">" if i == self.jump_list.index else ""
-            row = [
-                QStandardItem(f"{mark}{i}"),
-                QStandardItem(str(line)),
-                QStandardItem(str(col)),
-                QStandardItem(basename),
-                QStandardItem(text),
-            ]
-            for idx, item in enumerate(row):
-                item.setEditable(False)
-                if idx in (1, 2):
-                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.list_model.appendRow(row)
+        self.list_model.set_rows(list(enumerate(self.jump_list.jumps, start=1)))
 
     def update_current_row(self) -> None:
         row = max(0, self.jump_list.index - 1)
@@ -1,5 +1,6 @@
 """Manage the jump list for navigating positions."""
 
+from collections import Counter
 from dataclasses import dataclass
 
 
@@ -10,43 +11,99 @@ class Jump:
 
 
 class JumpList:
-    """Simple jump list implementation."""
+    """Jump list stored in a fixed-capacity ring buffer.
+
+    Pushing, truncating the forward history and dropping the oldest entry
+    never move the other entries.
+    """
 
     def __init__(self, max_items: int = 100) -> None:
         self.max_items = max_items
-        self.jumps: list[Jump] = []
+        self._buf: list[Jump | None] = [None] * max_items
+        self._start = 0
+        self._len = 0
+        self._files: Counter[str] = Counter()
         self.index: int = 0
 
+    @property
+    def jumps(self) -> list[Jump]:
+        """Return the jumps from the oldest to the newest."""
+        return [self[i] for i in range(self._len)]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, idx: int) -> Jump:
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("jump index out of range")
+        return self._buf[(self._start + idx) % self.max_items]
+
     def push(self, file: str, pos: int) -> None:
         """Add a new jump location."""
-        if self.index < len(self.jumps):
-            self.jumps = self.jumps[: self.index]
-        if self.jumps and self.jumps[-1].file == file and self.jumps[-1].pos == pos:
+        while self._len > self.index:
+            self._drop_last()
+        if self._len and self[-1].file == file and self[-1].pos == pos:
             return
-        self.jumps.append(Jump(file, pos))
-        if len(self.jumps) > self.max_items:
-            self.jumps.pop(0)
-        self.index = len(self.jumps)
+        if self._len == self.max_items:
+            self._files[self._buf[self._start].file] -= 1
+            self._buf[self._start] = None
+            self._start = (self._start + 1) % self.max_items
+            self._len -= 1
+        self._buf[(self._start + self._len) % self.max_items] = Jump(file, pos)
+        self._len += 1
+        self._files[file] += 1
+        self.index = self._len
 
     def back(self) -> Jump | None:
         """Return previous jump and update index."""
         if self.index <= 1:
             return None
         self.index -= 1
-        return self.jumps[self.index - 1]
+        return self[self.index - 1]
 
     def forward(self) -> Jump | None:
         """Return next jump and update index."""
-        if self.index >= len(self.jumps):
+        if self.index >= self._len:
             return None
-        jump = self.jumps[self.index]
+        jump = self[self.index]
         self.index += 1
         return jump
 
     def pop_last(self) -> None:
         """Remove the most recently added jump if present."""
-        if not self.jumps:
+        if not self._len:
             return
-        self.jumps.pop()
-        if self.index > len(self.jumps):
-            self.index = len(self.jumps)
+        self._drop_last()
+        if self.index > self._len:
+            self.index = self._len
+
+    def has_file(self, file: str) -> bool:
+        """Return ``True`` if a jump points into ``file``."""
+        return self._files[file] > 0
+
+    def shift(self, file: str, position: int, removed: int, added: int) -> None:
+        """Move the jumps of ``file`` after an edit.
+
+        Args:
+            file: Edited file.
+            position: Offset where the edit starts.
+            removed: Number of characters removed.
+            added: Number of characters inserted.
+        """
+        if added == removed or not self._files[file]:
+            return
+        end = position + removed
+        delta = added - removed
+        for i in range(self._len):
+            jump = self[i]
+            if jump.file != file or jump.pos < position:
+                continue
+            jump.pos = jump.pos + delta if jump.pos >= end else position
+
+    def _drop_last(self) -> None:
+        slot = (self._start + self._len - 1) % self.max_items
+        self._files[self._buf[slot].file] -= 1
+        self._buf[slot] = None
+        self._len -= 1
@@ -0,0 +1,145 @@
+"""Line operations of the ex commands, done on lists of lines."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import re
+from typing import Callable
+
+RE_SORT_NUMBER = re.compile(r"-?\d+")
+
+
+def move_lines(lines: list[str], start: int, end: int, dest: int) -> list[str]:
+    """Move the lines ``start`` to ``end`` below the line ``dest``.
+
+    ``dest`` is ``-1`` to move the lines to the top.
+
+    Raises:
+        ValueError: If ``dest`` is inside the moved lines.
+    """
+    if start <= dest < end:
+        raise ValueError("E134: Cannot move a range of lines into itself")
+    block = lines[start : end + 1]
+    if dest >= end:
+        return lines[:start] + lines[end + 1 : dest + 1] + block + lines[dest + 1 :]
+    return lines[: dest + 1] + block + lines[dest + 1 : start] + lines[end + 1 :]
+
+
+def copy_lines(lines: list[str], start: int, end: int, dest: int) -> list[str]:
+    """Copy the lines ``start`` to ``end`` below the line ``dest``."""
+    return lines[: dest + 1] + lines[start : end + 1] + lines[dest + 1 :]
+
+
+def shift_lines(lines: list[str], indent: str, level: int) -> list[str]:
+    """Add ``level`` indents to the lines, or remove them if negative.
+
+    Empty lines are left alone.
+    """
+    if level >= 0:
+        prefix = indent * level
+        return [prefix + line if line else line for line in lines]
+    width = len(indent) * -level
+    shifted = []
+    for line in lines:
+        n_space = len(line) - len(line.lstrip())
+        shifted.append(line[min(n_space, width) :])
+    return shifted
+
+
+def _number_key(line: str) -> tuple[int, int]:
+    match = RE_SORT_NUMBER.search(line)
+    # Lines without a number come first, in their original order.
+    return (0, 0) if match is None else (1, int(match[0]))
+
+
+def sort_lines(lines: list[str], flags: str = "") -> list[str]:
+    """Sort the lines like ``:sort``.
+
+    Args:
+        lines: Lines to sort.
+        flags: ``!`` to reverse, ``i`` to ignore case, ``n`` to sort by the
+            first decimal number and ``u`` to keep only the first of equal
+            lines.
+    """
+    if "n" in flags:
+        key = _number_key
+    elif "i" in flags:
+        key = str.lower
+    else:
+        key = None
+    sorted_lines = sorted(lines, key=key, reverse="!" in flags)
+    if "u" not in flags:
+        return sorted_lines
+
+    key = key or (lambda line: line)
+    unique = []
+    previous = object()
+    for line in sorted_lines:
+        current = key(line)
+        if current != previous:
+            unique.append(line)
+            previous = current
+    return unique
+
+
+# Where the lines returned by a :g action go.
+IN_PLACE = 0
+TO_TOP = 1
+TO_BOTTOM = 2
+
+
+def global_lines(
+    lines: list[str],
+    marked: list[int],
+    action: Callable[[list[str]], tuple[list[str], int, list[str]]],
+    count: int = 1,
+) -> tuple[list[str], int]:
+    """Run ``action`` on each marked line, like ``:g/pat/cmd``.
+
+    The text is read once from the first line to the last, so the marks
+    never need to be searched again after an edit. A marked line removed
+    by the action on a previous line is skipped.
+
+    Args:
+        lines: Lines of the document.
+        marked: Sorted indexes of the marked lines.
+        action: Called with the ``count`` lines starting at a marked line.
+            Returns the lines to keep in their place, where to put its
+            other lines (``IN_PLACE``, ``TO_TOP`` or ``TO_BOTTOM``) and
+            these lines.
+        count: Number of lines given to ``action``.
+
+    Returns:
+        The new lines and the line where the last action ended.
+    """
+    out = []
+    top_chunks = []
+    bottom = []
+    last = (IN_PLACE, 0)
+    idx = 0
+    for line_no in marked:
+        if line_no < idx:
+            continue
+        out.extend(lines[idx:line_no])
+        idx = min(line_no + count, len(lines))
+        kept, where, moved = action(lines[line_no:idx])
+        out.extend(kept)
+        if where == TO_TOP:
+            top_chunks.append(moved)
+            last = (TO_TOP, len(moved) - 1)
+        elif where == TO_BOTTOM:
+            bottom.extend(moved)
+            last = (TO_BOTTOM, len(bottom) - 1)
+        else:
+            last = (IN_PLACE, len(out) - 1 if kept else len(out))
+    out.extend(lines[idx:])
+
+    # Each chunk moved to the top goes above the previous ones.
+    top = [line for chunk in reversed(top_chunks) for line in chunk]
+    new_lines = top + out + bottom or [""]
+    where, line = last
+    if where == IN_PLACE:
+        line += len(top)
+    elif where == TO_BOTTOM:
+        line += len(top) + len(out)
+    return new_lines, min(line, len(new_lines) - 1)
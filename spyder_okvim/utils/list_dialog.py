@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+# Standard Libraries
+from collections.abc import Callable, Sequence
+
 # Third Party Libraries
-from qtpy.QtCore import QStringListModel, Qt
-from qtpy.QtGui import QStandardItem, QStandardItemModel
+from qtpy.QtCore import QAbstractTableModel, QModelIndex, QStringListModel, Qt
 from qtpy.QtWidgets import (
     QDialog,
     QListView,
@@ -14,6 +16,108 @@ from qtpy.QtWidgets import (
 from spyder.config.gui import get_font
 
 
+def _default_formatter(row) -> tuple[str, ...]:
+    if isinstance(row, (tuple, list)):
+        return tuple(str(val) for val in row)
+    return (str(row),)
+
+
+class ResultTableModel(QAbstractTableModel):
+    """Read-only table model backed by a plain list of results.
+
+    Rows are kept as the original Python objects. The text of a row is only
+    built by ``formatter`` when the view asks for it, which happens for the
+    visible rows, and is cached until the next :meth:`set_rows`.
+    """
+
+    def __init__(
+        self,
+        headers: list[str] | None = None,
+        formatter: Callable[[object], Sequence[str]] | None = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.headers = list(headers or [])
+        self.formatter = formatter or _default_formatter
+        self.alignments: dict[int, Qt.Alignment] = {}
+        self._rows: Sequence = []
+        self._owns_rows = False
+        self._cache: dict[int, Sequence[str]] = {}
+
+    def set_rows(self, rows: Sequence) -> None:
+        """Replace every row with a single model reset."""
+        self.beginResetModel()
+        self._rows = rows
+        self._owns_rows = False
+        self._cache = {}
+        self.endResetModel()
+
+    def append_rows(self, rows: Sequence) -> None:
+        """Add ``rows`` at the end of the results."""
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        if not self._owns_rows:
+            self._rows = list(self._rows)
+            self._owns_rows = True
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def row_object(self, row: int):
+        """Return the object shown in ``row`` or ``None``."""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def text(self, row: int, column: int) -> str:
+        """Return the text displayed at ``row`` and ``column``."""
+        texts = self._cache.get(row)
+        if texts is None:
+            texts = self.formatter(self._rows[row])
+            self._cache[row] = texts
+        return texts[column] if column < len(texts) else ""
+
+    # ------------------------------------------------------------------
+    # Qt overrides
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()) -> int:  # noqa: B008
+        """Return the number of results."""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:  # noqa: B008
+        """Return the number of columns."""
+        return 0 if parent.isValid() else max(len(self.headers), 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Return the data of a cell."""
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.text(index.row(), index.column())
+        if role == Qt.UserRole:
+            return self.row_object(index.row())
+        if role == Qt.TextAlignmentRole:
+            return self.alignments.get(index.column())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Return the column titles."""
+        if (
+            role == Qt.DisplayRole
+            and orientation == Qt.Horizontal
+            and section < len(self.headers)
+        ):
+            return self.headers[section]
+        return None
+
+    def flags(self, index):
+        """Return read-only, selectable flags."""
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
 class PopupListDialog(QDialog):
     """Base dialog for displaying a list of items."""
 
@@ -145,15 +249,15 @@ class PopupTableDialog(QDialog):
             self.list_viewer.setMinimumWidth(min_width)
         if max_height:
             self.list_viewer.setFixedHeight(max_height)
-        self.list_model = QStandardItemModel()
-        if headers:
-            self.list_model.setHorizontalHeaderLabels(headers)
+        self.list_model = ResultTableModel(headers, parent=self)
         self.list_viewer.setModel(self.list_model)
         self.list_viewer.setFont(font)
         self.list_viewer.setStyleSheet("QTableView { color: #f0f0f0; }")
         self.list_viewer.horizontalHeader().setSectionResizeMode(
             QHeaderView.ResizeToContents
         )
+        # Only measure the visible rows so large results stay cheap to show.
+        self.list_viewer.horizontalHeader().setResizeContentsPrecision(0)
         self.list_viewer.horizontalHeader().setStretchLastSection(True)
 
         self.layout_ = QVBoxLayout()
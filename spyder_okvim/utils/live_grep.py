@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""Project-wide live grep picker."""
+from __future__ import annotations
+
+# Standard Libraries
+import mmap
+import os
+import os.path as osp
+import re
+from concurrent.futures import Executor, Future
+from functools import lru_cache
+
+# Third Party Libraries
+from qtpy.QtCore import QObject, Qt, QTimer, Signal
+from qtpy.QtWidgets import QWidget
+from spyder.config.gui import get_font
+
+from .file_index import ProjectFileIndex
+from .file_search import FileSearchLineEdit
+from .fuzzy_matcher import get_executor
+from .list_dialog import PopupTableDialog
+
+# Files are sent to the workers in chunks of this size.
+CHUNK_SIZE = 64
+# Larger files are skipped.
+MAX_FILE_SIZE = 4 * 1024 * 1024
+# Matches kept per file and per query.
+MAX_HITS_PER_FILE = 100
+MAX_HITS = 2000
+# Delay between the last key press and the start of a search.
+SEARCH_DELAY_MS = 80
+
+_REGEX_SPECIALS = set(".^$*+?{}[]\\|()")
+
+
+def literal_prefix(pattern: str) -> bytes:
+    """Return literal bytes that every match of ``pattern`` starts with.
+
+    The prefix is used to skip files with ``mmap.find`` before running the
+    regex. An empty result means no fast path is possible.
+    """
+    if "|" in pattern:
+        return b""
+    end = 0
+    while end < len(pattern) and pattern[end] not in _REGEX_SPECIALS:
+        end += 1
+    if end < len(pattern) and pattern[end] in "*?{":
+        # The last literal character is optional or repeated.
+        end -= 1
+    return pattern[: max(end, 0)].encode("utf-8")
+
+
+def has_literal(buf, literal: bytes, ignore_case: bool) -> bool:
+    """Return whether ``buf`` contains ``literal``.
+
+    Ignoring the case folds the ASCII letters only, like the bytes regexes.
+    """
+    if not literal:
+        return True
+    if ignore_case:
+        return re.search(re.escape(literal), buf, re.IGNORECASE) is not None
+    return buf.find(literal) >= 0
+
+
+@lru_cache(maxsize=16)
+def _compile(pattern: str, ignore_case: bool) -> re.Pattern:
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(pattern.encode("utf-8"), flags)
+
+
+def grep_file(
+    path: str, pattern: str, ignore_case: bool, literal: bytes
+) -> list[tuple[int, int, str]]:
+    """Return ``(line, col, text)`` of the lines of ``path`` matching.
+
+    Lines and columns are zero based. Binary and very large files are
+    skipped.
+    """
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size == 0 or size > MAX_FILE_SIZE:
+                return []
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not has_literal(mm, literal, ignore_case):
+                    return []
+                if mm.find(b"\0", 0, 1024) >= 0:
+                    return []
+                return _grep_buffer(mm, _compile(pattern, ignore_case))
+    except (OSError, ValueError):
+        return []
+
+
+def _grep_buffer(buf, regex: re.Pattern) -> list[tuple[int, int, str]]:
+    hits = []
+    line = 0
+    counted = 0
+    pos = 0
+    size = len(buf)
+    while pos <= size and len(hits) < MAX_HITS_PER_FILE:
+        match = regex.search(buf, pos)
+        if match is None:
+            break
+        start = match.start()
+        line_start = buf.rfind(b"\n", 0, start) + 1
+        line_end = buf.find(b"\n", start)
+        if line_end < 0:
+            line_end = size
+        line += buf[counted:line_start].count(b"\n")
+        counted = line_start
+        text = buf[line_start:line_end].decode("utf-8", "replace")
+        col = len(buf[line_start:start].decode("utf-8", "replace"))
+        hits.append((line, col, text.strip()))
+        pos = line_end + 1
+    return hits
+
+
+def grep_files(
+    root: str, rel_paths: list[str], pattern: str, ignore_case: bool
+) -> list[tuple[str, int, int, str]]:
+    """Search ``rel_paths`` below ``root`` and return the hits."""
+    literal = literal_prefix(pattern)
+    hits = []
+    for rel_path in rel_paths:
+        for line, col, text in grep_file(
+            osp.join(root, rel_path), pattern, ignore_case, literal
+        ):
+            hits.append((rel_path, line, col, text))
+    return hits
+
+
+class LiveGrepSearch(QObject):
+    """Run grep queries on a worker pool and stream the hits.
+
+    Every query gets a new generation number. Starting a query cancels the
+    chunks of the previous one that did not start yet, and late results of
+    older generations are dropped.
+    """
+
+    sig_hits = Signal(int, list)
+    sig_finished = Signal(int)
+    _sig_chunk_done = Signal(int, list)
+
+    def __init__(
+        self, root: str, executor: Executor | None = None, parent=None
+    ) -> None:
+        super().__init__(parent)
+        self.root = root
+        self.executor = executor
+        self.generation = 0
+        self._futures: list[Future] = []
+        self._pending = 0
+        self._sig_chunk_done.connect(self._on_chunk_done)
+
+    def start(self, pattern: str, rel_paths: list[str]) -> int:
+        """Search ``pattern`` in ``rel_paths`` and return the generation.
+
+        Patterns in lower case ignore case. Invalid regexes are searched
+        literally.
+        """
+        self.cancel()
+        self.generation += 1
+        generation = self.generation
+        if not pattern or not rel_paths:
+            self.sig_finished.emit(generation)
+            return generation
+
+        ignore_case = pattern.lower() == pattern
+        try:
+            _compile(pattern, ignore_case)
+        except re.error:
+            pattern = re.escape(pattern)
+
+        executor = self.executor or get_executor()
+        self._pending = 0
+        for i in range(0, len(rel_paths), CHUNK_SIZE):
+            self._pending += 1
+            future = executor.submit(
+                grep_files, self.root, rel_paths[i : i + CHUNK_SIZE], pattern, ignore_case
+            )
+            future.add_done_callback(
+                lambda fut, gen=generation: self._on_future_done(gen, fut)
+            )
+            self._futures.append(future)
+        return generation
+
+    def cancel(self) -> None:
+        """Cancel the chunks of the running query."""
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def _on_future_done(self, generation: int, future: Future) -> None:
+        # Runs in an executor thread; the signal is queued to the GUI thread.
+        if generation != self.generation or future.cancelled():
+            return
+        try:
+            hits = future.result()
+        except Exception:
+            hits = []
+        self._sig_chunk_done.emit(generation, hits)
+
+    def _on_chunk_done(self, generation: int, hits: list) -> None:
+        if generation != self.generation:
+            return
+        if hits:
+            self.sig_hits.emit(generation, hits)
+        self._pending -= 1
+        if self._pending == 0:
+            self._futures = []
+            self.sig_finished.emit(generation)
+
+
+class LiveGrepDialog(PopupTableDialog):
+    """Dialog searching the contents of the project files as you type."""
+
+    _MIN_WIDTH = 1000
+    _MAX_HEIGHT = 600
+
+    def __init__(
+        self,
+        folder: str | None,
+        file_index: ProjectFileIndex | None,
+        parent: QWidget | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Create the dialog.
+
+        Args:
+            folder: Project root.
+            file_index: Index providing the files to search.
+            parent: Parent widget for the dialog.
+            executor: Pool running the searches. Defaults to the shared
+                process pool.
+        """
+        super().__init__(
+            "Live Grep",
+            parent=parent,
+            headers=["File", "Line", "Text"],
+            min_width=self._MIN_WIDTH,
+            max_height=self._MAX_HEIGHT,
+        )
+        self.folder = folder
+        self.file_index = file_index
+        self.hit_selected: tuple[str, int, int] | None = None
+
+        self.list_model.formatter = lambda hit: (hit[0], str(hit[1] + 1), hit[3])
+        self.list_model.alignments = {1: Qt.AlignRight | Qt.AlignVCenter}
+        self.list_viewer.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.list_viewer.setFocusPolicy(Qt.NoFocus)
+
+        self.search = LiveGrepSearch(folder or "", executor, self)
+        self.search.sig_hits.connect(self.on_hits)
+        self.search.sig_finished.connect(self.on_finished)
+
+        self.timer_search = QTimer(self)
+        self.timer_search.setSingleShot(True)
+        self.timer_search.setInterval(SEARCH_DELAY_MS)
+        self.timer_search.timeout.connect(self.start_search)
+
+        self.edit = FileSearchLineEdit(self, textChanged=self.timer_search.start)
+        self.edit.setFont(get_font(font_size_delta=2))
+        self.edit.sig_esc_key_pressed.connect(self.close)
+        self.edit.sig_enter_key_pressed.connect(self.enter)
+        self.edit.sig_up_key_pressed.connect(lambda: self.prev_row(1))
+        self.edit.sig_pg_up_key_pressed.connect(self.pg_up)
+        self.edit.sig_pg_half_up_key_pressed.connect(self.pg_half_up)
+        self.edit.sig_down_key_pressed.connect(lambda: self.next_row(1))
+        self.edit.sig_pg_down_key_pressed.connect(self.pg_down)
+        self.edit.sig_pg_half_down_key_pressed.connect(self.pg_half_down)
+        self.layout_.insertWidget(0, self.edit)
+
+        if folder is None or not osp.isdir(folder) or file_index is None:
+            self.edit.setPlaceholderText("The project is not valid.")
+        self.edit.setFocus()
+
+    def get_selected_hit(self) -> tuple[str, int, int] | None:
+        """Return the file, line and column chosen by the user."""
+        return self.hit_selected
+
+    def start_search(self) -> None:
+        """Search the text of the line edit."""
+        self.list_model.set_rows([])
+        if self.file_index is None:
+            return
+        self.search.start(self.edit.text(), self.file_index.paths)
+
+    def on_hits(self, generation: int, hits: list) -> None:
+        """Append the hits of the current query."""
+        if generation != self.search.generation:
+            return
+        room = MAX_HITS - self.list_model.rowCount()
+        if room <= 0:
+            self.search.cancel()
+            return
+        was_empty = self.list_model.rowCount() == 0
+        self.list_model.append_rows(hits[:room])
+        if was_empty:
+            self.list_viewer.setCurrentIndex(self.list_model.index(0, 0))
+            self.list_viewer.selectRow(0)
+
+    def on_finished(self, generation: int) -> None:
+        """Report queries without hits."""
+        if generation == self.search.generation and not self.list_model.rowCount():
+            self.edit.setPlaceholderText("No match")
+
+    def enter(self) -> None:
+        """Select the current hit and close the dialog."""
+        hit = self.list_model.row_object(self.list_viewer.currentIndex().row())
+        if hit and self.folder:
+            rel_path, line, col, _ = hit
+            self.hit_selected = (osp.join(self.folder, rel_path), line, col)
+        self.close()
+
+    def done(self, result: int) -> None:
+        """Stop the running query when the dialog closes."""
+        self.timer_search.stop()
+        self.search.cancel()
+        self.search.generation += 1
+        super().done(result)
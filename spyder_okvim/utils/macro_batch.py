@@ -0,0 +1,338 @@
+"""Run a macro over many files in worker processes, for ``:macrobatch``."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import atexit
+import math
+import os
+import os.path as osp
+import re
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+
+# Third Party Libraries
+from qtpy.QtCore import QObject, Signal
+from qtpy.QtWidgets import QApplication, QLabel
+from spyder.config.manager import CONF
+
+# Project Libraries
+from spyder_okvim.spyder.config import CONF_DEFAULTS, CONF_SECTION
+from spyder_okvim.utils.background_writer import write_atomic
+from spyder_okvim.utils.fuzzy_matcher import N_WORKERS
+from spyder_okvim.utils.list_dialog import PopupTableDialog
+from spyder_okvim.utils.quickfix import CHUNK_SIZE, MAX_FILE_SIZE, RE_FILE_SEPARATOR
+
+RE_REGISTER = re.compile(r'[a-zA-Z0-9"]$')
+# Each worker gets about this many chunks, so a slow file does not hold the
+# others back.
+CHUNKS_PER_WORKER = 4
+
+# Application of a worker process.
+_app = None
+# Number of workers and pool of the last batch, kept for the next batches so
+# the workers start their headless editor once.
+_pool: tuple[int, ProcessPoolExecutor] | None = None
+
+
+@dataclass
+class MacroBatchResult:
+    file: str
+    ok: bool
+    changed: bool = False
+    message: str = ""
+
+
+def parse_macro_batch(arg: str) -> tuple[str, int | None, list[str]]:
+    """Split the argument of ``:macrobatch``, like ``q 4 **/*.py``.
+
+    Spaces in file names are escaped with a backslash.
+
+    Returns:
+        The register, the number of workers or ``None`` and the file
+        arguments.
+
+    Raises:
+        ValueError: If the register or the files are missing.
+    """
+    names = [
+        name.replace("\\ ", " ")
+        for name in RE_FILE_SEPARATOR.split(arg.strip())
+        if name
+    ]
+    if len(names) < 2:
+        raise ValueError("E471: Argument required")
+    register = names.pop(0)
+    if not RE_REGISTER.match(register):
+        raise ValueError(f"E354: Invalid register name: '{register}'")
+    workers = None
+    if len(names) > 1 and names[0].isdigit():
+        workers = max(int(names.pop(0)), 1)
+    return register.lower(), workers, names
+
+
+def get_options() -> dict:
+    """Return the settings of the plugin, sent to the workers."""
+    defaults = dict(CONF_DEFAULTS)[CONF_SECTION]
+    return {option: CONF.get(CONF_SECTION, option) for option in defaults}
+
+
+def init_worker() -> None:
+    """Start the offscreen application of a worker process."""
+    global _app
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    _app = QApplication.instance() or QApplication([])
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the pool of ``workers`` processes, started on first use."""
+    global _pool
+    if _pool is None or _pool[0] != workers:
+        _shutdown_pool()
+        _pool = (
+            workers,
+            ProcessPoolExecutor(
+                workers, mp_context=get_context("spawn"), initializer=init_worker
+            ),
+        )
+    return _pool[1]
+
+
+def _shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool[1].shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+atexit.register(_shutdown_pool)
+
+
+def read_text(path: str) -> tuple[str, str, int]:
+    """Return the text, the line break and the mtime of ``path``.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is binary, too large or not UTF-8.
+    """
+    with open(path, "rb") as fh:
+        info = os.fstat(fh.fileno())
+        if info.st_size > MAX_FILE_SIZE:
+            raise ValueError("File too large")
+        data = fh.read()
+    if b"\0" in data[:1024]:
+        raise ValueError("Binary file")
+    text = data.decode("utf-8")
+    newline = "\r\n" if "\r\n" in text else "\n"
+    return text.replace("\r\n", "\n"), newline, info.st_mtime_ns
+
+
+def run_macro_files(
+    paths: list[str],
+    keys: str,
+    registers: dict[str, tuple[str, int]],
+    options: dict | None = None,
+) -> list[MacroBatchResult]:
+    """Type ``keys`` in a headless editor on each file and write it back.
+
+    A file is written only when the keys changed it without an error
+    message, and only if it did not change on disk meanwhile. The
+    ``options`` of the plugin are set in memory only, so the workers never
+    write the configuration files.
+    """
+    # Project Libraries
+    # The headless editor imports the executors, which import this module.
+    from spyder_okvim.spyder.headless import get_headless_vim
+
+    for option, value in (options or {}).items():
+        CONF.set(CONF_SECTION, option, value, save=False, notification=False)
+    vim = get_headless_vim()
+    results = []
+    for path in paths:
+        try:
+            text, newline, mtime = read_text(path)
+            new_text, error = vim.run(path, text, keys, registers)
+        except Exception as e:
+            # Any failure is reported for this file only.
+            results.append(MacroBatchResult(path, False, message=str(e)))
+            continue
+        if error:
+            results.append(MacroBatchResult(path, False, message=error))
+            continue
+        if new_text == text:
+            results.append(MacroBatchResult(path, True))
+            continue
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                raise OSError("File changed on disk")
+            write_atomic(path, new_text.replace("\n", newline), keep_mode=True)
+        except OSError as e:
+            results.append(MacroBatchResult(path, False, message=str(e)))
+            continue
+        results.append(MacroBatchResult(path, True, True))
+    return results
+
+
+class MacroBatchRun(QObject):
+    """Run a macro over files in worker processes and stream the results.
+
+    The files are split in chunks, so a slow file does not hold the others
+    back. Cancelling drops the chunks that did not start yet and the
+    results that come later.
+    """
+
+    sig_results = Signal(list)
+    sig_finished = Signal()
+    _sig_chunk_done = Signal(list)
+
+    def __init__(self, executor: Executor | None = None, parent=None) -> None:
+        """Create the run.
+
+        Args:
+            executor: Pool running :func:`run_macro_files`, whose workers
+                were started by :func:`init_worker`. Defaults to the pool
+                kept between the batches.
+            parent: Parent object.
+        """
+        super().__init__(parent)
+        self.executor = executor
+        self.cancelled = False
+        self._futures: list[Future] = []
+        self._pending = 0
+        self._sig_chunk_done.connect(self._on_chunk_done)
+
+    def start(
+        self,
+        paths: list[str],
+        keys: str,
+        registers: dict[str, tuple[str, int]],
+        workers: int | None = None,
+    ) -> None:
+        """Run the macro on ``paths``.
+
+        Args:
+            paths: Files to change on disk.
+            keys: Keys of the macro in Vim key notation.
+            registers: Content and type of each register, the same for
+                every file.
+            workers: Number of processes, one per CPU by default.
+        """
+        if not paths:
+            self.sig_finished.emit()
+            return
+        workers = workers or N_WORKERS
+        size = min(CHUNK_SIZE, math.ceil(len(paths) / (workers * CHUNKS_PER_WORKER)))
+        executor = self.executor or get_pool(workers)
+        options = get_options()
+        for i in range(0, len(paths), size):
+            chunk = paths[i : i + size]
+            self._pending += 1
+            future = executor.submit(run_macro_files, chunk, keys, registers, options)
+            future.add_done_callback(
+                lambda fut, chunk=chunk: self._on_future_done(chunk, fut)
+            )
+            self._futures.append(future)
+
+    def cancel(self) -> None:
+        """Cancel the chunks that did not start yet."""
+        self.cancelled = True
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def _on_future_done(self, chunk: list[str], future: Future) -> None:
+        # Runs in an executor thread; the signal is queued to the GUI thread.
+        if self.cancelled or future.cancelled():
+            return
+        try:
+            results = future.result()
+        except Exception as e:
+            # The worker running the chunk died.
+            message = str(e) or type(e).__name__
+            results = [MacroBatchResult(path, False, message=message) for path in chunk]
+        self._sig_chunk_done.emit(results)
+
+    def _on_chunk_done(self, results: list) -> None:
+        if self.cancelled:
+            return
+        self.sig_results.emit(results)
+        self._pending -= 1
+        if self._pending == 0:
+            self._futures = []
+            self.sig_finished.emit()
+
+
+class MacroBatchDialog(PopupTableDialog):
+    """Dialog listing the result of ``:macrobatch`` for each file.
+
+    The results of the workers are added as they come. Closing the dialog
+    cancels the files that did not start yet.
+    """
+
+    _MIN_WIDTH = 1000
+    _MAX_HEIGHT = 600
+
+    def __init__(
+        self,
+        results: list[MacroBatchResult],
+        n_files: int,
+        run: MacroBatchRun | None = None,
+        parent=None,
+    ) -> None:
+        """Create the dialog.
+
+        Args:
+            results: Results known when the dialog opens.
+            n_files: Number of files of the batch.
+            run: Run giving the other results.
+            parent: Parent widget for the dialog.
+        """
+        super().__init__(
+            "Macro Batch",
+            parent=parent,
+            headers=["File", "Result", "Message"],
+            min_width=self._MIN_WIDTH,
+            max_height=self._MAX_HEIGHT,
+        )
+        self.n_files = n_files
+        self.run = run
+        self.results: list[MacroBatchResult] = []
+        self.list_model.formatter = lambda result: (
+            osp.basename(result.file),
+            _format_status(result),
+            result.message,
+        )
+        self.label_progress = QLabel(self)
+        self.layout_.insertWidget(0, self.label_progress)
+        if run is not None:
+            run.sig_results.connect(self.add_results)
+        self.add_results(results)
+
+    def add_results(self, results: list[MacroBatchResult]) -> None:
+        """Append the results of some files."""
+        was_empty = not self.results
+        self.results.extend(results)
+        self.list_model.append_rows(results)
+        if was_empty and self.results:
+            self.list_viewer.setCurrentIndex(self.list_model.index(0, 0))
+            self.list_viewer.selectRow(0)
+        done = len(self.results)
+        if done < self.n_files:
+            self.label_progress.setText(
+                f"{done} of {self.n_files} files done, Esc to cancel"
+            )
+        else:
+            self.label_progress.setText(f"{done} files done")
+
+    def done(self, result: int) -> None:
+        """Cancel the files that did not start when the dialog closes."""
+        if self.run is not None:
+            self.run.cancel()
+        super().done(result)
+
+
+def _format_status(result: MacroBatchResult) -> str:
+    if not result.ok:
+        return "failed"
+    return "changed" if result.changed else "unchanged"
@@ -5,7 +5,6 @@ import os.path as osp
 
 # Third Party Libraries
 from qtpy.QtCore import Qt
-from qtpy.QtGui import QStandardItem
 
 from .list_dialog import PopupTableDialog
 
@@ -27,6 +26,11 @@ class MarkListDialog(PopupTableDialog):
 
         self.marks = marks
         self.selected_mark = ""
+        self.list_model.formatter = self._format_row
+        self.list_model.alignments = {
+            1: Qt.AlignRight | Qt.AlignVCenter,
+            2: Qt.AlignRight | Qt.AlignVCenter,
+        }
 
         self._populate()
         if self.list_model.rowCount() > 0:
@@ -50,33 +54,23 @@ class MarkListDialog(PopupTableDialog):
         self.selected_mark = ""
         super().reject()
 
+    def _format_row(self, row: tuple[str, dict]) -> tuple[str, ...]:
+        mark, info = row
+        file_path = info.get("file", "")
+        line = info.get("line", 0)
+        col = info.get("col", 0)
+        text = ""
+        try:
+            with open(file_path, "r", encoding="utf-8") as fh:
+                rows = fh.readlines()
+                if 0 <= line < len(rows):
+                    text = rows[line].strip()
+        except Exception:
+            pass
+        return mark, str(line + 1), str(col + 1), osp.basename(file_path), text
+
     def _populate(self) -> None:
-        self.list_model.setRowCount(0)
-        for mark, info in self.marks:
-            file_path = info.get("file", "")
-            line = info.get("line", 0)
-            col = info.get("col", 0)
-            text = ""
-            try:
-                with open(file_path, "r", encoding="utf-8") as fh:
-                    rows = fh.readlines()
-                    if 0 <= line < len(rows):
-                        text = rows[line].strip()
-            except Exception:
-                pass
-            basename = osp.basename(file_path)
-            row = [
-                QStandardItem(mark),
-                QStandardItem(str(line + 1)),
-                QStandardItem(str(col + 1)),
-                QStandardItem(basename),
-                QStandardItem(text),
-            ]
-            for i, item in enumerate(row):
-                item.setEditable(False)
-                if i in (1, 2):
-                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.list_model.appendRow(row)
+        self.list_model.set_rows(self.marks)
 
     def get_selected_mark(self) -> str:
         """Return the mark selected by the user."""
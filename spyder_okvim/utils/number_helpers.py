@@ -0,0 +1,96 @@
+"""Find and change the numbers used by ``Ctrl-A`` and ``Ctrl-X``."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import re
+
+RE_NUMBER = re.compile(
+    r"0[xX](?P<hex>[0-9a-fA-F]+)"
+    r"|0[bB](?P<bin>[01]+)"
+    r"|0[oO](?P<oct>[0-7]+)"
+    # The sign belongs to decimal numbers only; ``-0x10`` is the hex ``0x10``.
+    r"|(?P<dec>(?:-(?!0[xX][0-9a-fA-F]|0[bB][01]|0[oO][0-7]))?\d+)"
+)
+UNSIGNED_MASK = (1 << 64) - 1
+BASES = {"hex": (16, "x"), "bin": (2, "b"), "oct": (8, "o")}
+
+
+def find_number(
+    text: str, col: int = 0, start: int = 0, end: int | None = None
+) -> re.Match | None:
+    """Return the first number of ``text`` that ends after ``col``.
+
+    Args:
+        text: Text of a line.
+        col: Column of the cursor; a number under it or after it is found.
+        start: Column where the scan starts.
+        end: Column where the scan stops, the end of ``text`` by default.
+    """
+    end = len(text) if end is None else end
+    for match in RE_NUMBER.finditer(text, start, end):
+        if match.end() > col:
+            return match
+    return None
+
+
+def change_number(match: re.Match, delta: int) -> str:
+    """Return the text of the number in ``match`` plus ``delta``.
+
+    Hexadecimal, binary and octal numbers are unsigned and wrap around at
+    64 bits. They keep their prefix, their width and the case of their
+    letters. Decimal numbers keep their leading zeros.
+    """
+    for name, (base, fmt) in BASES.items():
+        digits = match[name]
+        if digits is None:
+            continue
+        val = (int(digits, base) + delta) & UNSIGNED_MASK
+        letters = [ch for ch in digits if ch.isalpha()]
+        if letters and letters[-1].isupper():
+            fmt = fmt.upper()
+        return match[0][:2] + format(val, f"0{len(digits)}{fmt}")
+
+    digits = match["dec"]
+    val = int(digits) + delta
+    body = digits.lstrip("-")
+    if len(body) > 1 and body[0] == "0":
+        sign = "-" if val < 0 else ""
+        return f"{sign}{abs(val):0{len(body)}d}"
+    return str(val)
+
+
+def increment_lines(
+    lines: list[str],
+    delta: int,
+    progressive: bool = False,
+    col_start: int = 0,
+    col_end: int | None = None,
+) -> tuple[list[str], int]:
+    """Add ``delta`` to the first number of each line.
+
+    Args:
+        lines: Lines of the selection.
+        delta: Value to add.
+        progressive: Add ``delta`` to the first number found, twice
+            ``delta`` to the second and so on, like ``g Ctrl-A``.
+        col_start: Column where the scan starts on the first line.
+        col_end: Column where the scan stops on the last line.
+
+    Returns:
+        The new lines and the number of changed numbers.
+    """
+    new_lines = []
+    count = 0
+    last = len(lines) - 1
+    for idx, line in enumerate(lines):
+        start = col_start if idx == 0 else 0
+        end = col_end if idx == last and col_end is not None else len(line)
+        match = find_number(line, start, start, end)
+        if match is None:
+            new_lines.append(line)
+            continue
+        count += 1
+        number = change_number(match, delta * count if progressive else delta)
+        new_lines.append(line[: match.start()] + number + line[match.end() :])
+    return new_lines, count
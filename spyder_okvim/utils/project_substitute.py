@@ -0,0 +1,281 @@
+"""Run ``:s`` on the files of the quickfix list, for ``:cdo`` and ``:cfdo``."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import mmap
+import os
+import os.path as osp
+import re
+from concurrent.futures import Executor
+
+# Third Party Libraries
+from qtpy.QtCore import Qt
+
+# Project Libraries
+from spyder_okvim.utils.background_writer import write_atomic
+from spyder_okvim.utils.list_dialog import PopupTableDialog
+from spyder_okvim.utils.live_grep import has_literal, literal_prefix
+from spyder_okvim.utils.quickfix import MAX_FILE_SIZE, run_in_chunks
+from spyder_okvim.utils.substitute import expand, iter_matches
+from spyder_okvim.utils.vim_regex import WORD_START, match_span
+
+# (file, line, old text, new text) of a changed line.
+Hunk = tuple[str, int, str, str]
+
+
+def get_literal(regex: re.Pattern) -> bytes:
+    """Return bytes found in every text matching ``regex``, maybe empty.
+
+    Bytes patterns fold the case of ASCII letters only, so when the case
+    is ignored the literal stops at the first non-ASCII character.
+    """
+    pattern = regex.pattern
+    # Skip the assertions matching no character at the start.
+    while pattern.startswith((WORD_START, "^")):
+        pattern = pattern[len(WORD_START) if pattern[0] == "\\" else 1 :]
+    literal = literal_prefix(pattern)
+    if regex.flags & re.IGNORECASE:
+        end = 0
+        while end < len(literal) and literal[end] < 0x80:
+            end += 1
+        literal = literal[:end]
+    return literal
+
+
+def substitute_text(
+    text: str,
+    regex: re.Pattern,
+    parts: tuple,
+    replace_all: bool,
+    lines: set[int] | None = None,
+) -> tuple[list[tuple[int, int, str]], list[tuple[int, str, str]]]:
+    """Run ``:s`` on the lines of ``text``, all of them or only ``lines``.
+
+    Returns:
+        The ``(start, end, text)`` replacements, with offsets in ``text``,
+        and the ``(line, old, new)`` changed lines.
+    """
+    spans = []
+    hunks = []
+    offset = 0
+    for line_no, line in enumerate(text.split("\n")):
+        if lines is None or line_no in lines:
+            pieces = []
+            last = 0
+            for match in iter_matches(line, regex, replace_all):
+                start, end = match_span(match)
+                new = expand(parts, match)
+                spans.append((offset + start, offset + end, new))
+                pieces.append(line[last:start])
+                pieces.append(new)
+                last = end
+            if pieces:
+                pieces.append(line[last:])
+                hunks.append((line_no, line, "".join(pieces)))
+        offset += len(line) + 1
+    return spans, hunks
+
+
+def replace_spans(text: str, spans: list[tuple[int, int, str]]) -> str:
+    """Return ``text`` with the sorted ``(start, end, new)`` spans replaced."""
+    pieces = []
+    last = 0
+    for start, end, new in spans:
+        pieces.append(text[last:start])
+        pieces.append(new)
+        last = end
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def _read(path: str, regex: re.Pattern, literal: bytes) -> tuple[str, str, int] | None:
+    """Return the text, the line break and the mtime of ``path``.
+
+    Files without ``literal`` are skipped before being decoded, like
+    binary, undecodable and very large files.
+    """
+    try:
+        with open(path, "rb") as fh:
+            info = os.fstat(fh.fileno())
+            if info.st_size == 0 or info.st_size > MAX_FILE_SIZE:
+                return None
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                ignore_case = bool(regex.flags & re.IGNORECASE)
+                if not has_literal(mm, literal, ignore_case):
+                    return None
+                if mm.find(b"\0", 0, 1024) >= 0:
+                    return None
+                text = mm[:].decode("utf-8")
+    except (OSError, ValueError):
+        # ``UnicodeDecodeError`` is a ``ValueError``.
+        return None
+    newline = "\r\n" if "\r\n" in text else "\n"
+    return text.replace("\r\n", "\n"), newline, info.st_mtime_ns
+
+
+def scan_files(
+    items: list[tuple[str, set[int] | None]],
+    regex: re.Pattern,
+    parts: tuple,
+    replace_all: bool,
+) -> list[tuple[int, int, list[tuple[int, str, str]]]]:
+    """Return the mtime, the number of matches and the changed lines.
+
+    There is one result for each ``(path, lines)`` of ``items``.
+    """
+    results = []
+    literal = get_literal(regex)
+    for path, lines in items:
+        read = _read(path, regex, literal)
+        if read is None:
+            results.append((0, 0, []))
+            continue
+        text, _, mtime = read
+        spans, hunks = substitute_text(text, regex, parts, replace_all, lines)
+        results.append((mtime, len(spans), hunks))
+    return results
+
+
+def rewrite_files(
+    items: list[tuple[str, set[int] | None, int]],
+    regex: re.Pattern,
+    parts: tuple,
+    replace_all: bool,
+) -> list[int | None]:
+    """Substitute in each ``(path, lines, mtime)`` and write it back.
+
+    Returns:
+        The number of substitutions in each file, ``None`` for a file
+        changed since it was scanned or that could not be written.
+    """
+    results = []
+    literal = get_literal(regex)
+    for path, lines, mtime in items:
+        read = _read(path, regex, literal)
+        if read is None or read[2] != mtime:
+            results.append(None)
+            continue
+        text, newline, _ = read
+        spans = substitute_text(text, regex, parts, replace_all, lines)[0]
+        try:
+            write_atomic(
+                path,
+                replace_spans(text, spans).replace("\n", newline),
+                keep_mode=True,
+            )
+        except OSError:
+            results.append(None)
+            continue
+        results.append(len(spans))
+    return results
+
+
+class ProjectSubstitute:
+    """Substitution over many files, scanned first and then applied.
+
+    Open files are handled by the caller from their documents. The files
+    on disk are scanned and rewritten in chunks on the worker pool.
+
+    Args:
+        targets: Lines to change in each file on disk, ``None`` for all.
+        regex: Compiled pattern.
+        parts: Compiled replacement.
+        replace_all: Replace every match of a line, like the ``g`` flag.
+        executor: Pool handling the files; see :func:`run_in_chunks`.
+    """
+
+    def __init__(
+        self,
+        targets: dict[str, set[int] | None],
+        regex: re.Pattern,
+        parts: tuple,
+        replace_all: bool,
+        executor: Executor | None = None,
+    ) -> None:
+        self.targets = targets
+        self.regex = regex
+        self.parts = parts
+        self.replace_all = replace_all
+        self.executor = executor
+        self.hunks: list[Hunk] = []
+        self.count = 0
+        self._mtimes: dict[str, int] = {}
+
+    def scan(self) -> list[Hunk]:
+        """Find the changed lines of the files, in file order."""
+        items = list(self.targets.items())
+        results = run_in_chunks(
+            scan_files,
+            items,
+            self.regex,
+            self.parts,
+            self.replace_all,
+            executor=self.executor,
+        )
+        self.hunks = []
+        self.count = 0
+        self._mtimes = {}
+        for (path, _), (mtime, count, hunks) in zip(items, results):
+            if hunks:
+                self.count += count
+                self._mtimes[path] = mtime
+                self.hunks.extend((path, *hunk) for hunk in hunks)
+        return self.hunks
+
+    def apply(self) -> tuple[int, int, int]:
+        """Write the scanned files.
+
+        Returns:
+            The number of substitutions, of changed files and of files
+            skipped because they changed since the scan.
+        """
+        items = [
+            (path, self.targets[path], mtime) for path, mtime in self._mtimes.items()
+        ]
+        results = run_in_chunks(
+            rewrite_files,
+            items,
+            self.regex,
+            self.parts,
+            self.replace_all,
+            executor=self.executor,
+        )
+        done = [count for count in results if count is not None]
+        return sum(done), len(done), len(results) - len(done)
+
+
+class SubstitutePreviewDialog(PopupTableDialog):
+    """Dialog listing the lines changed by ``:cdo s///c``; Enter applies them.
+
+    Only the visible rows are formatted, so long lists open quickly.
+    """
+
+    _MIN_WIDTH = 1000
+    _MAX_HEIGHT = 600
+
+    def __init__(self, hunks: list[Hunk], parent=None) -> None:
+        super().__init__(
+            "Substitute Preview",
+            parent=parent,
+            headers=["File", "Line", "Before", "After"],
+            min_width=self._MIN_WIDTH,
+            max_height=self._MAX_HEIGHT,
+        )
+        self.confirmed = False
+        self.list_model.formatter = lambda hunk: (
+            osp.basename(hunk[0]),
+            str(hunk[1] + 1),
+            hunk[2].strip(),
+            hunk[3].strip(),
+        )
+        self.list_model.alignments = {1: Qt.AlignRight | Qt.AlignVCenter}
+        self.list_model.set_rows(hunks)
+        if hunks:
+            self.list_viewer.setCurrentIndex(self.list_model.index(0, 0))
+            self.list_viewer.selectRow(0)
+
+    def accept(self) -> None:
+        """Confirm the substitution and close the dialog."""
+        self.confirmed = True
+        super().accept()
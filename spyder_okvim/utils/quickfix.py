@@ -0,0 +1,342 @@
+"""Quickfix list filled by ``:vimgrep`` and its popup."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import glob
+import os
+import os.path as osp
+import re
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Callable
+
+# Third Party Libraries
+from qtpy.QtCore import Qt
+
+# Project Libraries
+from spyder_okvim.utils.fuzzy_matcher import get_executor
+from spyder_okvim.utils.list_dialog import PopupTableDialog
+from spyder_okvim.utils.substitute import split_delimited
+from spyder_okvim.utils.vim_regex import match_span
+
+# Files on disk are sent to the workers in chunks of this size. Fewer files
+# are handled without the workers.
+CHUNK_SIZE = 64
+# Larger files are skipped.
+MAX_FILE_SIZE = 4 * 1024 * 1024
+RE_FLAGS = re.compile(r"([gj]*)(?:\s+|$)")
+RE_FILE_SEPARATOR = re.compile(r"(?<!\\)\s+")
+
+
+@dataclass
+class QuickfixEntry:
+    file: str
+    pos: int
+    line: int
+    col: int
+    text: str
+
+
+class QuickfixList:
+    """Entries of the quickfix list and the current one.
+
+    The positions of the entries follow the edits of their open documents,
+    like the jumps of the jump list.
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[QuickfixEntry] = []
+        self.index: int = -1
+        self._files: dict[str, list[QuickfixEntry]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def files(self) -> list[str]:
+        """Return the files having entries."""
+        return list(self._files)
+
+    def set_entries(self, entries: list[QuickfixEntry]) -> None:
+        """Replace the list; no entry is current until the first jump."""
+        self.entries = entries
+        self.index = -1
+        self._files = {}
+        for entry in entries:
+            self._files.setdefault(entry.file, []).append(entry)
+
+    def select(self, index: int) -> QuickfixEntry | None:
+        """Make the entry ``index`` current and return it."""
+        if not 0 <= index < len(self.entries):
+            return None
+        self.index = index
+        return self.entries[index]
+
+    def move(self, count: int) -> QuickfixEntry | None:
+        """Move ``count`` entries forward, backward if negative.
+
+        The move stops at the first or the last entry. ``None`` is returned
+        when the current entry is already there.
+        """
+        if self.index < 0:
+            # The first jump goes to the first entry.
+            index = count - 1 if count > 0 else 0
+        else:
+            index = self.index + count
+        index = min(max(index, 0), len(self.entries) - 1)
+        if index == self.index:
+            return None
+        return self.select(index)
+
+    def sync_positions(self, file: str, to_pos: Callable[[int, int], int]) -> None:
+        """Compute again the positions of ``file`` from their line and column."""
+        for entry in self._files.get(file, ()):
+            entry.pos = to_pos(entry.line, entry.col)
+
+    def sync_lines(
+        self, file: str, to_line_col: Callable[[int], tuple[int, int]]
+    ) -> None:
+        """Compute again the lines and columns of ``file`` from their positions."""
+        for entry in self._files.get(file, ()):
+            entry.line, entry.col = to_line_col(entry.pos)
+
+    def shift(self, file: str, position: int, removed: int, added: int) -> None:
+        """Move the entries of ``file`` after an edit.
+
+        Args:
+            file: Edited file.
+            position: Offset where the edit starts.
+            removed: Number of characters removed.
+            added: Number of characters inserted.
+        """
+        entries = self._files.get(file)
+        if added == removed or not entries:
+            return
+        end = position + removed
+        delta = added - removed
+        for entry in entries:
+            if entry.pos >= end:
+                entry.pos += delta
+            elif entry.pos > position:
+                entry.pos = position
+
+
+def parse_vimgrep(arg: str) -> tuple[str, str, list[str]]:
+    """Split the argument of ``:vimgrep``, like ``/pat/gj *.py``.
+
+    Without a delimiter the pattern is the first word. Spaces in file names
+    are escaped with a backslash.
+
+    Returns:
+        The pattern, the flags and the file arguments.
+
+    Raises:
+        ValueError: If the pattern or the files are missing.
+    """
+    arg = arg.strip()
+    if not arg:
+        raise ValueError("E683: File name missing or invalid pattern")
+    if arg[0].isalnum() or arg[0] in '\\"|':
+        pattern, _, rest = arg.partition(" ")
+        flags = ""
+    else:
+        pattern, rest = split_delimited(arg[1:], arg[0])
+        match = RE_FLAGS.match(rest or "")
+        if match is None:
+            raise ValueError("E683: File name missing or invalid pattern")
+        flags = match[1]
+        rest = rest[match.end() :]
+    files = [name.replace("\\ ", " ") for name in RE_FILE_SEPARATOR.split(rest) if name]
+    if not files:
+        raise ValueError("E683: File name missing or invalid pattern")
+    return pattern, flags, files
+
+
+def expand_files(
+    names: list[str], current: str | None, open_files: list[str], root: str
+) -> list[str]:
+    """Return the files of the ``:vimgrep`` arguments, in order and once each.
+
+    ``%`` is the current file, ``##`` every open file and the other names
+    are open files or glob patterns relative to ``root``; ``**`` matches
+    directories recursively.
+    """
+    files = []
+    for name in names:
+        if name == "%":
+            found = [current] if current else []
+        elif name == "##":
+            found = open_files
+        else:
+            path = osp.normpath(osp.join(root, osp.expanduser(name)))
+            if path in open_files:
+                # An open file may not be saved yet.
+                found = [path]
+            else:
+                found = sorted(
+                    match
+                    for match in glob.glob(path, recursive=True)
+                    if osp.isfile(match)
+                )
+        files.extend(osp.normpath(osp.abspath(path)) for path in found)
+    return list(dict.fromkeys(files))
+
+
+def grep_text(
+    text: str, regex: re.Pattern, all_matches: bool = False
+) -> list[tuple[int, int, int, str]]:
+    """Return ``(line, col, pos, text)`` of the matches of ``regex``.
+
+    Lines and columns are zero based and ``pos`` is the offset in ``text``.
+    Only the first match of a line is kept unless ``all_matches``.
+    """
+    hits = []
+    offset = 0
+    search = regex.search
+    finditer = regex.finditer
+    for line_no, line in enumerate(text.split("\n")):
+        if all_matches:
+            cols = [match_span(match)[0] for match in finditer(line)]
+        else:
+            match = search(line)
+            cols = [] if match is None else [match_span(match)[0]]
+        hits.extend((line_no, col, offset + col, line) for col in cols)
+        offset += len(line) + 1
+    return hits
+
+
+def grep_file(
+    path: str, regex: re.Pattern, all_matches: bool = False
+) -> list[tuple[int, int, int, str]]:
+    """Return the matches of ``regex`` in the file ``path``.
+
+    Binary, undecodable and very large files are skipped.
+    """
+    try:
+        if os.stat(path).st_size > MAX_FILE_SIZE:
+            return []
+        with open(path, "r", encoding="utf-8", newline="") as fh:
+            text = fh.read()
+    except (OSError, UnicodeDecodeError):
+        return []
+    if "\0" in text[:1024]:
+        return []
+    return grep_text(text.replace("\r\n", "\n").replace("\r", "\n"), regex, all_matches)
+
+
+def grep_files(
+    paths: list[str], regex: re.Pattern, all_matches: bool = False
+) -> list[list[tuple[int, int, int, str]]]:
+    """Return the matches of ``regex`` in each of ``paths``."""
+    return [grep_file(path, regex, all_matches) for path in paths]
+
+
+def run_in_chunks(
+    func: Callable[..., list], items: list, *args, executor: Executor | None = None
+) -> list:
+    """Return the results of ``func(items, *args)``, in the order of ``items``.
+
+    Many items are split into chunks run by ``executor``, the shared process
+    pool by default. A few items are handled here.
+    """
+    if len(items) <= CHUNK_SIZE:
+        return func(items, *args)
+    executor = executor or get_executor()
+    futures = [
+        executor.submit(func, items[i : i + CHUNK_SIZE], *args)
+        for i in range(0, len(items), CHUNK_SIZE)
+    ]
+    return [result for future in futures for result in future.result()]
+
+
+def vimgrep(
+    files: list[str],
+    buffers: dict[str, str],
+    regex: re.Pattern,
+    all_matches: bool = False,
+    executor: Executor | None = None,
+) -> list[QuickfixEntry]:
+    """Search ``files`` and return the quickfix entries in file order.
+
+    Args:
+        files: Files to search.
+        buffers: Text of the open files, searched instead of the disk.
+        regex: Compiled pattern.
+        all_matches: Keep every match of a line, like the ``g`` flag.
+        executor: Pool searching the files on disk; see :func:`run_in_chunks`.
+    """
+    hits = {
+        path: grep_text(buffers[path], regex, all_matches)
+        for path in files
+        if path in buffers
+    }
+    on_disk = [path for path in files if path not in buffers]
+    hits.update(
+        zip(
+            on_disk,
+            run_in_chunks(grep_files, on_disk, regex, all_matches, executor=executor),
+        )
+    )
+    return [
+        QuickfixEntry(path, pos, line, col, text)
+        for path in files
+        for line, col, pos, text in hits[path]
+    ]
+
+
+class QuickfixDialog(PopupTableDialog):
+    """Dialog showing the quickfix list, like ``:copen``.
+
+    Only the visible rows are formatted, so long lists open quickly.
+    """
+
+    _MIN_WIDTH = 1000
+    _MAX_HEIGHT = 600
+
+    def __init__(self, vim_status, parent=None) -> None:
+        super().__init__(
+            "Quickfix List",
+            parent=parent,
+            headers=["File", "Line", "Col", "Text"],
+            min_width=self._MIN_WIDTH,
+            max_height=self._MAX_HEIGHT,
+        )
+        self.vim_status = vim_status
+        self.quickfix = vim_status.quickfix
+        self.index_selected: int | None = None
+
+        self.list_model.formatter = self._format_row
+        self.list_model.alignments = {
+            1: Qt.AlignRight | Qt.AlignVCenter,
+            2: Qt.AlignRight | Qt.AlignVCenter,
+        }
+        self.list_model.set_rows(self.quickfix.entries)
+        if self.quickfix.entries:
+            row = max(self.quickfix.index, 0)
+            self.list_viewer.setCurrentIndex(self.list_model.index(row, 0))
+            self.list_viewer.selectRow(row)
+
+    def _format_row(self, entry: QuickfixEntry) -> tuple[str, ...]:
+        line, col, text = entry.line, entry.col, entry.text
+        document = self.vim_status.get_open_document(entry.file)
+        if document is not None:
+            # Open documents are tracked, so their positions are up to date.
+            block = document.findBlock(entry.pos)
+            if block.isValid():
+                line, col, text = (
+                    block.blockNumber(),
+                    entry.pos - block.position(),
+                    block.text(),
+                )
+        return osp.basename(entry.file), str(line + 1), str(col + 1), text.strip()
+
+    def get_selected_index(self) -> int | None:
+        """Return the index of the entry chosen by the user."""
+        return self.index_selected
+
+    def accept(self) -> None:
+        """Select the current entry and close the dialog."""
+        if self.list_model.rowCount():
+            self.index_selected = self.list_viewer.currentIndex().row()
+        super().accept()
@@ -10,6 +10,7 @@ from spyder.config.manager import CONF
 
 from spyder_okvim.spyder.config import CONF_SECTION
 from spyder_okvim.utils.motion import MotionInfo, MotionType
+from spyder_okvim.utils.vim_regex import compile_qt_pattern, escape, has_uppercase
 
 
 class SearchHelper:
@@ -25,43 +26,45 @@ class SearchHelper:
     # Search in document
     # ------------------------------------------------------------------
     def search(self, text: str) -> None:
-        """Highlight all occurrences of ``text`` in the document."""
+        """Highlight all occurrences of the Vim pattern ``text``."""
         editor = self.get_editor()
-        cursor = QTextCursor(editor.document())
+        document = editor.document()
+        cursor = QTextCursor(document)
         cursor.movePosition(QTextCursor.Start)
 
-        is_ignorecase = CONF.get(CONF_SECTION, "ignorecase")
-        is_smartcase = CONF.get(CONF_SECTION, "smartcase")
-
-        option = None
-        if is_ignorecase:
-            self.vim_status.search.ignorecase = True
-            if is_smartcase and text.lower() != text:
-                option = QTextDocument.FindCaseSensitively
-                self.vim_status.search.ignorecase = False
-        else:
-            option = QTextDocument.FindCaseSensitively
-            self.vim_status.search.ignorecase = False
+        ignore_case = CONF.get(CONF_SECTION, "ignorecase") and not (
+            CONF.get(CONF_SECTION, "smartcase") and has_uppercase(text)
+        )
+        self.vim_status.search.ignorecase = ignore_case
+        regex = compile_qt_pattern(text, ignore_case)
+        # Qt 5 sets the case option of the expression from these flags, so
+        # they follow the expression, where \c and \C override the options.
+        options = QTextDocument.FindFlags()
+        if not regex.patternOptions() & QRegularExpression.CaseInsensitiveOption:
+            options |= QTextDocument.FindCaseSensitively
 
         back = self.vim_status.search.color_bg
         fore = self.vim_status.search.color_fg
         search_stack = []
-        while True:
-            if option:
-                cursor = editor.document().find(QRegularExpression(text), cursor, options=option)
-            else:
-                cursor = editor.document().find(QRegularExpression(text), cursor)
-
-            if cursor.position() != -1:
-                selection = QTextEdit.ExtraSelection()
-                selection.format.setBackground(back)
-                selection.format.setForeground(fore)
-                selection.cursor = cursor
-                search_stack.append(selection)
-            else:
+        end = document.characterCount() - 1
+        while regex.isValid():
+            cursor = document.find(regex, cursor, options)
+            if cursor.isNull():
                 break
-
-        self.vim_status.cursor.set_extra_selections("vim_search", [i for i in search_stack])
+            if not cursor.hasSelection():
+                # Step over an empty match, which would be found again.
+                if cursor.position() >= end:
+                    break
+                cursor.setPosition(cursor.position() + 1)
+                continue
+
+            selection = QTextEdit.ExtraSelection()
+            selection.format.setBackground(back)
+            selection.format.setForeground(fore)
+            selection.cursor = cursor
+            search_stack.append(selection)
+
+        self.vim_status.cursor.set_extra_selections("vim_search", search_stack)
         self.vim_status.search.selection_list = search_stack
         self.vim_status.search.txt_searched = text
 
@@ -98,12 +101,16 @@ class SearchHelper:
         editor = self.get_editor()
         return editor.get_current_word()
 
+    def _search_word(self, word: str) -> None:
+        # The word is matched whole and with its case.
+        self.search(rf"\<{escape(word)}\>\C")
+
     def asterisk(self, num: int = 1, num_str: str = "") -> MotionInfo:
         """Search forward for the word under the cursor."""
         word = self._get_word_under_cursor()
         if word is None:
             return self._set_motion_info(None)
-        self.search(fr"\b{word}\b")
+        self._search_word(word)
         return self.n(num=num)
 
     def sharp(self, num: int = 1, num_str: str = "") -> MotionInfo:
@@ -111,5 +118,5 @@ class SearchHelper:
         word = self._get_word_under_cursor()
         if word is None:
             return self._set_motion_info(None)
-        self.search(fr"\b{word}\b")
+        self._search_word(word)
         return self.N(num=num)
@@ -0,0 +1,167 @@
+"""Keep the state of the editing session between Spyder restarts."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import json
+import os
+import os.path as osp
+from collections import OrderedDict
+
+# Third Party Libraries
+from qtpy.QtCore import QTimer
+
+# Project Libraries
+from spyder_okvim.utils.background_writer import BackgroundWriter, write_atomic
+
+# Entries kept per category; the oldest ones are dropped first.
+CATEGORY_SIZES = {
+    "search": 100,
+    "cmd": 100,
+    "register": 40,
+    "position": 500,
+}
+# Registers larger than this are not saved.
+MAX_REGISTER_SIZE = 64 * 1024
+# The log is compacted when it holds this many records more than needed.
+MAX_STALE_RECORDS = 1000
+# Delay used to batch the records of successive changes.
+APPEND_DELAY_MS = 1000
+
+
+class SessionStore:
+    """Histories, registers and last file positions saved on disk.
+
+    Every change is appended to a JSON lines log as ``[category, key,
+    value]``. The log is read on first use and rewritten with the live
+    entries once it holds too many stale records, so its size stays
+    bounded by :data:`CATEGORY_SIZES`. The records are batched and
+    written on a background thread after a short delay.
+    """
+
+    def __init__(self, log_file: str) -> None:
+        self.log_file = log_file
+        self.data: dict[str, OrderedDict] = {
+            category: OrderedDict() for category in CATEGORY_SIZES
+        }
+        self._loaded = False
+        self._records = 0
+        self._pending: list[list] = []
+        self._writer = BackgroundWriter()
+
+        self.timer_append = QTimer()
+        self.timer_append.setSingleShot(True)
+        self.timer_append.setInterval(APPEND_DELAY_MS)
+        self.timer_append.timeout.connect(self._append_pending)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, category: str, key: str, default=None):
+        """Return the value stored for ``key`` in ``category``."""
+        self._ensure_loaded()
+        return self.data[category].get(key, default)
+
+    def items(self, category: str) -> list[tuple[str, object]]:
+        """Return the entries of ``category`` from the oldest."""
+        self._ensure_loaded()
+        return list(self.data[category].items())
+
+    def keys(self, category: str) -> list[str]:
+        """Return the keys of ``category`` from the oldest."""
+        self._ensure_loaded()
+        return list(self.data[category])
+
+    def put(self, category: str, key: str, value=None) -> None:
+        """Store ``value`` for ``key`` and make it the newest entry."""
+        self._ensure_loaded()
+        entries = self.data[category]
+        if entries and next(reversed(entries)) == key and entries[key] == value:
+            return
+        self._set(category, key, value)
+        self._records += 1
+        if self._records > self._live_records() + MAX_STALE_RECORDS:
+            self.compact()
+            return
+        self._pending.append([category, key, value])
+        self.timer_append.start()
+
+    def clear(self) -> None:
+        """Forget every entry in memory and on disk."""
+        for entries in self.data.values():
+            entries.clear()
+        self._loaded = True
+        self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log with the live entries only."""
+        records = [
+            [category, key, value]
+            for category, entries in self.data.items()
+            for key, value in entries.items()
+        ]
+        # The rewrite holds the pending records too.
+        self.timer_append.stop()
+        self._pending = []
+        self._records = len(records)
+        self._writer.submit(self._rewrite, records, key=self.log_file)
+
+    def flush(self) -> None:
+        """Write the pending records now and wait for the writes."""
+        if self.timer_append.isActive():
+            self.timer_append.stop()
+            self._append_pending()
+        self._writer.join()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        broken = False
+        try:
+            with open(self.log_file, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        category, key, value = json.loads(line)
+                    except (ValueError, TypeError):
+                        broken = True
+                        continue
+                    if category in self.data:
+                        self._set(category, key, value)
+                    self._records += 1
+        except OSError:
+            return
+        if broken:
+            # Drop the records cut by a crash before appending again.
+            self.compact()
+
+    def _set(self, category: str, key: str, value) -> None:
+        entries = self.data[category]
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > CATEGORY_SIZES[category]:
+            entries.popitem(last=False)
+
+    def _live_records(self) -> int:
+        return sum(len(entries) for entries in self.data.values())
+
+    def _append_pending(self) -> None:
+        if self._pending:
+            records, self._pending = self._pending, []
+            self._writer.submit(self._append, records)
+
+    def _append(self, records: list[list]) -> None:
+        lines = [json.dumps(record) + "\n" for record in records]
+        try:
+            os.makedirs(osp.dirname(self.log_file), exist_ok=True)
+            with open(self.log_file, "a", encoding="utf-8") as fh:
+                fh.writelines(lines)
+        except OSError:
+            pass
+
+    def _rewrite(self, records: list[list]) -> None:
+        lines = [json.dumps(record) + "\n" for record in records]
+        write_atomic(self.log_file, "".join(lines))
@@ -0,0 +1,310 @@
+"""Parse, run and preview the ``:substitute`` command."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import re
+from functools import lru_cache
+from typing import Callable, Iterator
+
+# Third Party Libraries
+from qtpy.QtCore import QCoreApplication, QEvent, QObject, QRectF
+from qtpy.QtGui import QColor, QPainter
+from qtpy.QtWidgets import QPlainTextEdit, QWidget
+
+# Project Libraries
+from spyder_okvim.utils.qtcompat import text_width
+from spyder_okvim.utils.vim_regex import match_group, match_span
+
+RE_FLAGS = re.compile(r"(&?[cegiInp#lr]*)\s*(\d*)\s*$")
+REPLACE_ESCAPES = {"n": "\n", "r": "\n", "t": "\t"}
+CASE_OPS = "ulULeE"
+
+# Parts of a compiled replacement.
+LITERAL = 0
+GROUP = 1
+CASE = 2
+
+
+def split_delimited(text: str, delimiter: str) -> tuple[str, str | None]:
+    """Return the text before the first unescaped ``delimiter`` and the rest.
+
+    The rest is ``None`` when there is no delimiter. An escaped delimiter
+    loses its backslash.
+    """
+    chars = []
+    idx = 0
+    while idx < len(text):
+        ch = text[idx]
+        if ch == "\\" and idx + 1 < len(text):
+            nxt = text[idx + 1]
+            chars.append(nxt if nxt == delimiter else ch + nxt)
+            idx += 2
+            continue
+        if ch == delimiter:
+            return "".join(chars), text[idx + 1 :]
+        chars.append(ch)
+        idx += 1
+    return "".join(chars), None
+
+
+def parse_substitute(arg: str) -> tuple[str, str | None, str, int] | None:
+    """Parse the argument of ``:s``, like ``/pat/rep/g 3``.
+
+    Returns:
+        The pattern, the replacement, the flags and the count, or ``None``
+        when ``arg`` is not valid. The replacement is ``None`` while only
+        the pattern has been typed.
+    """
+    if not arg or arg[0].isalnum() or arg[0] in '\\"| ':
+        return None
+    delimiter = arg[0]
+    pattern, rest = split_delimited(arg[1:], delimiter)
+    if rest is None:
+        return pattern, None, "", 0
+    replacement, rest = split_delimited(rest, delimiter)
+    match = RE_FLAGS.match(rest or "")
+    if match is None:
+        return None
+    flags, count = match.groups()
+    return pattern, replacement, flags, int(count) if count else 0
+
+
+@lru_cache(maxsize=64)
+def compile_replacement(replacement: str, previous: str = "") -> tuple:
+    """Split a Vim replacement string into literals, groups and case changes.
+
+    ``&`` and ``\\0`` insert the match, ``\\1`` to ``\\9`` the groups, ``~``
+    the ``previous`` replacement, ``\\r`` and ``\\n`` a line break and
+    ``\\u``, ``\\l``, ``\\U``, ``\\L``, ``\\e``, ``\\E`` change the case.
+    """
+    parts = []
+    literal = []
+
+    def flush():
+        if literal:
+            parts.append((LITERAL, "".join(literal)))
+            literal.clear()
+
+    idx = 0
+    while idx < len(replacement):
+        ch = replacement[idx]
+        idx += 1
+        if ch == "&":
+            flush()
+            parts.append((GROUP, 0))
+        elif ch == "~":
+            literal.append(previous)
+        elif ch == "\\" and idx < len(replacement):
+            nxt = replacement[idx]
+            idx += 1
+            if nxt.isdigit():
+                flush()
+                parts.append((GROUP, int(nxt)))
+            elif nxt in CASE_OPS:
+                flush()
+                parts.append((CASE, nxt))
+            else:
+                literal.append(REPLACE_ESCAPES.get(nxt, nxt))
+        else:
+            literal.append(ch)
+    flush()
+    return tuple(parts)
+
+
+def expand(parts: tuple, match: re.Match) -> str:
+    """Return the replacement of ``match`` for the compiled ``parts``."""
+    out = []
+    one = ""
+    span = ""
+    for kind, value in parts:
+        if kind == CASE:
+            if value in "ul":
+                one = value
+            else:
+                span = value if value in "UL" else ""
+            continue
+        text = value if kind == LITERAL else (match_group(match, value) or "")
+        if span == "U":
+            text = text.upper()
+        elif span == "L":
+            text = text.lower()
+        if one and text:
+            first = text[0].upper() if one == "u" else text[0].lower()
+            text = first + text[1:]
+            one = ""
+        out.append(text)
+    return "".join(out)
+
+
+def iter_matches(line: str, regex: re.Pattern, replace_all: bool) -> Iterator[re.Match]:
+    """Yield the matches of ``regex`` to substitute in ``line``."""
+    for match in regex.finditer(line):
+        yield match
+        if not replace_all:
+            return
+
+
+def substitute_spans(
+    lines: list[str],
+    regex: re.Pattern,
+    replace: Callable[[re.Match], str],
+    replace_all: bool,
+) -> tuple[list[tuple[int, int, str]], list[int]]:
+    """Return the replacements of ``:s`` over ``lines`` in one pass.
+
+    Returns:
+        The ``(start, end, text)`` replacements, with offsets in the text of
+        the lines joined by ``\\n``, and the indexes of the changed lines.
+    """
+    spans = []
+    changed = []
+    offset = 0
+    for idx, line in enumerate(lines):
+        n_spans = len(spans)
+        for match in iter_matches(line, regex, replace_all):
+            start, end = match_span(match)
+            spans.append((offset + start, offset + end, replace(match)))
+        if len(spans) > n_spans:
+            changed.append(idx)
+        offset += len(line) + 1
+    return spans, changed
+
+
+def substitute_line(
+    line: str,
+    regex: re.Pattern,
+    replace: Callable[[re.Match], str] | None,
+    replace_all: bool,
+) -> tuple[str, list[tuple[int, int]]]:
+    """Return ``line`` after ``:s`` and the spans of the replaced parts.
+
+    Without ``replace`` the line is kept and the spans are the matches.
+    """
+    pieces = []
+    segments = []
+    last = 0
+    size = 0
+    for match in iter_matches(line, regex, replace_all):
+        start, end = match_span(match)
+        text = line[start:end] if replace is None else replace(match)
+        pieces.append(line[last:start])
+        size += start - last
+        pieces.append(text)
+        segments.append((size, size + len(text)))
+        size += len(text)
+        last = end
+    pieces.append(line[last:])
+    return "".join(pieces), segments
+
+
+class SubstitutePreview(QObject):
+    """Draw the result of the ``:s`` being typed over the visible lines.
+
+    The document is not changed; the substituted lines are painted over
+    the original ones.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.editor: QPlainTextEdit | None = None
+        self.color_fg = QColor("#A9B7C6")
+        self.color_bg = QColor("#30652F")
+        # (block number, new text, replaced spans)
+        self.lines: list[tuple[int, str, list[tuple[int, int]]]] = []
+
+    def show(
+        self,
+        editor: QPlainTextEdit,
+        line_range: tuple[int, int],
+        regex: re.Pattern,
+        replace: Callable[[re.Match], str] | None,
+        replace_all: bool,
+    ) -> None:
+        """Preview the substitution on the visible lines of ``line_range``."""
+        if self.editor is not editor:
+            self.clear()
+            self.editor = editor
+            editor.viewport().installEventFilter(self)
+
+        self.lines = []
+        first, last = line_range
+        viewport_height = editor.viewport().height()
+        offset = editor.contentOffset()
+        block = editor.firstVisibleBlock()
+        while block.isValid() and block.blockNumber() <= last:
+            top = editor.blockBoundingGeometry(block).translated(offset).top()
+            if top > viewport_height:
+                break
+            if block.blockNumber() >= first:
+                text, segments = substitute_line(
+                    block.text(), regex, replace, replace_all
+                )
+                if segments:
+                    self.lines.append((block.blockNumber(), text, segments))
+            block = block.next()
+        editor.viewport().update()
+
+    def clear(self) -> None:
+        """Remove the preview."""
+        editor = self.editor
+        self.editor = None
+        self.lines = []
+        if editor is not None:
+            editor.viewport().removeEventFilter(self)
+            editor.viewport().update()
+
+    def eventFilter(self, viewport: QWidget, event: QEvent) -> bool:
+        if event.type() != QEvent.Paint or self.editor is None:
+            return False
+        # Paint after the editor so that the preview stays on top.
+        viewport.removeEventFilter(self)
+        QCoreApplication.sendEvent(viewport, event)
+        viewport.installEventFilter(self)
+
+        editor = self.editor
+        document = editor.document()
+        fm = editor.fontMetrics()
+        highlighter = getattr(editor, "highlighter", None)
+        if highlighter is not None:
+            background = highlighter.get_background_color()
+            foreground = highlighter.get_foreground_color()
+        else:
+            background = editor.palette().base().color()
+            foreground = editor.palette().text().color()
+
+        with QPainter(viewport) as painter:
+            painter.setFont(editor.font())
+            for block_no, text, segments in self.lines:
+                block = document.findBlockByNumber(block_no)
+                if not block.isValid():
+                    continue
+                tc = editor.textCursor()
+                tc.setPosition(block.position())
+                rect = QRectF(editor.cursorRect(tc))
+                rect.setRight(viewport.width())
+                rect.setHeight(fm.height())
+                painter.fillRect(rect, background)
+
+                x = rect.left()
+                last = 0
+                for start, end in segments + [(len(text), len(text))]:
+                    plain = text[last:start]
+                    painter.setPen(foreground)
+                    painter.drawText(
+                        QRectF(x, rect.top(), rect.width(), fm.height()), 0, plain
+                    )
+                    x += text_width(fm, plain)
+                    changed = text[start:end]
+                    if changed:
+                        width = text_width(fm, changed)
+                        painter.fillRect(
+                            QRectF(x, rect.top(), width, fm.height()), self.color_bg
+                        )
+                        painter.setPen(self.color_fg)
+                        painter.drawText(
+                            QRectF(x, rect.top(), width, fm.height()), 0, changed
+                        )
+                        x += width
+                    last = end
+        return True
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""Background index of the Python symbols defined in a project."""
+from __future__ import annotations
+
+# Standard Libraries
+import ast
+import hashlib
+import json
+import os
+import os.path as osp
+import re
+from concurrent.futures import Executor, Future
+
+# Third Party Libraries
+from qtpy.QtCore import QObject, Signal
+
+from .background_writer import BackgroundWriter, write_atomic
+from .fuzzy_matcher import get_executor
+
+PYTHON_EXTENSIONS = (".py", ".pyw", ".pyi")
+# Files are sent to the workers in chunks of this size.
+CHUNK_SIZE = 128
+# Larger files are not parsed.
+MAX_FILE_SIZE = 2 * 1024 * 1024
+# Caches of another version are parsed again; 2 has the columns of the names.
+CACHE_VERSION = 2
+
+# The keywords before the name of a function or a class.
+RE_DEF_KEYWORD = re.compile(r"(?:async\s+)?(?:def|class)\s+")
+
+# (name, kind, line, column, container)
+Symbol = tuple[str, str, int, int, str]
+
+
+def extract_symbols(source: str | bytes) -> list[Symbol]:
+    """Return the classes, functions, methods and globals of ``source``.
+
+    Lines and columns are zero based, and the column of a function or a
+    class is the one of its name. ``container`` is the dotted name of the
+    enclosing classes.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    if isinstance(source, bytes):
+        source = source.decode("utf-8", "replace")
+    symbols: list[Symbol] = []
+    _collect(tree.body, "", True, symbols, re.split(r"\r\n?|\n", source))
+    return symbols
+
+
+def _name_col(node, lines: list[str]) -> int:
+    """Return the column of the name after ``def`` or ``class``."""
+    match = RE_DEF_KEYWORD.match(lines[node.lineno - 1], node.col_offset)
+    return match.end() if match else node.col_offset
+
+
+def _collect(
+    body: list, container: str, is_module: bool, out: list, lines: list[str]
+) -> None:
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            col = _name_col(node, lines)
+            out.append((node.name, "class", node.lineno - 1, col, container))
+            inner = f"{container}.{node.name}" if container else node.name
+            _collect(node.body, inner, False, out, lines)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            kind = "function" if is_module else "method"
+            col = _name_col(node, lines)
+            out.append((node.name, kind, node.lineno - 1, col, container))
+        elif is_module and isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in _target_names(target):
+                    out.append(
+                        (name.id, "variable", name.lineno - 1, name.col_offset, "")
+                    )
+        elif is_module and isinstance(node, (ast.If, ast.Try)):
+            # Definitions guarded by ``if`` or ``try`` are still module level.
+            blocks = [node.body, node.orelse]
+            if isinstance(node, ast.Try):
+                blocks += [node.finalbody] + [h.body for h in node.handlers]
+            for block in blocks:
+                _collect(block, container, True, out, lines)
+
+
+def _target_names(target) -> list[ast.Name]:
+    if isinstance(target, ast.Name):
+        return [target]
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return [name for elt in target.elts for name in _target_names(elt)]
+    return []
+
+
+def index_files(
+    root: str, entries: list[tuple[str, float | None]]
+) -> tuple[dict[str, list], list[str]]:
+    """Parse the files of ``entries`` whose mtime changed.
+
+    Args:
+        root: Project root.
+        entries: Relative paths with the mtime stored in the index.
+
+    Returns:
+        The new ``[mtime, symbols]`` of the changed files and the paths that
+        no longer exist.
+    """
+    updates = {}
+    removed = []
+    for rel_path, known_mtime in entries:
+        path = osp.join(root, rel_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            removed.append(rel_path)
+            continue
+        if stat.st_mtime == known_mtime:
+            continue
+        symbols = []
+        if stat.st_size <= MAX_FILE_SIZE:
+            try:
+                with open(path, "rb") as fh:
+                    symbols = extract_symbols(fh.read())
+            except OSError:
+                pass
+        updates[rel_path] = [stat.st_mtime, symbols]
+    return updates, removed
+
+
+class ProjectSymbolIndex(QObject):
+    """Symbols of the Python files of a project, kept per file mtime.
+
+    Files are parsed in a process pool and only when their mtime differs
+    from the indexed one. The index is cached on disk between sessions.
+    """
+
+    sig_symbols_updated = Signal()
+    _sig_chunk_done = Signal(dict, list)
+
+    def __init__(
+        self,
+        root: str,
+        cache_dir: str | None = None,
+        executor: Executor | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """Create the index.
+
+        Args:
+            root: Project root folder.
+            cache_dir: Folder storing the cache between sessions.
+            executor: Pool parsing the files. Defaults to the shared process
+                pool.
+            parent: Parent object.
+        """
+        super().__init__(parent)
+        self.root = root
+        self.cache_dir = cache_dir
+        self.executor = executor
+        self.files: dict[str, list] = {}
+        self._symbols: list[tuple[str, str, str, int, int]] | None = None
+        self._tags: dict[str, list[tuple[str, int, int]]] | None = None
+        self._futures: list[Future] = []
+        self._pending = 0
+        self._changed = False
+        self._writer = BackgroundWriter()
+        self._sig_chunk_done.connect(self._on_chunk_done)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @property
+    def cache_file(self) -> str | None:
+        """Return the cache file used for this project."""
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+        return osp.join(self.cache_dir, f"symbols_{digest}.json")
+
+    @property
+    def is_busy(self) -> bool:
+        """Return ``True`` while files are being parsed."""
+        return self._pending > 0
+
+    def symbols(self) -> list[tuple[str, str, str, int, int]]:
+        """Return ``(qualname, kind, rel_path, line, col)`` of every symbol."""
+        if self._symbols is None:
+            self._symbols = [
+                (f"{container}.{name}" if container else name, kind, rel, line, col)
+                for rel, (_, symbols) in sorted(self.files.items())
+                for name, kind, line, col, container in symbols
+            ]
+        return self._symbols
+
+    def find_definitions(self, name: str) -> list[tuple[str, int, int]]:
+        """Return ``(path, line, col)`` of the symbols called ``name``.
+
+        This is a ctags-like lookup by unqualified name.
+        """
+        if self._tags is None:
+            tags: dict[str, list[tuple[str, int, int]]] = {}
+            for rel_path, (_, symbols) in self.files.items():
+                path = osp.join(self.root, rel_path)
+                for sym_name, _, line, col, _ in symbols:
+                    tags.setdefault(sym_name, []).append((path, line, col))
+            self._tags = tags
+        return self._tags.get(name, [])
+
+    def update(self, rel_paths: list[str]) -> None:
+        """Index the Python files of ``rel_paths`` and forget the others."""
+        rel_paths = [path for path in rel_paths if path.endswith(PYTHON_EXTENSIONS)]
+        stale = set(self.files).difference(rel_paths)
+        for rel_path in stale:
+            del self.files[rel_path]
+        if stale:
+            self._changed = True
+            self._clear_views()
+        self._submit(
+            [(path, self._mtime(path)) for path in rel_paths], notify=bool(stale)
+        )
+
+    def update_file(self, path: str) -> None:
+        """Index ``path`` again if it belongs to the project and changed."""
+        if not path or not path.endswith(PYTHON_EXTENSIONS):
+            return
+        rel_path = osp.relpath(path, self.root) if osp.isabs(path) else path
+        if rel_path.startswith(".."):
+            return
+        rel_path = rel_path.replace(os.sep, "/")
+        self._submit([(rel_path, self._mtime(rel_path))])
+
+    def stop(self) -> None:
+        """Cancel the files waiting to be parsed and wait for the cache."""
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        self._pending = 0
+        self._writer.join()
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+    def _clear_views(self) -> None:
+        self._symbols = None
+        self._tags = None
+
+    def _mtime(self, rel_path: str) -> float | None:
+        entry = self.files.get(rel_path)
+        return entry[0] if entry else None
+
+    def _submit(self, entries: list, notify: bool = False) -> None:
+        if not entries:
+            if notify:
+                self._finish()
+            return
+        executor = self.executor or get_executor()
+        for i in range(0, len(entries), CHUNK_SIZE):
+            self._pending += 1
+            future = executor.submit(index_files, self.root, entries[i : i + CHUNK_SIZE])
+            future.add_done_callback(self._on_future_done)
+            self._futures.append(future)
+
+    def _on_future_done(self, future: Future) -> None:
+        # Runs in an executor thread; the signal is queued to the GUI thread.
+        if future.cancelled():
+            return
+        try:
+            updates, removed = future.result()
+        except Exception:
+            updates, removed = {}, []
+        self._sig_chunk_done.emit(updates, removed)
+
+    def _on_chunk_done(self, updates: dict, removed: list) -> None:
+        if self._pending == 0:
+            return
+        for rel_path, (mtime, symbols) in updates.items():
+            self.files[rel_path] = [mtime, [tuple(symbol) for symbol in symbols]]
+        for rel_path in removed:
+            self.files.pop(rel_path, None)
+        if updates or removed:
+            self._changed = True
+            self._clear_views()
+        self._pending -= 1
+        if self._pending == 0:
+            self._futures = []
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._changed:
+            self._changed = False
+            self._save_cache()
+        self.sig_symbols_updated.emit()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def load_cache(self) -> None:
+        """Fill the index from the on-disk cache."""
+        cache_file = self.cache_file
+        if not cache_file or not osp.isfile(cache_file):
+            return
+        try:
+            with open(cache_file, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if data.get("root") != self.root or data.get("version") != CACHE_VERSION:
+            return
+        self.files = {
+            rel_path: [mtime, [tuple(symbol) for symbol in symbols]]
+            for rel_path, (mtime, symbols) in data.get("files", {}).items()
+        }
+        self._clear_views()
+
+    def _save_cache(self) -> None:
+        cache_file = self.cache_file
+        if not cache_file:
+            return
+        # The entries are replaced, never changed, so a shallow copy lets
+        # the writer thread dump them while the index goes on.
+        self._writer.submit(
+            self._write_cache, cache_file, self.root, dict(self.files), key=cache_file
+        )
+
+    @staticmethod
+    def _write_cache(cache_file: str, root: str, files: dict) -> None:
+        data = {"version": CACHE_VERSION, "root": root, "files": files}
+        write_atomic(cache_file, json.dumps(data, separators=(",", ":")))
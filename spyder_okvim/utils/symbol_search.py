@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Dialog for locating symbols defined in a project."""
+from __future__ import annotations
+
+# Standard Libraries
+import os.path as osp
+
+# Third Party Libraries
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QWidget
+from spyder.config.gui import get_font
+
+from .file_search import FileSearchLineEdit
+from .fuzzy_matcher import FuzzyMatcher
+from .list_dialog import PopupTableDialog
+from .symbol_index import ProjectSymbolIndex
+
+# Maximum number of rows listed.
+MAX_ROWS = 1000
+
+
+class SymbolSearchDialog(PopupTableDialog):
+    """Dialog used to select a class, function or global of a project."""
+
+    _MIN_WIDTH = 1000
+    _MAX_HEIGHT = 600
+
+    def __init__(
+        self,
+        folder: str | None,
+        symbol_index: ProjectSymbolIndex | None,
+        parent: QWidget | None = None,
+    ) -> None:
+        """Create the dialog.
+
+        Args:
+            folder: Project root.
+            symbol_index: Index providing the symbols.
+            parent: Parent widget for the dialog.
+        """
+        super().__init__(
+            "Symbol Finder",
+            parent=parent,
+            headers=["Symbol", "Kind", "File"],
+            min_width=self._MIN_WIDTH,
+            max_height=self._MAX_HEIGHT,
+        )
+        self.folder = folder
+        self.symbol_index = symbol_index
+        self.symbol_selected: tuple[str, int, int] | None = None
+        self.by_name: dict[str, list[tuple]] = {}
+        self.matcher = FuzzyMatcher(limit=MAX_ROWS)
+
+        self.list_model.formatter = lambda sym: (sym[0], sym[1], f"{sym[2]}:{sym[3] + 1}")
+        self.list_viewer.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.list_viewer.setFocusPolicy(Qt.NoFocus)
+
+        self.edit = FileSearchLineEdit(self, textChanged=self.update_list)
+        self.edit.setFont(get_font(font_size_delta=2))
+        self.edit.sig_esc_key_pressed.connect(self.close)
+        self.edit.sig_enter_key_pressed.connect(self.enter)
+        self.edit.sig_up_key_pressed.connect(lambda: self.prev_row(1))
+        self.edit.sig_pg_up_key_pressed.connect(self.pg_up)
+        self.edit.sig_pg_half_up_key_pressed.connect(self.pg_half_up)
+        self.edit.sig_down_key_pressed.connect(lambda: self.next_row(1))
+        self.edit.sig_pg_down_key_pressed.connect(self.pg_down)
+        self.edit.sig_pg_half_down_key_pressed.connect(self.pg_half_down)
+        self.layout_.insertWidget(0, self.edit)
+
+        if folder is None or not osp.isdir(folder) or symbol_index is None:
+            self.edit.setPlaceholderText("The project is not valid.")
+        else:
+            if symbol_index.is_busy:
+                self.edit.setPlaceholderText("Indexing the project...")
+            symbol_index.sig_symbols_updated.connect(self.on_symbols_updated)
+            self.collect_symbols()
+        self.update_list()
+        self.edit.setFocus()
+
+    def get_selected_symbol(self) -> tuple[str, int, int] | None:
+        """Return the file, line and column of the chosen symbol."""
+        return self.symbol_selected
+
+    def collect_symbols(self) -> None:
+        """Group the symbols of the index by qualified name."""
+        by_name: dict[str, list[tuple]] = {}
+        for symbol in self.symbol_index.symbols():
+            by_name.setdefault(symbol[0], []).append(symbol)
+        self.by_name = by_name
+        self.matcher.set_paths(list(by_name))
+
+    def on_symbols_updated(self) -> None:
+        """Reload the symbols after the index changed."""
+        self.collect_symbols()
+        self.edit.setPlaceholderText("")
+        self.update_list()
+
+    def release_symbol_index(self) -> None:
+        """Stop listening to the symbol index."""
+        if self.symbol_index is None:
+            return
+        try:
+            self.symbol_index.sig_symbols_updated.disconnect(self.on_symbols_updated)
+        except (TypeError, RuntimeError):
+            pass
+
+    def update_list(self) -> None:
+        """Update listview."""
+        rows = []
+        for name in self.matcher.match(self.edit.text()):
+            rows.extend(self.by_name[name])
+            if len(rows) >= MAX_ROWS:
+                break
+        self.list_model.set_rows(rows[:MAX_ROWS])
+        if rows:
+            self.list_viewer.setCurrentIndex(self.list_model.index(0, 0))
+            self.list_viewer.selectRow(0)
+
+    def enter(self) -> None:
+        """Select the current symbol and close the dialog."""
+        symbol = self.list_model.row_object(self.list_viewer.currentIndex().row())
+        if symbol and self.folder:
+            _, _, rel_path, line, col = symbol
+            self.symbol_selected = (osp.join(self.folder, rel_path), line, col)
+        self.close()
@@ -0,0 +1,65 @@
+"""Tests for the background writer."""
+
+# Standard Libraries
+import os
+import threading
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.background_writer import BackgroundWriter, write_atomic
+
+
+def test_background_writer():
+    """A running write never blocks and only the latest snapshot follows."""
+    writer = BackgroundWriter()
+    started = threading.Event()
+    release = threading.Event()
+    written = []
+
+    def slow_write(data):
+        started.set()
+        release.wait(5)
+        written.append(data)
+
+    writer.submit(slow_write, "first", key="file")
+    assert started.wait(5)
+    for idx in range(3):
+        writer.submit(written.append, f"snapshot {idx}", key="file")
+    writer.submit(written.append, "append 1")
+    writer.submit(written.append, "append 2")
+    writer.submit(lambda: 1 / 0)
+    release.set()
+    writer.join()
+    assert written == ["first", "snapshot 2", "append 1", "append 2"]
+
+    writer.submit(written.append, "again", key="file")
+    writer.join()
+    assert written[-1] == "again"
+
+
+def test_write_atomic(tmp_path, monkeypatch):
+    """The file is replaced whole; a failed write leaves no temporary file."""
+    path = tmp_path / "data.json"
+    write_atomic(str(path), "[1]")
+    assert path.read_text() == "[1]"
+
+    def replace(src, dst):
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(os, "replace", replace)
+    with pytest.raises(OSError):
+        write_atomic(str(path), "[2]")
+    assert path.read_text() == "[1]"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_write_atomic_keeps_mode(tmp_path):
+    """The permissions of the file, the encoding and the line breaks stay."""
+    path = tmp_path / "script.py"
+    path.write_text("old\n")
+    path.chmod(0o751)
+    write_atomic(str(path), "é\r\n", encoding="latin-1", keep_mode=True)
+    assert path.read_bytes() == "é\r\n".encode("latin-1")
+    assert path.stat().st_mode & 0o777 == 0o751
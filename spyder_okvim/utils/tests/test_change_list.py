@@ -0,0 +1,33 @@
+"""Tests for ChangeList utility"""
+
+# Project Libraries
+from spyder_okvim.utils.change_list import ChangeList
+
+
+def test_record_and_navigation():
+    cl = ChangeList(max_items=3)
+    for pos in (1, 5, 9, 13):
+        cl.record(pos)
+    assert list(cl.positions) == [5, 9, 13]
+    assert cl.index == 3
+
+    assert cl.older() == 13
+    assert cl.older(5) == 5
+    assert cl.older() is None
+    assert cl.newer() == 9
+    assert cl.newer(5) == 13
+    assert cl.newer() is None
+
+    cl.record(20, merge=True)
+    assert list(cl.positions) == [5, 9, 20]
+    assert cl.index == 3
+
+
+def test_shift():
+    cl = ChangeList()
+    for pos in (2, 6, 10):
+        cl.record(pos)
+    cl.shift(4, 0, 3)
+    assert list(cl.positions) == [2, 9, 13]
+    cl.shift(1, 10, 0)
+    assert list(cl.positions) == [1, 1, 3]
@@ -1,12 +1,16 @@
 # Third Party Libraries
 import pytest
 from qtpy.QtCore import Qt, QEvent
-from qtpy.QtGui import QKeyEvent, QStandardItem
+from qtpy.QtGui import QKeyEvent
 from qtpy.QtWidgets import QDialog
 
 # Project Libraries
-from spyder_okvim.utils.list_dialog import PopupListDialog, PopupTableDialog
-from spyder_okvim.utils.jump_dialog import JumpListDialog
+from spyder_okvim.utils.list_dialog import (
+    PopupListDialog,
+    PopupTableDialog,
+    ResultTableModel,
+)
+from spyder_okvim.utils.jump_dialog import JumpListDialog, LineOffsetCache
 from spyder_okvim.utils.mark_dialog import MarkListDialog
 from spyder_okvim.utils.jump_list import JumpList
 
@@ -24,6 +28,9 @@ class DummyVimStatus:
     def jump_forward(self):
         self.jump_list.forward()
 
+    def get_open_document(self, file_path):
+        return None
+
     def set_focus_to_vim(self):
         self.focused = True
 
@@ -73,8 +80,7 @@ def test_popup_list_dialog_escape_and_pages(qtbot):
 def test_popup_table_dialog_keys(qtbot):
     dlg = PopupTableDialog("Table", headers=["col"])
     qtbot.addWidget(dlg)
-    dlg.list_model.appendRow([QStandardItem("x")])
-    dlg.list_model.appendRow([QStandardItem("y")])
+    dlg.list_model.set_rows([("x",), ("y",)])
     dlg.list_viewer.setCurrentIndex(dlg.list_model.index(0, 0))
     dlg.list_viewer.selectRow(0)
     dlg.show()
@@ -90,7 +96,7 @@ def test_popup_table_dialog_keys(qtbot):
 def test_popup_table_dialog_escape(qtbot):
     dlg = PopupTableDialog("Table", headers=["col"], min_width=120)
     qtbot.addWidget(dlg)
-    dlg.list_model.appendRow([QStandardItem("x")])
+    dlg.list_model.set_rows([("x",)])
     dlg.list_viewer.setCurrentIndex(dlg.list_model.index(0, 0))
     dlg.list_viewer.selectRow(0)
     dlg.show()
@@ -123,7 +129,7 @@ def test_jump_list_dialog_navigation(qtbot, tmpdir):
     qtbot.waitExposed(dlg)
 
     assert dlg.list_model.rowCount() == 2
-    assert dlg.list_model.item(1, 0).text().startswith(">")
+    assert dlg.list_model.index(1, 0).data().startswith(">")
 
     qtbot.keyPress(dlg.list_viewer, Qt.Key_O, modifier=Qt.ControlModifier)
     assert vs.jump_list.index == 1
@@ -150,7 +156,7 @@ def test_mark_list_dialog_accept_reject(qtbot, tmpdir):
     qtbot.waitExposed(dlg)
 
     assert dlg.list_model.rowCount() == 1
-    row = dlg.list_model.item(0, 0).text()
+    row = dlg.list_model.index(0, 0).data()
     assert row == "a"
 
     dlg.accept()
@@ -174,6 +180,19 @@ def test_jump_list_get_line_info(tmpdir):
     assert (line, col, text) == (1, 1, "")
 
 
+def test_line_offset_cache_reuses_file(tmpdir, monkeypatch):
+    file1 = tmpdir.join("lines.txt")
+    file1.write("alpha\n  beta\ngamma")
+    cache = LineOffsetCache()
+    assert cache.line_info(str(file1), 8) == (1, 2, "  beta")
+    assert cache.line_info(str(file1), 15) == (2, 2, "gamma")
+
+    opened = []
+    monkeypatch.setattr("builtins.open", lambda *args, **kw: opened.append(args))
+    assert cache.line_info(str(file1), 0) == (0, 0, "alpha")
+    assert opened == []
+
+
 def test_mark_list_dialog_invalid_accept_and_populate(tmpdir):
     bad_file = tmpdir.join("missing.txt")
     marks = [("a", {"file": str(bad_file), "line": 0, "col": 0})]
@@ -181,4 +200,28 @@ def test_mark_list_dialog_invalid_accept_and_populate(tmpdir):
     dlg.list_viewer.setCurrentIndex(dlg.list_model.index(1, 0))
     dlg.accept()
     assert dlg.get_selected_mark() == ""
-    assert dlg.list_model.item(0, 4).text() == ""
+    assert dlg.list_model.index(0, 4).data() == ""
+
+
+def test_result_table_model_formats_lazily():
+    calls = []
+
+    def formatter(row):
+        calls.append(row)
+        return str(row), str(row * 2)
+
+    model = ResultTableModel(["a", "b"], formatter)
+    model.set_rows(list(range(1000)))
+    assert model.rowCount() == 1000
+    assert model.columnCount() == 2
+    assert calls == []
+
+    assert model.index(3, 1).data() == "6"
+    assert model.index(3, 0).data() == "3"
+    assert model.index(3, 0).data(Qt.UserRole) == 3
+    assert model.headerData(1, Qt.Horizontal) == "b"
+    assert calls == [3]
+
+    model.set_rows([7])
+    assert model.index(0, 0).data() == "7"
+    assert model.row_object(1) is None
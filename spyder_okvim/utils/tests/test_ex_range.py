@@ -0,0 +1,112 @@
+"""Tests for the ex range parser and the line operations"""
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.ex_range import ExRangeParser, search_lines
+from spyder_okvim.utils.line_ops import (
+    IN_PLACE,
+    TO_BOTTOM,
+    TO_TOP,
+    global_lines,
+    move_lines,
+    sort_lines,
+)
+
+LINES = ["def a():", "    pass", "", "def b():", "    pass"]
+
+
+def make_parser(current=1):
+    marks = {"a": 3}
+    return ExRangeParser(
+        current,
+        len(LINES) - 1,
+        marks.get,
+        lambda pattern, line, backward: search_lines(LINES, pattern, line, backward),
+    )
+
+
+@pytest.mark.parametrize(
+    "text, line_range, rest",
+    [
+        ("d", None, "d"),
+        ("%d", (0, 4), "d"),
+        ("3", (2, 2), ""),
+        (".,$d", (1, 4), "d"),
+        ("'a,.m0", (1, 3), "m0"),
+        ("/def/+1y", (4, 4), "y"),
+        ("?def?", (0, 0), ""),
+        ("+,+2>", (2, 3), ">"),
+        ("2;+2d", (1, 3), "d"),
+        ("-", (0, 0), ""),
+        (",3d", (1, 2), "d"),
+    ],
+)
+def test_parse_range(text, line_range, rest):
+    assert make_parser().parse(text) == (line_range, rest)
+
+
+def test_parse_range_errors():
+    parser = make_parser()
+    with pytest.raises(ValueError, match="E20"):
+        parser.parse("'b,.d")
+    with pytest.raises(ValueError, match="E486"):
+        parser.parse("/xyz/d")
+    with pytest.raises(ValueError, match="E16"):
+        parser.check((0, 5))
+    with pytest.raises(ValueError, match="E14"):
+        parser.parse_address("9")
+    assert parser.parse_address("0") == -1
+    assert parser.parse_address("$") == 4
+
+
+def test_search_lines_after_zs():
+    assert search_lines(LINES, r"^\s*\zspass", 1) == 4
+    assert search_lines(LINES, r"^\s*\zspass", 1, True) == 4
+
+
+def test_sort_lines_unique():
+    lines = [f"line {idx % 1000:04d}" for idx in range(100000)]
+    result = sort_lines(lines, "u")
+    assert len(result) == 1000
+    assert result[0] == "line 0000"
+    assert sort_lines(["b", "A", "a"], "iu") == ["A", "b"]
+    assert sort_lines(["x2", "y", "x10", "x-1"], "n") == ["y", "x-1", "x2", "x10"]
+
+
+def test_move_lines():
+    lines = list("abcde")
+    assert move_lines(lines, 1, 2, -1) == list("bcade")
+    assert move_lines(lines, 0, 1, 4) == list("cdeab")
+    assert move_lines(lines, 0, 1, 1) == lines
+    with pytest.raises(ValueError, match="E134"):
+        move_lines(lines, 0, 2, 1)
+
+
+def test_global_lines():
+    lines = list("abcab")
+    marked = [0, 3]
+
+    new_lines, last = global_lines(lines, marked, lambda chunk: ([], IN_PLACE, []))
+    assert (new_lines, last) == (list("bcb"), 2)
+
+    new_lines, last = global_lines(lines, marked, lambda c: ([], TO_TOP, c))
+    assert (new_lines, last) == (list("aabcb"), 0)
+
+    new_lines, last = global_lines(lines, marked, lambda c: (c, TO_BOTTOM, c))
+    assert (new_lines, last) == (list("abcabaa"), 6)
+
+    # The second mark is inside the lines given to the first action.
+    new_lines, last = global_lines(lines, [0, 1], lambda c: ([], IN_PLACE, []), 2)
+    assert (new_lines, last) == (list("cab"), 0)
+
+    assert global_lines(["a"], [0], lambda c: ([], IN_PLACE, []))[0] == [""]
+
+
+def test_global_lines_large():
+    lines = ["" if idx % 2 else f"x{idx}" for idx in range(200000)]
+    marked = [idx for idx, line in enumerate(lines) if not line.strip()]
+    new_lines, last = global_lines(lines, marked, lambda c: ([], IN_PLACE, []))
+    assert new_lines == lines[::2]
+    assert last == len(new_lines) - 1
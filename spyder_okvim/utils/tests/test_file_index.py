@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Tests for the background project file index."""
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.file_index import GitIgnore, ProjectFileIndex, scan_folder
+from spyder_okvim.utils.file_search import FileSearchDialog
+
+
+@pytest.fixture
+def project(tmpdir):
+    """Create a small project tree."""
+    folder = tmpdir.mkdir("project")
+    for name in ["a.py", "b.txt", "c.md", "d.bin"]:
+        folder.join(name).write("contents")
+    sub = folder.mkdir("sub")
+    for name in ["e.py", "f.log"]:
+        sub.join(name).write("contents")
+    folder.mkdir("build").join("g.py").write("contents")
+    folder.mkdir("__pycache__").join("h.py").write("contents")
+    folder.join(".gitignore").write("# comment\nbuild/\n*.log\n")
+    return folder
+
+
+@pytest.mark.parametrize(
+    "rel_path, is_dir, expected",
+    [
+        ("build", True, True),
+        ("build", False, False),
+        ("sub/build", True, True),
+        ("x.log", False, True),
+        ("keep.log", False, False),
+        ("docs/api", True, True),
+        ("src/docs/api", True, False),
+    ],
+)
+def test_gitignore(rel_path, is_dir, expected):
+    """Test the supported subset of gitignore rules."""
+    ignore = GitIgnore(["build/", "*.log", "!keep.log", "/docs/api"])
+    assert ignore.match(rel_path, is_dir) is expected
+
+
+def test_scan_folder(project):
+    """Test include, exclude and gitignore filtering."""
+    ignore = GitIgnore.from_folder(str(project))
+    paths, folders = scan_folder(
+        str(project), ["*.py", "*.txt", "*.md"], ["__pycache__"], ignore
+    )
+    assert sorted(paths) == ["a.py", "b.txt", "c.md", "sub/e.py"]
+    assert sorted(folders) == ["", "sub"]
+
+
+def test_index_cache_and_rescan(qtbot, project, tmpdir):
+    """Test the background scan, the disk cache and folder rescans."""
+    cache_dir = str(tmpdir.mkdir("cache"))
+    index = ProjectFileIndex(str(project), cache_dir)
+    with qtbot.waitSignal(index.sig_paths_updated, timeout=5000):
+        index.start()
+    assert index.is_ready
+    assert index.paths == ["a.py", "b.txt", "c.md", "sub/e.py"]
+
+    project.join("sub", "new.py").write("contents")
+    project.join("a.py").remove()
+    index._pending_dirs.update(["", "sub"])
+    index._rescan_pending()
+    assert index.paths == ["b.txt", "c.md", "sub/e.py", "sub/new.py"]
+
+    new_dir = project.mkdir("pkg")
+    new_dir.join("mod.py").write("contents")
+    index._pending_dirs.add("")
+    index._rescan_pending()
+    assert "pkg/mod.py" in index.paths
+    index.stop()
+
+    index_cached = ProjectFileIndex(str(project), cache_dir)
+    index_cached._load_cache()
+    assert index_cached.paths == index.paths
+    assert not index_cached.is_ready
+
+
+def test_dialog_merges_index_updates(qtbot, project, tmpdir):
+    """Test that the dialog opens on the cached list and merges updates."""
+    index = ProjectFileIndex(str(project), str(tmpdir.mkdir("cache")))
+    index._set_paths(["a.py"])
+
+    pf = FileSearchDialog(str(project), file_index=index)
+    qtbot.addWidget(pf)
+    assert pf.list_model.rowCount() == 1
+
+    with qtbot.waitSignal(index.sig_paths_updated, timeout=5000):
+        index.refresh()
+    assert pf.list_model.rowCount() == 4
+
+    pf.release_file_index()
+    index.stop()
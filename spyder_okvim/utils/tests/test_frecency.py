@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Tests for the frecency store of opened files."""
+
+# Standard Libraries
+import os
+import os.path as osp
+
+# Project Libraries
+from spyder_okvim.utils.frecency import HALF_LIFE, FrecencyStore
+from spyder_okvim.utils.fuzzy_matcher import FuzzyMatcher
+
+
+def test_visit_decay_and_persistence(qtbot, tmpdir):
+    """Test scoring, decay and reloading from disk."""
+    store_file = str(tmpdir.join("frecency.json"))
+    root = str(tmpdir.mkdir("project"))
+    store = FrecencyStore(store_file)
+
+    store.visit(root, osp.join(root, "pkg", "a.py"), now=0)
+    store.visit(root, osp.join(root, "pkg", "a.py"), now=0)
+    store.visit(root, "b.py", now=0)
+    store.visit(root, osp.join(str(tmpdir), "outside.py"), now=0)
+    store.visit(None, "c.py", now=0)
+
+    assert store.score(root, "pkg/a.py", now=0) == 2
+    assert store.score(root, "pkg/a.py", now=HALF_LIFE) == 1
+    assert store.score(root, "outside.py", now=0) == 0
+    assert set(store.entries) == {root}
+
+    # The visits are written together after a delay.
+    assert store.timer_save.isActive()
+    assert not osp.exists(store_file)
+    store.flush()
+    assert not store.timer_save.isActive()
+    reloaded = FrecencyStore(store_file)
+    assert reloaded.score(root, "b.py", now=0) == 1
+
+
+def test_failed_save_removes_the_temporary_file(qtbot, tmpdir, monkeypatch):
+    """Test that a failed write leaves no temporary file behind."""
+    store = FrecencyStore(str(tmpdir.join("frecency.json")))
+    store.visit(str(tmpdir), "a.py", now=0)
+
+    def replace(src, dst):
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(os, "replace", replace)
+    store.flush()
+    assert tmpdir.listdir() == []
+
+
+def test_boost_table_is_cached(tmpdir):
+    """Test that the boost table is reused until the next visit."""
+    root = str(tmpdir)
+    store = FrecencyStore(None)
+    store.visit(root, "a.py")
+    store.visit(root, "a.py")
+    store.visit(root, "b.py")
+
+    boosts = store.boosts(root)
+    assert boosts["a.py"] > boosts["b.py"] > 0
+    assert store.boosts(root) is boosts
+
+    store.visit(root, "c.py")
+    assert store.boosts(root) is not boosts
+    assert store.boosts(None) == {}
+
+
+def test_matcher_uses_boosts():
+    """Test that boosts reorder the results and the empty query."""
+    paths = ["src/main.py", "vendor/lib/main.py", "README.md"]
+    matcher = FuzzyMatcher(paths)
+    assert matcher.match("main")[0] == "src/main.py"
+
+    matcher.set_boosts({"vendor/lib/main.py": 40, "deleted.py": 50})
+    assert matcher.match("main")[0] == "vendor/lib/main.py"
+    assert matcher.match("") == ["vendor/lib/main.py", "src/main.py", "README.md"]
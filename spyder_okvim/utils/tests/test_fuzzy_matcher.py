@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Tests for the fuzzy matching engine."""
+
+# Standard Libraries
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils import fuzzy_matcher
+from spyder_okvim.utils.file_search import fuzzyfinder
+from spyder_okvim.utils.fuzzy_matcher import FuzzyMatcher, fuzzy_score
+
+PATHS = [
+    "doc/design_patterns.md",
+    "spyder_okvim/utils/file_search.py",
+    "spyder_okvim/utils/fixtures.py",
+    "spyder_okvim/vim/status.py",
+    "spyder_okvim/spyder/FileSearchDialog.py",
+    "README.md",
+]
+
+
+@pytest.mark.parametrize(
+    "query, better, worse",
+    [
+        ("fs", "utils/file_search.py", "utils/fixtures.py"),
+        ("status", "vim/status.py", "utils/stat_us.py"),
+        ("fsd", "FileSearchDialog.py", "flagsword.py"),
+        ("init", "pkg/__init__.py", "pkg/in_it.py"),
+    ],
+)
+def test_fuzzy_score_order(query, better, worse):
+    """Test the boundary, camelCase, basename and gap scoring."""
+    assert fuzzy_score(query, better) > fuzzy_score(query, worse)
+
+
+def test_fuzzy_score_no_match():
+    """Test that characters have to appear in order."""
+    assert fuzzy_score("ba", "ab") is None
+    assert fuzzy_score("", "ab") == 0
+
+
+def test_matcher_ranking_and_limit():
+    """Test ranking and the top-k limit."""
+    matcher = FuzzyMatcher(PATHS, limit=2)
+    assert matcher.match("") == PATHS[:2]
+    assert matcher.match("fs") == [
+        "spyder_okvim/utils/file_search.py",
+        "spyder_okvim/spyder/FileSearchDialog.py",
+    ]
+    assert matcher.match("zzz") == []
+
+
+def test_matcher_reuses_candidates(monkeypatch):
+    """Test that refining a query filters the previous candidates."""
+    matcher = FuzzyMatcher(PATHS)
+    assert len(matcher.candidates("st")) == 4
+
+    filtered = []
+    compile_filter = fuzzy_matcher._compile_filter
+
+    def _compile_filter(query):
+        regex = compile_filter(query)
+        filtered.append(query)
+        return regex
+
+    monkeypatch.setattr(fuzzy_matcher, "_compile_filter", _compile_filter)
+    matcher.paths = []
+    assert matcher.candidates("sta") == [
+        "spyder_okvim/utils/file_search.py",
+        "spyder_okvim/vim/status.py",
+    ]
+    assert matcher.candidates("sta") is matcher.candidates("sta")
+    assert filtered == ["sta"]
+
+
+def test_matcher_parallel(monkeypatch):
+    """Test that pooled scoring gives the same ranking."""
+    paths = [f"pkg{i}/module_{i}.py" for i in range(200)]
+    expected = FuzzyMatcher(paths, limit=5).match("m1")
+
+    pools = []
+    submitted = []
+
+    class Pool(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args)
+            return super().submit(fn, *args)
+
+    def start_path_pool(pool_paths):
+        pools.append(
+            Pool(2, initializer=fuzzy_matcher._init_worker, initargs=(pool_paths,))
+        )
+        return pools[-1]
+
+    monkeypatch.setattr(fuzzy_matcher, "N_WORKERS", 2)
+    monkeypatch.setattr(fuzzy_matcher, "_start_path_pool", start_path_pool)
+    matcher = FuzzyMatcher(paths, limit=5, pool_threshold=10)
+    # The workers are started with the paths before the first query.
+    assert len(pools) == 1
+    fuzzy_matcher.get_path_pool(paths).result(timeout=5)
+    assert matcher.match("m1") == expected
+    assert matcher.match("m1") == expected
+    # Only the query is sent to the workers.
+    assert all(paths not in args for args in submitted)
+    assert submitted[2:] == [("m1", 0, 2, 5, {}), ("m1", 1, 2, 5, {})] * 2
+
+    FuzzyMatcher(paths, limit=5, pool_threshold=10)
+    assert len(pools) == 1
+
+    # A rescan with a few changed paths keeps the running workers.
+    rescanned = [path for path in paths if path != "pkg1/module_1.py"]
+    rescanned.append("new/m1.py")
+    matcher.set_paths(rescanned)
+    expected = FuzzyMatcher(rescanned, limit=5).match("m1")
+    assert matcher.match("m1") == expected
+    assert "new/m1.py" in expected
+    assert "pkg1/module_1.py" not in expected
+    assert len(pools) == 1
+
+    # Too many changes start the workers again on the next query.
+    monkeypatch.setattr(fuzzy_matcher, "MAX_POOL_CHANGES", 1)
+    matcher.set_paths(list(rescanned))
+    assert matcher.match("m1") == expected
+    assert len(pools) == 2
+    fuzzy_matcher._shutdown_path_pool()
+
+
+def test_fuzzyfinder():
+    """Test the list based helper."""
+    assert fuzzyfinder("rdm", PATHS) == ["README.md"]
@@ -37,3 +37,38 @@ def test_duplicate_and_truncate():
     jl.push("e.py", 5)
     assert jl.jumps == [Jump("b.py", 2), Jump("c.py", 3), Jump("e.py", 5)]
     assert jl.index == 3
+
+
+def test_ring_buffer_wraps():
+    jl = JumpList(max_items=3)
+    for i in range(10):
+        jl.push("a.py", i)
+    assert jl.jumps == [Jump("a.py", 7), Jump("a.py", 8), Jump("a.py", 9)]
+    assert jl[-1] == Jump("a.py", 9)
+    assert len(jl) == 3
+
+    jl.back()
+    jl.back()
+    jl.push("b.py", 0)
+    assert jl.jumps == [Jump("a.py", 7), Jump("b.py", 0)]
+    assert not jl.has_file("c.py")
+    assert jl.has_file("a.py")
+
+    jl.pop_last()
+    jl.pop_last()
+    assert jl.jumps == []
+    assert not jl.has_file("a.py")
+
+
+def test_shift():
+    jl = JumpList()
+    jl.push("a.py", 2)
+    jl.push("a.py", 10)
+    jl.push("a.py", 20)
+    jl.push("b.py", 20)
+
+    jl.shift("a.py", 5, 0, 3)
+    assert [j.pos for j in jl.jumps] == [2, 13, 23, 20]
+
+    jl.shift("a.py", 12, 4, 0)
+    assert [j.pos for j in jl.jumps] == [2, 12, 19, 20]
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Tests for the live grep picker."""
+
+# Standard Libraries
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.file_index import ProjectFileIndex
+from spyder_okvim.utils.live_grep import (
+    LiveGrepDialog,
+    LiveGrepSearch,
+    grep_file,
+    has_literal,
+    literal_prefix,
+)
+
+
+@pytest.fixture
+def project(tmpdir):
+    """Create a small project tree."""
+    folder = tmpdir.mkdir("project")
+    folder.join("a.py").write("import os\n\ndef foo():\n    return Foo\n")
+    folder.join("b.py").write("x = 1\n")
+    folder.join("c.bin").write_binary(b"foo\0bar")
+    return folder
+
+
+@pytest.fixture
+def executor():
+    """Run the searches in threads."""
+    pool = ThreadPoolExecutor(2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("foo", b"foo"),
+        ("def \\w+", b"def "),
+        ("a|b", b""),
+        ("Foo", b"Foo"),
+        ("12x*", b"12"),
+        ("[", b""),
+    ],
+)
+def test_literal_prefix(pattern, expected):
+    """Test the literal fast path of a regex."""
+    assert literal_prefix(pattern) == expected
+
+
+def test_has_literal():
+    """Test the literal search with and without the case."""
+    assert has_literal(b"return Foo", b"", False)
+    assert has_literal(b"return Foo", b"Foo", False)
+    assert not has_literal(b"return Foo", b"foo", False)
+    assert has_literal(b"return Foo", b"foo", True)
+    assert not has_literal(b"return Bar", b"foo", True)
+
+
+def test_grep_file(project):
+    """Test line, column, smartcase and binary handling."""
+    path = str(project.join("a.py"))
+    assert grep_file(path, "foo", True, b"") == [
+        (2, 4, "def foo():"),
+        (3, 11, "return Foo"),
+    ]
+    assert grep_file(path, "foo", True, b"foo") == [
+        (2, 4, "def foo():"),
+        (3, 11, "return Foo"),
+    ]
+    assert grep_file(path, "Foo", False, b"Foo") == [(3, 11, "return Foo")]
+    assert grep_file(path, "zzz", False, b"zzz") == []
+    assert grep_file(str(project.join("c.bin")), "foo", False, b"") == []
+
+
+def test_search_streams_latest_query(qtbot, project, executor):
+    """Test that only the latest query reports its hits."""
+    search = LiveGrepSearch(str(project), executor)
+    hits = []
+    search.sig_hits.connect(lambda gen, rows: hits.append((gen, rows)))
+
+    search.start("x", ["a.py", "b.py"])
+    with qtbot.waitSignal(search.sig_finished, timeout=5000) as blocker:
+        search.start("import", ["a.py", "b.py", "c.bin"])
+    assert blocker.args == [2]
+    assert hits == [(2, [("a.py", 0, 0, "import os")])]
+
+    with qtbot.waitSignal(search.sig_finished, timeout=5000):
+        search.start("(", ["a.py"])
+    assert hits[-1] == (3, [("a.py", 2, 7, "def foo():")])
+
+
+def test_dialog(qtbot, project, tmpdir, executor):
+    """Test typing a query and selecting a hit."""
+    index = ProjectFileIndex(str(project), str(tmpdir.mkdir("cache")))
+    index._set_paths(["a.py", "b.py"])
+
+    dlg = LiveGrepDialog(str(project), index, executor=executor)
+    qtbot.addWidget(dlg)
+    with qtbot.waitSignal(dlg.search.sig_finished, timeout=5000):
+        qtbot.keyClicks(dlg.edit, "foo")
+    assert dlg.list_model.rowCount() == 2
+    assert dlg.list_model.index(1, 1).data() == "4"
+    assert dlg.list_model.index(1, 2).data() == "return Foo"
+
+    dlg.next_row(1)
+    dlg.enter()
+    assert dlg.get_selected_hit() == (str(project.join("a.py")), 3, 11)
+    index.stop()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Tests for running a macro over many files."""
+
+# Standard Libraries
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.spyder.headless import HeadlessEditorPlugin
+from spyder_okvim.utils import macro_batch
+from spyder_okvim.utils.macro_batch import (
+    MacroBatchDialog,
+    MacroBatchResult,
+    MacroBatchRun,
+    parse_macro_batch,
+    run_macro_files,
+)
+from spyder_okvim.vim import VimState
+
+
+@pytest.fixture
+def restore_focus(vim_bot):
+    """Give the focus back to the editor of the other tests."""
+    main, _, _, vim, _ = vim_bot
+    yield
+    main.activateWindow()
+    vim.vim_cmd.commandline.setFocus()
+
+
+@pytest.mark.parametrize(
+    "arg, expected",
+    [
+        ("q *.py", ("q", None, ["*.py"])),
+        ("Q 4 a.py **/*.py", ("q", 4, ["a.py", "**/*.py"])),
+        ("a 0 my\\ file.py", ("a", 1, ["my file.py"])),
+        ("a 12", ("a", None, ["12"])),
+    ],
+)
+def test_parse_macro_batch(arg, expected):
+    """Split the register, the number of workers and the files."""
+    assert parse_macro_batch(arg) == expected
+
+
+@pytest.mark.parametrize(
+    "arg, error", [("", "E471"), ("q", "E471"), ("qq *.py", "E354")]
+)
+def test_parse_macro_batch_error(arg, error):
+    """The register and the files are required."""
+    with pytest.raises(ValueError, match=error):
+        parse_macro_batch(arg)
+
+
+def test_run_macro_files(tmpdir, monkeypatch, restore_focus):
+    """Write the changed files only; an error leaves the file untouched."""
+    crlf = tmpdir.join("crlf.py")
+    crlf.write_binary(b"old_name = 1\r\nprint(old_name)\r\n")
+    same = tmpdir.join("same.py")
+    same.write("x = 1\n")
+    binary = tmpdir.join("data.py")
+    binary.write_binary(b"old_name\0")
+    paths = [str(crlf), str(same), str(binary), str(tmpdir.join("missing.py"))]
+
+    results = run_macro_files(paths, "ciwnew_name<Esc>j0@a", {"a": ("D", 0)})
+    assert [(result.ok, result.changed) for result in results] == [
+        (True, True),
+        (True, True),
+        (False, False),
+        (False, False),
+    ]
+    assert results[2].message == "Binary file"
+    assert crlf.read_binary() == b"new_name = 1\r\n\r\n"
+    assert same.read() == "new_name = 1\n"
+
+    # Each file starts with the same registers and without a search.
+    same.write("x = 1\n")
+    results = run_macro_files(
+        [str(crlf), str(same)], '"ap:s//z/<CR>', {"a": ("y", VimState.NORMAL)}
+    )
+    assert results == [
+        MacroBatchResult(str(crlf), False, message="E35: No previous regular expression"),
+        MacroBatchResult(str(same), False, message="E35: No previous regular expression"),
+    ]
+    assert same.read() == "x = 1\n"
+
+    def save(self):
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(HeadlessEditorPlugin, "save", save)
+    results = run_macro_files([str(same)], "x:w<CR>", {})
+    assert results == [MacroBatchResult(str(same), False, message="Disk full")]
+    assert same.read() == "x = 1\n"
+
+
+def test_run_macro_batch_pool(qtbot, tmpdir):
+    """The files are changed by headless editors in worker processes."""
+    paths = []
+    for idx in range(3):
+        path = tmpdir.join(f"f{idx}.py")
+        path.write(f"value = {idx}\n" if idx else "nothing\n")
+        paths.append(str(path))
+
+    results = []
+    run = MacroBatchRun()
+    run.sig_results.connect(results.extend)
+    with qtbot.waitSignal(run.sig_finished, timeout=60000):
+        run.start(paths, ":s/value/total/<CR>", {}, 2)
+    results.sort(key=lambda result: result.file)
+    assert macro_batch.get_pool(2) is macro_batch.get_pool(2)
+    assert [(result.file, result.ok, result.changed) for result in results] == [
+        (paths[0], False, False),
+        (paths[1], True, True),
+        (paths[2], True, True),
+    ]
+    assert results[0].message == "E486: Pattern not found: value"
+    assert tmpdir.join("f2.py").read() == "total = 2\n"
+
+
+def test_macro_batch_dialog_cancel(qtbot, monkeypatch):
+    """The results come one chunk at a time; closing the dialog cancels."""
+    started = threading.Semaphore(0)
+    release = threading.Semaphore(0)
+
+    def fake_run_macro_files(paths, keys, registers, options=None):
+        started.release()
+        release.acquire(timeout=5)
+        return [MacroBatchResult(path, True, True) for path in paths]
+
+    monkeypatch.setattr(macro_batch, "run_macro_files", fake_run_macro_files)
+    paths = [f"f{idx}.py" for idx in range(8)]
+    with ThreadPoolExecutor(1) as executor:
+        run = MacroBatchRun(executor)
+        dlg = MacroBatchDialog([MacroBatchResult("open.py", True)], 9, run)
+        qtbot.addWidget(dlg)
+        run.start(paths, "x", {}, 1)
+        assert started.acquire(timeout=5)
+        assert dlg.label_progress.text() == "1 of 9 files done, Esc to cancel"
+
+        # Let the first chunk finish and close the dialog during the second.
+        release.release()
+        qtbot.waitUntil(lambda: len(dlg.results) == 3)
+        assert dlg.label_progress.text() == "3 of 9 files done, Esc to cancel"
+        assert started.acquire(timeout=5)
+        dlg.reject()
+        release.release()
+    qtbot.wait(10)
+    assert [result.file for result in dlg.results] == ["open.py", "f0.py", "f1.py"]
+    assert not started.acquire(blocking=False)
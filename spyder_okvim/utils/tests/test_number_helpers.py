@@ -0,0 +1,54 @@
+"""Tests for the number helpers"""
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.number_helpers import (
+    change_number,
+    find_number,
+    increment_lines,
+)
+
+
+@pytest.mark.parametrize(
+    "text, col, delta, expected",
+    [
+        ("x = 9", 0, 1, "10"),
+        ("x = -1", 5, 1, "0"),
+        ("x = 007", 0, 1, "008"),
+        ("x = 0x0f", 0, 1, "0x10"),
+        ("x = 0XFF", 6, 1, "0X100"),
+        ("x = 0xaB", 0, -0xAB, "0x00"),
+        ("x = 0x0", 0, -1, "0xffffffffffffffff"),
+        ("x = 0b011", 0, 1, "0b100"),
+        ("x = 0o17", 0, 1, "0o20"),
+        ("x = -0x10", 0, 1, "0x11"),
+        ("x = -0b1", 4, -1, "0b0"),
+        ("x = -0o7", 0, 1, "0o10"),
+        ("x = -0xg", 0, 1, "1"),
+    ],
+)
+def test_change_number(text, col, delta, expected):
+    match = find_number(text, col)
+    assert change_number(match, delta) == expected
+
+
+def test_find_number():
+    assert find_number("a1 b22", 2)[0] == "22"
+    assert find_number("a1 b22", 1)[0] == "1"
+    assert find_number("a1 b22", 6) is None
+    assert find_number("x-12", 0, start=2)[0] == "12"
+
+
+def test_increment_lines():
+    lines = ["0"] * 5000
+    new_lines, count = increment_lines(lines, 1, progressive=True)
+    assert count == 5000
+    assert new_lines[0] == "1"
+    assert new_lines[-1] == "5000"
+
+    assert increment_lines(["a 1 2", "3"], 1, col_start=3, col_end=0) == (
+        ["a 1 3", "3"],
+        1,
+    )
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Tests for the substitution over the files of the quickfix list."""
+
+# Standard Libraries
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.project_substitute import (
+    ProjectSubstitute,
+    get_literal,
+    rewrite_files,
+    scan_files,
+    substitute_text,
+)
+from spyder_okvim.utils.quickfix import CHUNK_SIZE
+from spyder_okvim.utils.substitute import compile_replacement
+from spyder_okvim.utils.vim_regex import compile_pattern
+
+
+@pytest.mark.parametrize(
+    "pattern, ignore_case, expected",
+    [
+        ("foo", False, b"foo"),
+        (r"foo\d", True, b"foo"),
+        ("bé", False, "bé".encode("utf-8")),
+        ("bé", True, b"b"),
+        (r"\(a\|b\)", False, b""),
+        (r"^\<foo\>", False, b"foo"),
+    ],
+)
+def test_get_literal(pattern, ignore_case, expected):
+    """The literal is safe for the case of the pattern."""
+    assert get_literal(compile_pattern(pattern, ignore_case)) == expected
+
+
+def test_substitute_text():
+    """Replace on every line or on the given lines only."""
+    regex = compile_pattern("a")
+    parts = compile_replacement("<&>")
+    text = "aa\nb\na"
+    assert substitute_text(text, regex, parts, False) == (
+        [(0, 1, "<a>"), (5, 6, "<a>")],
+        [(0, "aa", "<a>a"), (2, "a", "<a>")],
+    )
+    assert substitute_text(text, regex, parts, True, {0}) == (
+        [(0, 1, "<a>"), (1, 2, "<a>")],
+        [(0, "aa", "<a><a>")],
+    )
+
+
+def test_rewrite_files(tmpdir):
+    """Keep the line breaks and the mode; skip files changed since the scan."""
+    regex = compile_pattern("old")
+    parts = compile_replacement("new")
+    crlf = tmpdir.join("crlf.py")
+    crlf.write_binary(b"old = 1\r\nx = old\r\n")
+    os.chmod(crlf, 0o754)
+    changed = tmpdir.join("changed.py")
+    changed.write("old\n")
+    missing = tmpdir.join("missing.py")
+    missing.write("nothing\n")
+
+    items = [(str(crlf), None), (str(changed), {0}), (str(missing), None)]
+    scanned = scan_files(items, regex, parts, False)
+    assert [result[1:] for result in scanned] == [
+        (2, [(0, "old = 1", "new = 1"), (1, "x = old", "x = new")]),
+        (1, [(0, "old", "new")]),
+        (0, []),
+    ]
+
+    changed.write("old old\n")
+    os.utime(changed, ns=(scanned[1][0] + 10**9, scanned[1][0] + 10**9))
+    rewrite_items = [
+        (str(crlf), None, scanned[0][0]),
+        (str(changed), {0}, scanned[1][0]),
+    ]
+    assert rewrite_files(rewrite_items, regex, parts, False) == [2, None]
+    assert crlf.read_binary() == b"new = 1\r\nx = new\r\n"
+    assert stat.S_IMODE(os.stat(crlf).st_mode) == 0o754
+    assert changed.read() == "old old\n"
+    assert sorted(os.listdir(tmpdir)) == ["changed.py", "crlf.py", "missing.py"]
+
+
+def test_project_substitute_pool(tmpdir):
+    """Many files are scanned and rewritten in chunks by the pool."""
+    targets = {}
+    for idx in range(CHUNK_SIZE * 3 + 1):
+        path = tmpdir.join(f"f{idx:03}.py")
+        path.write(f"old_name = {idx}\nprint(old_name)\n" if idx % 2 else "x = 1\n")
+        targets[str(path)] = None
+
+    regex = compile_pattern(r"\<old_name\>")
+    parts = compile_replacement("new_name")
+    with ThreadPoolExecutor(2) as pool:
+        project = ProjectSubstitute(targets, regex, parts, True, pool)
+        hunks = project.scan()
+        assert len(hunks) == CHUNK_SIZE * 3
+        assert hunks[0] == (str(tmpdir.join("f001.py")), 0, "old_name = 1", "new_name = 1")
+        assert project.count == CHUNK_SIZE * 3
+        assert project.apply() == (CHUNK_SIZE * 3, CHUNK_SIZE * 3 // 2, 0)
+    assert tmpdir.join("f001.py").read() == "new_name = 1\nprint(new_name)\n"
+    assert tmpdir.join("f002.py").read() == "x = 1\n"
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Tests for the quickfix list and ``:vimgrep``."""
+
+# Standard Libraries
+import os.path as osp
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.quickfix import (
+    CHUNK_SIZE,
+    QuickfixEntry,
+    QuickfixList,
+    expand_files,
+    grep_text,
+    parse_vimgrep,
+    vimgrep,
+)
+from spyder_okvim.utils.vim_regex import compile_pattern
+
+
+@pytest.mark.parametrize(
+    "arg, expected",
+    [
+        ("/foo/ %", ("foo", "", ["%"])),
+        ("/a b/gj *.py ##", ("a b", "gj", ["*.py", "##"])),
+        ("#a\\#b#g x", ("a#b", "g", ["x"])),
+        ("foo my\\ file.py", ("foo", "", ["my file.py"])),
+    ],
+)
+def test_parse_vimgrep(arg, expected):
+    """Split the pattern, the flags and the files."""
+    assert parse_vimgrep(arg) == expected
+
+
+@pytest.mark.parametrize("arg", ["", "/foo/", "foo", "/foo/x %"])
+def test_parse_vimgrep_error(arg):
+    """The files are required."""
+    with pytest.raises(ValueError, match="E683"):
+        parse_vimgrep(arg)
+
+
+def test_expand_files(tmpdir):
+    """Expand globs below the root, ``%`` and ``##`` once each."""
+    tmpdir.join("a.py").write("")
+    tmpdir.mkdir("sub").join("b.py").write("")
+    tmpdir.join("c.txt").write("")
+    root = str(tmpdir)
+    a_py = osp.join(root, "a.py")
+    b_py = osp.join(root, "sub", "b.py")
+
+    assert expand_files(["*.py"], None, [], root) == [a_py]
+    assert expand_files(["**/*.py"], None, [], root) == [a_py, b_py]
+    assert expand_files(["%", "**/*.py"], b_py, [], root) == [b_py, a_py]
+    assert expand_files(["##", "%"], a_py, [a_py, b_py], root) == [a_py, b_py]
+    assert expand_files(["%"], None, [], root) == []
+    unsaved = osp.join(root, "new.py")
+    assert expand_files(["new.py", "*.py"], None, [unsaved], root) == [unsaved, a_py]
+
+
+def test_grep_text():
+    """Report the first match of each line, or all of them with ``g``."""
+    regex = compile_pattern(r"\<ab")
+    text = "ab ab\nx\ncab ab"
+    assert grep_text(text, regex) == [(0, 0, 0, "ab ab"), (2, 4, 12, "cab ab")]
+    assert grep_text(text, regex, True) == [
+        (0, 0, 0, "ab ab"),
+        (0, 3, 3, "ab ab"),
+        (2, 4, 12, "cab ab"),
+    ]
+
+
+def test_grep_text_after_zs():
+    """The column is the one of the part after ``\\zs``."""
+    regex = compile_pattern(r"^\s*\zsab")
+    assert grep_text("ab\n    ab ab", regex, True) == [
+        (0, 0, 0, "ab"),
+        (1, 4, 7, "    ab ab"),
+    ]
+
+
+def test_vimgrep_buffers_and_disk(tmpdir):
+    """Open files are searched in memory and the others on the disk."""
+    on_disk = tmpdir.join("disk.py")
+    on_disk.write("foo = 1\r\nbar = foo\r\n")
+    binary = tmpdir.join("data.bin")
+    binary.write_binary(b"foo\0")
+    buffer_path = str(tmpdir.join("open.py"))
+    tmpdir.join("open.py").write("foo on disk\n")
+
+    entries = vimgrep(
+        [buffer_path, str(on_disk), str(binary)],
+        {buffer_path: "x\nunsaved foo"},
+        compile_pattern("foo"),
+    )
+    assert entries == [
+        QuickfixEntry(buffer_path, 10, 1, 8, "unsaved foo"),
+        QuickfixEntry(str(on_disk), 0, 0, 0, "foo = 1"),
+        QuickfixEntry(str(on_disk), 14, 1, 6, "bar = foo"),
+    ]
+
+
+def test_vimgrep_pool(tmpdir):
+    """Many files are searched in chunks by the pool, in file order."""
+    paths = []
+    for idx in range(CHUNK_SIZE * 3 + 1):
+        path = tmpdir.join(f"f{idx:03}.py")
+        path.write(f"x\nvalue {idx}\n")
+        paths.append(str(path))
+
+    with ThreadPoolExecutor(2) as pool:
+        entries = vimgrep(paths, {}, compile_pattern(r"value \d"), executor=pool)
+    assert [entry.file for entry in entries] == paths
+    assert {(entry.line, entry.col, entry.pos) for entry in entries} == {(1, 0, 2)}
+
+
+def test_quickfix_list_move_and_shift():
+    """Move with counts, stop at the ends and follow the edits."""
+    quickfix = QuickfixList()
+    entries = [
+        QuickfixEntry("a", 5, 0, 5, ""),
+        QuickfixEntry("a", 20, 2, 0, ""),
+        QuickfixEntry("b", 3, 0, 3, ""),
+    ]
+    quickfix.set_entries(entries)
+    assert quickfix.move(1) is entries[0]
+    assert quickfix.move(5) is entries[2]
+    assert quickfix.move(1) is None
+    assert quickfix.move(-1) is entries[1]
+    assert quickfix.move(-9) is entries[0]
+    assert quickfix.move(-1) is None
+
+    quickfix.shift("a", 0, 0, 4)
+    quickfix.shift("a", 10, 16, 1)
+    assert [entry.pos for entry in entries] == [9, 10, 3]
+
+    quickfix.sync_positions("a", lambda line, col: line * 100 + col)
+    assert [entry.pos for entry in entries] == [5, 200, 3]
@@ -0,0 +1,53 @@
+"""Tests for SessionStore utility"""
+
+# Standard Libraries
+import json
+
+# Project Libraries
+from spyder_okvim.utils import session_store
+from spyder_okvim.utils.session_store import SessionStore
+
+
+def test_put_and_reload(tmp_path):
+    log_file = tmp_path / "session.log"
+    store = SessionStore(str(log_file))
+    store.put("search", "foo")
+    store.put("search", "bar")
+    store.put("search", "foo")
+    store.put("position", "a.py", [3, 1])
+    store.put("register", "a", ["text", 3])
+    # The records are written together after a delay.
+    assert not log_file.exists()
+    store.flush()
+
+    other = SessionStore(str(log_file))
+    assert not other._loaded
+    assert other.keys("search") == ["bar", "foo"]
+    assert other.get("position", "a.py") == [3, 1]
+    assert other.get("register", "a") == ["text", 3]
+
+
+def test_size_caps_and_compaction(tmp_path, monkeypatch):
+    monkeypatch.setitem(session_store.CATEGORY_SIZES, "cmd", 3)
+    monkeypatch.setattr(session_store, "MAX_STALE_RECORDS", 5)
+    log_file = tmp_path / "session.log"
+    store = SessionStore(str(log_file))
+    for i in range(20):
+        store.put("cmd", f"cmd{i}")
+    assert store.keys("cmd") == ["cmd17", "cmd18", "cmd19"]
+    store.flush()
+
+    lines = log_file.read_text().splitlines()
+    assert len(lines) <= 3 + 5
+    assert SessionStore(str(log_file)).keys("cmd") == ["cmd17", "cmd18", "cmd19"]
+
+
+def test_broken_record(tmp_path):
+    log_file = tmp_path / "session.log"
+    log_file.write_text(json.dumps(["cmd", "w", None]) + "\n" + '["cmd", "q')
+    store = SessionStore(str(log_file))
+    store.put("cmd", "e")
+    assert store.keys("cmd") == ["w", "e"]
+    store.flush()
+    assert SessionStore(str(log_file)).keys("cmd") == ["w", "e"]
+    assert [p.name for p in tmp_path.iterdir()] == ["session.log"]
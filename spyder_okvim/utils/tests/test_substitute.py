@@ -0,0 +1,72 @@
+"""Tests for the substitute helpers"""
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.substitute import (
+    compile_replacement,
+    expand,
+    parse_substitute,
+    substitute_line,
+    substitute_spans,
+)
+from spyder_okvim.utils.vim_regex import compile_pattern
+
+
+@pytest.mark.parametrize(
+    "arg, expected",
+    [
+        ("/a/b/", ("a", "b", "", 0)),
+        ("/a/b/gi 3", ("a", "b", "gi", 3)),
+        ("/a", ("a", None, "", 0)),
+        ("/a/b", ("a", "b", "", 0)),
+        (r"#a\#b#c#", ("a#b", "c", "", 0)),
+        (r"/a\/b/c\/d/", ("a/b", "c/d", "", 0)),
+        (r"/\d/x/", (r"\d", "x", "", 0)),
+        ("/a/b/&g", ("a", "b", "&g", 0)),
+        ("/a/b/z", None),
+        ("a/b/", None),
+    ],
+)
+def test_parse_substitute(arg, expected):
+    assert parse_substitute(arg) == expected
+
+
+@pytest.mark.parametrize(
+    "replacement, expected",
+    [
+        ("<&>", "<foo-bar>"),
+        (r"\2\1", "barfoo"),
+        (r"\0\&", "foo-bar&"),
+        (r"\u\1 \U\2\E!", "Foo BAR!"),
+        (r"\L\0\e", "foo-bar"),
+        ("~x", "prevx"),
+        (r"a\tb\rc", "a\tb\nc"),
+    ],
+)
+def test_expand(replacement, expected):
+    match = compile_pattern(r"\(\w\+\)-\(\w\+\)").search("foo-bar")
+    assert expand(compile_replacement(replacement, "prev"), match) == expected
+
+
+def test_substitute_line():
+    regex = compile_pattern("o")
+    replace = lambda match: "00"  # noqa: E731
+    assert substitute_line("foo", regex, replace, True) == ("f0000", [(1, 3), (3, 5)])
+    assert substitute_line("foo", regex, replace, False) == ("f00o", [(1, 3)])
+    assert substitute_line("foo", regex, None, True) == ("foo", [(1, 2), (2, 3)])
+
+
+def test_substitute_after_zs():
+    """Only the part after ``\\zs`` is replaced, after a head of any width."""
+    regex = compile_pattern(r"^\s*\zsfoo")
+    replace = lambda match: expand(compile_replacement(r"<&>"), match)  # noqa: E731
+    assert substitute_line("  foo foo", regex, replace, True) == (
+        "  <foo> foo",
+        [(2, 7)],
+    )
+    assert substitute_spans(["foo", "\t foo"], regex, replace, True) == (
+        [(0, 3, "<foo>"), (6, 9, "<foo>")],
+        [0, 1],
+    )
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Tests for the project symbol index."""
+
+# Standard Libraries
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils import symbol_index as symbol_index_module
+from spyder_okvim.utils.symbol_index import ProjectSymbolIndex, extract_symbols
+from spyder_okvim.utils.symbol_search import SymbolSearchDialog
+
+SOURCE = """\
+import os
+
+VERSION = "1"
+a, (b, c) = 1, (2, 3)
+
+class Foo:
+    attr = 1
+
+    def bar(self):
+        def inner():
+            pass
+
+    class Inner:
+        async def run(self):
+            pass
+
+def main():
+    pass
+
+try:
+    from x import y
+except ImportError:
+    def y():
+        pass
+"""
+
+
+@pytest.fixture
+def project(tmpdir):
+    """Create a small project tree."""
+    folder = tmpdir.mkdir("project")
+    folder.join("mod.py").write(SOURCE)
+    folder.join("other.py").write("def helper():\n    pass\n")
+    folder.join("broken.py").write("def (\n")
+    folder.join("notes.txt").write("def not_python():\n")
+    return folder
+
+
+@pytest.fixture
+def executor():
+    """Parse the files in threads."""
+    pool = ThreadPoolExecutor(2)
+    yield pool
+    pool.shutdown()
+
+
+def test_extract_symbols():
+    """Test the collected symbols and their containers."""
+    assert extract_symbols(SOURCE) == [
+        ("VERSION", "variable", 2, 0, ""),
+        ("a", "variable", 3, 0, ""),
+        ("b", "variable", 3, 4, ""),
+        ("c", "variable", 3, 7, ""),
+        ("Foo", "class", 5, 6, ""),
+        ("bar", "method", 8, 8, "Foo"),
+        ("Inner", "class", 12, 10, "Foo"),
+        ("run", "method", 13, 18, "Foo.Inner"),
+        ("main", "function", 16, 4, ""),
+        ("y", "function", 22, 8, ""),
+    ]
+    assert extract_symbols("def (") == []
+
+
+def test_index_is_incremental(qtbot, project, tmpdir, executor, monkeypatch):
+    """Test that only changed files are parsed again."""
+    cache_dir = str(tmpdir.mkdir("cache"))
+    index = ProjectSymbolIndex(str(project), cache_dir, executor)
+    paths = ["broken.py", "mod.py", "notes.txt", "other.py"]
+    with qtbot.waitSignal(index.sig_symbols_updated, timeout=5000):
+        index.update(paths)
+    assert sorted(index.files) == ["broken.py", "mod.py", "other.py"]
+    assert ("Foo.bar", "method", "mod.py", 8, 8) in index.symbols()
+
+    parsed = []
+    extract = symbol_index_module.extract_symbols
+
+    def _extract_symbols(source):
+        parsed.append(source)
+        return extract(source)
+
+    monkeypatch.setattr(symbol_index_module, "extract_symbols", _extract_symbols)
+    other = project.join("other.py")
+    other.write("def helper2():\n    pass\n")
+    mtime = os.stat(str(other)).st_mtime + 10
+    os.utime(str(other), (mtime, mtime))
+    with qtbot.waitSignal(index.sig_symbols_updated, timeout=5000):
+        index.update_file(str(other))
+    assert parsed == [b"def helper2():\n    pass\n"]
+    assert ("helper2", "function", "other.py", 0, 4) in index.symbols()
+
+    with qtbot.waitSignal(index.sig_symbols_updated, timeout=5000):
+        index.update(["mod.py", "other.py"])
+    assert sorted(index.files) == ["mod.py", "other.py"]
+    assert len(parsed) == 1
+
+    # The cache is written on a background thread.
+    index.stop()
+    cached = ProjectSymbolIndex(str(project), cache_dir, executor)
+    cached.load_cache()
+    assert cached.files == index.files
+
+    # A cache of another version is ignored.
+    with open(index.cache_file, "w", encoding="utf-8") as fh:
+        json.dump({"root": index.root, "files": index.files}, fh)
+    cached = ProjectSymbolIndex(str(project), cache_dir, executor)
+    cached.load_cache()
+    assert cached.files == {}
+
+
+def test_dialog(qtbot, project, executor):
+    """Test fuzzy searching and selecting a symbol."""
+    index = ProjectSymbolIndex(str(project), None, executor)
+    with qtbot.waitSignal(index.sig_symbols_updated, timeout=5000):
+        index.update(["mod.py", "other.py"])
+
+    dlg = SymbolSearchDialog(str(project), index)
+    qtbot.addWidget(dlg)
+    qtbot.keyClicks(dlg.edit, "fooinner")
+    assert dlg.list_model.rowCount() == 2
+    assert dlg.list_model.index(0, 0).data() == "Foo.Inner"
+    assert dlg.list_model.index(0, 2).data() == "mod.py:13"
+
+    dlg.next_row(1)
+    dlg.enter()
+    assert dlg.get_selected_symbol() == (str(project.join("mod.py")), 13, 18)
+    dlg.release_symbol_index()
+
+
+def test_find_definitions(qtbot, project, executor):
+    """Test the tag lookup by unqualified name."""
+    index = ProjectSymbolIndex(str(project), None, executor)
+    with qtbot.waitSignal(index.sig_symbols_updated, timeout=5000):
+        index.update(["mod.py", "other.py"])
+    assert index.find_definitions("run") == [(str(project.join("mod.py")), 13, 18)]
+    assert index.find_definitions("missing") == []
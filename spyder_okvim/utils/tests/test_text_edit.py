@@ -0,0 +1,93 @@
+"""Tests for the minimal-diff text edit applier"""
+
+# Third Party Libraries
+import pytest
+from qtpy.QtGui import QTextCursor, QTextDocument
+
+# Project Libraries
+from spyder_okvim.utils.text_edit import (
+    LineTracker,
+    apply_line_change,
+    apply_text_change,
+    diff_spans,
+)
+
+
+def test_diff_spans_per_line():
+    old = "a\n\nb\nc"
+    new = "    a\n\n    b\nc"
+    assert diff_spans(old, new) == [(0, 0, "    "), (3, 3, "    ")]
+    assert diff_spans("f(a) + 1", "f(A) + 1") == [(2, 3, "A")]
+    assert diff_spans("x", "x") == []
+
+
+def test_diff_spans_line_count_changes():
+    assert diff_spans("(\n  a\n)", "a") == [(0, 7, "a")]
+    assert diff_spans("[a\nb]", "a\nb") == [(0, 1, ""), (4, 5, "")]
+
+
+def test_apply_text_change(qtbot):
+    lines = [f"line {idx}" for idx in range(5000)]
+    doc = QTextDocument("\n".join(lines))
+    block = doc.begin()
+    while block.isValid():
+        block.setUserState(7)
+        block = block.next()
+
+    cursor = QTextCursor(doc)
+    new_text = "\n".join("    " + line for line in lines)
+    assert apply_text_change(cursor, 0, "\n".join(lines), new_text) == 5000
+
+    assert doc.toPlainText() == new_text
+    # The blocks are edited in place instead of being replaced.
+    assert doc.findBlockByNumber(4999).userState() == 7
+
+    doc.undo()
+    assert doc.toPlainText() == "\n".join(lines)
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("a\nb\nc", "a\nc"),
+        ("a\nb\nc", "a\nb"),
+        ("a\nb\nc", "b\nc"),
+        ("a\nb", "a\nb\nc"),
+        ("a\nb", "x\na\nb"),
+        ("a\nb\nc", "c\nb\na"),
+        ("a", ""),
+    ],
+)
+def test_apply_line_change(qtbot, old, new):
+    doc = QTextDocument("x\n" + old + "\ny")
+    assert apply_line_change(
+        QTextCursor(doc), 2, old.split("\n"), new.split("\n")
+    )
+    assert doc.toPlainText() == "x\n" + new + "\ny"
+
+    doc = QTextDocument(old)
+    apply_line_change(QTextCursor(doc), 0, old.split("\n"), new.split("\n"))
+    assert doc.toPlainText() == new
+    doc.undo()
+    assert doc.toPlainText() == old
+
+
+def _replace(doc, start, end, text):
+    cursor = QTextCursor(doc)
+    cursor.setPosition(start)
+    cursor.setPosition(end, QTextCursor.KeepAnchor)
+    cursor.insertText(text)
+
+
+def test_line_tracker(qtbot):
+    """Deleted and joined lines are skipped; the others follow the edits."""
+    doc = QTextDocument("0\n1\n2\n3\n4\n5")
+    lines = iter(LineTracker(doc, range(6)))
+    assert next(lines) == 0
+    _replace(doc, 2, 4, "")  # Delete the line "1" with its line break.
+    _replace(doc, 0, 0, "x\n")  # Open a line above "0".
+    assert next(lines) == 2
+    _replace(doc, 5, 6, " ")  # Join "3" to "2".
+    _replace(doc, 9, 11, "")  # Delete the last line with the break above it.
+    assert list(lines) == [3]
+    assert doc.toPlainText() == "x\n0\n2 3\n4"
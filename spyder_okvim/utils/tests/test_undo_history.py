@@ -0,0 +1,63 @@
+"""Tests for the undo history helpers"""
+
+# Third Party Libraries
+from qtpy.QtGui import QTextCursor
+from qtpy.QtWidgets import QPlainTextEdit
+
+# Project Libraries
+from spyder_okvim.utils.undo_history import (
+    UndoHistory,
+    parse_undo_offset,
+    undo_steps,
+    undo_to_state,
+)
+
+
+def test_parse_undo_offset():
+    assert parse_undo_offset("") == (1, 0.0)
+    assert parse_undo_offset("3") == (3, 0.0)
+    assert parse_undo_offset("30s") == (0, 30.0)
+    assert parse_undo_offset("5m") == (0, 300.0)
+    assert parse_undo_offset("1h") == (0, 3600.0)
+    assert parse_undo_offset("5x") is None
+
+
+def test_undo_history_target():
+    history = UndoHistory()
+    for steps, when in ((1, 0.0), (2, 10.0), (3, 100.0), (4, 130.0)):
+        history.record(steps, when)
+
+    assert history.target(4, 30, later=False) == 3
+    assert history.target(4, 31, later=False) == 2
+    assert history.target(4, 1000, later=False) == 0
+    assert history.target(2, 60, later=True) == 2
+    assert history.target(2, 120, later=True) == 4
+    assert history.target(0, 10, later=True) == 2
+
+    # A change after an undo drops the newer states.
+    history.record(3, 200.0)
+    assert list(history.steps) == [1, 2, 3]
+    assert history.times[-1] == 200.0
+
+
+def test_undo_steps(qtbot):
+    editor = QPlainTextEdit()
+    qtbot.addWidget(editor)
+    cursor = editor.textCursor()
+    for idx in range(50):
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(f"{idx}\n")
+
+    assert undo_steps(editor, 40) == 40
+    assert editor.toPlainText() == "".join(f"{idx}\n" for idx in range(10))
+    assert editor.updatesEnabled()
+
+    assert undo_steps(editor, 100) == 10
+    assert editor.toPlainText() == ""
+    assert undo_steps(editor, 5, redo=True) == 5
+    assert editor.toPlainText() == "0\n1\n2\n3\n4\n"
+
+    steps = editor.document().availableUndoSteps()
+    undo_steps(editor, 3, redo=True)
+    assert undo_to_state(editor, steps) == 3
+    assert editor.toPlainText() == "0\n1\n2\n3\n4\n"
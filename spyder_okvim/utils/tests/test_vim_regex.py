@@ -0,0 +1,85 @@
+"""Tests for the Vim regular expression translator"""
+
+# Third Party Libraries
+import pytest
+
+# Project Libraries
+from spyder_okvim.utils.vim_regex import (
+    compile_pattern,
+    compile_qt_pattern,
+    escape,
+    has_uppercase,
+    match_group,
+    match_span,
+    translate,
+)
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        (r"\<foo\>", r"\b(?=\w)foo\b(?<=\w)"),
+        (r"\(\w\+\) \1", r"(\w+)\ \1"),
+        (r"(a+)", r"\(a\+\)"),
+        (r"\vfoo(bar)+|b?", "foo(bar)+|b?"),
+        (r"\v<x>", r"\b(?=\w)x\b(?<=\w)"),
+        (r"\Vf.o*", r"f\.o\*"),
+        (r"\Mf\.o*", r"f.o\*"),
+        (r"a\{2,3}b\{-}c\{,4}", "a{2,3}b*?c{0,4}"),
+        (r"a\=b\?", "a?b?"),
+        (r"\%(a\|b\)c", "(?:a|b)c"),
+        (r"[a-z]\+[^]x]", r"[a-z]+[^\]x]"),
+        (r"[abc", r"\[abc"),
+        (r"*x", r"\*x"),
+        ("^a$b$", r"^a\$b$"),
+        (r"\a\u\x", "[A-Za-z][A-Z][0-9A-Fa-f]"),
+        (r"foo\zsbar", "foo(?P<zs>bar)"),
+        (r"^\s*\zsfoo", r"^\s*(?P<zs>foo)"),
+        (r"\(a\)\zs\(b\)\2\1", r"(a)(?P<zs>(b)\3\1)"),
+        (r"foo\zebar", "foo(?=bar)"),
+    ],
+)
+def test_translate(pattern, expected):
+    assert translate(pattern)[0] == expected
+
+
+def test_translate_qt_and_case():
+    assert translate(r"foo\s*\zsbar")[1] == r"foo\s*\Kbar"
+    assert translate(r"\cFoo")[2] is True
+    assert translate(r"foo\C")[2] is False
+    assert translate("foo")[2] is None
+
+
+def test_compile_pattern():
+    assert compile_pattern(r"a\+b", True) is compile_pattern(r"a\+b", True)
+    assert compile_pattern(r"\<a\>").findall("a ab a") == ["a", "a"]
+    assert compile_pattern("A", True).search("a")
+    assert not compile_pattern(r"A\C", True).search("a")
+    assert match_span(compile_pattern(r"foo\zsbar").search("foobar")) == (3, 6)
+
+    regex = compile_qt_pattern(r"foo\s*\zsbar")
+    assert regex is compile_qt_pattern(r"foo\s*\zsbar")
+    assert regex.isValid()
+    assert regex.match("foo  bar").capturedStart() == 5
+
+
+def test_match_span_and_group():
+    """The part before ``\\zs`` may have any width."""
+    match = compile_pattern(r"^\s*\zs\(\w\+\)(\(\w*\))").search("    foo(bar)")
+    assert match_span(match) == (4, 12)
+    assert match_group(match, 0) == "foo(bar)"
+    assert match_group(match, 1) == "foo"
+    assert match_group(match, 2) == "bar"
+    assert match_group(match, 3) is None
+
+    match = compile_pattern(r"foo").search("a foo")
+    assert match_span(match) == (2, 5)
+    assert match_group(match, 0) == "foo"
+
+
+def test_escape_and_uppercase():
+    word = "a.b*c"
+    assert compile_pattern(escape(word)).fullmatch(word)
+    assert not compile_pattern(escape(word)).search("axbbc")
+    assert has_uppercase("Foo")
+    assert not has_uppercase(r"\S\W foo")
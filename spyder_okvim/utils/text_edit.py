@@ -0,0 +1,190 @@
+"""Apply a rewritten text by editing only the spans that changed."""
+
+from __future__ import annotations
+
+# Standard Libraries
+from collections.abc import Iterable, Iterator
+
+# Third Party Libraries
+from qtpy.QtGui import QTextCursor, QTextDocument
+
+
+def _common_prefix(old: str, new: str) -> int:
+    size = min(len(old), len(new))
+    idx = 0
+    while idx < size and old[idx] == new[idx]:
+        idx += 1
+    return idx
+
+
+def _common_suffix(old: str, new: str, limit: int) -> int:
+    idx = 0
+    while idx < limit and old[-1 - idx] == new[-1 - idx]:
+        idx += 1
+    return idx
+
+
+def _span(offset: int, old: str, new: str) -> tuple[int, int, str] | None:
+    """Return the span of ``old`` to replace to obtain ``new``."""
+    if old == new:
+        return None
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    return (
+        offset + prefix,
+        offset + len(old) - suffix,
+        new[prefix : len(new) - suffix],
+    )
+
+
+def diff_spans(old_text: str, new_text: str) -> list[tuple[int, int, str]]:
+    """Return the ``(start, end, text)`` replacements turning old into new.
+
+    Lines are compared one by one when both texts have as many lines, so
+    that indenting a block gives one small insertion per line. Otherwise
+    the text between the common prefix and suffix is replaced.
+    """
+    old_lines = old_text.split("\n")
+    new_lines = new_text.split("\n")
+    if len(old_lines) != len(new_lines):
+        span = _span(0, old_text, new_text)
+        return [] if span is None else [span]
+
+    spans = []
+    offset = 0
+    for old, new in zip(old_lines, new_lines):
+        span = _span(offset, old, new)
+        if span is not None:
+            spans.append(span)
+        offset += len(old) + 1
+    return spans
+
+
+def apply_text_change(
+    cursor: QTextCursor, pos_start: int, old_text: str, new_text: str
+) -> int:
+    """Turn ``old_text`` found at ``pos_start`` into ``new_text``.
+
+    Only the changed spans are replaced, in one edit block, so breakpoints,
+    bookmarks and folding of the untouched lines are kept.
+
+    Args:
+        cursor: Cursor of the document to edit.
+        pos_start: Position of ``old_text`` in the document.
+        old_text: Current text, with ``\\n`` line separators.
+        new_text: Text to obtain.
+
+    Returns:
+        Number of replaced spans.
+    """
+    return apply_spans(cursor, pos_start, diff_spans(old_text, new_text))
+
+
+def apply_spans(
+    cursor: QTextCursor, pos_start: int, spans: list[tuple[int, int, str]]
+) -> int:
+    """Replace the sorted ``(start, end, text)`` spans in one edit block.
+
+    The offsets are relative to ``pos_start``.
+
+    Returns:
+        Number of replaced spans.
+    """
+    if not spans:
+        return 0
+    cursor.beginEditBlock()
+    # From the end so that the positions of the other spans stay valid.
+    for start, end, text in reversed(spans):
+        cursor.setPosition(pos_start + start)
+        cursor.setPosition(pos_start + end, QTextCursor.KeepAnchor)
+        cursor.insertText(text)
+    cursor.endEditBlock()
+    return len(spans)
+
+
+def apply_line_change(
+    cursor: QTextCursor, pos_start: int, old_lines: list[str], new_lines: list[str]
+) -> bool:
+    """Turn ``old_lines`` found at ``pos_start`` into ``new_lines``.
+
+    The lines shared at the start and at the end are kept and the lines
+    between them are replaced with one edit, which suits commands that
+    reorder, add or remove whole lines.
+
+    Returns:
+        ``True`` if the text was changed.
+    """
+    size = min(len(old_lines), len(new_lines))
+    head = 0
+    while head < size and old_lines[head] == new_lines[head]:
+        head += 1
+    tail = 0
+    while tail < size - head and old_lines[-1 - tail] == new_lines[-1 - tail]:
+        tail += 1
+    if head == len(old_lines) == len(new_lines):
+        return False
+
+    old_mid = old_lines[head : len(old_lines) - tail]
+    new_mid = new_lines[head : len(new_lines) - tail]
+    start = pos_start + sum(map(len, old_lines[:head])) + head
+    if tail:
+        old_text = "".join(line + "\n" for line in old_mid)
+        new_text = "".join(line + "\n" for line in new_mid)
+    elif head:
+        # Nothing follows the changed lines: take the separator before them.
+        start -= 1
+        old_text = "".join("\n" + line for line in old_mid)
+        new_text = "".join("\n" + line for line in new_mid)
+    else:
+        old_text = "\n".join(old_mid)
+        new_text = "\n".join(new_mid)
+
+    cursor.beginEditBlock()
+    cursor.setPosition(start)
+    cursor.setPosition(start + len(old_text), QTextCursor.KeepAnchor)
+    cursor.insertText(new_text)
+    cursor.endEditBlock()
+    return True
+
+
+class LineTracker:
+    """Follow lines of a document through its edits, like the marks of ``:g``.
+
+    The line breaks are selected by cursors, which Qt moves with every
+    edit, and a line lies between the breaks around it. A line is lost when
+    the break above it is removed and its text joins the line above, or
+    when the break below it is removed with all its text.
+    """
+
+    def __init__(self, document: QTextDocument, lines: Iterable[int]) -> None:
+        self._lines = list(lines)
+        self._breaks = {}
+        # The first line has no break above it.
+        self._first = QTextCursor(document)
+        last = document.blockCount() - 1
+        for line in self._lines:
+            for idx in (line - 1, line):
+                if 0 <= idx < last and idx not in self._breaks:
+                    cursor = QTextCursor(document.findBlockByNumber(idx + 1))
+                    cursor.movePosition(QTextCursor.Left, QTextCursor.KeepAnchor)
+                    self._breaks[idx] = cursor
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield the current number of each line left, checked when reached."""
+        for line in self._lines:
+            above = self._breaks.pop(line - 1, None)
+            below = self._breaks.get(line)
+            if above is None:
+                start = self._first.position()
+            elif above.hasSelection():
+                start = above.selectionEnd()
+            else:
+                start = above.position()
+                if not above.block().position() == start:
+                    # Joined to the line above.
+                    continue
+            if below is not None and not below.hasSelection():
+                if below.position() == start:
+                    # Deleted with its break.
+                    continue
+            yield self._first.document().findBlock(start).blockNumber()
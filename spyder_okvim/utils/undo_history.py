@@ -0,0 +1,136 @@
+"""Counted undo and time-based undo checkpoints."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import re
+from array import array
+from bisect import bisect_right
+
+# Third Party Libraries
+from qtpy.QtWidgets import QPlainTextEdit
+
+TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+RE_UNDO_OFFSET = re.compile(r"\s*(\d*)\s*([smhd]?)\s*$")
+
+
+def parse_undo_offset(arg: str) -> tuple[int, float] | None:
+    """Parse the argument of ``:earlier`` and ``:later``.
+
+    Returns:
+        ``(count, 0)`` for a number of changes, ``(0, seconds)`` for a
+        duration like ``5m`` or ``None`` when the argument is invalid.
+    """
+    match = RE_UNDO_OFFSET.match(arg)
+    if match is None:
+        return None
+    num, unit = match.groups()
+    num = int(num) if num else 1
+    if unit:
+        return 0, float(num * TIME_UNITS[unit])
+    return num, 0.0
+
+
+def undo_steps(editor, count: int, redo: bool = False) -> int:
+    """Undo or redo ``count`` changes with a single repaint.
+
+    The editor notifies its listeners once for the whole count instead of
+    once per change.
+
+    Returns:
+        Number of changes undone or redone.
+    """
+    return _run_batched(editor, redo, lambda done: done < count)
+
+
+def undo_to_state(editor, steps: int) -> int:
+    """Undo or redo until the document has ``steps`` undo steps.
+
+    Returns:
+        Number of changes undone or redone.
+    """
+    document = editor.document()
+    if steps < document.availableUndoSteps():
+        return _run_batched(
+            editor, False, lambda _: document.availableUndoSteps() > steps
+        )
+    return _run_batched(
+        editor, True, lambda _: document.availableUndoSteps() < steps
+    )
+
+
+def _run_batched(editor, redo: bool, keep_going) -> int:
+    document = editor.document()
+    available = document.isRedoAvailable if redo else document.isUndoAvailable
+    step = QPlainTextEdit.redo if redo else QPlainTextEdit.undo
+    flag = "is_redoing" if redo else "is_undoing"
+    has_flags = hasattr(editor, flag)
+
+    editor.setUpdatesEnabled(False)
+    if has_flags:
+        editor.skip_rstrip = True
+        setattr(editor, flag, True)
+    done = 0
+    try:
+        while available() and keep_going(done):
+            step(editor)
+            done += 1
+    finally:
+        if has_flags:
+            setattr(editor, flag, False)
+            editor.skip_rstrip = False
+        editor.setUpdatesEnabled(True)
+
+    if done and hasattr(editor, "text_version"):
+        editor.text_version += done if redo else -done
+        (editor.sig_redo if redo else editor.sig_undo).emit()
+        editor.sig_text_was_inserted.emit()
+    return done
+
+
+class UndoHistory:
+    """Times at which the undo states of a document were reached.
+
+    A state is identified by the number of available undo steps of the
+    document, which grows with every change. The states discarded by a
+    change made after an undo are dropped, so the steps and the times
+    both increase.
+    """
+
+    def __init__(self, max_items: int = 1000) -> None:
+        self.max_items = max_items
+        self.steps = array("q")
+        self.times = array("d")
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def record(self, steps: int, when: float) -> None:
+        """Record that the state with ``steps`` undo steps was reached."""
+        while self.steps and self.steps[-1] >= steps:
+            self.steps.pop()
+            self.times.pop()
+        if len(self.steps) >= self.max_items:
+            del self.steps[0]
+            del self.times[0]
+        self.steps.append(steps)
+        self.times.append(when)
+
+    def target(self, current: int, seconds: float, later: bool) -> int:
+        """Return the state ``seconds`` away from the ``current`` state."""
+        if not self.steps:
+            return current
+        idx = bisect_right(self.steps, current) - 1
+        if idx >= 0 and self.steps[idx] == current:
+            base = self.times[idx]
+        elif idx + 1 < len(self.steps):
+            # The state is older than the history; start from the next one.
+            base = self.times[idx + 1]
+        else:
+            base = self.times[-1]
+
+        if later:
+            idx = bisect_right(self.times, base + seconds) - 1
+            return max(current, self.steps[idx]) if idx >= 0 else current
+        idx = bisect_right(self.times, base - seconds) - 1
+        return min(current, self.steps[idx]) if idx >= 0 else 0
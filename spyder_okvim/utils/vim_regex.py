@@ -0,0 +1,290 @@
+"""Translate Vim regular expressions to Python and Qt ones."""
+
+from __future__ import annotations
+
+# Standard Libraries
+import re
+from functools import lru_cache
+
+# Third Party Libraries
+from qtpy.QtCore import QRegularExpression
+
+# Characters whose meaning is swapped by a backslash, depending on the mode.
+TOGGLED = set(".*[~()|+?={}<>@%")
+# Characters special without a backslash in each mode.
+MODE_SPECIAL = {
+    "v": TOGGLED,
+    "m": set(".*[~"),
+    "M": set(),
+    "V": set(),
+}
+CLASS_ESCAPES = {
+    "s": r"\s",
+    "S": r"\S",
+    "d": r"\d",
+    "D": r"\D",
+    "w": r"\w",
+    "W": r"\W",
+    "a": "[A-Za-z]",
+    "A": "[^A-Za-z]",
+    "l": "[a-z]",
+    "L": "[^a-z]",
+    "u": "[A-Z]",
+    "U": "[^A-Z]",
+    "x": "[0-9A-Fa-f]",
+    "X": "[^0-9A-Fa-f]",
+    "o": "[0-7]",
+    "O": "[^0-7]",
+    "h": "[A-Za-z_]",
+    "H": "[^A-Za-z_]",
+    "n": r"\n",
+    "t": r"\t",
+    "e": r"\x1b",
+    "r": r"\r",
+    "b": r"\x08",
+}
+WORD_START = r"\b(?=\w)"
+WORD_END = r"\b(?<=\w)"
+RE_BRACE = re.compile(r"(-?)(\d*)(,?)(\d*)\\?}")
+# Characters escaped by ``*`` and ``#`` in the word under the cursor.
+LITERAL_CHARS = "\\/.*$^~["
+
+# Markers of ``\zs`` and ``\ze`` in the translated pieces.
+ZS = object()
+ZE = object()
+# Group of the Python patterns around the part after ``\zs``.
+ZS_GROUP = "zs"
+RE_BACKREF = re.compile(r"\\([1-9])")
+
+
+def has_uppercase(pattern: str) -> bool:
+    """Return whether ``pattern`` has an uppercase letter for 'smartcase'.
+
+    The letters after a backslash, like in ``\\S``, are not counted.
+    """
+    idx = 0
+    while idx < len(pattern):
+        if pattern[idx] == "\\":
+            idx += 2
+            continue
+        if pattern[idx].isupper():
+            return True
+        idx += 1
+    return False
+
+
+def escape(text: str) -> str:
+    """Return ``text`` escaped to be matched literally by a Vim pattern."""
+    return "".join("\\" + ch if ch in LITERAL_CHARS else ch for ch in text)
+
+
+def translate(pattern: str) -> tuple[str, str, bool | None]:
+    """Translate a Vim pattern to Python ``re`` and ``QRegularExpression``.
+
+    The pattern starts in the 'magic' mode; ``\\v``, ``\\m``, ``\\M`` and
+    ``\\V`` switch the mode. ``\\c`` and ``\\C`` force ignoring or matching
+    the case. ``\\zs`` and ``\\ze`` set the start and the end of the match
+    when they are not inside a group.
+
+    Returns:
+        The Python pattern, the Qt pattern and the case forced by ``\\c``
+        or ``\\C``, ``None`` if the pattern does not force it.
+    """
+    pieces = []
+    ignore_case = None
+    mode = "m"
+    idx = 0
+    size = len(pattern)
+    while idx < size:
+        ch = pattern[idx]
+        idx += 1
+        escaped = ch == "\\" and idx < size
+        if escaped:
+            ch = pattern[idx]
+            idx += 1
+
+        if ch in TOGGLED:
+            if (ch in MODE_SPECIAL[mode]) == escaped:
+                pieces.append(re.escape(ch))
+                continue
+            piece, idx = _special(ch, pattern, idx, not pieces)
+            pieces.append(piece)
+        elif ch == "^" and not escaped:
+            at_start = not pieces or pieces[-1] in ("(", "(?:", "|")
+            pieces.append("^" if at_start else r"\^")
+        elif ch == "$" and not escaped:
+            at_end = idx == size or pattern.startswith(
+                ("|", ")") if mode == "v" else ("\\|", "\\)"), idx
+            )
+            pieces.append("$" if at_end or mode == "v" else r"\$")
+        elif not escaped:
+            pieces.append(re.escape(ch))
+        elif ch in "vmMV":
+            mode = ch
+        elif ch in "cC":
+            ignore_case = ch == "c"
+        elif ch == "z" and idx < size and pattern[idx] in "se":
+            pieces.append(ZS if pattern[idx] == "s" else ZE)
+            idx += 1
+        elif ch == "_" and idx < size:
+            nxt = pattern[idx]
+            idx += 1
+            if nxt == ".":
+                pieces.append(r"[\s\S]")
+            elif nxt in "^$":
+                pieces.append(nxt)
+            else:
+                pieces.append(CLASS_ESCAPES.get(nxt, re.escape(nxt)))
+        elif ch in CLASS_ESCAPES:
+            pieces.append(CLASS_ESCAPES[ch])
+        elif ch.isdigit() and ch != "0":
+            pieces.append("\\" + ch)
+        else:
+            pieces.append(re.escape(ch))
+    return _join(pieces, False), _join(pieces, True), ignore_case
+
+
+def _special(ch: str, pattern: str, idx: int, at_start: bool):
+    """Return the translation of the special character ``ch`` and the index."""
+    if ch == "*":
+        return (r"\*" if at_start else "*"), idx
+    if ch == "[":
+        return _char_class(pattern, idx)
+    if ch in "=?":
+        return "?", idx
+    if ch == "{":
+        match = RE_BRACE.match(pattern, idx)
+        if match is None:
+            return r"\{", idx
+        lazy, low, comma, high = match.groups()
+        if not comma:
+            quantifier = "*" if not low else f"{{{low}}}"
+        elif not low and not high:
+            quantifier = "*"
+        else:
+            quantifier = f"{{{low or 0},{high}}}"
+        return quantifier + ("?" if lazy else ""), match.end()
+    if ch == "<":
+        return WORD_START, idx
+    if ch == ">":
+        return WORD_END, idx
+    if ch == "%":
+        if pattern.startswith("(", idx):
+            return "(?:", idx + 1
+        return "%", idx
+    if ch in "~@":
+        # The last substitute string and the lookarounds are not supported.
+        return re.escape(ch), idx
+    return ch, idx
+
+
+def _char_class(pattern: str, idx: int) -> tuple[str, int]:
+    """Translate the ``[...]`` starting at ``idx``, after the ``[``."""
+    chars = ["["]
+    start = idx
+    if pattern.startswith("^", idx):
+        chars.append("^")
+        idx += 1
+    if pattern.startswith("]", idx):
+        chars.append(r"\]")
+        idx += 1
+    while idx < len(pattern):
+        ch = pattern[idx]
+        idx += 1
+        if ch == "]":
+            chars.append("]")
+            return "".join(chars), idx
+        if ch == "\\" and idx < len(pattern):
+            nxt = pattern[idx]
+            idx += 1
+            chars.append(
+                CLASS_ESCAPES.get(nxt, "\\" + nxt) if nxt in "entrb" else "\\" + nxt
+            )
+        elif ch in "[&~|":
+            chars.append("\\" + ch)
+        else:
+            chars.append(ch)
+    # Without a closing ``]`` the ``[`` is a literal character.
+    return r"\[", start
+
+
+def _join(pieces: list, for_qt: bool) -> str:
+    if ZS in pieces:
+        idx = len(pieces) - 1 - pieces[::-1].index(ZS)
+        if for_qt:
+            head = _join(pieces[:idx], for_qt)
+            tail = _join(pieces[idx + 1 :], for_qt)
+            return head + r"\K" + tail if head else tail
+        head_pieces = [piece for piece in pieces[:idx] if piece is not ZS]
+        head = _join(head_pieces, for_qt)
+        tail = _join(pieces[idx + 1 :], for_qt)
+        if not head:
+            return tail
+        # A look-behind needs a fixed width, so the part after ``\zs`` is
+        # put in a group instead; the groups after it are numbered one more.
+        n_groups = head_pieces.count("(")
+        tail = RE_BACKREF.sub(
+            lambda m: m[0] if int(m[1]) <= n_groups else f"\\{int(m[1]) + 1}",
+            tail,
+        )
+        return f"{head}(?P<{ZS_GROUP}>{tail})"
+    if ZE in pieces:
+        idx = pieces.index(ZE)
+        head = "".join(p for p in pieces[:idx] if p is not ZE)
+        tail = "".join(p for p in pieces[idx + 1 :] if p is not ZE)
+        return f"{head}(?={tail})" if tail else head
+    return "".join(pieces)
+
+
+def match_span(match: re.Match) -> tuple[int, int]:
+    """Return the span of ``match`` without the part before ``\\zs``."""
+    if ZS_GROUP in match.re.groupindex:
+        return match.span(ZS_GROUP)
+    return match.span()
+
+
+def match_group(match: re.Match, index: int) -> str | None:
+    """Return the group ``index`` of ``match`` numbered like in Vim.
+
+    The group 0 is the match after ``\\zs``.
+    """
+    zs_index = match.re.groupindex.get(ZS_GROUP)
+    if zs_index is not None and (index == 0 or index >= zs_index):
+        index = zs_index if index == 0 else index + 1
+    if index > match.re.groups:
+        return None
+    return match.group(index)
+
+
+def _ignore_case(pattern: str, ignore_case: bool) -> tuple[str, str, bool]:
+    python_pattern, qt_pattern, forced = translate(pattern)
+    return python_pattern, qt_pattern, ignore_case if forced is None else forced
+
+
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str, ignore_case: bool = False) -> re.Pattern:
+    """Return the Python regular expression of the Vim ``pattern``.
+
+    The compiled patterns are cached, so searching again with the same
+    pattern does not compile it again.
+
+    Raises:
+        re.error: If ``pattern`` is not a valid regular expression.
+    """
+    python_pattern, _, ignore_case = _ignore_case(pattern, ignore_case)
+    return re.compile(python_pattern, re.IGNORECASE if ignore_case else 0)
+
+
+@lru_cache(maxsize=128)
+def compile_qt_pattern(pattern: str, ignore_case: bool = False) -> QRegularExpression:
+    """Return the ``QRegularExpression`` of the Vim ``pattern``, cached.
+
+    The expression may be invalid; see ``QRegularExpression.isValid``.
+    """
+    _, qt_pattern, ignore_case = _ignore_case(pattern, ignore_case)
+    options = QRegularExpression.NoPatternOption
+    if ignore_case:
+        options = QRegularExpression.CaseInsensitiveOption
+    regex = QRegularExpression(qt_pattern, options)
+    regex.optimize()
+    return regex
@@ -7,7 +7,7 @@ Users should import them directly from ``spyder_okvim.vim``.
 
 from .cursor import VimCursor
 from .label import InlineLabel
-from .macro import MacroManager
+from .macro import Macro, MacroManager
 from .search import SearchInfo
 from .state import DotCmdInfo, FindInfo, InputCmdInfo, KeyInfo, RegisterInfo, VimState
 from .status import VimStatus
@@ -20,6 +20,7 @@ __all__ = [
     "KeyInfo",
     "RegisterInfo",
     "SearchInfo",
+    "Macro",
     "MacroManager",
     "InlineLabel",
     "VimCursor",
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Text changed by an insert session."""
+
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QTextCursor
+
+
+class InsertChange:
+    """Net text change of an insert session.
+
+    ``text`` replaces ``n_before`` characters before the insert point and
+    ``n_after`` characters after it. The cursor ends ``cursor_offset``
+    characters after the start of ``text``.
+    """
+
+    __slots__ = ("n_before", "text", "n_after", "cursor_offset")
+
+    def __init__(self, n_before=0, text="", n_after=0, cursor_offset=None):
+        self.n_before = n_before
+        self.text = text
+        self.n_after = n_after
+        self.cursor_offset = len(text) if cursor_offset is None else cursor_offset
+
+    def __bool__(self) -> bool:
+        return bool(self.text or self.n_before or self.n_after)
+
+    def apply(self, editor) -> None:
+        """Replay the change at the cursor of ``editor`` in one edit block."""
+        cursor = editor.textCursor()
+        pos = cursor.position()
+        start = max(0, pos - self.n_before)
+        end = min(pos + self.n_after, editor.document().characterCount() - 1)
+        cursor.beginEditBlock()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.insertText(self.text)
+        cursor.endEditBlock()
+        cursor.setPosition(start + self.cursor_offset)
+        editor.setTextCursor(cursor)
+
+    def keys(self):
+        """Yield the key code, text and modifiers typing this change.
+
+        The keys end with ``Esc`` like an insert typed in Vim.
+        """
+        for _ in range(self.n_before):
+            yield Qt.Key_Backspace, "\x08", 0
+        for char in self.text:
+            if char == "\n":
+                yield Qt.Key_Return, "\r", 0
+            elif char == "\t":
+                yield Qt.Key_Tab, "\t", 0
+            else:
+                upper = char.upper()
+                key = ord(upper) if len(upper) == 1 else ord(char)
+                yield key, char, Qt.ShiftModifier if char != char.lower() else 0
+        for _ in range(self.n_after):
+            yield Qt.Key_Delete, "\x7f", 0
+        for _ in range(len(self.text) - self.cursor_offset):
+            yield Qt.Key_Left, "", 0
+        yield Qt.Key_Escape, "\x1b", 0
+
+    def add_key(self, key: int, text: str) -> None:
+        """Extend the change with a key yielded by :meth:`keys`."""
+        if key == Qt.Key_Escape:
+            return
+        if key == Qt.Key_Backspace:
+            if self.text:
+                self.text = self.text[:-1]
+            else:
+                self.n_before += 1
+        elif key == Qt.Key_Delete:
+            self.n_after += 1
+        elif key == Qt.Key_Left:
+            self.cursor_offset = max(0, self.cursor_offset - 1)
+            return
+        elif key in (Qt.Key_Return, Qt.Key_Enter):
+            self.text += "\n"
+        else:
+            self.text += text
+        self.cursor_offset = len(self.text)
+
+
+class InsertRecorder:
+    """Follow the text changed by an insert session.
+
+    The inserted text lies between :attr:`start` and :attr:`end`. Text
+    removed around it is counted so that the session can be replayed as
+    one :class:`InsertChange`.
+    """
+
+    def __init__(self):
+        self.document = None
+        self.start = 0
+        self.end = 0
+        self.n_before = 0
+        self.n_after = 0
+        #: Whether the cursor left the inserted text during the session
+        self.moved = False
+
+    def contains(self, pos: int) -> bool:
+        """Return whether ``pos`` lies in the inserted text."""
+        return self.document is not None and self.start <= pos <= self.end
+
+    def begin(self, document, pos: int) -> None:
+        """Start following the changes of ``document`` made at ``pos``."""
+        moved = self.document is not None
+        self._disconnect()
+        self.document = document
+        self.start = self.end = pos
+        self.n_before = self.n_after = 0
+        self.moved = moved
+        document.contentsChange.connect(self._on_contents_change)
+
+    def finish(self, cursor_pos: int):
+        """Stop following the document and return the change or ``None``."""
+        document = self.document
+        if document is None:
+            return None
+        self._disconnect()
+        self.document = None
+        cursor = QTextCursor(document)
+        cursor.setPosition(min(self.start, document.characterCount() - 1))
+        cursor.setPosition(
+            min(self.end, document.characterCount() - 1), QTextCursor.KeepAnchor
+        )
+        text = cursor.selectedText().replace("\u2029", "\n")
+        offset = min(max(cursor_pos - self.start, 0), len(text))
+        return InsertChange(self.n_before, text, self.n_after, offset)
+
+    def _disconnect(self) -> None:
+        if self.document is not None:
+            try:
+                self.document.contentsChange.disconnect(self._on_contents_change)
+            except (TypeError, RuntimeError):
+                pass
+
+    def _on_contents_change(self, pos: int, removed: int, added: int) -> None:
+        removed_end = pos + removed
+        if removed_end < self.start:
+            self.start += added - removed
+            self.end += added - removed
+            return
+        if pos > self.end:
+            return
+        self.n_before += max(0, min(self.start, removed_end) - pos)
+        self.n_after += max(0, removed_end - self.end)
+        self.start = min(self.start, pos)
+        self.end = max(self.end, removed_end) - removed + added
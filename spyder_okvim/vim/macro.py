@@ -1,20 +1,266 @@
 # -*- coding: utf-8 -*-
 """Macro recording and playback utilities."""
 
-from collections import defaultdict
+import io
+import re
+from array import array
 
-from qtpy.QtCore import QObject
+from qtpy.QtCore import QObject, Qt
 from qtpy.QtGui import QKeyEvent
 
+from .insert_change import InsertChange
 from .state import KeyInfo
 
+#: Key typed in the Vim command line.
+FROM_VIM = 0
+#: Key typed in the editor.
+FROM_EDITOR = 1
+#: Key parsed from a register, sent to the widget having the focus.
+FROM_FOCUS = 2
+#: Key of a text inserted without the editor handling each key.
+FROM_INSERT = 3
+
+KEY_MASK = 0x01FFFFFF
+MODIFIER_MASK = 0xFE000000
+
+# Vim key notation of the keys without a printable text.
+KEY_NAMES = {
+    Qt.Key_Escape: "Esc",
+    Qt.Key_Return: "CR",
+    Qt.Key_Enter: "kEnter",
+    Qt.Key_Tab: "Tab",
+    Qt.Key_Backtab: "Tab",
+    Qt.Key_Backspace: "BS",
+    Qt.Key_Delete: "Del",
+    Qt.Key_Insert: "Insert",
+    Qt.Key_Home: "Home",
+    Qt.Key_End: "End",
+    Qt.Key_PageUp: "PageUp",
+    Qt.Key_PageDown: "PageDown",
+    Qt.Key_Up: "Up",
+    Qt.Key_Down: "Down",
+    Qt.Key_Left: "Left",
+    Qt.Key_Right: "Right",
+    Qt.Key_Space: "Space",
+    Qt.Key_Less: "lt",
+    **{Qt.Key_F1 + idx: f"F{idx + 1}" for idx in range(12)},
+}
+NAME_KEYS = {}
+for _key, _name in KEY_NAMES.items():
+    NAME_KEYS.setdefault(_name.lower(), _key)
+KEY_TEXTS = {
+    Qt.Key_Escape: "\x1b",
+    Qt.Key_Return: "\r",
+    Qt.Key_Enter: "\r",
+    Qt.Key_Tab: "\t",
+    Qt.Key_Backspace: "\x08",
+    Qt.Key_Delete: "\x7f",
+    Qt.Key_Space: " ",
+    Qt.Key_Less: "<",
+}
+MODIFIER_PREFIXES = (
+    (int(Qt.ControlModifier), "C"),
+    (int(Qt.ShiftModifier), "S"),
+    (int(Qt.AltModifier), "M"),
+    (int(Qt.MetaModifier), "D"),
+)
+MODIFIER_LETTERS = {letter: mod for mod, letter in MODIFIER_PREFIXES}
+# Pressing these alone does nothing, so they are not recorded.
+MODIFIER_KEYS = {
+    Qt.Key_Shift,
+    Qt.Key_Control,
+    Qt.Key_Alt,
+    Qt.Key_AltGr,
+    Qt.Key_Meta,
+    Qt.Key_CapsLock,
+}
+SHIFT = int(Qt.ShiftModifier)
+CONTROL = int(Qt.ControlModifier)
+KEYPAD = int(Qt.KeypadModifier)
+
+RE_KEY_NOTATION = re.compile(r"<((?:[A-Za-z]-)*)([^<>\s]+)>")
+
+
+def encode_key(key: int, text: str, modifiers: int) -> str:
+    """Return the Vim key notation of a key press."""
+    modifiers &= ~KEYPAD
+    if len(text) == 1 and text.isprintable() and not modifiers & ~SHIFT:
+        return "<lt>" if text == "<" else text
+    prefix = "".join(f"{letter}-" for mod, letter in MODIFIER_PREFIXES if modifiers & mod)
+    name = KEY_NAMES.get(key)
+    if name is None:
+        if key < 0x110000 and chr(key).isprintable():
+            name = chr(key).lower()
+        else:
+            name = f"0x{key:x}"
+    return f"<{prefix}{name}>"
+
+
+def parse_notation(notation: str):
+    """Yield the key code, modifiers and text of each key in ``notation``.
+
+    Unknown ``<...>`` groups are read as plain characters like Vim does.
+    """
+    idx = 0
+    end = len(notation)
+    while idx < end:
+        if notation[idx] == "<":
+            match = RE_KEY_NOTATION.match(notation, idx)
+            key = _decode_name(*match.groups()) if match else None
+            if key is not None:
+                yield key
+                idx = match.end()
+                continue
+        yield _decode_char(notation[idx])
+        idx += 1
+
+
+def _decode_name(prefix: str, name: str):
+    modifiers = 0
+    for letter in prefix[::2]:
+        mod = MODIFIER_LETTERS.get(letter.upper())
+        if mod is None:
+            return None
+        modifiers |= mod
+    key = NAME_KEYS.get(name.lower())
+    if key is not None:
+        return key, modifiers, KEY_TEXTS.get(key, "")
+    if len(name) == 1:
+        upper = name.upper()
+        key = ord(upper) if len(upper) == 1 else ord(name)
+        if modifiers & CONTROL:
+            text = chr(key & 0x1F) if 0x40 <= key < 0x60 else ""
+        else:
+            text = upper if modifiers & SHIFT else name
+        return key, modifiers, text
+    if name[:2].lower() == "0x":
+        try:
+            return int(name, 16) & KEY_MASK, modifiers, ""
+        except ValueError:
+            return None
+    return None
+
+
+def _decode_char(char: str):
+    if char in "\r\n":
+        return Qt.Key_Return, 0, "\r"
+    if char == "\t":
+        return Qt.Key_Tab, 0, "\t"
+    upper = char.upper()
+    key = ord(upper) if len(upper) == 1 else ord(char)
+    return key, SHIFT if char != char.lower() else 0, char
+
+
+class Macro:
+    """Keys of a macro in Vim key notation and a packed array.
+
+    ``notation`` holds one token per key, which is the text stored in the
+    register of the macro. ``codes`` packs the key code, the modifiers and
+    the widget receiving each key into one integer. A macro parsed from a
+    register does not know the widgets, so its keys are sent to the widget
+    having the focus. Keys typed in insert mode are kept as the net text
+    change of the insert, replayed as one :class:`InsertChange`.
+    """
+
+    __slots__ = ("codes", "_notation", "_tail", "_last", "_editor_run")
+
+    def __init__(self, notation: str = "", codes=None):
+        if codes is None:
+            codes = array(
+                "Q",
+                (
+                    FROM_FOCUS << 32 | modifiers | key
+                    for key, modifiers, _ in parse_notation(notation)
+                ),
+            )
+        self.codes = codes
+        self._notation = notation
+        self._tail = None
+        self._last = ""
+        self._editor_run = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def notation(self) -> str:
+        """Return the keys in Vim key notation."""
+        if self._tail is not None:
+            self._notation += self._tail.getvalue()
+            self._tail = None
+        return self._notation
+
+    def copy(self) -> "Macro":
+        """Return a copy which can be extended separately."""
+        return Macro(self.notation, array("Q", self.codes))
+
+    def append(self, key: int, text: str, modifiers, source: int) -> None:
+        """Add a key press coming from ``source``."""
+        if key in MODIFIER_KEYS:
+            return
+        modifiers = int(modifiers) & MODIFIER_MASK
+        if source != FROM_EDITOR:
+            self._editor_run = None
+        elif self._editor_run is None:
+            self._editor_run = (len(self.codes), len(self.notation))
+        self.codes.append(source << 32 | modifiers | key & KEY_MASK)
+        if self._tail is None:
+            self._tail = io.StringIO()
+        self._last = encode_key(key, text, modifiers)
+        self._tail.write(self._last)
+
+    def remove_last(self, token: str) -> None:
+        """Remove the last key if its notation is ``token``."""
+        if not self._last or self._last != token:
+            return
+        self.codes.pop()
+        self._notation = self.notation[: -len(self._last)]
+        self._last = ""
+
+    def record_insert(self, change: InsertChange) -> None:
+        """Replace the keys typed in the editor by their net text change."""
+        if self._editor_run is not None:
+            n_codes, n_chars = self._editor_run
+            del self.codes[n_codes:]
+            self._notation = self.notation[:n_chars]
+        for key, text, modifiers in change.keys():
+            self.append(key, text, modifiers, FROM_INSERT)
+        self._last = ""
+
+    def key_infos(self):
+        """Yield a :class:`KeyInfo` for each key.
+
+        Consecutive inserted keys are yielded as one :class:`InsertChange`.
+        """
+        change = None
+        for code, (_, _, text) in zip(self.codes, parse_notation(self.notation)):
+            source = code >> 32
+            if source == FROM_INSERT:
+                if change is None:
+                    change = InsertChange()
+                change.add_key(code & KEY_MASK, text)
+                continue
+            if change is not None:
+                yield change
+                change = None
+            yield KeyInfo(
+                code & KEY_MASK,
+                text,
+                Qt.KeyboardModifiers(code & MODIFIER_MASK),
+                source,
+            )
+        if change is not None:
+            yield change
+
 
 class MacroManager:
     """Store and play back recorded macros."""
 
     def __init__(self):
-        #: Mapping of register names to recorded :class:`KeyInfo` instances
-        self.registers = defaultdict(list)
+        #: Mapping of register names to recorded :class:`Macro` instances
+        self.registers: dict[str, Macro] = {}
+        #: Macro being recorded
+        self.recording = None
         #: Whether a macro is currently being recorded
         self.is_recording = False
         #: Register being used for recording
@@ -36,24 +282,28 @@ class MacroManager:
         self.reg_name_for_execute = register
         self.num_execute = count
 
-    def start_record(self, register):
+    def start_record(self, register, macro=None):
         """Begin recording keystrokes.
 
         Args:
             register: Name of the register to store the recording in.
+            macro: Keys to append the recording to.
         """
         self.reg_name_for_record = register
         self.is_recording = True
-
-        if register.lower() == register:
-            self.registers[register] = list()
+        self.recording = Macro() if macro is None else macro
 
     def stop_record(self):
-        """Finish recording and clean up."""
+        """Finish recording, clean up and return the recorded macro."""
         # Remove the trailing ``q`` when finishing recording
         self.remove_last_key("q")
+        macro = self.recording
+        if macro is not None:
+            self.registers[self.reg_name_for_record] = macro
+        self.recording = None
         self.reg_name_for_record = ""
         self.is_recording = False
+        return macro
 
     def remove_last_key(self, text):
         """Remove a trailing key from the recording if it matches ``text``.
@@ -61,24 +311,27 @@ class MacroManager:
         Args:
             text: Character to remove from the end of the recorded sequence.
         """
-        key_list = self.registers[self.reg_name_for_record]
-        if key_list:
-            last_key = key_list[-1]
-            if last_key.text == text:
-                self.registers[self.reg_name_for_record] = key_list[:-1]
+        if self.recording is not None:
+            self.recording.remove_last(text)
 
     def add_vim_keyevent(self, event: QKeyEvent):
         """Record a key event coming from the Vim command line."""
         if self.is_recording:
-            self.registers[self.reg_name_for_record].append(
-                KeyInfo(event.key(), event.text(), event.modifiers(), 0)
+            self.recording.append(
+                event.key(), event.text(), event.modifiers(), FROM_VIM
             )
 
+    def record_insert(self, change: InsertChange):
+        """Record the text change of an insert session."""
+        if self.recording is not None:
+            self.recording.record_insert(change)
+
     def add_editor_keyevent(self, event: QKeyEvent):
         """Record a key event originating in the editor."""
-        self.registers[self.reg_name_for_record].append(
-            KeyInfo(event.key(), event.text(), event.modifiers(), 1)
-        )
+        if self.recording is not None:
+            self.recording.append(
+                event.key(), event.text(), event.modifiers(), FROM_EDITOR
+            )
 
     def connect_to_editor(self, editor: QObject, slot):
         """Start receiving key events from ``editor``.
@@ -100,7 +353,3 @@ class MacroManager:
                 # Already disconnected or editor deleted
                 pass
         self.editor_connected = None
-
-
-
-
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Storage of the Vim registers."""
+
+# Standard Libraries
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+# Project Libraries
+from spyder_okvim.vim.state import RegisterInfo
+
+# Registers larger than this are written to a temporary file.
+MAX_REGISTER_MEMORY = 1024 * 1024
+# Characters kept in memory by all registers together.
+MAX_TOTAL_MEMORY = 8 * 1024 * 1024
+# Registers "1 to "9 form the delete ring.
+NUMBERED_REGISTERS = "123456789"
+
+
+class RegisterStore:
+    """Registers indexed by name with a memory budget.
+
+    It behaves like the ``defaultdict(RegisterInfo)`` it replaces. Contents
+    above :data:`MAX_REGISTER_MEMORY` are spilled to temporary files, and
+    the least recently set registers are spilled once all of them hold
+    more than :data:`MAX_TOTAL_MEMORY` characters.
+    """
+
+    def __init__(self) -> None:
+        self._registers: OrderedDict[str, RegisterInfo] = OrderedDict()
+        self._memory = 0
+        self._spill_dir = None
+
+    def __getitem__(self, name: str) -> RegisterInfo:
+        info = self._registers.get(name)
+        if info is None:
+            info = self._registers[name] = RegisterInfo()
+        return info
+
+    def __setitem__(self, name: str, info: RegisterInfo) -> None:
+        old = self._registers.get(name)
+        if old is info:
+            return
+        if old is not None:
+            self._release(old)
+        self._registers[name] = info
+        if info.path is None:
+            self._memory += len(info._content)
+            self._enforce_budget()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._registers
+
+    def __iter__(self):
+        return iter(self._registers)
+
+    def __len__(self) -> int:
+        return len(self._registers)
+
+    def items(self):
+        """Return the names and registers."""
+        return self._registers.items()
+
+    @property
+    def memory(self) -> int:
+        """Return the characters kept in memory."""
+        return self._memory
+
+    def set(self, name: str, content: str, register_type: int) -> RegisterInfo:
+        """Store ``content`` in register ``name`` and return it."""
+        info = self._registers.get(name)
+        if info is None:
+            info = self._registers[name] = RegisterInfo()
+        else:
+            self._release(info)
+            self._registers.move_to_end(name)
+        info.name = name
+        info.type = register_type
+        path = self._spill(content) if len(content) > MAX_REGISTER_MEMORY else None
+        if path is None:
+            info.content = content
+            self._memory += len(content)
+            self._enforce_budget()
+        else:
+            info.content = ""
+            info.path = path
+        return info
+
+    def shift_delete(self, content: str, register_type: int) -> None:
+        """Push ``content`` into ``"1`` and shift the delete ring."""
+        self._release(self._registers.pop(NUMBERED_REGISTERS[-1], RegisterInfo()))
+        for src, dst in zip(NUMBERED_REGISTERS[-2::-1], NUMBERED_REGISTERS[:0:-1]):
+            info = self._registers.pop(src, None)
+            if info is not None:
+                info.name = dst
+                self._registers[dst] = info
+        self.set(NUMBERED_REGISTERS[0], content, register_type)
+
+    def clear(self) -> None:
+        """Remove every register and its temporary file."""
+        for info in self._registers.values():
+            self._release(info)
+        self._registers.clear()
+        self._memory = 0
+
+    def close(self) -> None:
+        """Remove the registers and the folder of the spilled contents."""
+        self.clear()
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    # ------------------------------------------------------------------
+    # Memory budget
+    # ------------------------------------------------------------------
+    def _release(self, info: RegisterInfo) -> None:
+        if info.path is not None:
+            try:
+                os.remove(info.path)
+            except OSError:
+                pass
+            info.path = None
+        else:
+            self._memory -= len(info._content)
+        info._content = ""
+
+    def _spill(self, content: str) -> str | None:
+        try:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="okvim-registers-")
+            fd, path = tempfile.mkstemp(dir=self._spill_dir, suffix=".txt")
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as fh:
+                fh.write(content)
+        except OSError:
+            return None
+        return path
+
+    def _enforce_budget(self) -> None:
+        for info in list(self._registers.values()):
+            if self._memory <= MAX_TOTAL_MEMORY:
+                return
+            if info.path is not None or not info._content:
+                continue
+            path = self._spill(info._content)
+            if path is None:
+                return
+            self._memory -= len(info._content)
+            info._content = ""
+            info.path = path
@@ -1,18 +1,23 @@
 # -*- coding: utf-8 -*-
 """Utilities for searching within the editor."""
 
-from qtpy.QtCore import QRegularExpression
-from qtpy.QtGui import (
-    QBrush,
-    QColor,
-    QTextCursor,
-    QValidator,
-    QRegularExpressionValidator,
-)
+import re
+
+from qtpy.QtGui import QBrush, QColor
 
 from spyder.config.manager import CONF
 
 from spyder_okvim.spyder.config import CONF_SECTION
+from spyder_okvim.utils.vim_regex import ZS_GROUP, compile_pattern, match_span
+
+
+def _matches_span(regex: re.Pattern, text: str, span: tuple[int, int]) -> bool:
+    """Return whether ``regex`` still matches ``span`` of ``text``."""
+    if ZS_GROUP not in regex.groupindex:
+        match = regex.match(text, span[0])
+        return match is not None and match.end() == span[1]
+    # The part before ``\zs`` starts before the span.
+    return any(match_span(match) == span for match in regex.finditer(text))
 
 
 class SearchInfo:
@@ -43,28 +48,30 @@ class SearchInfo:
             sel.format.setBackground(self.color_bg)
 
     def get_sel_start_list(self):
-        """Return start positions for valid selections."""
-        cursor = self.vim_cursor.get_cursor()
-        validator = QRegularExpressionValidator(
-            QRegularExpression(self.txt_searched), None
-        )
+        """Return start positions for valid selections.
 
-        tmp = []
-        for sel in self.selection_list:
-            cursor.setPosition(sel.cursor.selectionStart())
-            cursor.setPosition(sel.cursor.selectionEnd(), QTextCursor.KeepAnchor)
-            txt_sel = cursor.selectedText()
-
-            if (validator.validate(txt_sel, 0)[0] == QValidator.Acceptable) or (
-                self.ignorecase is True and txt_sel.lower() == self.txt_searched.lower()
-            ):
-                tmp.append(sel)
-        self.selection_list = tmp
+        A selection whose text no longer matches the pattern after an edit
+        is dropped.
+        """
+        try:
+            regex = compile_pattern(self.txt_searched, self.ignorecase)
+        except re.error:
+            # Python cannot check a pattern that only Qt compiles.
+            regex = None
+
+        if regex is not None:
+            tmp = []
+            for sel in self.selection_list:
+                start = sel.cursor.selectionStart()
+                block = sel.cursor.document().findBlock(start)
+                offset = block.position()
+                span = (start - offset, sel.cursor.selectionEnd() - offset)
+                if _matches_span(regex, block.text(), span):
+                    tmp.append(sel)
+            self.selection_list = tmp
 
         self.vim_cursor.set_extra_selections(
             "vim_search", [i for i in self.selection_list]
         )
 
         return [i.cursor.selectionStart() for i in self.selection_list]
-
-
@@ -75,12 +75,13 @@ class DotCmdInfo:
         self.cmd_list_insertmode = None
         self.register_name = None
         self.editor_connected = None
-        self.key_list_from_editor = []
+        #: Net text change typed in insert mode
+        self.insert_change = None
         self.key_list_to_cmd_line = []
 
     def clear_key_list(self):
-        """Remove any stored key events."""
-        self.key_list_from_editor.clear()
+        """Remove any stored key events and inserted text."""
+        self.insert_change = None
         self.key_list_to_cmd_line.clear()
 
     def to_cmd_string(self, num, num_str):
@@ -130,7 +131,8 @@ class KeyInfo:
         self.key_code = key_code
         self.text = text
         self.modifiers = modifiers
-        #: 0 if coming from the Vim command line, 1 if from the editor
+        #: 0 if coming from the Vim command line, 1 if from the editor and
+        #: 2 if sent to the widget having the focus
         self.identifier = identifier
 
     def to_event(self):
@@ -141,12 +143,33 @@ class KeyInfo:
 
 
 class RegisterInfo:
-    """Simple register structure used by macros and yank/put."""
+    """Simple register structure used by macros and yank/put.
+
+    The content of a large register may live in a file given by ``path``;
+    it is read back when :attr:`content` is accessed.
+    """
 
     def __init__(self):
         """Initialize an empty register."""
         self.name = ""
-        self.content = ""
+        self._content = ""
+        self.path = None
         self.type = VimState.NORMAL
 
+    @property
+    def content(self) -> str:
+        """Return the text of the register."""
+        if self.path is None:
+            return self._content
+        try:
+            with open(self.path, "r", encoding="utf-8", newline="") as fh:
+                return fh.read()
+        except OSError:
+            return ""
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self._content = value
+        self.path = None
+
 
@@ -2,7 +2,9 @@
 
 # Standard Libraries
 import os.path as osp
-from collections import defaultdict
+import re
+import time
+from functools import partial
 
 # Third Party Libraries
 from qtpy.QtCore import QCoreApplication, QObject, QTimer, Signal, Slot
@@ -15,15 +17,36 @@ from spyder.config.manager import CONF
 from spyder_okvim.spyder.config import CONF_SECTION
 from spyder_okvim.utils.bookmark_manager import BookmarkManager
 from spyder_okvim.utils.cell_helpers import CellRegion, get_document_cells
+from spyder_okvim.utils.change_list import ChangeList
 from spyder_okvim.utils.easymotion import EasyMotionMarkerManager, EasyMotionPainter
+from spyder_okvim.utils.file_index import ProjectFileIndex
+from spyder_okvim.utils.frecency import FrecencyStore
 from spyder_okvim.utils.jump_list import JumpList
 from spyder_okvim.utils.qtcompat import text_width
+from spyder_okvim.utils.quickfix import QuickfixEntry, QuickfixList
+from spyder_okvim.utils.session_store import MAX_REGISTER_SIZE, SessionStore
+from spyder_okvim.utils.substitute import SubstitutePreview
+from spyder_okvim.utils.symbol_index import ProjectSymbolIndex, extract_symbols
+from spyder_okvim.utils.undo_history import (
+    UndoHistory,
+    parse_undo_offset,
+    undo_steps,
+    undo_to_state,
+)
 
 from .cursor import VimCursor
+from .insert_change import InsertChange, InsertRecorder
 from .label import ANNOTATION_STYLE, InlineLabel
-from .macro import MacroManager
+from .macro import Macro, MacroManager
+from .register import RegisterStore
 from .search import SearchInfo
-from .state import DotCmdInfo, FindInfo, InputCmdInfo, KeyInfo, RegisterInfo, VimState
+from .state import DotCmdInfo, FindInfo, InputCmdInfo, RegisterInfo, VimState
+
+# Time given to the language server before ``gd`` uses an ambiguous tag.
+DEFINITION_LSP_WAIT_MS = 500
+# Time after which ``gd`` gives up waiting for the language server.
+DEFINITION_TIMEOUT_MS = 2000
+RE_ERROR = re.compile(r"E\d+:")
 
 
 class VimStatus(QObject):
@@ -32,7 +55,11 @@ class VimStatus(QObject):
     change_label = Signal(int)
 
     def __init__(
-        self, editor_widget: QWidget, main: QWidget, msg_label: QLabel
+        self,
+        editor_widget: QWidget,
+        main: QWidget,
+        msg_label: QLabel,
+        config_dir: str | None = None,
     ) -> None:
         """Initialize the status object.
 
@@ -40,8 +67,11 @@ class VimStatus(QObject):
             editor_widget: Editor plugin used to access the current editor.
             main: Main Spyder window.
             msg_label: Label widget used to display status messages.
+            config_dir: Folder of the marks, the session and the indexes;
+                the plugin config folder by default.
         """
         super().__init__()
+        self.config_dir = config_dir or CONF.get_plugin_config_path(CONF_SECTION)
         self.is_visual_mode = False
         self.vim_state = VimState.NORMAL
         self.editor_widget = editor_widget
@@ -70,9 +100,15 @@ class VimStatus(QObject):
         self.input_cmd_prev = InputCmdInfo("", "")
         self.dot_cmd = DotCmdInfo()
         self.running_dot_cmd = False
+        self.insert_recorder = InsertRecorder()
+        # Whether the keys fed by ``:normal`` go to the editor, which then
+        # does not take the focus; ``None`` when no keys are fed.
+        self.feeding_insert: bool | None = None
 
         # register
-        self.register_dict = defaultdict(RegisterInfo)
+        self.register_dict = RegisterStore()
+        self._clipboard_text: str | None = None
+        QApplication.clipboard().dataChanged.connect(self._on_clipboard_changed)
 
         # config
         self.indent = "    "
@@ -80,17 +116,21 @@ class VimStatus(QObject):
         # search
         self.search = SearchInfo(self.cursor)
 
+        # substitute: last pattern, replacement and flags
+        self.last_substitute: tuple[str, str, str] | None = None
+        self.substitute_preview = SubstitutePreview()
+
         # message
         self.msg_label = msg_label
         self.msg_prefix = ""
+        # Last error, kept when the message is replaced; cleared by the caller.
+        self.error_message = ""
 
         # Macro
         self.manager_macro = MacroManager()
 
         # bookmarks
-        bookmarks_file = osp.join(
-            CONF.get_plugin_config_path(CONF_SECTION), "bookmarks.json"
-        )
+        bookmarks_file = osp.join(self.config_dir, "bookmarks.json")
         self._application_plugin = None
         self.bookmark_manager = BookmarkManager(
             bookmarks_file,
@@ -105,7 +145,32 @@ class VimStatus(QObject):
 
         # jumplist
         self.jump_list = JumpList()
+        self._jump_documents: dict = {}
+
+        # quickfix list
+        self.quickfix = QuickfixList()
+        self._quickfix_documents: dict = {}
+
+        # change list
+        self.change_lists: dict[str, ChangeList] = {}
+        self._change_documents: dict = {}
+        self.undo_histories: dict[str, UndoHistory] = {}
         self.timer_go_to_definition = None
+        self._definition_origin = None
+        self._definition_stack = None
+        self._buffer_symbols = (None, [])
+
+        # file history
+        self.frecency = FrecencyStore(osp.join(self.config_dir, "frecency.json"))
+        self._last_visited_file = None
+        self.file_indexes: dict[str, ProjectFileIndex] = {}
+        self.symbol_indexes: dict[str, ProjectSymbolIndex] = {}
+
+        # session state
+        self.session = SessionStore(osp.join(self.config_dir, "session.log"))
+        self._registers_restored = False
+        self._session_stack = None
+        self._position_file = None
 
         # easymotion
         self.painter_easymotion = EasyMotionPainter()
@@ -121,6 +186,8 @@ class VimStatus(QObject):
 
     def clear_state(self):
         """Clear."""
+        if self.is_visual_mode:
+            self.set_visual_marks()
         self.is_visual_mode = False
         self.vim_state = VimState.NORMAL
         editor = self.get_editor()
@@ -129,6 +196,20 @@ class VimStatus(QObject):
             editor.clear_extra_selections("vim_cursor")
         self.hide_annotate_on_txt()
 
+    def set_visual_marks(self) -> None:
+        """Set the ``'<`` and ``'>`` marks to the visual selection."""
+        editor = self.get_editor()
+        if editor is None:
+            return
+        sel_start = self.cursor.get_pos_start_in_selection()
+        sel_end = self.cursor.get_pos_end_in_selection()
+        if sel_start is None:
+            return
+        if self.vim_state != VimState.VLINE:
+            sel_end = max(sel_start, sel_end - 1)
+        self.bookmark_manager.set_bookmark("<", sel_start)
+        self.bookmark_manager.set_bookmark(">", sel_end)
+
     def is_normal(self):
         """Check that vim state is normal mode."""
         return self.vim_state == VimState.NORMAL
@@ -166,18 +247,21 @@ class VimStatus(QObject):
         self.get_editor().clear_extra_selections("hl_yank")
 
         # register
-        self.register_dict = defaultdict(RegisterInfo)
+        self.register_dict.clear()
 
         # config
         self.indent = "    "
 
         # search
         self.search = SearchInfo(self.cursor)
+        self.last_substitute = None
+        self.substitute_preview.clear()
 
         # Macro
         self.manager_macro = MacroManager()
 
         self.msg_label.setText("")
+        self.error_message = ""
 
         # bookmarks
         self.bookmark_manager.clear()
@@ -186,14 +270,24 @@ class VimStatus(QObject):
 
         # jumplist
         self.jump_list = JumpList()
+        self._last_visited_file = None
+
+        # quickfix list
+        self.quickfix = QuickfixList()
+
+        # change list
+        self.change_lists = {}
+        self.undo_histories = {}
+
+        # session state
+        self.session.clear()
+        self._registers_restored = False
 
         # Ensure EasyMotion overlays are removed between tests to avoid
         # accessing deleted widgets when reusing the session-scoped editor.
         self.remove_marker_of_easymotion()
 
-        if self.timer_go_to_definition is not None:
-            self.timer_go_to_definition.stop()
-            self.timer_go_to_definition = None
+        self.stop_definition_tracking()
 
         self.to_normal()
 
@@ -244,10 +338,32 @@ class VimStatus(QObject):
         return num_lines
 
     def set_focus_to_vim(self):
-        """Set focus to vim command line."""
+        """Set focus to vim command line.
+
+        While keys are fed, the insert mode is ended without moving the focus.
+        """
+        if self.feeding_insert is not None:
+            if self.feeding_insert:
+                self.feeding_insert = False
+                self.disconnect_from_editor()
+                self.to_normal()
+            return
         if self.cmd_line:
             self.cmd_line.setFocus()
 
+    def set_focus_to_editor(self):
+        """Set focus to the editor to type in insert mode.
+
+        While keys are fed, the insert mode starts without moving the focus.
+        """
+        if self.feeding_insert is not None:
+            if not self.feeding_insert:
+                self.feeding_insert = True
+                self.cmd_line.clear()
+                self.to_insert()
+            return
+        self.get_editor().setFocus()
+
     def set_focus_to_vim_after_delay(self, delay=300):
         """Set focus to the Vim command line after ``delay`` milliseconds.
 
@@ -267,10 +383,20 @@ class VimStatus(QObject):
 
     @Slot(QKeyEvent)
     def rcv_key_from_editor(self, event):
-        """Add key event from editor to list."""
-        self.dot_cmd.key_list_from_editor.append(
-            KeyInfo(event.key(), event.text(), event.modifiers(), 1)
-        )
+        """Capture the text typed in the editor from its first key."""
+        self.capture_insert()
+
+    def capture_insert(self):
+        """Follow the text inserted at the cursor for the ``.`` command.
+
+        The capture starts again when the cursor left the inserted text.
+        """
+        editor = self.dot_cmd.editor_connected
+        if editor is None:
+            return
+        pos = editor.textCursor().position()
+        if not self.insert_recorder.contains(pos):
+            self.insert_recorder.begin(editor.document(), pos)
 
     def disconnect_from_editor(self):
         """Disconnect from the editor."""
@@ -278,8 +404,23 @@ class VimStatus(QObject):
         editor = self.dot_cmd.editor_connected
         if editor:
             editor.sig_key_pressed.disconnect(self.rcv_key_from_editor)
+            self._finish_insert(editor)
         self.dot_cmd.editor_connected = None
 
+    def _finish_insert(self, editor):
+        recorder = self.insert_recorder
+        moved = recorder.moved
+        try:
+            change = recorder.finish(editor.textCursor().position())
+        except RuntimeError:
+            # The editor was deleted during the insert.
+            return
+        if change is not None:
+            self.dot_cmd.insert_change = change
+        if self.manager_macro.is_recording and not moved:
+            # Without a change, the keys sent by the command itself are dropped.
+            self.manager_macro.record_insert(change or InsertChange())
+
     def update_dot_cmd(
         self, connect_editor, register_name=None, key_list_to_cmd_line=None
     ):
@@ -330,25 +471,118 @@ class VimStatus(QObject):
         """Set content into register_dict."""
         if name == "+":
             QApplication.clipboard().setText(content)
+            self._clipboard_text = content
         else:
-            info = self.register_dict[name]
-            info.name = name
-            info.content = content
-            info.type = register_type
-            self.register_dict[name] = info
+            self.register_dict.set(name, content, register_type)
+            if len(content) <= MAX_REGISTER_SIZE:
+                self.session.put("register", name, [content, register_type])
+
+    def set_deleted_register(self, content, register_type, is_small):
+        """Keep deleted text in ``"-`` or in the ``"1``-``"9`` ring.
+
+        Args:
+            content: Deleted text.
+            register_type: Type of the register.
+            is_small: ``True`` when less than a line was deleted.
+        """
+        if is_small:
+            self.set_register("-", content, register_type)
+        else:
+            self.register_dict.shift_delete(content, register_type)
+
+    def _on_clipboard_changed(self) -> None:
+        self._clipboard_text = None
 
     def get_register(self):
         """Get content from register_dict."""
         name = self.get_register_name()
         if name == "+":
+            if self._clipboard_text is None:
+                self._clipboard_text = QApplication.clipboard().text()
             info = RegisterInfo()
             info.name = "+"
-            info.content = QApplication.clipboard().text()
+            info.content = self._clipboard_text
             info.type = VimState.NORMAL
             return info
         else:
+            self._restore_registers()
             return self.register_dict[name]
 
+    def _restore_registers(self) -> None:
+        """Fill the registers saved by the previous sessions."""
+        if self._registers_restored:
+            return
+        self._registers_restored = True
+        for name, (content, register_type) in self.session.items("register"):
+            if name not in self.register_dict:
+                self.register_dict.set(name, content, register_type)
+
+    # ---- Session state -----------------------------------------------
+    def add_history(self, kind: str, text: str) -> None:
+        """Append ``text`` to the ``"search"`` or ``"cmd"`` history."""
+        if text:
+            self.session.put(kind, text)
+
+    def get_history(self, kind: str) -> list[str]:
+        """Return the ``"search"`` or ``"cmd"`` history from the oldest."""
+        return self.session.keys(kind)
+
+    def watch_editorstack(self) -> None:
+        """Remember the cursor of the files left in the current stack."""
+        stack = self.get_editorstack()
+        if stack is None or stack is self._session_stack:
+            return
+        if self._session_stack is not None:
+            try:
+                self._session_stack.current_file_changed.disconnect(
+                    self._on_session_file_changed
+                )
+                self._session_stack.sig_codeeditor_deleted.disconnect(
+                    self.remember_position
+                )
+                self._session_stack.sig_codeeditor_deleted.disconnect(
+                    self.forget_editor
+                )
+            except (TypeError, RuntimeError):
+                pass
+        self._session_stack = stack
+        self._position_file = stack.get_current_filename()
+        stack.current_file_changed.connect(self._on_session_file_changed)
+        stack.sig_codeeditor_deleted.connect(self.remember_position)
+        stack.sig_codeeditor_deleted.connect(self.forget_editor)
+
+    def _on_session_file_changed(self, file_path: str, *args) -> None:
+        previous = self._position_file
+        self._position_file = file_path
+        if not previous or previous == file_path:
+            return
+        idx = self._session_stack.is_file_opened(previous)
+        if idx is not None:
+            self.remember_position(self._session_stack.data[idx].editor)
+
+    def remember_position(self, editor) -> None:
+        """Save the cursor of ``editor`` as the ``'"`` mark of its file."""
+        file_path = getattr(editor, "filename", None)
+        if not file_path:
+            return
+        cursor = editor.textCursor()
+        line = cursor.blockNumber()
+        self.session.put(
+            "position", file_path, [line, cursor.position() - cursor.block().position()]
+        )
+
+    def save_session(self) -> None:
+        """Remember the cursor of every file and write the session."""
+        stack = self.get_editorstack()
+        if stack is not None:
+            try:
+                for finfo in stack.data:
+                    self.remember_position(finfo.editor)
+            except RuntimeError:
+                # The editors may already be deleted when Spyder closes.
+                pass
+        self.session.flush()
+
     # ---- Application helpers ----------------------------------------
     def _get_application_plugin(self):
         """Return and cache Spyder's application plugin."""
@@ -384,7 +618,16 @@ class VimStatus(QObject):
         self.bookmark_manager.set_bookmark(name)
 
     def get_bookmark(self, name: str):
-        """Return bookmark information for *name* or None."""
+        """Return bookmark information for *name* or None.
+
+        ``"`` is the cursor position when the file was last left.
+        """
+        if name == '"':
+            file_path = self.get_editorstack().get_current_filename()
+            position = self.session.get("position", file_path)
+            if position is None:
+                return None
+            return {"file": file_path, "line": position[0], "col": position[1]}
         return self.bookmark_manager.get_bookmark(name)
 
     def jump_to_bookmark(self, name: str) -> None:
@@ -409,39 +652,481 @@ class VimStatus(QObject):
         location = self.get_current_location()
         if location is None:
             return
-        file_path, pos = location
+        self.add_jump(*location)
+
+    def add_jump(self, file_path: str, pos: int) -> None:
+        """Record ``pos`` of ``file_path`` in the jump list.
+
+        The jump follows the edits made in the open document of the file.
+        """
         self.jump_list.push(file_path, pos)
+        self.record_file_visit(file_path)
+        document = self.get_open_document(file_path)
+        if document is not None and not self._is_tracked(
+            self._jump_documents, file_path, document
+        ):
+            self._track_document(
+                self._jump_documents,
+                file_path,
+                document,
+                contentsChange=partial(self._on_jump_document_changed, file_path),
+            )
+
+    def get_open_editor(self, file_path: str):
+        """Return the editor of ``file_path`` if it is open."""
+        stack = self.get_editorstack()
+        if stack is None:
+            return None
+        idx = stack.is_file_opened(file_path)
+        if idx is None:
+            return None
+        return stack.data[idx].editor
+
+    def get_open_document(self, file_path: str):
+        """Return the document of ``file_path`` if it is open in the editor."""
+        editor = self.get_open_editor(file_path)
+        return None if editor is None else editor.document()
+
+    def _on_jump_document_changed(
+        self, file_path: str, position: int, removed: int, added: int
+    ) -> None:
+        self.jump_list.shift(file_path, position, removed, added)
+
+    # ---- Tracked documents -------------------------------------------
+    @staticmethod
+    def _is_tracked(documents: dict, file_path: str, document) -> bool:
+        return file_path in documents and documents[file_path][0] is document
+
+    def _track_document(
+        self, documents: dict, file_path: str, document, **slots
+    ) -> None:
+        """Connect ``slots`` to the signals of the document of ``file_path``.
+
+        The document tracked before for the file is disconnected first.
+        """
+        if file_path in documents:
+            self._untrack_document(documents, file_path)
+        for name, slot in slots.items():
+            getattr(document, name).connect(slot)
+        documents[file_path] = (document, slots)
+
+    @staticmethod
+    def _untrack_document(documents: dict, file_path: str) -> None:
+        document, slots = documents.pop(file_path)
+        for name, slot in slots.items():
+            try:
+                getattr(document, name).disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+
+    def forget_editor(self, editor) -> None:
+        """Stop following the document of a closed editor.
+
+        The quickfix entries keep the lines and columns they moved to.
+        """
+        document = editor.document()
+        for file_path, (doc, _) in self._quickfix_documents.items():
+            if doc is document:
+                self._sync_quickfix_lines(file_path)
+        for documents in (
+            self._jump_documents,
+            self._quickfix_documents,
+            self._change_documents,
+        ):
+            for file_path in [
+                path for path, (doc, _) in documents.items() if doc is document
+            ]:
+                self._untrack_document(documents, file_path)
+
+    # ---- Quickfix list -----------------------------------------------
+    def set_quickfix(self, entries: list[QuickfixEntry]) -> None:
+        """Replace the quickfix list with ``entries``."""
+        self.quickfix.set_entries(entries)
+        self.track_quickfix()
+
+    def track_quickfix(self) -> None:
+        """Make the quickfix entries follow the edits of their open files.
+
+        The entries of a file opened since the search are placed again from
+        their line and column.
+        """
+        for file_path in self.quickfix.files:
+            document = self.get_open_document(file_path)
+            if document is None or self._is_tracked(
+                self._quickfix_documents, file_path, document
+            ):
+                continue
+            if file_path in self._quickfix_documents:
+                self._sync_quickfix_lines(file_path)
+            self.quickfix.sync_positions(
+                file_path, partial(self._get_quickfix_position, document)
+            )
+            self._track_document(
+                self._quickfix_documents,
+                file_path,
+                document,
+                contentsChange=partial(self._on_quickfix_document_changed, file_path),
+            )
+
+    def _sync_quickfix_lines(self, file_path: str) -> None:
+        """Store the lines and columns of the entries of a tracked document."""
+        document = self._quickfix_documents[file_path][0]
+
+        def to_line_col(pos: int) -> tuple[int, int]:
+            block = document.findBlock(pos)
+            if not block.isValid():
+                block = document.lastBlock()
+            return block.blockNumber(), min(pos - block.position(), block.length() - 1)
+
+        try:
+            self.quickfix.sync_lines(file_path, to_line_col)
+        except RuntimeError:
+            # The document was already deleted.
+            pass
+
+    @staticmethod
+    def _get_quickfix_position(document, line: int, col: int) -> int:
+        block = document.findBlockByNumber(line)
+        if not block.isValid():
+            return document.characterCount() - 1
+        return block.position() + min(col, block.length() - 1)
+
+    def _on_quickfix_document_changed(
+        self, file_path: str, position: int, removed: int, added: int
+    ) -> None:
+        self.quickfix.shift(file_path, position, removed, added)
+
+    def move_in_quickfix(self, count: int) -> None:
+        """Jump ``count`` entries forward in the quickfix list, back if negative."""
+        if not len(self.quickfix):
+            self.set_message("E42: No Errors")
+            return
+        if self.quickfix.move(count) is None:
+            self.set_message("E553: No more items")
+            return
+        self.jump_to_quickfix(self.quickfix.index)
+
+    def jump_to_quickfix(self, index: int) -> None:
+        """Jump to the entry ``index`` of the quickfix list."""
+        entry = self.quickfix.select(index)
+        if entry is None:
+            return
+        self.push_jump()
+        editor_stack = self.get_editorstack()
+        if editor_stack.is_file_opened(entry.file) is None:
+            self._open_file_in_application(entry.file)
+        editor_stack.set_current_filename(entry.file)
+        self.track_quickfix()
+        document = self.get_open_document(entry.file)
+        if document is None:
+            return
+        self.cursor.set_cursor_pos(min(entry.pos, document.characterCount() - 1))
+        self.push_jump()
+        # Focusing the command line clears the message.
+        self.set_focus_to_vim()
+        block = document.findBlock(entry.pos)
+        self.set_message(
+            f"({index + 1} of {len(self.quickfix)}): {block.text().strip()}"
+        )
+
+    # ---- Change list -------------------------------------------------
+    def track_changes(self) -> None:
+        """Feed the change list of the current file from its document."""
+        location = self.get_current_location()
+        if location is None:
+            return
+        file_path = location[0]
+        document = self.get_editor().document()
+        if not self._is_tracked(self._change_documents, file_path, document):
+            self._track_document(
+                self._change_documents,
+                file_path,
+                document,
+                contentsChange=partial(self._on_change_document_changed, file_path),
+                undoCommandAdded=partial(self._on_undo_command_added, file_path),
+            )
+
+    def _on_change_document_changed(
+        self, file_path: str, position: int, removed: int, added: int
+    ) -> None:
+        if not removed and not added:
+            return
+        changes = self.change_lists.get(file_path)
+        if changes is None:
+            changes = self.change_lists[file_path] = ChangeList()
+        changes.shift(position, removed, added)
+        merge = False
+        if len(changes):
+            document = self._change_documents[file_path][0]
+            last_line = document.findBlock(changes.positions[-1]).blockNumber()
+            merge = last_line == document.findBlock(position).blockNumber()
+        changes.record(position, merge)
+
+    def _on_undo_command_added(self, file_path: str) -> None:
+        history = self.undo_histories.get(file_path)
+        if history is None:
+            history = self.undo_histories[file_path] = UndoHistory()
+        steps = self._change_documents[file_path][0].availableUndoSteps()
+        history.record(steps, time.monotonic())
+
+    def travel_undo(self, arg: str, later: bool) -> int | None:
+        """Move through the undo states for ``:earlier`` and ``:later``.
+
+        Args:
+            arg: Number of changes or a duration such as ``30s`` or ``5m``.
+            later: Move to newer states instead of older ones.
+
+        Returns:
+            Number of changes undone or redone, ``None`` for a bad argument.
+        """
+        offset = parse_undo_offset(arg)
+        if offset is None:
+            self.set_message("E475: Invalid argument")
+            return None
+        count, seconds = offset
+        editor = self.get_editor()
+        current = editor.document().availableUndoSteps()
+        if seconds:
+            location = self.get_current_location()
+            history = self.undo_histories.get(location[0]) if location else None
+            if history is None:
+                target = current if later else 0
+            else:
+                target = history.target(current, seconds, later)
+            done = undo_to_state(editor, target)
+        else:
+            done = undo_steps(editor, count, redo=later)
+        self.set_message(f"{done} changes")
+        return done
+
+    def get_change_position(self, count: int, older: bool) -> int | None:
+        """Move through the change list of the current file.
+
+        Args:
+            count: Number of entries to move.
+            older: Move to older changes (``g;``) instead of newer ones.
+
+        Returns:
+            The position of the change or ``None`` at the end of the list.
+        """
+        location = self.get_current_location()
+        changes = self.change_lists.get(location[0]) if location else None
+        if not changes:
+            self.set_message("E664: changelist is empty")
+            return None
+        pos = changes.older(count) if older else changes.newer(count)
+        if pos is None:
+            if older:
+                self.set_message("E662: At start of changelist")
+            else:
+                self.set_message("E663: At end of changelist")
+            return None
+        block = self.get_editor().document().findBlock(pos)
+        return max(min(pos, block.position() + block.length() - 2), block.position())
+
+    def get_file_index(self, root_folder: str | None) -> ProjectFileIndex | None:
+        """Return the file index of ``root_folder`` and start it if needed."""
+        if not root_folder or not osp.isdir(root_folder):
+            return None
+        file_index = self.file_indexes.get(root_folder)
+        if file_index is None:
+            file_index = ProjectFileIndex(
+                root_folder,
+                self.config_dir,
+                CONF.get(CONF_SECTION, "file_search_include"),
+                CONF.get(CONF_SECTION, "file_search_exclude"),
+                parent=self,
+            )
+            file_index.start()
+            self.file_indexes[root_folder] = file_index
+        return file_index
+
+    def release_file_index(self, root_folder: str | None = None) -> None:
+        """Stop the file index of ``root_folder`` or every index."""
+        if root_folder is None:
+            roots = list(self.file_indexes)
+        else:
+            roots = [root_folder]
+        for root in roots:
+            symbol_index = self.symbol_indexes.pop(root, None)
+            if symbol_index is not None:
+                symbol_index.stop()
+                symbol_index.deleteLater()
+            file_index = self.file_indexes.pop(root, None)
+            if file_index is not None:
+                file_index.stop()
+                file_index.deleteLater()
+
+    def get_symbol_index(
+        self, root_folder: str | None
+    ) -> ProjectSymbolIndex | None:
+        """Return the symbol index of ``root_folder`` and start it if needed.
+
+        The symbol index follows the files of the project file index.
+        """
+        file_index = self.get_file_index(root_folder)
+        if file_index is None:
+            return None
+        symbol_index = self.symbol_indexes.get(root_folder)
+        if symbol_index is None:
+            symbol_index = ProjectSymbolIndex(root_folder, self.config_dir, parent=self)
+            symbol_index.load_cache()
+            file_index.sig_paths_updated.connect(
+                lambda: symbol_index.update(file_index.paths)
+            )
+            if file_index.paths:
+                symbol_index.update(file_index.paths)
+            self.symbol_indexes[root_folder] = symbol_index
+        return symbol_index
+
+    def update_symbols_of_file(self, file_path: str, language: str = "") -> None:
+        """Parse ``file_path`` again if it changed since it was indexed."""
+        for symbol_index in self.symbol_indexes.values():
+            symbol_index.update_file(file_path)
+
+    def open_file_at(self, file_path: str, line: int, col: int = 0) -> None:
+        """Show ``file_path`` and move the cursor to ``line`` and ``col``.
+
+        Args:
+            file_path: File to open.
+            line: Zero based line number.
+            col: Zero based column.
+        """
+        editor_stack = self.get_editorstack()
+        if editor_stack.is_file_opened(file_path) is None:
+            self._open_file_in_application(file_path)
+        editor_stack.set_current_filename(file_path)
+        block = self.get_editor().document().findBlockByNumber(line)
+        if block.isValid():
+            self.cursor.set_cursor_pos(block.position() + min(col, block.length() - 1))
+
+    def get_project_root(self) -> str | None:
+        """Return the path of the active project or ``None``."""
+        try:
+            return self.main.projects.get_active_project_path()
+        except AttributeError:
+            return None
+
+    def record_file_visit(self, file_path: str) -> None:
+        """Count a visit of ``file_path`` in the frecency store."""
+        if file_path == self._last_visited_file:
+            return
+        self._last_visited_file = file_path
+        self.frecency.visit(self.get_project_root(), file_path)
+
+    def find_definitions(self, name: str) -> list[tuple[str, int, int]]:
+        """Return the tag locations of ``name``.
+
+        Definitions in the current buffer are preferred over the ones of the
+        project symbol index.
+        """
+        if not name:
+            return []
+        editor = self.get_editor()
+        document = editor.document()
+        key = (editor.filename, document.revision())
+        if self._buffer_symbols[0] != key:
+            self._buffer_symbols = (key, extract_symbols(editor.toPlainText()))
+        local = [
+            (editor.filename, line, col)
+            for sym_name, _, line, col, _ in self._buffer_symbols[1]
+            if sym_name == name
+        ]
+        if local:
+            return local
+        symbol_index = self.get_symbol_index(self.get_project_root())
+        if symbol_index is None:
+            return []
+        return symbol_index.find_definitions(name)
+
+    def go_to_definition(self) -> None:
+        """Jump to the definition of the word under the cursor.
+
+        The language server is asked first, and the first tag is used if it
+        does not answer in time.
+        """
+        editor = self.get_editor()
+        if not editor:
+            return
+        cursor = editor.textCursor()
+        cursor.select(QTextCursor.WordUnderCursor)
+        candidates = self.find_definitions(cursor.selectedText())
+        previous = self.get_current_location()
+        self.push_jump()
+        self.start_definition_tracking(previous, candidates)
+        editor.go_to_definition_from_cursor()
+
+    def start_definition_tracking(self, previous, candidates=None):
+        """Monitor cursor movement after ``gd`` and update the jump list.
+
+        Args:
+            previous: Location before the jump.
+            candidates: Tag locations used when the language server does
+                not move the cursor in time.
+        """
+        self.stop_definition_tracking()
+        self._definition_origin = previous
+        stack = self.get_editorstack()
+        self._definition_stack = stack
+        stack.sig_editor_cursor_position_changed.connect(self._on_definition_moved)
+        stack.current_file_changed.connect(self._on_definition_moved)
 
-    def start_definition_tracking(self, previous):
-        """Monitor cursor movement after ``gd`` and update the jump list."""
         timer = QTimer(self)
+        timer.setSingleShot(True)
+        if candidates:
+            timer.timeout.connect(lambda: self._use_tag_definition(candidates[0]))
+            timer.start(DEFINITION_LSP_WAIT_MS)
+        else:
+            timer.timeout.connect(self._cancel_definition_tracking)
+            timer.start(DEFINITION_TIMEOUT_MS)
         self.timer_go_to_definition = timer
 
-        def stop():
-            timer.stop()
-            self.timer_go_to_definition = None
+    def stop_definition_tracking(self) -> None:
+        """Stop listening for the result of ``gd``."""
+        if self.timer_go_to_definition is None:
+            return
+        self.timer_go_to_definition.stop()
+        self.timer_go_to_definition = None
+        stack, self._definition_stack = self._definition_stack, None
+        if stack is None:
+            return
+        for signal in (
+            stack.sig_editor_cursor_position_changed,
+            stack.current_file_changed,
+        ):
+            try:
+                signal.disconnect(self._on_definition_moved)
+            except (TypeError, RuntimeError):
+                pass
 
-        def check():
-            current = self.get_current_location()
-            if previous is not None and current and current != previous:
-                pos = current[1]
+    def _on_definition_moved(self, *args) -> None:
+        # The cursor is positioned after the file switch; check once the
+        # event that moved it is fully processed.
+        QTimer.singleShot(0, self._check_definition_moved)
 
-                if pos < 1:
-                    # The cursor may be set to 0 before it is created and positioned,
-                    # but a definition never starts at cursor position 0.
-                    return
-                self.push_jump()
-                stop()
+    def _check_definition_moved(self) -> None:
+        if self.timer_go_to_definition is None:
+            return
+        current = self.get_current_location()
+        previous = self._definition_origin
+        if previous is None or not current or current == previous:
+            return
+        if current[1] < 1:
+            # The cursor may be set to 0 before it is created and positioned,
+            # but a definition never starts at cursor position 0.
+            return
+        self.stop_definition_tracking()
+        self.push_jump()
 
-        def finalize():
-            stop()
-            current = self.get_current_location()
-            if previous is not None and current == previous:
-                self.jump_list.pop_last()
+    def _use_tag_definition(self, location) -> None:
+        self.stop_definition_tracking()
+        self.open_file_at(*location)
+        self.push_jump()
 
-        timer.timeout.connect(check)
-        timer.start(100)
-        QTimer.singleShot(2000, finalize)
+    def _cancel_definition_tracking(self) -> None:
+        self.stop_definition_tracking()
+        if self.get_current_location() == self._definition_origin:
+            self.jump_list.pop_last()
 
     def jump_backward(self) -> None:
         """Jump to the previous location in the jump list."""
@@ -465,6 +1150,8 @@ class VimStatus(QObject):
 
     def set_message(self, msg, duration_ms=-1):
         """Display ``msg`` in the status bar."""
+        if RE_ERROR.match(msg):
+            self.error_message = msg
         self.msg_label.setText(f"{self.msg_prefix}{msg}")
 
     def start_recording_macro(self, reg_name):
@@ -472,7 +1159,10 @@ class VimStatus(QObject):
         self.msg_prefix = f"recording @{reg_name}... "
 
         editor = self.get_editor()
-        self.manager_macro.start_record(reg_name)
+        name = reg_name.lower()
+        # An uppercase register appends to the macro like Vim.
+        macro = self.get_macro(name).copy() if name != reg_name else None
+        self.manager_macro.start_record(name, macro)
         self.manager_macro.connect_to_editor(
             editor, self.add_key_from_editor_to_macro_manager
         )
@@ -484,11 +1174,28 @@ class VimStatus(QObject):
     def stop_recording_macro(self):
         """Stop recording macro."""
         self.msg_prefix = ""
-        self.manager_macro.stop_record()
+        name = self.manager_macro.reg_name_for_record
+        macro = self.manager_macro.stop_record()
+        if macro is not None:
+            self.set_register(name, macro.notation, VimState.NORMAL)
         self.manager_macro.disconnect_from_editor(
             self.add_key_from_editor_to_macro_manager
         )
 
+    def get_macro(self, name):
+        """Return the macro stored in register ``name``.
+
+        The recorded keys are reused while the register holds their
+        notation; an edited or yanked register is parsed again.
+        """
+        name = name.lower()
+        self._restore_registers()
+        content = self.register_dict[name].content if name in self.register_dict else ""
+        macro = self.manager_macro.registers.get(name)
+        if macro is None or macro.notation != content:
+            macro = self.manager_macro.registers[name] = Macro(content)
+        return macro
+
     @Slot(QKeyEvent)
     def add_key_from_editor_to_macro_manager(self, event):
         """Add key event from editor to list to macro_manager."""